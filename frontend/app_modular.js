@@ -86,12 +86,16 @@ document.addEventListener('DOMContentLoaded', async () => {
     // Mas o HTML atual tem uma <img>. O módulo avatar.js espera um container.
     // Vamos ajustar:
     if (avatarContainer && avatarContainer.tagName === 'IMG') {
-        const parent = avatarContainer.parentElement;
+        // A imagem pode estar dentro de um <picture> (variantes AVIF/WebP)
+        const replaced = avatarContainer.parentElement.tagName === 'PICTURE'
+            ? avatarContainer.parentElement
+            : avatarContainer;
+        const parent = replaced.parentElement;
         const newContainer = document.createElement('div');
         newContainer.className = 'ada-avatar-container';
         newContainer.style.width = '60px'; // Ajuste conforme CSS original
         newContainer.style.height = '60px';
-        parent.replaceChild(newContainer, avatarContainer);
+        parent.replaceChild(newContainer, replaced);
         initAvatar(newContainer);
     } else if (avatarContainer) {
         initAvatar(avatarContainer);
@@ -100,7 +104,10 @@ document.addEventListener('DOMContentLoaded', async () => {
     // 6. Configura Event Listeners Globais
     setupEventListeners();
 
-    // 7. Verifica Backend
+    // 7. Registra Service Worker (shell offline e respostas salvas)
+    registerServiceWorker();
+
+    // 8. Verifica Backend
     try {
         const isHealthy = await checkHealth();
         if (isHealthy) {
@@ -125,6 +132,21 @@ document.addEventListener('DOMContentLoaded', async () => {
     };
 });
 
+// =========================================
+// Service Worker
+// =========================================
+/**
+ * Registra o service worker (servido em /sw.js para ter escopo na raiz)
+ * Falhas não impedem o uso do chat, apenas desativam o modo offline.
+ */
+function registerServiceWorker() {
+    if (!('serviceWorker' in navigator)) return;
+
+    navigator.serviceWorker.register('/sw.js').catch(error => {
+        console.warn('Service worker não registrado:', error);
+    });
+}
+
 // =========================================
 // Event Listeners Globais
 // =========================================
@@ -166,7 +188,12 @@ function setupEventListeners() {
                 updateAvatar(AVATAR_STATES.HAPPY);
 
                 // Anuncia resposta para leitor de tela (resumo)
-                announceToScreenReader('Resposta recebida da Ada');
+                if (response.offline_replay) {
+                    showToast('Sem conexão com o servidor: exibindo resposta salva anteriormente', 'info');
+                    announceToScreenReader('Resposta salva anteriormente exibida pela Ada');
+                } else {
+                    announceToScreenReader('Resposta recebida da Ada');
+                }
             }
 
         } catch (error) {
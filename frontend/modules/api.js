@@ -15,6 +15,9 @@ const API_BASE_URL = window.location.origin;
 const API_CHAT_ENDPOINT = `${API_BASE_URL}/api/chat`;
 const API_CONFIG_ENDPOINT = `${API_BASE_URL}/api/config`;
 
+// Header definido pelo service worker ao reaproveitar uma resposta salva (sw.js)
+const OFFLINE_REPLAY_HEADER = 'X-Ada-Offline-Replay';
+
 // Configurações do frontend (carregadas do backend)
 let frontendConfig = {
     request_timeout_ms: 120000,
@@ -141,8 +144,8 @@ export async function sendMessage(pergunta, callbacks = {}) {
     }, warningTime);
 
     try {
-        // Verifica se está offline
-        if (!navigator.onLine) {
+        // Verifica se está offline (com service worker ativo, ele pode responder do cache)
+        if (!navigator.onLine && !navigator.serviceWorker?.controller) {
             throw new Error('OFFLINE');
         }
 
@@ -173,6 +176,7 @@ export async function sendMessage(pergunta, callbacks = {}) {
         }
 
         const data = await response.json();
+        data.offline_replay = response.headers.get(OFFLINE_REPLAY_HEADER) === '1';
 
         // Callback de sucesso
         if (onSuccess) onSuccess(data);
@@ -189,6 +193,11 @@ export async function sendMessage(pergunta, callbacks = {}) {
             return null;
         }
 
+        // Falha de rede sem conexão e sem resposta salva no service worker
+        if (error instanceof TypeError && !navigator.onLine) {
+            error = new Error('OFFLINE');
+        }
+
         // Callback de erro
         if (onError) onError(error);
 
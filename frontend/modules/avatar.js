@@ -5,6 +5,8 @@
  * - Carregamento da animação Lottie
  * - Transições de estado (IDLE, THINKING, HAPPY, etc.)
  * - Feedback visual para o usuário
+ * - Imagens responsivas dos estados (AVIF/WebP via ada-images-manifest.json)
+ *   e pré-carregamento apenas dos próximos estados prováveis
  */
 
 // =========================================
@@ -28,10 +30,29 @@ export const AVATAR_STATES = {
 // Configuração do Lottie
 const LOTTIE_PATH = 'https://assets2.lottiefiles.com/packages/lf20_w51pcehl.json'; // Robô amigável
 
+// Imagens responsivas (geradas por scripts/build_ada_images.py)
+const ASSETS_BASE = '/assets/';
+const IMAGES_MANIFEST_URL = `${ASSETS_BASE}ada-images-manifest.json`;
+const IMAGE_FORMATS = ['avif', 'webp']; // Ordem de preferência nos <source>
+const MESSAGE_AVATAR_SIZES = '(min-width: 768px) 100px, 80px';
+
+// Estados que costumam vir em seguida a cada estado (pré-carregados em segundo plano)
+const NEXT_STATES = {
+    [AVATAR_STATES.GREETING]: [AVATAR_STATES.THINKING],
+    [AVATAR_STATES.IDLE]: [AVATAR_STATES.THINKING],
+    [AVATAR_STATES.LISTENING]: [AVATAR_STATES.THINKING],
+    [AVATAR_STATES.THINKING]: [AVATAR_STATES.HAPPY, AVATAR_STATES.CONFUSED],
+    [AVATAR_STATES.HAPPY]: [AVATAR_STATES.THINKING],
+    [AVATAR_STATES.SLEEP]: [AVATAR_STATES.GREETING]
+};
+
 // Estado interno
 let lottieInstance = null;
 let currentAvatarState = AVATAR_STATES.GREETING;
 let avatarContainer = null;
+let imagesManifest = null;
+let preferredFormat = null;      // Primeiro formato de IMAGE_FORMATS suportado
+const preloadedStates = new Set();
 
 // =========================================
 // Inicialização
@@ -48,6 +69,9 @@ export function initAvatar(container) {
 
     avatarContainer = container;
 
+    // Manifest das variantes responsivas (não bloqueia o avatar)
+    loadImagesManifest().then(() => preloadNextStates(currentAvatarState));
+
     try {
         // Verifica se lottie está carregado (global)
         if (typeof lottie === 'undefined') {
@@ -89,6 +113,7 @@ export function updateAvatar(state, animate = true) {
     }
 
     currentAvatarState = state;
+    preloadNextStates(state);
 
     // Atualiza atributo data-state para CSS
     if (avatarContainer) {
@@ -192,6 +217,114 @@ export function getAvatarPath(state) {
     return `/assets/ada-states/${filename}`;
 }
 
+// =========================================
+// Imagens Responsivas
+// =========================================
+/**
+ * Carrega o manifest das variantes e detecta o formato preferido
+ * @returns {Promise<Object|null>} Manifest ou null (usa os PNG originais)
+ */
+export async function loadImagesManifest() {
+    if (imagesManifest) return imagesManifest;
+
+    try {
+        const response = await fetch(IMAGES_MANIFEST_URL);
+        if (!response.ok) return null;
+        imagesManifest = await response.json();
+        preferredFormat = await detectPreferredFormat(imagesManifest);
+    } catch (error) {
+        console.warn('Manifest de imagens da Ada indisponível, usando PNG:', error);
+    }
+    return imagesManifest;
+}
+
+/**
+ * Testa o suporte a cada formato decodificando a menor variante real
+ * (o arquivo testado é o mesmo que seria usado, então não há download extra)
+ */
+async function detectPreferredFormat(manifest) {
+    const idle = manifest.images[stateImageKey(AVATAR_STATES.IDLE)];
+    for (const format of IMAGE_FORMATS) {
+        const variants = idle?.variants?.[format];
+        if (!variants) continue;
+        const smallest = Object.keys(variants).sort((a, b) => a - b)[0];
+        const supported = await new Promise(resolve => {
+            const img = new Image();
+            img.onload = () => resolve(img.width > 0);
+            img.onerror = () => resolve(false);
+            img.src = ASSETS_BASE + variants[smallest];
+        });
+        if (supported) return format;
+    }
+    return null;
+}
+
+function stateImageKey(state) {
+    return getAvatarPath(state).slice(ASSETS_BASE.length);
+}
+
+/**
+ * Monta o srcset de um estado em um formato
+ * @returns {string} srcset ('' se não houver variantes)
+ */
+function buildSrcset(state, format) {
+    const entry = imagesManifest?.images?.[stateImageKey(state)];
+    const variants = entry?.variants?.[format];
+    if (!variants) return '';
+    return Object.entries(variants)
+        .map(([width, path]) => `${ASSETS_BASE}${path} ${width}w`)
+        .join(', ');
+}
+
+/**
+ * Cria um <picture> com AVIF/WebP e o PNG original como fallback
+ * @param {string} state - Estado do avatar
+ * @param {string} alt - Texto alternativo
+ * @param {string} sizes - Atributo sizes (padrão: avatar das mensagens)
+ * @returns {{picture: HTMLPictureElement, img: HTMLImageElement}}
+ */
+export function createAvatarPicture(state, alt, sizes = MESSAGE_AVATAR_SIZES) {
+    const picture = document.createElement('picture');
+
+    IMAGE_FORMATS.forEach(format => {
+        const srcset = buildSrcset(state, format);
+        if (!srcset) return;
+        const source = document.createElement('source');
+        source.type = `image/${format}`;
+        source.srcset = srcset;
+        source.sizes = sizes;
+        picture.appendChild(source);
+    });
+
+    const img = document.createElement('img');
+    img.src = getAvatarPath(state);
+    img.alt = alt;
+    img.decoding = 'async';
+    picture.appendChild(img);
+
+    return { picture, img };
+}
+
+/**
+ * Pré-carrega, em segundo plano, as imagens dos estados que devem vir a seguir
+ * Só o formato suportado e a largura escolhida pelo navegador são baixados.
+ * @param {string} state - Estado atual
+ */
+export function preloadNextStates(state) {
+    if (!imagesManifest || !preferredFormat) return;
+
+    (NEXT_STATES[state] || []).forEach(next => {
+        if (preloadedStates.has(next)) return;
+        const srcset = buildSrcset(next, preferredFormat);
+        if (!srcset) return;
+
+        preloadedStates.add(next);
+        const img = new Image();
+        img.sizes = MESSAGE_AVATAR_SIZES;
+        img.srcset = srcset;
+    });
+}
+
 /**
  * Destrói a instância do avatar (limpeza)
  */
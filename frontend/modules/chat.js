@@ -3,35 +3,58 @@
  * 
  * Responsável por:
  * - Gerenciar lista de mensagens
- * - Renderizar interface do chat
+ * - Renderizar interface do chat (janela virtualizada de mensagens montadas)
  * - Processar Markdown e sanitização
  * - Gerenciar indicador de digitação
  * - Integrar com Storage e Avatar
  */
 
 import {
-    saveMessagesToStorage,
-    loadMessagesFromStorage,
-    clearMessagesFromStorage
+    appendMessageToStorage,
+    loadMessagesPage,
+    deleteMessageFromStorage,
+    clearMessagesFromStorage,
+    HISTORY_PAGE_SIZE
 } from './storage.js';
 
 import {
     updateAvatar,
     AVATAR_STATES,
-    getAvatarPath
+    createAvatarPicture,
+    loadImagesManifest
 } from './avatar.js';
 
 // =========================================
 // Constantes
 // =========================================
 const TYPING_MESSAGE_ID = 'typing-indicator-message';
+const LOAD_OLDER_BUTTON_ID = 'load-older-messages';
 const TYPING_SPEED = 30; // ms por caractere para efeito de digitação (opcional)
 
+// Janela de renderização: só as mensagens próximas da área visível ficam no DOM
+const INITIAL_WINDOW_SIZE = 30;         // Mensagens montadas ao (re)renderizar a lista
+const WINDOW_CHUNK_SIZE = 15;           // Mensagens montadas/desmontadas por passo de rolagem
+const MAX_MOUNTED_MESSAGES = 60;        // Limite de mensagens no DOM (visíveis + buffer acessível)
+const ESTIMATED_MESSAGE_HEIGHT = 144;   // px (mensagem + gap), usado até ser medida
+const WINDOW_ROOT_MARGIN = '400px 0px'; // Antecedência para montar antes de entrar na tela
+
 // Estado interno
 let messages = [];
 let chatContainer = null;
 let userInput = null;
 let searchFilter = '';
+let hasOlderMessages = false; // Há páginas anteriores no histórico persistido
+let isLoadingOlder = false;
+
+// Estado da janela virtualizada
+let renderList = [];        // Mensagens exibidas (todas ou resultado da busca)
+let windowStart = 0;        // Índice (em renderList) da primeira mensagem montada
+let windowEnd = 0;          // Índice (exclusivo) após a última mensagem montada
+let topSpacer = null;       // Ocupa a altura das mensagens desmontadas acima
+let bottomSpacer = null;    // Ocupa a altura das mensagens desmontadas abaixo
+let windowObserver = null;  // IntersectionObserver dos espaçadores
+const measuredHeights = new WeakMap(); // mensagem → altura medida + gap do flex (px)
+const contentCache = new WeakMap();    // mensagem → HTML já processado (Markdown + sanitização)
 let isTTSEnabled = false; // Será atualizado via config
 let playSoundFn = null;   // Função de som injetada
 let speakFn = null;       // Função de TTS injetada
@@ -58,11 +81,71 @@ export function initChat(container, input, options = {}) {
     playSoundFn = options.playSound || (() => { });
     speakFn = options.speak || (() => { });
 
-    // Carrega mensagens salvas
-    messages = loadMessagesFromStorage();
+    // Carrega apenas a página mais recente do histórico (assíncrono, sem bloquear a UI)
+    messages = [];
+    hasOlderMessages = false;
     renderMessages();
 
-    console.log('Chat inicializado com', messages.length, 'mensagens');
+    // O manifest das imagens chega junto para o histórico já usar AVIF/WebP
+    Promise.all([
+        loadMessagesPage(null, HISTORY_PAGE_SIZE),
+        loadImagesManifest()
+    ]).then(([{ messages: page, hasMore }]) => {
+        // Mensagens enviadas durante o carregamento ficam depois do histórico
+        messages = page.concat(messages);
+        hasOlderMessages = hasMore;
+        renderMessages();
+        console.log('Chat inicializado com', page.length, 'mensagens');
+    });
+}
+
+/**
+ * Carrega a página anterior do histórico e a insere no topo do chat
+ * @returns {Promise<number>} Quantidade de mensagens carregadas
+ */
+export async function loadOlderMessages() {
+    if (!hasOlderMessages || isLoadingOlder) return 0;
+
+    const oldest = messages.find(msg => msg.id !== undefined);
+    if (!oldest) return 0;
+
+    isLoadingOlder = true;
+    if (chatContainer) chatContainer.setAttribute('aria-busy', 'true');
+
+    try {
+        const { messages: page, hasMore } = await loadMessagesPage(oldest.id, HISTORY_PAGE_SIZE);
+        hasOlderMessages = hasMore;
+
+        // Mantém a posição de leitura: ancora na primeira mensagem já montada
+        const anchor = topSpacer ? topSpacer.nextElementSibling : null;
+        const anchorOffset = anchor ? offsetInContainer(anchor) : 0;
+        const previouslyMounted = windowEnd - windowStart;
+
+        messages = page.concat(messages);
+        renderMessages({
+            start: 0,
+            end: Math.min(
+                messages.length,
+                MAX_MOUNTED_MESSAGES,
+                page.length + Math.max(previouslyMounted, INITIAL_WINDOW_SIZE)
+            )
+        });
+
+        // Foco vai para a primeira mensagem que já estava visível antes do carregamento
+        const firstPrevious = chatContainer
+            ? chatContainer.querySelector(`[data-message-id="${page.length}"]`)
+            : null;
+        if (firstPrevious) {
+            chatContainer.scrollTop += offsetInContainer(firstPrevious) - anchorOffset;
+            firstPrevious.setAttribute('tabindex', '-1');
+            firstPrevious.focus({ preventScroll: true });
+        }
+
+        return page.length;
+    } finally {
+        isLoadingOlder = false;
+        if (chatContainer) chatContainer.removeAttribute('aria-busy');
+    }
 }
 
 /**
@@ -101,8 +184,11 @@ export function addMessage(role, content) {
     };
 
     messages.push(message);
-    saveMessagesToStorage(messages);
-    renderMessages();
+    // Persiste apenas a nova mensagem (assíncrono, não bloqueia o envio)
+    appendMessageToStorage(message).then(id => {
+        if (id !== null) message.id = id;
+    });
+    appendToWindow(message);
 
     // Feedback de Acessibilidade e Áudio
     handleMessageFeedback(role, content);
@@ -119,13 +205,13 @@ export function removeLastErrorMessage() {
             typeof message.content === 'object' &&
             message.content.erro) {
             messages.splice(i, 1);
+            deleteMessageFromStorage(message.id);
             removed = true;
             break;
         }
     }
 
     if (removed) {
-        saveMessagesToStorage(messages);
         renderMessages();
     }
 }
@@ -135,6 +221,7 @@ export function removeLastErrorMessage() {
  */
 export function clearChat() {
     messages = [];
+    hasOlderMessages = false;
     clearMessagesFromStorage();
     renderMessages();
 
@@ -164,7 +251,7 @@ export function showTypingIndicator() {
 
     messages.push(typingMessage);
     // Não salva indicador no storage
-    renderMessages();
+    appendToWindow(typingMessage);
 }
 
 /**
@@ -175,6 +262,17 @@ export function hideTypingIndicator() {
     if (typingIndex !== -1) {
         messages.splice(typingIndex, 1);
         // Não precisa salvar storage pois indicador não é salvo
+
+        // Caso comum: o indicador é a última mensagem montada, basta removê-la
+        const typingElement = chatContainer
+            ? chatContainer.querySelector('.message.typing')
+            : null;
+        if (!searchFilter && typingElement && typingIndex === windowEnd - 1 &&
+            typingElement.nextElementSibling === bottomSpacer) {
+            typingElement.remove();
+            windowEnd -= 1;
+            return;
+        }
         renderMessages();
     }
 }
@@ -183,9 +281,15 @@ export function hideTypingIndicator() {
 // Renderização
 // =========================================
 /**
- * Renderiza todas as mensagens no container
+ * Renderiza a lista de mensagens no container
+ *
+ * Apenas uma janela contígua de mensagens fica montada no DOM; as demais são
+ * representadas por espaçadores com a altura medida (ou estimada) e montadas
+ * conforme a rolagem se aproxima delas.
+ *
+ * @param {Object} [range] - Janela a montar ({start, end}); padrão: as mais recentes
  */
-export function renderMessages() {
+export function renderMessages(range = null) {
     if (!chatContainer) return;
 
     // Filtra mensagens reais (sem indicador) para lógica de UI
@@ -195,15 +299,16 @@ export function renderMessages() {
     // Gerencia visibilidade de elementos externos (Intro Card, Chips)
     updateExternalUI(hasMessages);
 
-    // Limpa container (mantendo apenas mensagens novas)
-    // Nota: Em uma implementação React/Vue isso seria virtual DOM
-    // Aqui fazemos limpeza total por simplicidade, mas idealmente seria incremental
+    // Reconstrói a estrutura: [botão anteriores] [espaçador] [janela] [espaçador]
+    disconnectWindowObserver();
     chatContainer.innerHTML = '';
+    topSpacer = null;
+    bottomSpacer = null;
 
     // Filtra mensagens para busca
-    let filteredMessages = messages;
+    renderList = messages;
     if (searchFilter) {
-        filteredMessages = messages.filter(msg => {
+        renderList = messages.filter(msg => {
             if (msg.content === TYPING_MESSAGE_ID) return false;
             const content = typeof msg.content === 'string'
                 ? msg.content
@@ -213,21 +318,225 @@ export function renderMessages() {
     }
 
     // Mensagem de "Nenhum resultado"
-    if (filteredMessages.length === 0 && searchFilter) {
+    if (renderList.length === 0 && searchFilter) {
+        windowStart = windowEnd = 0;
         renderNoResults();
         return;
     }
 
-    // Renderiza mensagens
-    filteredMessages.forEach((message, index) => {
-        const messageElement = createMessageElement(message, index);
-        chatContainer.appendChild(messageElement);
-    });
+    // Sem mensagens: container vazio (exibe o placeholder de :empty)
+    if (renderList.length === 0) {
+        windowStart = windowEnd = 0;
+        return;
+    }
 
-    // Scroll para o final
+    windowEnd = range ? Math.min(range.end, renderList.length) : renderList.length;
+    windowStart = range
+        ? Math.max(0, range.start)
+        : Math.max(0, windowEnd - INITIAL_WINDOW_SIZE);
+    windowStart = Math.max(windowStart, windowEnd - MAX_MOUNTED_MESSAGES);
+
+    topSpacer = createSpacer('top');
+    bottomSpacer = createSpacer('bottom');
+    chatContainer.appendChild(topSpacer);
+    chatContainer.appendChild(createMessagesFragment(windowStart, windowEnd));
+    chatContainer.appendChild(bottomSpacer);
+
+    updateWindowControls();
+    observeWindowEdges();
+
+    // Scroll para o final (janela padrão termina na mensagem mais recente)
+    if (!range) scrollToBottom();
+}
+
+/**
+ * Acrescenta uma mensagem recém-adicionada sem reconstruir a lista
+ *
+ * Só o novo nó entra no container (role="log"), então leitores de tela
+ * anunciam apenas a mensagem nova, e o foco atual não é perdido.
+ */
+function appendToWindow(message) {
+    const index = messages.length - 1;
+    if (!chatContainer || !bottomSpacer || searchFilter ||
+        renderList !== messages || windowEnd !== index) {
+        // Busca ativa ou janela longe do final: volta para as mensagens mais recentes
+        renderMessages();
+        return;
+    }
+
+    updateExternalUI(true);
+    bottomSpacer.before(createMessageElement(message, index));
+    windowEnd = index + 1;
+
+    if (windowEnd - windowStart > MAX_MOUNTED_MESSAGES) {
+        unmountFromStart(windowEnd - windowStart - MAX_MOUNTED_MESSAGES);
+    }
+    updateWindowControls();
     scrollToBottom();
 }
 
+// =========================================
+// Janela Virtualizada
+// =========================================
+function createSpacer(position) {
+    const spacer = document.createElement('div');
+    spacer.className = `chat-window-spacer chat-window-spacer-${position}`;
+    spacer.setAttribute('aria-hidden', 'true');
+    return spacer;
+}
+
+function createMessagesFragment(start, end) {
+    const fragment = document.createDocumentFragment();
+    for (let i = start; i < end; i++) {
+        fragment.appendChild(createMessageElement(renderList[i], i));
+    }
+    return fragment;
+}
+
+function estimatedHeight(start, end) {
+    let total = 0;
+    for (let i = start; i < end; i++) {
+        total += measuredHeights.get(renderList[i]) || ESTIMATED_MESSAGE_HEIGHT;
+    }
+    return total;
+}
+
+function updateWindowControls() {
+    if (topSpacer) topSpacer.style.height = `${estimatedHeight(0, windowStart)}px`;
+    if (bottomSpacer) bottomSpacer.style.height = `${estimatedHeight(windowEnd, renderList.length)}px`;
+
+    // Botão "anteriores": mensagens desmontadas acima ou páginas ainda no storage
+    const needsButton = !searchFilter && (windowStart > 0 || hasOlderMessages);
+    const button = chatContainer.querySelector(`#${LOAD_OLDER_BUTTON_ID}`);
+    if (needsButton && !button) {
+        chatContainer.insertBefore(createLoadOlderButton(), chatContainer.firstChild);
+    } else if (!needsButton && button) {
+        if (document.activeElement === button && userInput) userInput.focus();
+        button.remove();
+    }
+}
+
+/**
+ * Monta mensagens acima da janela, preservando a posição de leitura
+ * @returns {HTMLElement|null} Primeira mensagem montada
+ */
+function mountBefore(count) {
+    const newStart = Math.max(0, windowStart - count);
+    if (newStart === windowStart || !topSpacer) return null;
+
+    const anchor = topSpacer.nextElementSibling;
+    const anchorOffset = anchor ? offsetInContainer(anchor) : 0;
+
+    withoutAnnouncements(() => {
+        topSpacer.after(createMessagesFragment(newStart, windowStart));
+        windowStart = newStart;
+        if (windowEnd - windowStart > MAX_MOUNTED_MESSAGES) {
+            unmountFromEnd(windowEnd - windowStart - MAX_MOUNTED_MESSAGES);
+        }
+        updateWindowControls();
+    });
+
+    if (anchor) chatContainer.scrollTop += offsetInContainer(anchor) - anchorOffset;
+    return topSpacer.nextElementSibling;
+}
+
+/**
+ * Monta mensagens abaixo da janela (rolagem de volta para as recentes)
+ */
+function mountAfter(count) {
+    const newEnd = Math.min(renderList.length, windowEnd + count);
+    if (newEnd === windowEnd || !bottomSpacer) return;
+
+    withoutAnnouncements(() => {
+        bottomSpacer.before(createMessagesFragment(windowEnd, newEnd));
+        windowEnd = newEnd;
+        if (windowEnd - windowStart > MAX_MOUNTED_MESSAGES) {
+            unmountFromStart(windowEnd - windowStart - MAX_MOUNTED_MESSAGES);
+        }
+        updateWindowControls();
+    });
+}
+
+/**
+ * Desmonta mensagens do início da janela, guardando a altura medida
+ * Nunca remove a mensagem que contém o foco atual.
+ */
+function unmountFromStart(count) {
+    const gap = containerGap();
+    for (let i = 0; i < count; i++) {
+        const element = topSpacer.nextElementSibling;
+        if (!element || element === bottomSpacer || element.contains(document.activeElement)) break;
+        measuredHeights.set(renderList[windowStart], element.offsetHeight + gap);
+        element.remove();
+        windowStart += 1;
+    }
+    updateWindowControls();
+}
+
+/**
+ * Desmonta mensagens do final da janela, guardando a altura medida
+ * Nunca remove a mensagem que contém o foco atual.
+ */
+function unmountFromEnd(count) {
+    const gap = containerGap();
+    for (let i = 0; i < count; i++) {
+        const element = bottomSpacer.previousElementSibling;
+        if (!element || element === topSpacer || element.contains(document.activeElement)) break;
+        measuredHeights.set(renderList[windowEnd - 1], element.offsetHeight + gap);
+        element.remove();
+        windowEnd -= 1;
+    }
+    updateWindowControls();
+}
+
+function containerGap() {
+    return parseFloat(getComputedStyle(chatContainer).rowGap) || 0;
+}
+
+/**
+ * Executa uma mutação da janela sem anunciar o conteúdo antigo remontado
+ * (o container é role="log", que anunciaria cada nó inserido)
+ */
+function withoutAnnouncements(mutate) {
+    const wasBusy = chatContainer.getAttribute('aria-busy') === 'true';
+    chatContainer.setAttribute('aria-busy', 'true');
+    try {
+        mutate();
+    } finally {
+        if (!wasBusy) chatContainer.removeAttribute('aria-busy');
+    }
+}
+
+function observeWindowEdges() {
+    if (typeof IntersectionObserver === 'undefined' || !topSpacer || !bottomSpacer) return;
+
+    windowObserver = new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (!entry.isIntersecting) return;
+            if (entry.target === topSpacer && windowStart > 0) {
+                mountBefore(WINDOW_CHUNK_SIZE);
+            } else if (entry.target === bottomSpacer && windowEnd < renderList.length) {
+                mountAfter(WINDOW_CHUNK_SIZE);
+            } else {
+                return;
+            }
+            // Re-observa para disparar de novo se o espaçador continuar visível
+            windowObserver.unobserve(entry.target);
+            windowObserver.observe(entry.target);
+        });
+    }, { root: chatContainer, rootMargin: WINDOW_ROOT_MARGIN });
+
+    windowObserver.observe(topSpacer);
+    windowObserver.observe(bottomSpacer);
+}
+
+function disconnectWindowObserver() {
+    if (windowObserver) {
+        windowObserver.disconnect();
+        windowObserver = null;
+    }
+}
+
 /**
  * Cria elemento DOM para uma mensagem
  */
@@ -253,9 +562,12 @@ function createMessageElement(message, index) {
         contentDiv.innerHTML = `<p class="error-message">${message.content.erro}</p>`;
         messageDiv.classList.add('error');
     } else {
-        // Processa Markdown e Sanitiza
-        const rawContent = typeof message.content === 'string' ? message.content : JSON.stringify(message.content);
-        contentDiv.innerHTML = processContent(rawContent);
+        // Processa Markdown e Sanitiza (uma vez por mensagem; remontagens reutilizam)
+        if (!contentCache.has(message)) {
+            const rawContent = typeof message.content === 'string' ? message.content : JSON.stringify(message.content);
+            contentCache.set(message, processContent(rawContent));
+        }
+        contentDiv.innerHTML = contentCache.get(message);
     }
 
     // Timestamp e Ações
@@ -276,15 +588,16 @@ function createAvatarElement(message) {
     avatarDiv.className = 'message-avatar';
     avatarDiv.setAttribute('aria-hidden', 'true');
 
-    const img = document.createElement('img');
-
     if (message.role === 'user') {
+        const img = document.createElement('img');
         img.src = '/assets/user-avatar.png';
         img.alt = 'Você';
         img.onerror = () => {
             avatarDiv.textContent = '👤';
             img.remove();
         };
+        styleAvatarImage(img);
+        avatarDiv.appendChild(img);
     } else {
         // Lógica de avatar do assistente baseada no conteúdo/estado
         let state = AVATAR_STATES.HAPPY;
@@ -299,21 +612,10 @@ function createAvatarElement(message) {
             else state = AVATAR_STATES.CONFUSED;
         }
 
-        // Usa função importada de avatar.js (se disponível) ou path direto
-        // Aqui assumimos que getAvatarPath foi importado ou implementado
-        img.src = `/assets/ada-states/ada-${state}.png`; // Fallback simples
-        if (typeof getAvatarPath === 'function') {
-            img.src = getAvatarPath(state);
-        }
-
-        img.alt = 'Ada';
-    }
-
-    if (img.src) {
-        img.style.width = '100%';
-        img.style.height = '100%';
-        img.style.objectFit = 'contain';
-        avatarDiv.appendChild(img);
+        // <picture> com AVIF/WebP no tamanho exibido e PNG como fallback
+        const { picture, img } = createAvatarPicture(state, 'Ada');
+        styleAvatarImage(img);
+        avatarDiv.appendChild(picture);
     }
 
     return avatarDiv;
@@ -377,6 +679,35 @@ function cleanTextForTTS(text) {
         .replace(/\[([^\]]+)\]\([^)]+\)/g, '$1');
 }
 
+function createLoadOlderButton() {
+    const button = document.createElement('button');
+    button.type = 'button';
+    button.id = LOAD_OLDER_BUTTON_ID;
+    button.className = 'load-older-button';
+    button.setAttribute('data-testid', 'btn-carregar-anteriores');
+    button.textContent = 'Carregar mensagens anteriores';
+    button.addEventListener('click', showOlderMessages);
+    return button;
+}
+
+/**
+ * Ação do botão "anteriores": monta mensagens já carregadas que estão fora da
+ * janela ou, se todas estiverem montadas, busca a página anterior no storage.
+ * O foco vai para a primeira mensagem exibida (navegação por teclado/leitor).
+ */
+function showOlderMessages() {
+    if (windowStart === 0) {
+        loadOlderMessages();
+        return;
+    }
+
+    const firstShown = mountBefore(WINDOW_CHUNK_SIZE);
+    if (firstShown && firstShown !== bottomSpacer) {
+        firstShown.setAttribute('tabindex', '-1');
+        firstShown.focus({ preventScroll: true });
+    }
+}
+
 function createTypingIndicatorHTML() {
     return `
         <div class="typing-indicator">
@@ -424,6 +755,19 @@ function renderNoResults() {
     chatContainer.appendChild(noResults);
 }
 
+function styleAvatarImage(img) {
+    img.style.width = '100%';
+    img.style.height = '100%';
+    img.style.objectFit = 'contain';
+}
+
+/**
+ * Distância (px) do topo de um elemento até o topo visível do container
+ */
+function offsetInContainer(element) {
+    return element.getBoundingClientRect().top - chatContainer.getBoundingClientRect().top;
+}
+
 function scrollToBottom() {
     if (chatContainer) {
         chatContainer.scrollTop = chatContainer.scrollHeight;
@@ -1,8 +1,8 @@
 /**
- * Módulo Storage - Gerenciamento de LocalStorage
+ * Módulo Storage - Gerenciamento de IndexedDB e LocalStorage
  * 
  * Gerencia persistência de dados no navegador:
- * - Mensagens do chat
+ * - Mensagens do chat (IndexedDB, com fallback para localStorage)
  * - Preferências de acessibilidade
  * - Configurações de tema
  */
@@ -18,11 +18,254 @@ const TTS_KEY = 'ttsEnabled';
 const DYSLEXIA_FONT_KEY = 'dyslexiaFont';
 const COLOR_FILTER_KEY = 'colorFilter';
 
+// Histórico do chat em IndexedDB
+const DB_NAME = 'ada_chat';
+const DB_VERSION = 1;
+const MESSAGES_STORE = 'messages';
+export const HISTORY_PAGE_SIZE = 30; // Mensagens carregadas por página
+const MAX_HISTORY_BYTES = 4 * 1024 * 1024; // Orçamento do histórico (~4 MB)
+const MAX_HISTORY_MESSAGES = 2000; // Limite de mensagens mantidas
+
+// Estado interno do IndexedDB
+let dbPromise = null;
+let historyBytes = null; // Tamanho total estimado do histórico (calculado sob demanda)
+
 // =========================================
-// Mensagens do Chat
+// Mensagens do Chat (IndexedDB)
 // =========================================
 /**
- * Carrega mensagens do localStorage
+ * Converte uma IDBRequest em Promise
+ * @param {IDBRequest} request - Requisição do IndexedDB
+ * @returns {Promise<any>} Resultado da requisição
+ */
+function promisifyRequest(request) {
+    return new Promise((resolve, reject) => {
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+/**
+ * Estima o tamanho em bytes de uma mensagem serializada
+ * @param {Object} message - Mensagem do chat
+ * @returns {number} Tamanho aproximado em bytes
+ */
+function estimateMessageSize(message) {
+    // Caracteres BMP ocupam até 2 bytes na serialização do navegador
+    return JSON.stringify(message.content).length * 2;
+}
+
+/**
+ * Verifica se o IndexedDB está disponível
+ * @returns {boolean} true se disponível
+ */
+export function isIndexedDBAvailable() {
+    try {
+        return typeof indexedDB !== 'undefined' && indexedDB !== null;
+    } catch (error) {
+        return false;
+    }
+}
+
+/**
+ * Abre (ou cria) o banco do histórico, migrando o histórico legado do localStorage
+ * @returns {Promise<IDBDatabase>} Conexão com o banco
+ */
+function openMessagesDB() {
+    if (dbPromise) return dbPromise;
+
+    dbPromise = new Promise((resolve, reject) => {
+        const request = indexedDB.open(DB_NAME, DB_VERSION);
+
+        request.onupgradeneeded = () => {
+            const db = request.result;
+            if (!db.objectStoreNames.contains(MESSAGES_STORE)) {
+                db.createObjectStore(MESSAGES_STORE, { keyPath: 'id', autoIncrement: true });
+            }
+        };
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+        request.onblocked = () => reject(new Error('Abertura do IndexedDB bloqueada'));
+    }).then(async (db) => {
+        await migrateLegacyMessages(db);
+        return db;
+    }).catch((error) => {
+        // Permite nova tentativa na próxima chamada
+        dbPromise = null;
+        throw error;
+    });
+
+    return dbPromise;
+}
+
+/**
+ * Move o histórico antigo (array JSON no localStorage) para o IndexedDB
+ * @param {IDBDatabase} db - Conexão com o banco
+ */
+async function migrateLegacyMessages(db) {
+    const legacy = loadMessagesFromStorage();
+    if (legacy.length === 0) return;
+
+    const tx = db.transaction(MESSAGES_STORE, 'readwrite');
+    const store = tx.objectStore(MESSAGES_STORE);
+    legacy.forEach(message => {
+        const { id, ...record } = message;
+        store.add({ ...record, size: estimateMessageSize(record) });
+    });
+    await new Promise((resolve, reject) => {
+        tx.oncomplete = resolve;
+        tx.onerror = () => reject(tx.error);
+    });
+
+    clearLegacyMessages();
+    console.log('Histórico migrado do localStorage para IndexedDB:', legacy.length, 'mensagens');
+}
+
+/**
+ * Calcula o tamanho total do histórico (uma única vez por sessão)
+ * @param {IDBObjectStore} store - Store de mensagens
+ * @returns {Promise<number>} Tamanho total estimado em bytes
+ */
+async function getHistoryBytes(store) {
+    if (historyBytes !== null) return historyBytes;
+
+    let total = 0;
+    await new Promise((resolve, reject) => {
+        const request = store.openCursor();
+        request.onsuccess = () => {
+            const cursor = request.result;
+            if (!cursor) return resolve();
+            total += cursor.value.size || 0;
+            cursor.continue();
+        };
+        request.onerror = () => reject(request.error);
+    });
+    historyBytes = total;
+    return total;
+}
+
+/**
+ * Remove as mensagens mais antigas até o histórico caber no orçamento
+ * @param {IDBObjectStore} store - Store de mensagens (transação readwrite)
+ */
+async function evictOldMessages(store) {
+    let total = await getHistoryBytes(store);
+    let count = await promisifyRequest(store.count());
+    if (total <= MAX_HISTORY_BYTES && count <= MAX_HISTORY_MESSAGES) return;
+
+    await new Promise((resolve, reject) => {
+        const request = store.openCursor();
+        request.onsuccess = () => {
+            const cursor = request.result;
+            // Mantém sempre ao menos a mensagem mais recente
+            if (!cursor || count <= 1 ||
+                (total <= MAX_HISTORY_BYTES && count <= MAX_HISTORY_MESSAGES)) {
+                return resolve();
+            }
+            total -= cursor.value.size || 0;
+            count -= 1;
+            cursor.delete();
+            cursor.continue();
+        };
+        request.onerror = () => reject(request.error);
+    });
+    historyBytes = total;
+}
+
+/**
+ * Acrescenta uma única mensagem ao histórico (sem reescrever as anteriores)
+ * @param {Object} message - Mensagem ({ role, content, timestamp })
+ * @returns {Promise<number|null>} ID da mensagem salva ou null em caso de erro
+ */
+export async function appendMessageToStorage(message) {
+    if (!isIndexedDBAvailable()) {
+        // Fallback: mantém o formato legado no localStorage
+        const messages = loadMessagesFromStorage();
+        messages.push(message);
+        saveMessagesToStorage(messages);
+        return null;
+    }
+
+    try {
+        const db = await openMessagesDB();
+        const tx = db.transaction(MESSAGES_STORE, 'readwrite');
+        const store = tx.objectStore(MESSAGES_STORE);
+        const { id, ...record } = message;
+        record.size = estimateMessageSize(record);
+
+        const newId = await promisifyRequest(store.add(record));
+        if (historyBytes !== null) historyBytes += record.size;
+        await evictOldMessages(store);
+        return newId;
+    } catch (error) {
+        console.error('Erro ao salvar mensagem no IndexedDB:', error);
+        return null;
+    }
+}
+
+/**
+ * Carrega uma página de mensagens, da mais recente para a mais antiga
+ * @param {number|null} beforeId - Carrega mensagens com ID menor que este (null = mais recentes)
+ * @param {number} limit - Quantidade máxima de mensagens
+ * @returns {Promise<{messages: Array, hasMore: boolean}>} Página em ordem cronológica
+ */
+export async function loadMessagesPage(beforeId = null, limit = HISTORY_PAGE_SIZE) {
+    if (!isIndexedDBAvailable()) {
+        const all = loadMessagesFromStorage();
+        return { messages: beforeId === null ? all : [], hasMore: false };
+    }
+
+    try {
+        const db = await openMessagesDB();
+        const store = db.transaction(MESSAGES_STORE, 'readonly').objectStore(MESSAGES_STORE);
+        const range = beforeId === null ? null : IDBKeyRange.upperBound(beforeId, true);
+
+        const page = [];
+        let hasMore = false;
+        await new Promise((resolve, reject) => {
+            const request = store.openCursor(range, 'prev');
+            request.onsuccess = () => {
+                const cursor = request.result;
+                if (!cursor) return resolve();
+                if (page.length === limit) {
+                    hasMore = true;
+                    return resolve();
+                }
+                const { size, ...message } = cursor.value;
+                page.push(message);
+                cursor.continue();
+            };
+            request.onerror = () => reject(request.error);
+        });
+
+        return { messages: page.reverse(), hasMore };
+    } catch (error) {
+        console.error('Erro ao carregar mensagens do IndexedDB:', error);
+        return { messages: loadMessagesFromStorage(), hasMore: false };
+    }
+}
+
+/**
+ * Remove uma mensagem do histórico
+ * @param {number} id - ID da mensagem
+ */
+export async function deleteMessageFromStorage(id) {
+    if (id === null || id === undefined || !isIndexedDBAvailable()) return;
+
+    try {
+        const db = await openMessagesDB();
+        const store = db.transaction(MESSAGES_STORE, 'readwrite').objectStore(MESSAGES_STORE);
+        const record = await promisifyRequest(store.get(id));
+        if (!record) return;
+        await promisifyRequest(store.delete(id));
+        if (historyBytes !== null) historyBytes -= record.size || 0;
+    } catch (error) {
+        console.error('Erro ao remover mensagem do IndexedDB:', error);
+    }
+}
+
+/**
+ * Carrega mensagens do formato legado (array JSON no localStorage)
  * @returns {Array} Array de mensagens ou array vazio
  */
 export function loadMessagesFromStorage() {
@@ -38,7 +281,7 @@ export function loadMessagesFromStorage() {
 }
 
 /**
- * Salva mensagens no localStorage
+ * Salva mensagens no formato legado (usado apenas sem IndexedDB)
  * @param {Array} messages - Array de mensagens para salvar
  */
 export function saveMessagesToStorage(messages) {
@@ -50,9 +293,9 @@ export function saveMessagesToStorage(messages) {
 }
 
 /**
- * Limpa mensagens do localStorage
+ * Remove o histórico legado do localStorage
  */
-export function clearMessagesFromStorage() {
+function clearLegacyMessages() {
     try {
         localStorage.removeItem(STORAGE_KEY);
     } catch (error) {
@@ -60,6 +303,24 @@ export function clearMessagesFromStorage() {
     }
 }
 
+/**
+ * Limpa todo o histórico de mensagens (IndexedDB e localStorage)
+ * @returns {Promise<void>}
+ */
+export async function clearMessagesFromStorage() {
+    clearLegacyMessages();
+    if (!isIndexedDBAvailable()) return;
+
+    try {
+        const db = await openMessagesDB();
+        const store = db.transaction(MESSAGES_STORE, 'readwrite').objectStore(MESSAGES_STORE);
+        await promisifyRequest(store.clear());
+        historyBytes = 0;
+    } catch (error) {
+        console.error('Erro ao limpar mensagens do IndexedDB:', error);
+    }
+}
+
 // =========================================
 // Tema
 // =========================================
@@ -249,7 +510,7 @@ export function clearColorFilter() {
 // Utilitários
 // =========================================
 /**
- * Limpa todos os dados do localStorage
+ * Limpa todos os dados do localStorage e o histórico do chat
  */
 export function clearAllStorage() {
     try {
@@ -257,6 +518,7 @@ export function clearAllStorage() {
     } catch (error) {
         console.error('Erro ao limpar localStorage:', error);
     }
+    clearMessagesFromStorage();
 }
 
 /**
@@ -0,0 +1,270 @@
+/**
+ * Service Worker - Shell Offline e Respostas em Cache
+ *
+ * Responsável por:
+ * - Pré-carregar o app shell (HTML, CSS, módulos JS) e as imagens da Ada
+ * - Servir assets versionados (hash no nome) cache-first e os demais
+ *   network-first, com a cópia em cache como fallback offline
+ * - Guardar um número limitado de respostas recebidas para reutilizar
+ *   perguntas repetidas offline ou durante indisponibilidade do backend
+ *
+ * Servido em /sw.js (escopo raiz). O manifest gerado no build
+ * (assets-manifest.json) define a versão do cache e os arquivos versionados;
+ * sem ele (desenvolvimento) é usada a lista de arquivos originais.
+ */
+
+// =========================================
+// Constantes
+// =========================================
+const SHELL_CACHE_PREFIX = 'ada-shell-';
+const RUNTIME_CACHE = 'ada-runtime-v1';
+const ANSWERS_CACHE = 'ada-answers-v1';
+const ASSETS_MANIFEST_URL = '/static/assets-manifest.json';
+const CHAT_ENDPOINT = '/api/chat';
+
+// Limites dos caches dinâmicos (entradas mais antigas são removidas primeiro)
+const MAX_CACHED_ANSWERS = 50;
+const MAX_RUNTIME_ENTRIES = 60;
+
+// Chave sintética das respostas (Cache API só indexa requisições GET)
+const ANSWER_KEY_PREFIX = '/__ada-answers__/';
+
+// Header que marca respostas reaproveitadas do cache local
+const REPLAY_HEADER = 'X-Ada-Offline-Replay';
+
+// Assets versionados pelo build: nome.<hash>.ext (mesmo padrão de
+// HASHED_ASSET_PATTERN no backend). Só esses são imutáveis.
+const HASHED_ASSET = /\.[0-9a-f]{8}\.[a-z0-9]+$/;
+
+// App shell sem build (arquivos originais servidos pelo mount /static)
+const DEV_SHELL = [
+    '/',
+    '/static/styles.css',
+    '/static/app_modular.js',
+    '/static/modules/api.js',
+    '/static/modules/avatar.js',
+    '/static/modules/audio.js',
+    '/static/modules/accessibility.js',
+    '/static/modules/ui.js',
+    '/static/modules/chat.js',
+    '/static/modules/storage.js'
+];
+
+// Imagens exibidas no primeiro carregamento e nas respostas mais comuns
+// (variantes AVIF/WebP de scripts/build_ada_images.py; as demais larguras e
+// estados entram no cache de runtime quando usados)
+const ADA_IMAGES = [
+    '/assets/ada-images-manifest.json',
+    '/assets/user-avatar.png',
+    ...['greeting', 'thinking', 'happy'].flatMap(state => [
+        `/assets/ada-states/variants/ada-${state}-160.avif`,
+        `/assets/ada-states/variants/ada-${state}-160.webp`
+    ])
+];
+
+// =========================================
+// Ciclo de Vida
+// =========================================
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const { version, shell } = await resolveShell();
+        const cache = await caches.open(SHELL_CACHE_PREFIX + (version || 'dev'));
+        // Imagens ausentes não impedem a instalação do shell
+        await cache.addAll(shell);
+        await Promise.all(ADA_IMAGES.map(url => cache.add(url).catch(() => null)));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const { version } = await resolveShell();
+        // Sem acesso ao manifest não dá para saber qual shell é o atual: mantém todos
+        if (version !== null) {
+            const current = SHELL_CACHE_PREFIX + version;
+            const names = await caches.keys();
+            await Promise.all(
+                names
+                    .filter(name => name.startsWith(SHELL_CACHE_PREFIX) && name !== current)
+                    .map(name => caches.delete(name))
+            );
+        }
+        await self.clients.claim();
+    })());
+});
+
+/**
+ * Lê o manifest do build para obter versão e arquivos versionados
+ * @returns {Promise<{version: ?string, shell: string[]}>} version null se o manifest não pôde ser lido
+ */
+async function resolveShell() {
+    try {
+        const response = await fetch(ASSETS_MANIFEST_URL, { cache: 'no-cache' });
+        if (response.ok) {
+            const manifest = await response.json();
+            const versioned = [...manifest.assets.css, ...manifest.assets.js];
+            return {
+                version: manifest.version,
+                shell: ['/', ...versioned.map(path => `/static/${path}`)]
+            };
+        }
+        // Sem build (manifest inexistente): shell de desenvolvimento
+        return { version: 'dev', shell: DEV_SHELL };
+    } catch (error) {
+        return { version: null, shell: DEV_SHELL };
+    }
+}
+
+// =========================================
+// Roteamento de Requisições
+// =========================================
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+
+    if (request.method === 'POST' && url.pathname === CHAT_ENDPOINT) {
+        event.respondWith(chatWithReplay(request));
+    } else if (request.method !== 'GET') {
+        return;
+    } else if (request.mode === 'navigate') {
+        event.respondWith(networkFirst(request));
+    } else if (url.pathname.startsWith('/static/') || url.pathname.startsWith('/assets/')) {
+        // Sem hash o conteúdo muda a cada deploy (o backend serve com no-cache)
+        event.respondWith(
+            HASHED_ASSET.test(url.pathname) ? cacheFirst(request) : networkFirstAsset(request)
+        );
+    }
+});
+
+/**
+ * HTML sempre revalida na rede (referencia os assets da versão atual);
+ * offline, cai para o shell pré-carregado.
+ */
+async function networkFirst(request) {
+    try {
+        return await fetch(request);
+    } catch (error) {
+        const cached = await caches.match(request) || await caches.match('/');
+        if (cached) return cached;
+        throw error;
+    }
+}
+
+/**
+ * Assets versionados: cache primeiro, rede como fallback (guardando a cópia)
+ */
+async function cacheFirst(request) {
+    const cached = await caches.match(request);
+    if (cached) return cached;
+
+    const response = await fetch(request);
+    if (response.ok) {
+        const cache = await caches.open(RUNTIME_CACHE);
+        await cache.put(request, response.clone());
+        await trimCache(RUNTIME_CACHE, MAX_RUNTIME_ENTRIES);
+    }
+    return response;
+}
+
+/**
+ * Assets sem hash: rede primeiro, atualizando a cópia do cache de runtime;
+ * offline, usa essa cópia ou a do shell pré-carregado.
+ */
+async function networkFirstAsset(request) {
+    const runtime = await caches.open(RUNTIME_CACHE);
+    try {
+        const response = await fetch(request);
+        if (response.ok) {
+            await runtime.put(request, response.clone());
+            await trimCache(RUNTIME_CACHE, MAX_RUNTIME_ENTRIES);
+        }
+        return response;
+    } catch (error) {
+        const cached = await runtime.match(request) || await caches.match(request);
+        if (cached) return cached;
+        throw error;
+    }
+}
+
+// =========================================
+// Respostas em Cache (Replay)
+// =========================================
+/**
+ * Envia a pergunta ao backend e guarda respostas bem-sucedidas.
+ * Em falha de rede ou erro 5xx, reaproveita a resposta guardada para a mesma
+ * pergunta (se houver), marcada com o header de replay.
+ */
+async function chatWithReplay(request) {
+    const body = await request.clone().text();
+    const key = await answerKey(body);
+
+    let response;
+    try {
+        response = await fetch(request);
+    } catch (error) {
+        const replay = await replayAnswer(key);
+        if (replay) return replay;
+        throw error;
+    }
+
+    if (response.ok && key) {
+        const cache = await caches.open(ANSWERS_CACHE);
+        // Reinserção move a entrada para o fim (mais recente)
+        await cache.delete(key);
+        await cache.put(key, response.clone());
+        await trimCache(ANSWERS_CACHE, MAX_CACHED_ANSWERS);
+    } else if (response.status >= 500) {
+        const replay = await replayAnswer(key);
+        if (replay) return replay;
+    }
+    return response;
+}
+
+async function replayAnswer(key) {
+    if (!key) return null;
+    const cache = await caches.open(ANSWERS_CACHE);
+    const cached = await cache.match(key);
+    if (!cached) return null;
+
+    const headers = new Headers(cached.headers);
+    headers.set(REPLAY_HEADER, '1');
+    return new Response(await cached.blob(), {
+        status: 200,
+        statusText: 'OK',
+        headers
+    });
+}
+
+/**
+ * Gera a chave da resposta a partir da pergunta normalizada
+ * (mesma ideia do backend: minúsculas e espaços colapsados)
+ */
+async function answerKey(body) {
+    let pergunta;
+    try {
+        pergunta = JSON.parse(body).pergunta;
+    } catch (error) {
+        return null;
+    }
+    if (typeof pergunta !== 'string') return null;
+
+    const normalized = pergunta.trim().toLowerCase().replace(/\s+/g, ' ');
+    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(normalized));
+    const hex = Array.from(new Uint8Array(digest))
+        .map(byte => byte.toString(16).padStart(2, '0'))
+        .join('');
+    return new Request(ANSWER_KEY_PREFIX + hex);
+}
+
+/**
+ * Remove as entradas mais antigas (ordem de inserção) acima do limite
+ */
+async function trimCache(name, maxEntries) {
+    const cache = await caches.open(name);
+    const keys = await cache.keys();
+    const excess = keys.length - maxEntries;
+    for (let i = 0; i < excess; i++) {
+        await cache.delete(keys[i]);
+    }
+}
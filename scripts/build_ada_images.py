@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Script para gerar as variantes responsivas das imagens da Ada
+Cria versões WebP/AVIF em larguras adequadas aos tamanhos exibidos no
+frontend, a animação em WebP e o ada-images-manifest.json usado pelo
+avatar.js para montar os srcset e pré-carregar só os próximos estados.
+"""
+
+import json
+import os
+import sys
+
+from PIL import Image, features
+
+from create_ada_gif import create_ada_animation
+
+# Cores para output
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+NC = "\033[0m"  # No Color
+
+# Larguras geradas (px): avatar das mensagens (80-100px CSS), o mesmo em
+# telas 2x e o cartão de introdução (120-150px CSS) em telas 2x
+VARIANT_WIDTHS = (96, 160, 320)
+
+# Formatos em ordem de preferência do navegador (AVIF é o menor)
+VARIANT_FORMATS = {
+    "avif": {"format": "AVIF", "quality": 55, "speed": 6},
+    "webp": {"format": "WEBP", "quality": 80, "method": 6},
+}
+
+# Imagens de origem, relativas ao diretório static/images
+SOURCE_GLOBS = ("ada-states", "ada-logo.png")
+
+VARIANTS_DIR = "variants"
+MANIFEST_NAME = "ada-images-manifest.json"
+
+
+def available_formats():
+    """Formatos suportados pelo Pillow instalado (AVIF depende do build)"""
+    return [fmt for fmt in VARIANT_FORMATS if features.check(fmt)]
+
+
+def collect_sources(images_dir):
+    """Lista os PNG de origem (relativos a images_dir)"""
+    sources = []
+    for entry in SOURCE_GLOBS:
+        path = os.path.join(images_dir, entry)
+        if os.path.isdir(path):
+            sources.extend(
+                f"{entry}/{name}" for name in sorted(os.listdir(path)) if name.endswith(".png")
+            )
+        elif os.path.isfile(path):
+            sources.append(entry)
+    return sources
+
+
+def build_variants(images_dir, rel_path, formats):
+    """
+    Gera as variantes de uma imagem em todas as larguras e formatos.
+
+    Larguras maiores que a original não são geradas (não há ganho de
+    qualidade, só de bytes).
+
+    Returns:
+        Entrada do manifest: dimensões, bytes do original e variantes por formato
+    """
+    source_path = os.path.join(images_dir, rel_path)
+    directory, name = os.path.split(rel_path)
+    stem = os.path.splitext(name)[0]
+    output_dir = os.path.join(images_dir, directory, VARIANTS_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+
+    with Image.open(source_path) as original:
+        image = original.convert("RGBA")
+
+    entry = {
+        "width": image.width,
+        "height": image.height,
+        "bytes": os.path.getsize(source_path),
+        "variants": {fmt: {} for fmt in formats},
+    }
+
+    for width in VARIANT_WIDTHS:
+        if width > image.width:
+            continue
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        for fmt in formats:
+            variant_name = f"{stem}-{width}.{fmt}"
+            resized.save(os.path.join(output_dir, variant_name), **VARIANT_FORMATS[fmt])
+            variant_rel = "/".join(filter(None, (directory, VARIANTS_DIR, variant_name)))
+            entry["variants"][fmt][str(width)] = variant_rel
+
+    return entry
+
+
+def build_images(images_dir):
+    """Gera variantes e animação e grava o manifest em images_dir"""
+    formats = available_formats()
+    if "avif" not in formats:
+        print(f"{YELLOW}⚠️  Pillow sem suporte a AVIF, gerando apenas WebP{NC}")
+
+    manifest = {"widths": list(VARIANT_WIDTHS), "formats": formats, "images": {}}
+    for rel_path in collect_sources(images_dir):
+        entry = build_variants(images_dir, rel_path, formats)
+        manifest["images"][rel_path] = entry
+
+        variant_bytes = sum(
+            os.path.getsize(os.path.join(images_dir, path))
+            for variants in entry["variants"].values()
+            for path in variants.values()
+        )
+        print(f"  ✓ {rel_path} ({entry['bytes'] // 1024} KB → {variant_bytes // 1024} KB)")
+
+    if create_ada_animation("webp", output_dir=images_dir):
+        manifest["animated"] = "ada-animated.webp"
+
+    with open(os.path.join(images_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return manifest
+
+
+if __name__ == "__main__":
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    images_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, "static", "images")
+
+    if not os.path.isdir(images_dir):
+        print(f"{YELLOW}❌ Diretório não encontrado: {images_dir}{NC}")
+        sys.exit(1)
+
+    print(f"{GREEN}🖼️  Gerando variantes responsivas da Ada em {images_dir}...{NC}")
+    resultado = build_images(images_dir)
+    print(f"{GREEN}✅ {len(resultado['images'])} imagem(ns) processada(s){NC}")
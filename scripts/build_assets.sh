@@ -33,6 +33,15 @@ if [ ! -d "${STATIC_DIR}" ]; then
     mkdir -p "${STATIC_DIR}"
 fi
 
+# 0. Gerar variantes responsivas da Ada (AVIF/WebP, srcset manifest e WebP animado)
+# Servidas em /assets direto de static/images, por isso são geradas na origem
+if command -v python3 &> /dev/null && python3 -c "import PIL" &> /dev/null; then
+    echo -e "${GREEN}🖼️  Gerando variantes responsivas da Ada...${NC}"
+    python3 "${PROJECT_ROOT}/scripts/build_ada_images.py" "${STATIC_DIR}/images"
+else
+    echo -e "${YELLOW}⚠️  Pillow não encontrado, mantendo variantes da Ada já geradas${NC}"
+fi
+
 # 1. Copiar arquivos do frontend
 echo -e "${GREEN}📁 Copiando arquivos do frontend...${NC}"
 cp -r "${FRONTEND_DIR}"/* "${BUILD_DIR}/" 2>/dev/null || true
@@ -88,46 +97,24 @@ else
     echo -e "${YELLOW}⚠️  imagemin não encontrado, pulando otimização de imagens${NC}"
 fi
 
-# 6. Gerar hash para cache busting (opcional)
-if command -v md5sum &> /dev/null; then
-    echo -e "${GREEN}🔐 Gerando hashes para cache busting...${NC}"
-    find "${BUILD_DIR}" -type f \( -name "*.css" -o -name "*.js" \) | while read -r file; do
-        hash=$(md5sum "$file" | cut -d' ' -f1 | cut -c1-8)
-        echo "Hash para $(basename "$file"): $hash"
-    done
-elif command -v md5 &> /dev/null; then
-    echo -e "${GREEN}🔐 Gerando hashes para cache busting...${NC}"
-    find "${BUILD_DIR}" -type f \( -name "*.css" -o -name "*.js" \) | while read -r file; do
-        hash=$(md5 -q "$file" | cut -c1-8)
-        echo "Hash para $(basename "$file"): $hash"
-    done
+# 6. Versionar assets (hash no nome) e criar manifest
+# Reescreve imports entre módulos e referências em index_modular.html;
+# assets com hash recebem cache imutável do StaticCacheMiddleware
+if ! command -v python3 &> /dev/null; then
+    echo -e "${RED}❌ python3 é necessário para versionar e pré-comprimir os assets${NC}"
+    exit 1
 fi
+python3 "${PROJECT_ROOT}/scripts/fingerprint_assets.py" "${BUILD_DIR}"
 
-# 7. Criar arquivo de manifest (opcional)
-echo -e "${GREEN}📋 Criando manifest de assets...${NC}"
-cat > "${BUILD_DIR}/assets-manifest.json" <<EOF
-{
-  "version": "$(date +%Y%m%d-%H%M%S)",
-  "build_date": "$(date -u +%Y-%m-%dT%H:%M:%SZ)",
-  "assets": {
-    "css": [
-      $(find "${BUILD_DIR}" -name "*.css" -type f | sed 's|.*/||' | sed 's/^/      "/' | sed 's/$/"/' | sed '$!s/$/,/')
-    ],
-    "js": [
-      $(find "${BUILD_DIR}" -name "*.js" -type f | sed 's|.*/||' | sed 's/^/      "/' | sed 's/$/"/' | sed '$!s/$/,/')
-    ],
-    "images": [
-      $(find "${BUILD_DIR}" -type f \( -iname "*.jpg" -o -iname "*.jpeg" -o -iname "*.png" -o -iname "*.webp" \) | sed 's|.*/||' | sed 's/^/      "/' | sed 's/$/"/' | sed '$!s/$/,/')
-    ]
-  }
-}
-EOF
+# 7. Pré-comprimir assets textuais (.br/.gz) com hash de conteúdo
+python3 "${PROJECT_ROOT}/scripts/precompress_assets.py" "${BUILD_DIR}"
 
 # 8. Estatísticas
 echo -e "${GREEN}📊 Estatísticas do build:${NC}"
 echo "  - CSS: $(find "${BUILD_DIR}" -name "*.css" -type f | wc -l | tr -d ' ') arquivo(s)"
 echo "  - JavaScript: $(find "${BUILD_DIR}" -name "*.js" -type f | wc -l | tr -d ' ') arquivo(s)"
-echo "  - Imagens: $(find "${BUILD_DIR}" -type f \( -iname "*.jpg" -o -iname "*.jpeg" -o -iname "*.png" -o -iname "*.webp" \) | wc -l | tr -d ' ') arquivo(s)"
+echo "  - Imagens: $(find "${BUILD_DIR}" -type f \( -iname "*.jpg" -o -iname "*.jpeg" -o -iname "*.png" -o -iname "*.webp" -o -iname "*.avif" \) | wc -l | tr -d ' ') arquivo(s)"
+echo "  - Variantes pré-comprimidas: $(find "${BUILD_DIR}" -type f \( -name "*.br" -o -name "*.gz" \) | wc -l | tr -d ' ') arquivo(s)"
 echo "  - Tamanho total: $(du -sh "${BUILD_DIR}" | cut -f1)"
 
 echo -e "${GREEN}✅ Build concluído!${NC}"
@@ -136,6 +123,6 @@ echo ""
 echo -e "${GREEN}💡 Próximos passos:${NC}"
 echo "  1. Revisar assets em ${BUILD_DIR}"
 echo "  2. Fazer upload para CDN (Cloudflare, AWS CloudFront, etc.)"
-echo "  3. Atualizar referências no código se necessário"
+echo "  3. Servir o build com FRONTEND_DIR=build (variantes .br/.gz são usadas automaticamente)"
 echo "  4. Testar em ambiente de staging"
 
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Script para gerar o corpus de warm-up do cache de respostas
+Executa o pipeline completo para as perguntas frequentes
+(CACHE_WARMUP_QUESTIONS) e grava as respostas em data/cache_corpus.json,
+carregado em segundo plano no startup da API.
+
+Requer GOOGLE_API_KEY (as respostas são geradas pelos agentes).
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+
+from chatbot_acessibilidade.core.constants import (  # noqa: E402
+    CACHE_CORPUS_FILE,
+    CACHE_WARMUP_QUESTIONS,
+)
+from chatbot_acessibilidade.pipeline import pipeline_acessibilidade  # noqa: E402
+
+# Cores para output
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+NC = "\033[0m"  # No Color
+
+
+async def build_corpus(perguntas):
+    """
+    Gera as respostas em sequência (evita estourar a quota da API).
+
+    Respostas com erro ficam de fora do corpus.
+    """
+    entries = []
+    for pergunta in perguntas:
+        resposta = await pipeline_acessibilidade(pergunta)
+        if "erro" in resposta:
+            print(f"  {YELLOW}✗ {pergunta} ({resposta['erro']}){NC}")
+            continue
+        entries.append({"pergunta": pergunta, "resposta": resposta})
+        print(f"  ✓ {pergunta}")
+    return entries
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else os.path.join(BASE_DIR, CACHE_CORPUS_FILE)
+
+    print(f"{GREEN}🧠 Gerando corpus de warm-up do cache...{NC}")
+    entries = asyncio.run(build_corpus(CACHE_WARMUP_QUESTIONS))
+    if not entries:
+        print(f"{YELLOW}❌ Nenhuma resposta gerada{NC}")
+        sys.exit(1)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"entries": entries}, f, ensure_ascii=False, indent=2)
+
+    print(f"{GREEN}✅ {len(entries)} resposta(s) salva(s) em {output}{NC}")
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """
-Script para criar GIF animado da Ada para o README
-Cria uma animação suave usando os estados principais da Ada
+Script para criar a animação da Ada
+Cria uma animação suave usando os estados principais da Ada. O formato padrão
+é WebP animado (bem menor que o GIF, com transparência real); o GIF continua
+disponível com --gif para o README.
 """
 
 from PIL import Image
@@ -14,13 +16,36 @@ YELLOW = "\033[1;33m"
 NC = "\033[0m"  # No Color
 
 
+# Formatos suportados: extensão do arquivo e parâmetros do Pillow
+ANIMATION_FORMATS = {
+    "webp": (".webp", {"format": "WEBP", "quality": 80, "method": 6}),
+    "gif": (".gif", {"format": "GIF", "optimize": True}),
+}
+
+
 def create_ada_gif():
-    """Cria GIF animado da Ada com estados principais"""
+    """Cria GIF animado da Ada com estados principais (usado no README)"""
+    return create_ada_animation("gif")
+
+
+def create_ada_animation(fmt="webp", output_dir=None):
+    """
+    Cria a animação da Ada com os estados principais.
+
+    Args:
+        fmt: Formato de saída ("webp" ou "gif")
+        output_dir: Diretório de saída (padrão: static/images)
+
+    Returns:
+        True se a animação foi criada
+    """
+    extension, save_options = ANIMATION_FORMATS[fmt]
 
     # Diretório base
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     images_dir = os.path.join(base_dir, "static", "images", "ada-states")
-    output_path = os.path.join(base_dir, "static", "images", "ada-animated.gif")
+    output_dir = output_dir or os.path.join(base_dir, "static", "images")
+    output_path = os.path.join(output_dir, f"ada-animated{extension}")
 
     # Sequência de estados para a animação (ciclo suave)
     # Ordem: greeting -> idle -> surprised -> thinking -> happy -> idle -> greeting
@@ -34,7 +59,7 @@ def create_ada_gif():
         "ada-greeting.png",
     ]
 
-    print(f"{GREEN}🎬 Criando GIF animado da Ada...{NC}")
+    print(f"{GREEN}🎬 Criando animação da Ada ({fmt.upper()})...{NC}")
 
     # Carregar imagens
     images = []
@@ -72,21 +97,20 @@ def create_ada_gif():
         # Repetir última duração
         durations.extend([durations[-1]] * (len(images) - len(durations)))
 
-    print(f"\n{GREEN}💾 Salvando GIF...{NC}")
+    print(f"\n{GREEN}💾 Salvando {fmt.upper()}...{NC}")
 
-    # Salvar como GIF animado
+    # Salvar animação
     images[0].save(
         output_path,
         save_all=True,
         append_images=images[1:],
         duration=durations,
         loop=0,  # Loop infinito
-        optimize=True,
-        quality=95,
+        **save_options,
     )
 
     file_size = os.path.getsize(output_path) / 1024  # KB
-    print(f"\n{GREEN}✅ GIF criado com sucesso!{NC}")
+    print(f"\n{GREEN}✅ Animação criada com sucesso!{NC}")
     print(f"  📁 Local: {output_path}")
     print(f"  📊 Tamanho: {file_size:.1f} KB")
     print(f"  🖼️  Frames: {len(images)}")
@@ -97,10 +121,10 @@ def create_ada_gif():
 
 if __name__ == "__main__":
     try:
-        success = create_ada_gif()
+        success = create_ada_animation("gif" if "--gif" in sys.argv[1:] else "webp")
         sys.exit(0 if success else 1)
     except Exception as e:
-        print(f"\n{YELLOW}❌ Erro ao criar GIF: {e}{NC}")
+        print(f"\n{YELLOW}❌ Erro ao criar animação: {e}{NC}")
         import traceback
 
         traceback.print_exc()
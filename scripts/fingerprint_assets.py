@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Script para versionar (fingerprint) os assets do frontend no build
+Renomeia CSS/JS para nome.<hash>.ext, reescreve imports entre módulos e as
+referências nos HTML, e grava o assets-manifest.json com o mapeamento.
+Arquivos com hash no nome recebem cache imutável do StaticCacheMiddleware.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+
+# Cores para output
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+NC = "\033[0m"  # No Color
+
+# Prefixo público sob o qual o build é servido (mount /static da API)
+PUBLIC_PREFIX = "/static/"
+
+FINGERPRINT_EXTENSIONS = (".css", ".js")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".avif", ".gif", ".svg")
+HASH_LENGTH = 8
+
+MANIFEST_NAME = "assets-manifest.json"
+
+# Arquivos que precisam manter URL fixa (o service worker é registrado em /sw.js)
+UNVERSIONED_FILES = {"sw.js"}
+
+# Arquivos que já carregam hash no nome (nome.<hash>.ext)
+HASHED_RE = re.compile(r"\.[0-9a-f]{%d}\.[a-z0-9]+$" % HASH_LENGTH)
+
+# import ... from './x.js' | import './x.js' | export ... from './x.js' | import('./x.js')
+IMPORT_RE = re.compile(r"""(\bfrom\s*|\bimport\s*\(?\s*)(['"])(\.{1,2}/[^'"]+\.js)\2""")
+
+
+def content_hash(data):
+    """Hash curto do conteúdo usado no nome do arquivo"""
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(rel_path, digest):
+    """Retorna o caminho com o hash antes da extensão (styles.css → styles.<hash>.css)"""
+    base, ext = os.path.splitext(rel_path)
+    return f"{base}.{digest}{ext}"
+
+
+def _resolve(importer, spec):
+    """Resolve um import relativo para caminho relativo à raiz do build"""
+    return os.path.normpath(os.path.join(os.path.dirname(importer), spec)).replace(os.sep, "/")
+
+
+def _relative(importer, target):
+    """Caminho relativo de importer até target, no formato './x.js'"""
+    rel = os.path.relpath(target, os.path.dirname(importer) or ".").replace(os.sep, "/")
+    return rel if rel.startswith("../") else f"./{rel}"
+
+
+def collect_assets(build_dir):
+    """Lista CSS/JS do build (ignorando variantes e arquivos já versionados)"""
+    assets = []
+    for root, _dirs, files in os.walk(build_dir):
+        for name in sorted(files):
+            if not name.endswith(FINGERPRINT_EXTENSIONS) or HASHED_RE.search(name):
+                continue
+            if name in UNVERSIONED_FILES:
+                continue
+            rel_path = os.path.relpath(os.path.join(root, name), build_dir).replace(os.sep, "/")
+            assets.append(rel_path)
+    return assets
+
+
+def fingerprint(build_dir):
+    """
+    Gera cópias versionadas dos assets em ordem topológica de imports.
+
+    Um módulo só é versionado depois das suas dependências, para que o hash
+    reflita também a mudança de nome dos arquivos que ele importa.
+
+    Returns:
+        Tupla (mapeamento {original: versionado}, dependências {original: imports})
+    """
+    assets = collect_assets(build_dir)
+    contents = {}
+    deps = {}
+    for rel_path in assets:
+        with open(os.path.join(build_dir, rel_path), encoding="utf-8") as f:
+            contents[rel_path] = f.read()
+        deps[rel_path] = {
+            _resolve(rel_path, match.group(3))
+            for match in IMPORT_RE.finditer(contents[rel_path])
+            if rel_path.endswith(".js")
+        } & set(assets)
+
+    mapping = {}
+    pending = list(assets)
+    while pending:
+        ready = [path for path in pending if deps[path] <= mapping.keys()]
+        if not ready:
+            raise RuntimeError(f"Ciclo de imports entre módulos: {', '.join(pending)}")
+
+        for rel_path in ready:
+
+            def rewrite(match, importer=rel_path):
+                target = _resolve(importer, match.group(3))
+                if target not in mapping:
+                    return match.group(0)
+                quote = match.group(2)
+                return f"{match.group(1)}{quote}{_relative(importer, mapping[target])}{quote}"
+
+            rewritten = IMPORT_RE.sub(rewrite, contents[rel_path])
+            data = rewritten.encode("utf-8")
+            mapping[rel_path] = hashed_name(rel_path, content_hash(data))
+            with open(os.path.join(build_dir, mapping[rel_path]), "wb") as f:
+                f.write(data)
+            print(f"  ✓ {rel_path} → {mapping[rel_path]}")
+            pending.remove(rel_path)
+
+    return mapping, deps
+
+
+def _transitive_deps(entry, deps):
+    """Dependências transitivas de um módulo de entrada, em ordem de descoberta"""
+    seen = []
+    stack = [entry]
+    while stack:
+        for dep in sorted(deps.get(stack.pop(), ())):
+            if dep not in seen:
+                seen.append(dep)
+                stack.append(dep)
+    return seen
+
+
+def rewrite_html(build_dir, mapping, deps):
+    """Reescreve referências /static/... nos HTML e adiciona modulepreload"""
+    for name in sorted(os.listdir(build_dir)):
+        if not name.endswith(".html"):
+            continue
+        path = os.path.join(build_dir, name)
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+
+        preloads = []
+        for original, versioned in mapping.items():
+            referencia = f'"{PUBLIC_PREFIX}{original}"'
+            if referencia not in html:
+                continue
+            html = html.replace(referencia, f'"{PUBLIC_PREFIX}{versioned}"')
+            if original.endswith(".js"):
+                preloads.extend(mapping[dep] for dep in _transitive_deps(original, deps))
+
+        if preloads:
+            links = "".join(
+                f'    <link rel="modulepreload" href="{PUBLIC_PREFIX}{href}">\n'
+                for href in dict.fromkeys(preloads)
+            )
+            html = html.replace("</head>", f"{links}</head>", 1)
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"  ✓ Referências atualizadas em {name}")
+
+
+def write_manifest(build_dir, mapping):
+    """Grava assets-manifest.json com versão do build e mapeamento de fingerprints"""
+    images = []
+    for root, _dirs, files in os.walk(build_dir):
+        images.extend(name for name in sorted(files) if name.lower().endswith(IMAGE_EXTENSIONS))
+
+    now = datetime.now(timezone.utc)
+    manifest = {
+        "version": now.strftime("%Y%m%d-%H%M%S"),
+        "build_date": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "assets": {
+            "css": sorted(v for v in mapping.values() if v.endswith(".css")),
+            "js": sorted(v for v in mapping.values() if v.endswith(".js")),
+            "images": images,
+        },
+        "fingerprints": dict(sorted(mapping.items())),
+    }
+    with open(os.path.join(build_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def fingerprint_dir(build_dir):
+    """
+    Executa o versionamento completo de um diretório de build.
+
+    Os arquivos originais são mantidos para que URLs sem hash continuem
+    funcionando (com revalidação), por exemplo em abas abertas antes do deploy.
+    """
+    mapping, deps = fingerprint(build_dir)
+    rewrite_html(build_dir, mapping, deps)
+    write_manifest(build_dir, mapping)
+    return mapping
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(f"Uso: {sys.argv[0]} <diretório-de-build>")
+        sys.exit(1)
+
+    if not os.path.isdir(sys.argv[1]):
+        print(f"{YELLOW}❌ Diretório não encontrado: {sys.argv[1]}{NC}")
+        sys.exit(1)
+
+    print(f"{GREEN}🔐 Versionando assets em {sys.argv[1]}...{NC}")
+    resultado = fingerprint_dir(sys.argv[1])
+    print(f"{GREEN}✅ {len(resultado)} asset(s) versionado(s){NC}")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Script para pré-comprimir assets textuais do build
+Gera irmãos .br/.gz (ex: styles.css.br) e um manifest com hash de conteúdo,
+servidos pelo PrecompressedStaticFiles sem comprimir a cada requisição
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Cores para output
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+NC = "\033[0m"  # No Color
+
+# Extensões que se beneficiam de compressão (imagens e fontes já são comprimidas)
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".html", ".json", ".svg", ".txt", ".map")
+
+# Variantes menores que isso (ou que não economizam bytes) não são geradas
+MIN_SIZE_BYTES = 500
+
+MANIFEST_NAME = "precompressed-manifest.json"
+
+
+def precompress_file(path):
+    """
+    Gera as variantes comprimidas de um arquivo.
+
+    Returns:
+        Dicionário com hash do conteúdo e tamanhos por codificação
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    entry = {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "size": len(data),
+        "encodings": {},
+    }
+    if len(data) < MIN_SIZE_BYTES:
+        return entry
+
+    variants = {"gzip": (".gz", gzip.compress(data, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        variants["br"] = (".br", brotli.compress(data, quality=11))
+
+    for encoding, (extension, compressed) in variants.items():
+        if len(compressed) >= len(data):
+            continue
+        with open(path + extension, "wb") as f:
+            f.write(compressed)
+        entry["encodings"][encoding] = len(compressed)
+
+    return entry
+
+
+def precompress_dir(build_dir):
+    """Pré-comprime todos os assets textuais de um diretório e grava o manifest"""
+    manifest = {}
+    for root, _dirs, files in os.walk(build_dir):
+        for name in sorted(files):
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS) or name == MANIFEST_NAME:
+                continue
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, build_dir).replace(os.sep, "/")
+            manifest[rel_path] = precompress_file(path)
+            encodings = manifest[rel_path]["encodings"]
+            resumo = ", ".join(f"{enc}: {size} B" for enc, size in encodings.items()) or "-"
+            print(f"  ✓ {rel_path} ({manifest[rel_path]['size']} B → {resumo})")
+
+    with open(os.path.join(build_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return manifest
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(f"Uso: {sys.argv[0]} <diretório-de-build>")
+        sys.exit(1)
+
+    print(f"{GREEN}🗜️  Pré-comprimindo assets em {sys.argv[1]}...{NC}")
+    if brotli is None:
+        print(f"{YELLOW}⚠️  brotli não instalado, gerando apenas .gz{NC}")
+
+    resultado = precompress_dir(sys.argv[1])
+    print(f"{GREEN}✅ {len(resultado)} arquivo(s) processado(s){NC}")
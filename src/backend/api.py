@@ -4,18 +4,21 @@ API FastAPI para o Chatbot de Acessibilidade Digital
 
 import logging
 import os
+import secrets
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
-from fastapi import FastAPI, HTTPException, Request
+from typing import Dict, List, Optional
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from limits import parse as parse_rate_limit
 
 import sys
 
@@ -29,27 +32,36 @@ from dotenv import load_dotenv  # noqa: E402
 
 load_dotenv()
 
-from chatbot_acessibilidade.config import settings  # noqa: E402
+from chatbot_acessibilidade.config import AgentConfig, settings  # noqa: E402
 from backend.middleware import (  # noqa: E402
+    CompressionMiddleware,
     SecurityHeadersMiddleware,
     StaticCacheMiddleware,
 )
+from backend.static_files import PrecompressedStaticFiles  # noqa: E402
 
 # Garante que GOOGLE_API_KEY está disponível como variável de ambiente
 # O Google ADK precisa disso para criar o cliente internamente
 if settings.google_api_key and not os.getenv("GOOGLE_API_KEY"):
     os.environ["GOOGLE_API_KEY"] = settings.google_api_key
-from chatbot_acessibilidade.pipeline import pipeline_acessibilidade  # noqa: E402
-from chatbot_acessibilidade.core.exceptions import ValidationError  # noqa: E402
+from chatbot_acessibilidade.core.exceptions import (  # noqa: E402
+    CacheBackendError,
+    ValidationError,
+)
 from chatbot_acessibilidade.core.cache import (  # noqa: E402
     get_cached_response,
+    get_similar_cached_response,
+    invalidate_similar_cache,
     set_cached_response,
     get_cache_stats,
 )
+from chatbot_acessibilidade.core.comandos import Comando, resolver_comando  # noqa: E402
+from chatbot_acessibilidade.core.faq import responder_faq  # noqa: E402
 from chatbot_acessibilidade.core.metrics import (  # noqa: E402
     record_request,
     record_cache_hit,
     record_cache_miss,
+    record_faq_hit,
     get_metrics,
     MetricsContext,
 )
@@ -58,13 +70,55 @@ from chatbot_acessibilidade.core.validators import (  # noqa: E402
     validate_content,
     detect_injection_patterns,
 )
+from chatbot_acessibilidade.core.cache_warmup import (  # noqa: E402
+    save_cache_snapshot,
+    start_cache_warmup,
+)
+from chatbot_acessibilidade.core.warmup import (  # noqa: E402
+    get_readiness,
+    restart_warmup_if_failed,
+    start_warmup,
+)
 
 # Configuração de logging
 logging.basicConfig(level=getattr(logging, settings.log_level), format=settings.log_format)
 logger = logging.getLogger(__name__)
 
+
+async def pipeline_acessibilidade(pergunta: str) -> dict:
+    """
+    Executa o pipeline de agentes.
+
+    O pacote do pipeline (e com ele ADK, genai e a criação dos agentes) é
+    importado só aqui, para que a API suba e responda health checks sem esperar
+    por ele. Normalmente o warm-up do startup já o carregou.
+    """
+    from chatbot_acessibilidade.pipeline import pipeline_acessibilidade as _pipeline
+
+    return await _pipeline(pergunta)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Inicia os warm-ups em segundo plano sem atrasar o startup e salva o
+    snapshot do cache no shutdown.
+    """
+    if settings.startup_warmup_enabled:
+        start_warmup()
+    if settings.cache_enabled and settings.cache_warmup_enabled:
+        start_cache_warmup()
+    yield
+    if settings.cache_snapshot_file:
+        try:
+            await save_cache_snapshot()
+        except (OSError, CacheBackendError) as e:
+            logger.error(f"Erro ao salvar snapshot do cache: {e}")
+
+
 # Inicializa FastAPI com documentação completa
 app = FastAPI(
+    lifespan=lifespan,
     title="Chatbot de Acessibilidade Digital API",
     description="""
     ## 🎯 API para Chatbot de Acessibilidade Digital
@@ -141,12 +195,11 @@ app.add_middleware(SecurityHeadersMiddleware)
 # Middleware de cache para assets estáticos (após segurança)
 app.add_middleware(StaticCacheMiddleware)
 
-# Middleware de compressão (usando implementação nativa do Starlette/FastAPI)
+# Middleware de compressão (brotli/zstd quando disponíveis, gzip como fallback)
 if settings.compression_enabled:
-    from fastapi.middleware.gzip import GZipMiddleware
     from chatbot_acessibilidade.core.constants import COMPRESSION_MIN_SIZE_BYTES
 
-    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE_BYTES)
+    app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE_BYTES)
 
 # Configura CORS com origens permitidas
 app.add_middleware(
@@ -372,7 +425,7 @@ async def health_check():
         }
         ```
     """
-    cache_stats = get_cache_stats()
+    cache_stats = await get_cache_stats()
 
     return {
         "status": "ok",
@@ -381,8 +434,82 @@ async def health_check():
     }
 
 
+@app.get(
+    "/api/live",
+    tags=["Health"],
+    summary="Liveness Probe",
+    description="""
+    Indica apenas que o processo está no ar e respondendo.
+    
+    Não depende de agentes, cache ou provedores de LLM: deve ser usado como
+    liveness probe (reiniciar o container só quando o processo travar).
+    """,
+    response_description="Processo ativo",
+)
+async def liveness_check():
+    """
+    Verifica se o processo está vivo.
+
+    Returns:
+        dict: {"status": "alive"}
+    """
+    return {"status": "alive"}
+
+
+@app.get(
+    "/api/ready",
+    tags=["Health"],
+    summary="Readiness Probe",
+    description="""
+    Indica se a instância está pronta para receber tráfego.
+    
+    Retorna 503 enquanto:
+    - O warm-up (import do ADK e criação dos agentes) não terminou ou falhou
+    - O cache ainda está sendo pré-carregado (progresso em checks.cache)
+    - Algum provedor de LLM está com o circuito aberto (quota esgotada)
+    
+    Um warm-up que falhou é agendado novamente a cada consulta.
+    """,
+    response_description="Status de prontidão e detalhe de cada verificação",
+    responses={503: {"description": "Instância ainda não está pronta"}},
+)
+async def readiness_check():
+    """
+    Verifica se a instância está pronta para receber tráfego.
+
+    Returns:
+        JSONResponse: status "ready" (200) ou "not_ready" (503) com as
+            verificações de warm-up e de provedores
+
+    Example:
+        ```json
+        {
+            "status": "ready",
+            "checks": {
+                "warmup": {"status": "done", "agents_ready": true, ...},
+                "cache": {"status": "done", "loaded": 10, "total": 10, ...},
+                "providers": {"Google Gemini": {"state": "closed", ...}}
+            }
+        }
+        ```
+    """
+    if settings.startup_warmup_enabled:
+        restart_warmup_if_failed()
+
+    readiness = get_readiness()
+    return JSONResponse(
+        status_code=200 if readiness["ready"] else 503,
+        content={
+            "status": "ready" if readiness["ready"] else "not_ready",
+            "checks": readiness["checks"],
+        },
+    )
+
+
 # Endpoint principal de chat
 from chatbot_acessibilidade.core.constants import (  # noqa: E402
+    AGENT_GENERATION_DEFAULTS,
+    CACHE_INVALIDATION_THRESHOLD,
     FALLBACK_RATE_LIMIT_PER_MINUTE,
 )
 
@@ -393,6 +520,29 @@ rate_limit_str = (
 )
 
 
+def verificar_limite_do_comando(request: Request, comando: Comando) -> None:
+    """
+    Aplica o rate limit próprio do comando, além do limite global do chat.
+
+    Chamado só quando a resposta não está em cache: o limite protege os agentes.
+
+    Raises:
+        HTTPException: 429 se o IP excedeu o limite do comando
+    """
+    if not settings.rate_limit_enabled or comando.rate_limit_per_minute is None:
+        return
+    from chatbot_acessibilidade.core.constants import ErrorMessages  # noqa: E402
+
+    limite = parse_rate_limit(f"{comando.rate_limit_per_minute}/minute")
+    if not limiter.limiter.hit(limite, get_remote_address(request), comando.namespace):
+        raise HTTPException(
+            status_code=429,
+            detail=ErrorMessages.COMMAND_RATE_LIMIT_EXCEEDED.format(
+                comando=comando.nome, limite=comando.rate_limit_per_minute
+            ),
+        )
+
+
 @app.post(
     "/api/chat",
     response_model=ChatResponse,
@@ -510,8 +660,30 @@ async def chat(request: Request, chat_request: ChatRequest):
     logger.info(f"Processando pergunta: {chat_request.pergunta[:50]}...")
 
     try:
+        # Comandos têm namespace de cache próprio (chave canônica dos argumentos);
+        # perguntas comuns usam o texto da pergunta
+        resolvido = resolver_comando(chat_request.pergunta)
+        chave_cache: Optional[str] = chat_request.pergunta
+        namespace = ""
+        if resolvido is not None:
+            chave_cache = resolvido.chave_cache()
+            namespace = resolvido.comando.namespace
+
+        # Perguntas frequentes têm resposta curada: nenhum agente é chamado
+        resposta_dict = responder_faq(chat_request.pergunta)
+        if resposta_dict is not None:
+            record_faq_hit()
+            logger.info("Resposta retornada da FAQ")
+            return ChatResponse(resposta=resposta_dict)
+
         # Verifica cache antes de processar
-        resposta_dict = get_cached_response(chat_request.pergunta)
+        resposta_dict = None
+        if chave_cache is not None:
+            resposta_dict = await get_cached_response(chave_cache, namespace=namespace)
+        if resposta_dict is None and resolvido is None and settings.cache_semantic_enabled:
+            # Reformulações de uma pergunta já respondida reaproveitam a resposta
+            similar = await get_similar_cached_response(chat_request.pergunta)
+            resposta_dict = similar[0] if similar else None
 
         if resposta_dict is not None:
             record_cache_hit()
@@ -520,13 +692,21 @@ async def chat(request: Request, chat_request: ChatRequest):
 
         record_cache_miss()
 
+        # O rate limit do comando só conta chamadas que acionam os agentes
+        if resolvido is not None:
+            verificar_limite_do_comando(request, resolvido.comando)
+
         # Chama o pipeline assíncrono com métricas
+        inicio_pipeline = time.perf_counter()
         with MetricsContext():
             resposta_dict = await pipeline_acessibilidade(chat_request.pergunta)
+        custo = time.perf_counter() - inicio_pipeline
 
-        # Salva no cache apenas se não houver erro
-        if not (isinstance(resposta_dict, dict) and "erro" in resposta_dict):
-            set_cached_response(chat_request.pergunta, resposta_dict)
+        # Salva no cache apenas se não houver erro (o tempo gasto pesa na admissão)
+        if chave_cache is not None and not (
+            isinstance(resposta_dict, dict) and "erro" in resposta_dict
+        ):
+            await set_cached_response(chave_cache, resposta_dict, cost=custo, namespace=namespace)
 
         # Verifica se houve erro no pipeline
         if isinstance(resposta_dict, dict) and "erro" in resposta_dict:
@@ -552,21 +732,178 @@ async def chat(request: Request, chat_request: ChatRequest):
         )
 
 
+class CacheInvalidationRequest(BaseModel):
+    """Pergunta de referência para invalidar as reformulações em cache"""
+
+    pergunta: str = Field(
+        ..., min_length=1, description="Pergunta cuja resposta mudou", examples=["O que é WCAG?"]
+    )
+    threshold: float = Field(
+        CACHE_INVALIDATION_THRESHOLD,
+        ge=0.0,
+        le=1.0,
+        description="Similaridade mínima (Jaccard dos termos normalizados) para invalidar",
+    )
+    dry_run: bool = Field(False, description="Apenas listar as entradas que seriam invalidadas")
+
+
+class CacheInvalidationResponse(BaseModel):
+    invalidated: int = Field(..., description="Número de entradas invalidadas")
+    perguntas: List[str] = Field(..., description="Perguntas originais das entradas")
+    dry_run: bool
+
+
+async def verify_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Exige o header X-Admin-Token igual a settings.admin_api_token.
+
+    Sem token configurado os endpoints administrativos ficam desabilitados (404).
+    """
+    from chatbot_acessibilidade.core.constants import ErrorMessages  # noqa: E402
+
+    if not settings.admin_api_token:
+        raise HTTPException(status_code=404, detail=ErrorMessages.ADMIN_DISABLED)
+    if not x_admin_token or not secrets.compare_digest(
+        x_admin_token.encode("utf-8"), settings.admin_api_token.encode("utf-8")
+    ):
+        raise HTTPException(status_code=401, detail=ErrorMessages.ADMIN_INVALID_TOKEN)
+
+
+@app.post(
+    "/api/admin/cache/invalidate",
+    response_model=CacheInvalidationResponse,
+    tags=["Admin"],
+    summary="Invalidar Respostas Similares",
+    description="""
+    Remove do cache a pergunta informada e todas as reformulações quase idênticas
+    (MinHash/LSH sobre as perguntas cacheadas), sem limpar o cache inteiro.
+
+    Use quando uma orientação da WCAG muda e uma família de respostas precisa ser
+    regenerada. Com `dry_run` as entradas são apenas listadas.
+
+    Requer o header `X-Admin-Token` (settings.admin_api_token). Nos backends
+    compartilhados (shared, disk, redis) a pergunta fica guardada com cada resposta
+    e a invalidação vale para todos os workers e réplicas. No backend memory cada
+    worker tem o próprio cache e só o worker que atendeu a requisição é afetado:
+    com vários workers, use um backend compartilhado.
+    """,
+    response_description="Entradas invalidadas",
+    dependencies=[Depends(verify_admin_token)],
+)
+async def invalidate_cache(invalidation: CacheInvalidationRequest):
+    """
+    Invalida entradas do cache similares a uma pergunta.
+
+    Args:
+        invalidation: Pergunta de referência, limiar e dry_run
+
+    Returns:
+        CacheInvalidationResponse com as perguntas invalidadas
+    """
+    perguntas = await invalidate_similar_cache(
+        invalidation.pergunta, threshold=invalidation.threshold, dry_run=invalidation.dry_run
+    )
+    return CacheInvalidationResponse(
+        invalidated=len(perguntas), perguntas=perguntas, dry_run=invalidation.dry_run
+    )
+
+
+@app.get(
+    "/api/admin/agents",
+    response_model=Dict[str, AgentConfig],
+    tags=["Admin"],
+    summary="Configuração dos Agentes",
+    description="""
+    Retorna a configuração efetiva de cada agente: modelo, max_output_tokens,
+    temperature, thinking_budget e timeout_seconds.
+
+    Requer o header `X-Admin-Token` (settings.admin_api_token).
+    """,
+    response_description="Configuração por agente",
+    dependencies=[Depends(verify_admin_token)],
+)
+async def get_agent_configs():
+    """Configuração efetiva de todos os agentes"""
+    return {tipo: settings.agent_config(tipo) for tipo in AGENT_GENERATION_DEFAULTS}
+
+
+@app.put(
+    "/api/admin/agents/{tipo}",
+    response_model=AgentConfig,
+    tags=["Admin"],
+    summary="Alterar Configuração de um Agente",
+    description="""
+    Substitui a configuração do agente (campos nulos voltam ao padrão) e recria os
+    agentes sem reiniciar o servidor. Útil para limitar, por exemplo, o tamanho da
+    saída do Testador.
+
+    Requer o header `X-Admin-Token` (settings.admin_api_token). A alteração vale só
+    para o worker que recebeu a requisição e não sobrevive a um restart (use
+    AGENT_CONFIGS no .env para torná-la permanente).
+    """,
+    response_description="Configuração efetiva do agente",
+    dependencies=[Depends(verify_admin_token)],
+)
+async def update_agent_config(tipo: str, config: AgentConfig):
+    """
+    Altera a configuração de um agente e recria os agentes.
+
+    Args:
+        tipo: Nome do agente (assistente, validador, revisor, ...)
+        config: Nova configuração do agente
+
+    Returns:
+        AgentConfig efetiva do agente
+    """
+    from chatbot_acessibilidade.core.constants import ErrorMessages  # noqa: E402
+
+    if tipo not in AGENT_GENERATION_DEFAULTS:
+        raise HTTPException(
+            status_code=404, detail=ErrorMessages.ADMIN_UNKNOWN_AGENT.format(tipo=tipo)
+        )
+
+    # Importado só aqui: recriar os agentes carrega o ADK
+    from chatbot_acessibilidade.agents.dispatcher import recarregar_agentes
+
+    settings.agent_configs[tipo] = config
+    recarregar_agentes()
+    return settings.agent_config(tipo)
+
+
 # Servir arquivos estáticos do frontend e assets
 # Caminhos relativos à raiz do projeto
 project_root = Path(__file__).parent.parent.parent
-frontend_path = project_root / "frontend"
+frontend_path = (
+    project_root / settings.frontend_dir if settings.frontend_dir else project_root / "frontend"
+)
 static_path = project_root / "static"
 
 if frontend_path.exists():
-    # Serve arquivos do frontend (CSS, JS) em /static
-    app.mount("/static", StaticFiles(directory=str(frontend_path)), name="static")
+    # Serve arquivos do frontend (CSS, JS) em /static, com variantes .br/.gz do build
+    app.mount("/static", PrecompressedStaticFiles(directory=str(frontend_path)), name="static")
+
+    # Service worker na raiz para controlar todo o site (escopo "/")
+    service_worker_path = frontend_path / "sw.js"
+    if service_worker_path.exists():
+
+        @app.get("/sw.js", include_in_schema=False)
+        async def service_worker():
+            """Serve o service worker do frontend"""
+            # Atualizações do service worker precisam ser detectadas a cada visita
+            return FileResponse(
+                str(service_worker_path),
+                media_type="application/javascript",
+                headers={"Cache-Control": "no-cache", "Service-Worker-Allowed": "/"},
+            )
 
     # Serve index.html na raiz
     @app.get("/")
     async def read_root():
         """Serve a página principal do frontend"""
-        return FileResponse(str(frontend_path / "index_modular.html"))
+        # O HTML referencia os assets versionados, então precisa sempre revalidar
+        return FileResponse(
+            str(frontend_path / "index_modular.html"), headers={"Cache-Control": "no-cache"}
+        )
 
 
 static_images_path = static_path / "images"
@@ -3,12 +3,33 @@ Middleware de segurança e compressão para adicionar headers HTTP de segurança
 e comprimir respostas
 """
 
-from typing import Awaitable, Callable
+import re
+import zlib
+from typing import Awaitable, Callable, List, Optional
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from chatbot_acessibilidade.config import settings
+from chatbot_acessibilidade.core.constants import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_SIZE_BYTES,
+    COMPRESSION_ZSTD_LEVEL,
+)
+
+# Codecs opcionais: sem eles, a compressão dinâmica cai para gzip
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depende do ambiente
+    zstandard = None
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -81,21 +102,32 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 
 
 class StaticCacheMiddleware(BaseHTTPMiddleware):
-    """Middleware que adiciona headers de cache para assets estáticos."""
+    """
+    Middleware que adiciona headers de cache para assets estáticos.
+
+    Assets versionados pelo build (hash de conteúdo no nome, ex:
+    `app_modular.1a2b3c4d.js`) nunca mudam e recebem cache imutável de 1 ano.
+    Assets sem hash continuam sem cache, pois seu conteúdo muda a cada deploy.
+    """
 
     # TTLs em segundos (usando constantes)
     STATIC_TTL = None  # Será definido via constantes
     ASSETS_TTL = None  # Será definido via constantes
+    IMMUTABLE_TTL = None  # Será definido via constantes
 
     def __init__(self, app):
         super().__init__(app)
         from chatbot_acessibilidade.core.constants import (
             STATIC_CACHE_TTL_SECONDS,
             ASSETS_CACHE_TTL_SECONDS,
+            IMMUTABLE_CACHE_TTL_SECONDS,
+            HASHED_ASSET_PATTERN,
         )
 
         self.STATIC_TTL = STATIC_CACHE_TTL_SECONDS
         self.ASSETS_TTL = ASSETS_CACHE_TTL_SECONDS
+        self.IMMUTABLE_TTL = IMMUTABLE_CACHE_TTL_SECONDS
+        self._hashed_asset_re = re.compile(HASHED_ASSET_PATTERN)
 
     async def dispatch(
         self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
@@ -106,15 +138,216 @@ class StaticCacheMiddleware(BaseHTTPMiddleware):
         # Verifica se é um asset estático
         path = request.url.path
 
-        if path.startswith("/static/"):
-            # CSS, JS, etc. - cache desabilitado para dev
-            response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-            # response.headers["Cache-Control"] = f"public, max-age={self.STATIC_TTL}, immutable"
-            response.headers["Vary"] = "Accept-Encoding"
-        elif path.startswith("/assets/"):
-            # Imagens - cache desabilitado temporariamente
+        if not path.startswith(("/static/", "/assets/")):
+            return response
+
+        if response.status_code in (200, 304) and self._hashed_asset_re.search(path):
+            # Asset versionado: conteúdo nunca muda para esta URL
+            response.headers["Cache-Control"] = f"public, max-age={self.IMMUTABLE_TTL}, immutable"
+        else:
+            # CSS, JS e imagens sem hash - cache desabilitado para evitar versões antigas
             response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-            # response.headers["Cache-Control"] = f"public, max-age={self.ASSETS_TTL}, immutable"
-            response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Vary"] = "Accept-Encoding"
 
         return response
+
+
+# Tipos de conteúdo que já são comprimidos (ou são streams de eventos)
+EXCLUDED_CONTENT_TYPES = (
+    "image/",
+    "audio/",
+    "video/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "text/event-stream",
+)
+
+
+def available_encodings() -> List[str]:
+    """
+    Retorna as codificações suportadas neste ambiente, em ordem de preferência.
+
+    Returns:
+        Lista de codificações (br e zstd apenas se os codecs estiverem instalados)
+    """
+    encodings = []
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None:
+        encodings.append("zstd")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(
+    accept_encoding: str, supported: Optional[List[str]] = None
+) -> Optional[str]:
+    """
+    Escolhe a melhor codificação aceita pelo cliente.
+
+    Respeita valores q do header Accept-Encoding (q=0 recusa a codificação) e,
+    em caso de empate, a ordem de preferência do servidor.
+
+    Args:
+        accept_encoding: Valor do header Accept-Encoding
+        supported: Codificações suportadas (padrão: available_encodings())
+
+    Returns:
+        Nome da codificação escolhida ou None se nenhuma for aceita
+    """
+    if supported is None:
+        supported = available_encodings()
+
+    aceitas = {}
+    for item in accept_encoding.lower().split(","):
+        nome, _, params = item.strip().partition(";")
+        if not nome:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        aceitas[nome.strip()] = q
+
+    melhor: Optional[str] = None
+    melhor_q = 0.0
+    for encoding in supported:
+        q = aceitas.get(encoding, aceitas.get("*", 0.0))
+        if q > melhor_q:
+            melhor, melhor_q = encoding, q
+    return melhor
+
+
+class _Encoder:
+    """Compressor incremental para uma codificação HTTP"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=COMPRESSION_ZSTD_LEVEL).compressobj()
+        else:
+            self._compressor = zlib.compressobj(
+                COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Comprime um bloco; com final=False faz flush para permitir streaming"""
+        if self.encoding == "br":
+            saida = self._compressor.process(data)
+            return saida + (self._compressor.finish() if final else self._compressor.flush())
+        if self.encoding == "zstd":
+            modo = (
+                zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+            return self._compressor.compress(data) + self._compressor.flush(modo)
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        )
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI de compressão com brotli, zstd e gzip.
+
+    Substitui o GZipMiddleware: negocia a melhor codificação pelo header
+    Accept-Encoding e comprime respostas dinâmicas (JSON da API). Respostas que já
+    possuem Content-Encoding (ex: variantes pré-comprimidas servidas pelo
+    PrecompressedStaticFiles) passam intactas.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self.app, encoding, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Aplica a compressão escolhida sobre as mensagens de uma única resposta"""
+
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = _unattached_send
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.encoder: Optional[_Encoder] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Segura o início até saber se o corpo será comprimido
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "").lower()
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 206, 304)
+                or content_type.startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            if not self.started and not self.passthrough and self.initial_message:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            if len(body) < self.minimum_size and not more_body:
+                # Respostas pequenas não compensam o custo da compressão
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            self.encoder = _Encoder(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            message["body"] = self.encoder.compress(body, final=not more_body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(message["body"]))
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        if self.encoder is not None:
+            message["body"] = self.encoder.compress(body, final=not more_body)
+        await self.send(message)
+
+
+async def _unattached_send(message: Message) -> None:
+    raise RuntimeError("send não configurado")  # pragma: no cover
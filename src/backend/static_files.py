@@ -0,0 +1,83 @@
+"""
+Servidor de arquivos estáticos com suporte a variantes pré-comprimidas
+"""
+
+import mimetypes
+import os
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from backend.middleware import negotiate_encoding
+from chatbot_acessibilidade.core.constants import PRECOMPRESSED_EXTENSIONS
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles que serve irmãos `.br`/`.gz` gerados no build.
+
+    Quando o cliente aceita brotli ou gzip e existe a variante pré-comprimida ao
+    lado do arquivo original (ex: `styles.css.br`), ela é servida com o
+    Content-Encoding correspondente, evitando comprimir o mesmo asset a cada
+    requisição. Sem variantes (ambiente de desenvolvimento), o comportamento é o
+    do StaticFiles padrão.
+    """
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        variante = self._find_variant(str(full_path), request_headers.get("accept-encoding", ""))
+        if variante is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers.setdefault("Vary", "Accept-Encoding")
+            return response
+
+        encoding, variant_path, variant_stat = variante
+        media_type, _ = mimetypes.guess_type(str(full_path))
+        response = FileResponse(
+            variant_path,
+            status_code=status_code,
+            stat_result=variant_stat,
+            media_type=media_type or "application/octet-stream",
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _find_variant(
+        full_path: str, accept_encoding: str
+    ) -> Optional[tuple[str, str, os.stat_result]]:
+        """
+        Procura a melhor variante pré-comprimida disponível para o arquivo.
+
+        Args:
+            full_path: Caminho absoluto do arquivo original
+            accept_encoding: Valor do header Accept-Encoding
+
+        Returns:
+            Tupla (encoding, caminho, stat) ou None se não houver variante aceita
+        """
+        disponiveis = [
+            encoding
+            for encoding, extensao in PRECOMPRESSED_EXTENSIONS.items()
+            if os.path.isfile(full_path + extensao)
+        ]
+        if not disponiveis:
+            return None
+
+        encoding = negotiate_encoding(accept_encoding, disponiveis)
+        if encoding is None:
+            return None
+
+        variant_path = full_path + PRECOMPRESSED_EXTENSIONS[encoding]
+        return encoding, variant_path, os.stat(variant_path)
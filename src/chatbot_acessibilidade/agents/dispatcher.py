@@ -3,7 +3,8 @@ Dispatcher de agentes - Gerencia a execução dos agentes do chatbot
 """
 
 import logging
-from typing import Optional
+from threading import Lock
+from typing import AsyncIterator, Dict, Optional
 
 # Dependências do Google
 from google.adk.agents import Agent
@@ -16,15 +17,57 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 from chatbot_acessibilidade.agents.factory import criar_agentes
 from chatbot_acessibilidade.config import settings
 from chatbot_acessibilidade.core.exceptions import APIError, AgentError
-from chatbot_acessibilidade.core.llm_provider import GoogleGeminiClient
+from chatbot_acessibilidade.core.llm_provider import GoogleGeminiClient, clear_agent_variants
 from chatbot_acessibilidade.core.constants import ErrorMessages, MAX_RETRY_ATTEMPTS, LogMessages
+from chatbot_acessibilidade.core.metrics import record_tokens
+from chatbot_acessibilidade.core.tokens import estimar_tokens, estimar_tokens_instrucao
 
 logger = logging.getLogger(__name__)
 
 # =======================
-# Agentes disponíveis
+# Agentes disponíveis (criados sob demanda ou no warm-up do startup)
 # =======================
-AGENTES = criar_agentes()
+_agentes: Optional[Dict[str, Agent]] = None
+_agentes_lock = Lock()
+
+
+def get_agentes() -> Dict[str, Agent]:
+    """
+    Retorna os agentes configurados, criando-os na primeira chamada.
+
+    A criação é protegida por lock porque o warm-up roda em thread separada e
+    pode concorrer com a primeira requisição.
+    """
+    global _agentes
+    if _agentes is None:
+        with _agentes_lock:
+            if _agentes is None:
+                _agentes = criar_agentes()
+                logger.info(LogMessages.AGENTS_CREATED.format(count=len(_agentes)))
+    return _agentes
+
+
+def recarregar_agentes() -> Dict[str, Agent]:
+    """
+    Recria os agentes com a configuração atual de settings (modelo, geração).
+
+    Chamadas em andamento terminam com os agentes antigos; as próximas usam os
+    novos. Vale só para o processo atual (cada worker recarrega os seus).
+    """
+    global _agentes
+    with _agentes_lock:
+        _agentes = criar_agentes()
+        clear_agent_variants()
+    logger.info(LogMessages.AGENTS_RELOADED.format(count=len(_agentes)))
+    return _agentes
+
+
+def __getattr__(name: str):
+    """Mantém `dispatcher.AGENTES` disponível sem criar os agentes no import"""
+    if name == "AGENTES":
+        return get_agentes()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # =======================
 # Inicialização de clientes LLM (lazy loading)
@@ -77,7 +120,14 @@ def _should_retry(exception: Exception) -> bool:
         else None
     ),
 )
-async def rodar_agente(agent: Agent, prompt: str, user_id="user", session_prefix="sessao") -> str:
+async def rodar_agente(
+    agent: Agent,
+    prompt: str,
+    user_id="user",
+    session_prefix="sessao",
+    model: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> str:
     """
     Executa um agente com tratamento de erros, logging e fallback automático.
 
@@ -86,6 +136,8 @@ async def rodar_agente(agent: Agent, prompt: str, user_id="user", session_prefix
         prompt: Prompt para o agente
         user_id: ID do usuário
         session_prefix: Prefixo para o ID da sessão
+        model: Modelo escolhido pelo roteador (None usa o modelo do agente)
+        timeout: Timeout da chamada em segundos (None usa settings.api_timeout_seconds)
 
     Returns:
         Resposta do agente como string
@@ -101,7 +153,7 @@ async def rodar_agente(agent: Agent, prompt: str, user_id="user", session_prefix
 
     try:
         # Usa apenas Google Gemini (com fallback automático entre chaves)
-        resposta = await primary_client.generate(prompt)
+        resposta = await primary_client.generate(prompt, model=model, timeout=timeout)
         provedor_usado = primary_client.get_provider_name()
 
         logger.info(f"Agente '{agent.name}' executado com sucesso usando {provedor_usado}")
@@ -112,7 +164,7 @@ async def rodar_agente(agent: Agent, prompt: str, user_id="user", session_prefix
         error_msg = str(e)
         if "Timeout" in error_msg:
             raise APIError(
-                ErrorMessages.TIMEOUT_GEMINI.format(timeout=settings.api_timeout_seconds)
+                ErrorMessages.TIMEOUT_GEMINI.format(timeout=timeout or settings.api_timeout_seconds)
                 + " Por favor, tente novamente."
             )
         elif "quota" in error_msg.lower() or "rate limit" in error_msg.lower():
@@ -134,8 +186,78 @@ async def rodar_agente(agent: Agent, prompt: str, user_id="user", session_prefix
 # =======================
 # Interface pública
 # =======================
-async def get_agent_response(tipo: str, prompt: str, prefixo: str) -> str:
-    if tipo not in AGENTES:
+async def get_agent_response(
+    tipo: str, prompt: str, prefixo: str, model: Optional[str] = None
+) -> str:
+    agentes = get_agentes()
+    if tipo not in agentes:
         return f"Erro: agente '{tipo}' não encontrado."
-    result = await rodar_agente(AGENTES[tipo], prompt, session_prefix=prefixo)
-    return str(result)
+    agente = agentes[tipo]
+    result = str(
+        await rodar_agente(
+            agente,
+            prompt,
+            session_prefix=prefixo,
+            model=model,
+            timeout=settings.agent_config(tipo).timeout_seconds,
+        )
+    )
+    instrucao = agente.instruction if isinstance(agente.instruction, str) else ""
+    record_tokens(
+        tipo,
+        estimar_tokens_instrucao(instrucao) + estimar_tokens(prompt),
+        estimar_tokens(result),
+    )
+    return result
+
+
+async def stream_agent_response(
+    tipo: str, prompt: str, prefixo: str, model: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Executa um agente entregando a resposta em partes, à medida que é gerada.
+
+    Mesmo contrato de `get_agent_response` (agente inexistente vira uma única
+    parte com a mensagem de erro), sem retry: uma parte já entregue não pode ser
+    refeita. Falhas antes da primeira parte já caem na chamada sem streaming
+    do cliente, que tem a troca de chave.
+
+    Args:
+        tipo: Nome do agente (assistente, revisor, ...)
+        prompt: Prompt para o agente
+        prefixo: Prefixo da sessão (usado nos logs)
+        model: Modelo escolhido pelo roteador (None usa o modelo do agente)
+
+    Yields:
+        Trechos de texto da resposta
+
+    Raises:
+        APIError: Se houver erro na comunicação com a API
+        AgentError: Se houver erro inesperado na execução do agente
+    """
+    agentes = get_agentes()
+    if tipo not in agentes:
+        yield f"Erro: agente '{tipo}' não encontrado."
+        return
+
+    agente = agentes[tipo]
+    logger.debug(f"Executando agente '{agente.name}' ({prefixo}) em streaming: {prompt[:50]}...")
+    partes = []
+    try:
+        async for parte in GoogleGeminiClient(agente).generate_stream(
+            prompt, model=model, timeout=settings.agent_config(tipo).timeout_seconds
+        ):
+            partes.append(parte)
+            yield parte
+    except APIError:
+        raise
+    except Exception as e:
+        logger.error(f"Erro inesperado no agente '{agente.name}': {e}", exc_info=True)
+        raise AgentError("Erro: Ocorreu uma falha inesperada. Por favor, tente novamente.")
+
+    instrucao = agente.instruction if isinstance(agente.instruction, str) else ""
+    record_tokens(
+        tipo,
+        estimar_tokens_instrucao(instrucao) + estimar_tokens(prompt),
+        estimar_tokens("".join(partes)),
+    )
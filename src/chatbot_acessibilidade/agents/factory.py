@@ -7,11 +7,49 @@ Foco: HTML5 Semântico + JavaScript Vanilla (sem frameworks)
 Melhores práticas: Contexto Rígido, Output Estruturado, Validação de Segurança, Chain-of-Thought.
 """
 
+from typing import Any, Dict
+
 from google.adk.agents import Agent
-from google.adk.tools import google_search
+from google.genai import types
+
+from chatbot_acessibilidade.config import settings
+from chatbot_acessibilidade.core.context_cache import (
+    descartar_cache_invalido,
+    usar_cache_de_contexto,
+)
+from chatbot_acessibilidade.core.knowledge_base import buscar_referencias_acessibilidade
+from chatbot_acessibilidade.core.resposta_combinada import RespostaCombinada
+from chatbot_acessibilidade.core.saida_estruturada import RefatoracaoCodigo
+
 
-# Modelo rápido e capaz de raciocínio complexo
-NOME_MODELO_ADK = "gemini-2.5-flash"
+def configurar_modelo(tipo: str) -> Dict[str, Any]:
+    """
+    Modelo e configuração de geração de um agente, lidos de settings.agent_config.
+
+    Args:
+        tipo: Nome do agente (assistente, validador, ...)
+
+    Returns:
+        Argumentos `model`, `generate_content_config`, `before_model_callback`
+        (instruções via cache de contexto) e `on_model_error_callback` (descarta
+        handles recusados pela API) do Agent
+    """
+    config = settings.agent_config(tipo)
+    thinking = (
+        types.ThinkingConfig(thinking_budget=config.thinking_budget)
+        if config.thinking_budget is not None
+        else None
+    )
+    return {
+        "model": config.model,
+        "generate_content_config": types.GenerateContentConfig(
+            max_output_tokens=config.max_output_tokens,
+            temperature=config.temperature,
+            thinking_config=thinking,
+        ),
+        "before_model_callback": usar_cache_de_contexto,
+        "on_model_error_callback": descartar_cache_invalido,
+    }
 
 
 def criar_agentes():
@@ -23,7 +61,9 @@ def criar_agentes():
     2. validador: Garante segurança técnica e conformidade WCAG 2.2.
     3. revisor: Simplifica a linguagem (linguagem inclusiva).
     4. testador: Cria roteiros de QA (Desktop + Mobile).
-    5. aprofundador: Busca referências externas confiáveis.
+    5. aprofundador: Busca referências confiáveis na base local (WCAG/ARIA/WAI).
+    Comandos e modos: refatorador (/refatorar), persona (/simular) e combinado
+    (todas as seções em uma chamada, settings.pipeline_mode="combinado").
     """
 
     return {
@@ -32,8 +72,8 @@ def criar_agentes():
         # ===================================================================
         "assistente": Agent(
             name="assistente_acessibilidade_digital",
-            model=NOME_MODELO_ADK,
-            tools=[google_search],
+            **configurar_modelo("assistente"),
+            tools=[buscar_referencias_acessibilidade],
             instruction="""
 ROLE: Ada, Engenheira Sênior de Front-end e Acessibilidade (HTML/JS Puro).
 CONTEXTO: WCAG 2.2 AA/AAA (preferir AAA quando possível), ARIA 1.2, Desenvolvimento Web Moderno sem Frameworks.
@@ -204,7 +244,7 @@ REGRAS RÍGIDAS:
 - OBRIGATÓRIO: Todos os elementos interativos (botões, inputs, links) e containers principais DEVEM ter `data-testid` em kebab-case (ex: `data-testid="send-message-button"`). Isso é essencial para testes E2E automatizados.
 - Se for componente interativo (Modal, Menu), OBRIGATÓRIO mencionar o gerenciamento de foco (para onde o foco vai ao abrir/fechar). O foco DEVE retornar para um elemento lógico após a interação.
 - NÃO use ARIA se o HTML nativo já fizer a função (ex: não use `role="button"` em `<button>`).
-- SE precisar de dados externos (ex: suporte de browser), use a tool `google_search`.
+- SE precisar citar critério, técnica, padrão ARIA ou suporte de browser, use a tool `buscar_referencias_acessibilidade` (base local).
 - MANTENHA a resposta concisa. Máximo 3 parágrafos de texto corrido.
 - USE o formato de 3 seções (Conceito/Implementação/QA) SEMPRE.
 """,
@@ -214,7 +254,7 @@ REGRAS RÍGIDAS:
         # ===================================================================
         "validador": Agent(
             name="validador_code_review",
-            model=NOME_MODELO_ADK,
+            **configurar_modelo("validador"),
             instruction="""
 ROLE: Auditor Técnico WCAG 2.2 AA/AAA e Code Reviewer. Priorize conformidade AAA quando possível.
 OBJETIVO: Validar a resposta do Assistente procurando erros de sintaxe HTML ou violações de acessibilidade.
@@ -327,7 +367,7 @@ RESTRIÇÕES:
         # ===================================================================
         "revisor": Agent(
             name="revisor_clareza_acessibilidade",
-            model=NOME_MODELO_ADK,
+            **configurar_modelo("revisor"),
             instruction="""
 ROLE: Especialista em Linguagem Simples (Plain Language) e UX Writing.
 OBJETIVO: Garantir que a explicação textual seja compreensível por juniores, mantendo o rigor técnico e usando linguagem inclusiva.
@@ -401,8 +441,8 @@ RESTRIÇÕES:
         # ===================================================================
         "testador": Agent(
             name="planejador_testes_qa",
-            model=NOME_MODELO_ADK,
-            tools=[google_search],
+            **configurar_modelo("testador"),
+            tools=[buscar_referencias_acessibilidade],
             instruction="""
 ROLE: QA Lead Especialista em Acessibilidade.
 OBJETIVO: Criar um roteiro de testes prático para validar o código gerado (Desktop + Mobile).
@@ -503,8 +543,8 @@ RESTRIÇÕES:
         # ===================================================================
         "aprofundador": Agent(
             name="guia_estudos_referencias",
-            model=NOME_MODELO_ADK,
-            tools=[google_search],
+            **configurar_modelo("aprofundador"),
+            tools=[buscar_referencias_acessibilidade],
             instruction="""
 ROLE: Curador Educacional de Conteúdo sobre Acessibilidade.
 OBJETIVO: Listar 3 referências de alta qualidade para quem quer saber mais.
@@ -519,7 +559,7 @@ FONTES PERMITIDAS (White-list):
 
 PROCESSO DE PENSAMENTO (CoT):
 1. Identifique o tópico central (ex: Modais Acessíveis).
-2. Use `google_search` para encontrar a documentação OFICIAL mais recente.
+2. Use `buscar_referencias_acessibilidade` (base local com WCAG 2.2, WAI-ARIA APG, tutoriais WAI e ferramentas) para obter a documentação OFICIAL.
 3. Selecione 1 documentação oficial, 1 tutorial prático e 1 ferramenta.
 
 FORMATO DE SAÍDA:
@@ -579,7 +619,7 @@ Resposta esperada:
    - *Link:* Extensão gratuita para Chrome/Firefox (busque "axe DevTools" na loja de extensões)
 
 RESTRIÇÕES:
-- Use `google_search` para garantir que os links são atuais e funcionam.
+- Use apenas links devolvidos por `buscar_referencias_acessibilidade`; NÃO invente URLs.
 - Priorize conteúdo em Português (PT-BR), mas se o melhor conteúdo for em Inglês, avise.
 - Não recomende cursos pagos caros sem opção gratuita.
 - NÃO adicione mais de 3 recursos (foco em qualidade).
@@ -592,7 +632,8 @@ RESTRIÇÕES:
         # ===================================================================
         "refatorador": Agent(
             name="refatorador_codigo_acessivel",
-            model=NOME_MODELO_ADK,
+            **configurar_modelo("refatorador"),
+            output_schema=RefatoracaoCodigo,
             instruction="""
 ROLE: Especialista em Refatoração de Código para Acessibilidade (WCAG 2.2 AAA).
 OBJETIVO: Analisar snippets de código e reescrevê-los para serem 100% acessíveis e semânticos.
@@ -603,7 +644,8 @@ OUTPUT: Um JSON estrito com a seguinte estrutura:
 {
   "code": "string com o código refatorado completo",
   "explanation": "string com a explicação das mudanças",
-  "wcag_criteria": ["lista", "de", "criterios", "atendidos"]
+  "wcag_criteria": ["lista", "de", "criterios", "atendidos"],
+  "language": "html | css | javascript (linguagem principal do código)"
 }
 
 DIRETRIZES:
@@ -619,7 +661,8 @@ Output:
 {
   "code": "<button type=\"button\" onclick=\"alert('oi')\">Clique</button>",
   "explanation": "Substituído div genérico por tag button semântica para garantir foco e suporte a teclado.",
-  "wcag_criteria": ["2.1.1", "4.1.2"]
+  "wcag_criteria": ["2.1.1", "4.1.2"],
+  "language": "html"
 }
 """,
         ),
@@ -628,7 +671,7 @@ Output:
         # ===================================================================
         "persona": Agent(
             name="simulador_persona_acessibilidade",
-            model=NOME_MODELO_ADK,
+            **configurar_modelo("persona"),
             instruction="""
 ROLE: Simulador de Experiência de Usuário com Deficiência (Persona).
 OBJETIVO: Simular como uma pessoa com deficiência específica interagiria com um conteúdo ou responderia a uma pergunta, focando nas barreiras encontradas.
@@ -652,6 +695,48 @@ FORMATO:
 "Olá, sou [Nome], tenho [Deficiência].
 Ao tentar acessar isso... [Relato da experiência].
 O que me ajudaria seria... [Sugestão]."
+""",
+        ),
+        # ===================================================================
+        # AGENTE 8: RESPOSTA COMBINADA (Modo de uma chamada)
+        # ===================================================================
+        "combinado": Agent(
+            name="assistente_resposta_combinada",
+            **configurar_modelo("combinado"),
+            output_schema=RespostaCombinada,
+            instruction="""
+ROLE: Ada, Engenheira Sênior de Front-end e Acessibilidade (HTML/JS Puro), revisora técnica, especialista em Linguagem Simples e QA Lead.
+CONTEXTO: WCAG 2.2 AA/AAA (preferir AAA quando possível), ARIA 1.2, HTML5 semântico e Vanilla JS.
+OBJETIVO: Responder a pergunta com TODAS as seções de uma vez, já validadas e em linguagem simples.
+
+INPUT:
+- Pergunta do usuário.
+- Referências da base local (título, fonte e link).
+
+OUTPUT: Um JSON estrito com as chaves abaixo (sem texto fora do JSON, sem bloco ```json):
+{
+  "introducao": "1 parágrafo curto respondendo diretamente a pergunta",
+  "conceitos": "Markdown com ### 💡 Conceito, ### 💻 Implementação e > **Critério:** WCAG 2.2 – [Número e Nome]",
+  "testes": "Markdown com 1. Teste Automático, 2. Teste Manual (Teclado Desktop) e 3. Teste Mobile (Touch)",
+  "aprofundar": "Markdown com até 3 referências: título, fonte, link e por que ler"
+}
+
+REGRAS DE CONTEÚDO:
+- PRIORIZE HTML Semântico. Use ARIA apenas como último recurso; nunca `role="button"` em `<button>`.
+- Prefira `addEventListener` a `onclick` inline.
+- OBRIGATÓRIO: elementos interativos e containers principais com `data-testid` em kebab-case.
+- Componentes interativos (Modal, Menu): explique para onde o foco vai ao abrir e fechar.
+- Nunca remova `outline` sem `:focus-visible` alternativo. Contraste mínimo 4.5:1 (AA), 7:1 (AAA).
+- Touch targets de pelo menos 44x44px CSS nos testes mobile.
+
+REGRAS DE LINGUAGEM:
+- Frases de até 25 palavras, voz ativa, analogias do dia a dia.
+- Linguagem inclusiva: "pessoa que usa leitor de tela", "selecione o link", "consulte a imagem".
+- Não altere nomes de atributos nem números de critérios WCAG.
+
+REGRAS DE REFERÊNCIAS:
+- Use APENAS links das referências da base local recebidas no input; NÃO invente URLs.
+- Selecione 1 documentação oficial, 1 tutorial ou padrão e 1 ferramenta quando houver.
 """,
         ),
     }
@@ -2,9 +2,32 @@
 Configuração centralizada do projeto usando Pydantic Settings
 """
 
-from typing import List
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, field_validator
+from pydantic import BaseModel, Field, field_validator
+
+from chatbot_acessibilidade.core.constants import AGENT_GENERATION_DEFAULTS
+
+
+class AgentConfig(BaseModel):
+    """Modelo, geração e timeout de um agente (None mantém o valor padrão)"""
+
+    model: Optional[str] = Field(default=None, description="Modelo Gemini do agente")
+    max_output_tokens: Optional[int] = Field(
+        default=None, ge=1, description="Limite de tokens gerados por resposta"
+    )
+    temperature: Optional[float] = Field(default=None, ge=0.0, le=2.0)
+    thinking_budget: Optional[int] = Field(
+        default=None,
+        ge=-1,
+        description="Tokens de raciocínio do Gemini 2.5 (0 desliga, -1 dinâmico)",
+    )
+    timeout_seconds: Optional[float] = Field(
+        default=None, gt=0, description="Timeout da chamada ao agente em segundos"
+    )
+    prompt_budget_tokens: Optional[int] = Field(
+        default=None, ge=1, description="Orçamento estimado de tokens do prompt do estágio"
+    )
 
 
 class Settings(BaseSettings):
@@ -43,6 +66,38 @@ class Settings(BaseSettings):
         default=60, description="Timeout para chamadas à API Google em segundos"
     )
 
+    # Agentes
+    agent_model: str = Field(
+        default="gemini-2.5-flash", description="Modelo padrão de todos os agentes"
+    )
+    agent_configs: Dict[str, AgentConfig] = Field(
+        default_factory=dict,
+        description=(
+            "Configuração por agente em JSON (model, max_output_tokens, temperature, "
+            "thinking_budget, timeout_seconds, prompt_budget_tokens), "
+            'ex: {"testador": {"max_output_tokens": 1024}}'
+        ),
+    )
+
+    context_cache_enabled: bool = Field(
+        default=True,
+        description=(
+            "Enviar as instruções fixas dos agentes como cached content do Gemini, "
+            "referenciado por handle (falhas voltam às instruções inline)"
+        ),
+    )
+    context_cache_ttl_seconds: int = Field(
+        default=3600, ge=300, description="TTL do cached content das instruções em segundos"
+    )
+    context_cache_min_tokens: int = Field(
+        default=2048,
+        ge=0,
+        description=(
+            "Tokens estimados mínimos para cachear as instruções de um agente "
+            "(mínimo do cache explícito do Gemini 2.5)"
+        ),
+    )
+
     # Cache
     cache_enabled: bool = Field(default=True, description="Habilitar cache de respostas")
     cache_ttl_seconds: int = Field(
@@ -51,6 +106,115 @@ class Settings(BaseSettings):
     cache_max_size: int = Field(
         default=100, description="Tamanho máximo do cache (número de itens)"
     )
+    cache_policy: str = Field(
+        default="tinylfu",
+        description=(
+            "Política do cache em memória: 'tinylfu' (orçamento em bytes, admissão por "
+            "frequência x custo) ou 'ttl' (TTLCache limitado por número de itens)"
+        ),
+    )
+    cache_max_bytes: int = Field(
+        default=8 * 1024 * 1024,
+        description="Orçamento de memória do cache com política 'tinylfu' (bytes)",
+    )
+    cache_compression: str = Field(
+        default="zlib",
+        description=(
+            "Compressão das respostas no backend 'memory': 'zlib', 'zstd' (requer "
+            "zstandard) ou 'none'. O dicionário é treinado no corpus de warm-up"
+        ),
+    )
+    cache_semantic_enabled: bool = Field(
+        default=True,
+        description="Reaproveitar respostas de perguntas cacheadas reformuladas (BM25/TF-IDF)",
+    )
+    cache_semantic_threshold: float = Field(
+        default=0.8,
+        ge=0.0,
+        le=1.0,
+        description="Similaridade mínima (0.0 a 1.0) para a busca semântica no cache",
+    )
+    faq_enabled: bool = Field(
+        default=True,
+        description="Responder perguntas frequentes com respostas curadas, sem chamar agentes",
+    )
+    faq_confidence_threshold: float = Field(
+        default=0.75,
+        ge=0.0,
+        le=1.0,
+        description="Confiança mínima (0.0 a 1.0) para usar uma resposta curada da FAQ",
+    )
+
+    # Roteamento por complexidade
+    router_enabled: bool = Field(
+        default=True,
+        description="Escolher modelos e estágios do pipeline pela complexidade da pergunta",
+    )
+    router_lite_model: str = Field(
+        default="gemini-2.5-flash-lite",
+        description="Modelo leve usado nos estágios de router_lite_stages (perguntas não complexas)",
+    )
+    router_lite_stages: str = Field(
+        default="validador,revisor,testador",
+        description="Estágios que usam o modelo leve em perguntas simples e padrão (vírgulas)",
+    )
+    router_simple_skip_stages: str = Field(
+        default="validador",
+        description="Estágios pulados em perguntas simples (vírgulas; vazio executa todos)",
+    )
+    router_simple_max_score: int = Field(
+        default=0, description="Pontuação máxima de uma pergunta simples"
+    )
+    router_complex_min_score: int = Field(
+        default=3, description="Pontuação mínima de uma pergunta complexa"
+    )
+
+    # Modo do pipeline
+    pipeline_mode: str = Field(
+        default="multi",
+        description=(
+            "'multi' (Assistente → Validador → Revisor + Testador/Aprofundador) ou "
+            "'combinado' (uma chamada com todas as seções em JSON; respostas "
+            "inválidas voltam ao modo multi)"
+        ),
+    )
+    cache_backend: str = Field(
+        default="memory",
+        description=(
+            "Armazenamento do cache: 'memory' (por worker), 'shared' (memória "
+            "compartilhada entre os workers do host), 'disk' ou 'redis' (compartilhado "
+            "entre pods)"
+        ),
+    )
+    cache_shared_path: str = Field(
+        default="",
+        description=(
+            "Prefixo do arquivo do segmento compartilhado, completado com o layout "
+            "(vazio usa /dev/shm/ada-answer-cache)"
+        ),
+    )
+    cache_disk_dir: str = Field(
+        default="data/cache",
+        description="Diretório do cache em disco (relativo à raiz do projeto)",
+    )
+    cache_redis_url: str = Field(
+        default="redis://localhost:6379/0",
+        description="URL do servidor Redis (ou compatível) para cache_backend='redis'",
+    )
+    cache_warmup_enabled: bool = Field(
+        default=True, description="Pré-carregar o cache no startup a partir do corpus"
+    )
+    cache_corpus_file: str = Field(
+        default="data/cache_corpus.json",
+        description="Corpus de respostas pré-computadas (relativo à raiz do projeto)",
+    )
+    cache_snapshot_file: str = Field(
+        default="",
+        description=(
+            "Arquivo onde o cache é salvo no shutdown e recarregado no startup "
+            "(vazio desabilita a persistência)"
+        ),
+    )
 
     # Logging
     log_level: str = Field(
@@ -65,6 +229,13 @@ class Settings(BaseSettings):
     security_headers_enabled: bool = Field(
         default=True, description="Habilitar headers de segurança HTTP"
     )
+    admin_api_token: str = Field(
+        default="",
+        description=(
+            "Token exigido no header X-Admin-Token dos endpoints /api/admin "
+            "(vazio desabilita os endpoints)"
+        ),
+    )
     csp_policy: str = Field(
         default="",
         description="Política CSP customizada (vazio usa padrão). Exemplo: default-src 'self'",
@@ -72,7 +243,23 @@ class Settings(BaseSettings):
 
     # Performance
     compression_enabled: bool = Field(
-        default=True, description="Habilitar compressão gzip de respostas"
+        default=True, description="Habilitar compressão (brotli/zstd/gzip) de respostas"
+    )
+    frontend_dir: str = Field(
+        default="",
+        description=(
+            "Diretório do frontend servido em /static, relativo à raiz do projeto "
+            "(vazio usa frontend/; use build/ após scripts/build_assets.sh)"
+        ),
+    )
+
+    # Startup
+    startup_warmup_enabled: bool = Field(
+        default=True,
+        description=(
+            "Importar o ADK/genai e criar os agentes em segundo plano no startup "
+            "(False: tudo é carregado na primeira pergunta)"
+        ),
     )
 
     model_config = SettingsConfigDict(
@@ -90,6 +277,80 @@ class Settings(BaseSettings):
         # Filtra strings vazias após split
         return [origin.strip() for origin in v.split(",") if origin.strip()]
 
+    @field_validator("router_lite_stages", "router_simple_skip_stages")
+    @classmethod
+    def parse_router_stages(cls, v: str) -> List[str]:
+        """Converte a lista de estágios separados por vírgula"""
+        valid_stages = ["validador", "revisor", "testador", "aprofundador"]
+        stages = [stage.strip().lower() for stage in v.split(",") if stage.strip()]
+        invalid = [stage for stage in stages if stage not in valid_stages]
+        if invalid:
+            raise ValueError(f"Estágios inválidos: {', '.join(invalid)}")
+        return stages
+
+    @field_validator("agent_configs")
+    @classmethod
+    def validate_agent_configs(cls, v: Dict[str, AgentConfig]) -> Dict[str, AgentConfig]:
+        """Valida os nomes dos agentes configurados"""
+        invalid = [tipo for tipo in v if tipo not in AGENT_GENERATION_DEFAULTS]
+        if invalid:
+            raise ValueError(f"Agentes inválidos: {', '.join(invalid)}")
+        return v
+
+    def agent_config(self, tipo: str) -> AgentConfig:
+        """
+        Configuração efetiva de um agente.
+
+        Ordem de precedência: agent_configs[tipo], AGENT_GENERATION_DEFAULTS[tipo],
+        agent_model/api_timeout_seconds.
+        """
+        valores = {"model": self.agent_model, "timeout_seconds": self.api_timeout_seconds}
+        valores.update(AGENT_GENERATION_DEFAULTS.get(tipo, {}))
+        override = self.agent_configs.get(tipo)
+        if override is not None:
+            valores.update(override.model_dump(exclude_none=True))
+        return AgentConfig(**valores)
+
+    @field_validator("pipeline_mode")
+    @classmethod
+    def validate_pipeline_mode(cls, v: str) -> str:
+        """Valida o modo do pipeline"""
+        valid_modes = ["multi", "combinado"]
+        v_lower = v.lower()
+        if v_lower not in valid_modes:
+            raise ValueError(f"pipeline_mode deve ser um de: {', '.join(valid_modes)}")
+        return v_lower
+
+    @field_validator("cache_policy")
+    @classmethod
+    def validate_cache_policy(cls, v: str) -> str:
+        """Valida a política do cache em memória"""
+        valid_policies = ["tinylfu", "ttl"]
+        v_lower = v.lower()
+        if v_lower not in valid_policies:
+            raise ValueError(f"cache_policy deve ser um de: {', '.join(valid_policies)}")
+        return v_lower
+
+    @field_validator("cache_compression")
+    @classmethod
+    def validate_cache_compression(cls, v: str) -> str:
+        """Valida o algoritmo de compressão do cache"""
+        valid_algorithms = ["zlib", "zstd", "none"]
+        v_lower = v.lower()
+        if v_lower not in valid_algorithms:
+            raise ValueError(f"cache_compression deve ser um de: {', '.join(valid_algorithms)}")
+        return v_lower
+
+    @field_validator("cache_backend")
+    @classmethod
+    def validate_cache_backend(cls, v: str) -> str:
+        """Valida o armazenamento do cache"""
+        valid_backends = ["memory", "shared", "disk", "redis"]
+        v_lower = v.lower()
+        if v_lower not in valid_backends:
+            raise ValueError(f"cache_backend deve ser um de: {', '.join(valid_backends)}")
+        return v_lower
+
     @field_validator("log_level")
     @classmethod
     def validate_log_level(cls, v: str) -> str:
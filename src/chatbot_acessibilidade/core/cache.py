@@ -1,32 +1,73 @@
 """
 Módulo de cache para respostas do chatbot
+
+As funções públicas são assíncronas e usam o CacheBackend escolhido em
+settings.cache_backend (memory, shared, disk ou redis). Falhas do backend
+nunca derrubam a requisição: viram cache miss.
 """
 
 import hashlib
 import logging
-from typing import Optional, Dict, Any, List, Tuple
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Union
 from difflib import SequenceMatcher
 from cachetools import TTLCache
 
 from chatbot_acessibilidade.config import settings
+from chatbot_acessibilidade.core.cache_backends import (
+    CacheBackend,
+    DiskCacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    SizedTTLCache,
+)
+from chatbot_acessibilidade.core.cache_codec import CacheCodec, create_codec
+from chatbot_acessibilidade.core.comandos import resolver_comando
 from chatbot_acessibilidade.core.constants import (
+    CACHE_CORPUS_FILE,
+    CACHE_DISK_DIR,
+    CACHE_INVALIDATION_THRESHOLD,
+    CACHE_MAX_BYTES,
     CACHE_MAX_SIZE,
+    CACHE_QUESTION_FIELD,
+    CACHE_SEMANTIC_CANDIDATES,
+    CACHE_SEMANTIC_THRESHOLD,
+    CACHE_SHARED_FILE_NAME,
     CACHE_TTL_SECONDS,
     LogMessages,
 )
+from chatbot_acessibilidade.core.exceptions import CacheBackendError
+from chatbot_acessibilidade.core.minhash import jaccard, shingles
+from chatbot_acessibilidade.core.semantic_index import QuestionIndex, tokenize
+from chatbot_acessibilidade.core.shared_cache import SharedMemoryCache, default_shared_path
+from chatbot_acessibilidade.core.tinylfu import TinyLFUCache
 
 logger = logging.getLogger(__name__)
 
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
 # Cache global (inicializado quando necessário)
-_cache: Optional[TTLCache] = None
+_cache: Optional[Union[TTLCache, TinyLFUCache, SharedMemoryCache]] = None
+# Backends externos (disk/redis), criados uma vez por processo
+_backend: Optional[CacheBackend] = None
+# Compressão dos valores do backend memory (criada uma vez por processo)
+_codec: Optional[CacheCodec] = None
+_codec_loaded = False
+# Texto das perguntas cacheadas por este processo (busca por similaridade)
+_index: Optional[QuestionIndex] = None
 
 
-def get_cache() -> Optional[TTLCache]:
+def get_cache() -> Optional[Union[TTLCache, TinyLFUCache, SharedMemoryCache]]:
     """
-    Retorna a instância do cache, criando se necessário.
+    Retorna o armazenamento em memória do processo, criando se necessário.
+
+    Com cache_backend="shared" o cache fica em memória compartilhada e é o
+    mesmo para todos os workers do host. No backend memory, cache_policy
+    escolhe entre TinyLFUCache (orçamento em bytes) e TTLCache (nº de itens).
+    Usado pelos backends memory/shared.
 
     Returns:
-        Instância do TTLCache ou None se cache desabilitado
+        Instância do TTLCache/TinyLFUCache/SharedMemoryCache ou None se cache desabilitado
     """
     global _cache
 
@@ -36,94 +77,249 @@ def get_cache() -> Optional[TTLCache]:
     if _cache is None:
         max_size = getattr(settings, "cache_max_size", CACHE_MAX_SIZE)
         ttl = getattr(settings, "cache_ttl_seconds", CACHE_TTL_SECONDS)
-        _cache = TTLCache(maxsize=max_size, ttl=ttl)
+        if getattr(settings, "cache_backend", "memory") == "shared":
+            path = getattr(settings, "cache_shared_path", "") or default_shared_path(
+                CACHE_SHARED_FILE_NAME
+            )
+            _cache = SharedMemoryCache(path, maxsize=max_size, ttl=ttl)
+        elif getattr(settings, "cache_policy", "ttl") == "tinylfu":
+            max_size = getattr(settings, "cache_max_bytes", CACHE_MAX_BYTES)
+            _cache = TinyLFUCache(max_bytes=max_size, ttl=ttl)
+        else:
+            _cache = SizedTTLCache(maxsize=max_size, ttl=ttl)
         logger.info(LogMessages.CACHE_INITIALIZED.format(max_size=max_size, ttl=ttl))
 
     return _cache
 
 
-def get_cache_key(pergunta: str) -> str:
+def get_cache_codec() -> Optional[CacheCodec]:
+    """
+    Retorna o codec de settings.cache_compression, criando se necessário.
+
+    O dicionário é treinado nas respostas do corpus de warm-up
+    (settings.cache_corpus_file), quando ele existe.
+
+    Returns:
+        CacheCodec ou None se a compressão estiver desabilitada
+    """
+    global _codec, _codec_loaded
+
+    if not _codec_loaded:
+        algorithm = getattr(settings, "cache_compression", "none")
+        corpus = getattr(settings, "cache_corpus_file", CACHE_CORPUS_FILE)
+        corpus_path = Path(corpus) if isinstance(corpus, str) and corpus else None
+        if corpus_path is not None and not corpus_path.is_absolute():
+            corpus_path = PROJECT_ROOT / corpus_path
+        _codec = create_codec(algorithm, corpus_path)
+        _codec_loaded = True
+    return _codec
+
+
+def get_cache_backend() -> Optional[CacheBackend]:
+    """
+    Retorna o backend do cache configurado em settings.cache_backend.
+
+    Returns:
+        CacheBackend ou None se cache desabilitado
+    """
+    global _backend
+
+    if not getattr(settings, "cache_enabled", True):
+        return None
+
+    tipo = getattr(settings, "cache_backend", "memory")
+    if tipo in ("disk", "redis"):
+        if _backend is None:
+            max_size = getattr(settings, "cache_max_size", CACHE_MAX_SIZE)
+            ttl = getattr(settings, "cache_ttl_seconds", CACHE_TTL_SECONDS)
+            if tipo == "disk":
+                directory = Path(getattr(settings, "cache_disk_dir", "") or CACHE_DISK_DIR)
+                if not directory.is_absolute():
+                    directory = PROJECT_ROOT / directory
+                _backend = DiskCacheBackend(directory, max_size=max_size, ttl=ttl)
+            else:
+                _backend = RedisCacheBackend(settings.cache_redis_url, ttl=ttl, max_size=max_size)
+            logger.info(LogMessages.CACHE_BACKEND_SELECTED.format(backend=tipo))
+        return _backend
+
+    # memory/shared: o adaptador é leve e segue o armazenamento atual do processo
+    cache = get_cache()
+    if cache is None:
+        return None
+    if tipo == "shared":
+        # O segmento compartilhado guarda JSON em slots de tamanho fixo
+        return MemoryCacheBackend(cache, name="shared")
+    return MemoryCacheBackend(cache, name="memory", codec=get_cache_codec())
+
+
+def get_question_index() -> QuestionIndex:
+    """
+    Retorna o índice das perguntas cacheadas, criando se necessário.
+
+    Returns:
+        QuestionIndex do processo
+    """
+    global _index
+
+    if _index is None:
+        _index = QuestionIndex()
+    return _index
+
+
+def get_cache_key(pergunta: str, namespace: str = "") -> str:
     """
     Gera uma chave de cache normalizada a partir da pergunta.
 
     Args:
-        pergunta: Pergunta do usuário
+        pergunta: Pergunta do usuário (ou chave canônica de um comando)
+        namespace: Namespace do comando (vazio para perguntas comuns)
 
     Returns:
-        Hash MD5 da pergunta normalizada
+        Hash MD5 da pergunta normalizada (chaves de comando entram como recebidas)
     """
-    # Normaliza a pergunta (casefold, strip, remove espaços extras)
-    pergunta_normalizada = " ".join(pergunta.casefold().strip().split())
+    if namespace:
+        # Chave canônica do comando: a normalização é da função de chave do comando
+        # (o código do /refatorar diferencia maiúsculas e espaços)
+        pergunta_normalizada = f"{namespace}\0{pergunta}"
+    else:
+        # Normaliza a pergunta (casefold, strip, remove espaços extras)
+        pergunta_normalizada = " ".join(pergunta.casefold().strip().split())
     return hashlib.md5(pergunta_normalizada.encode("utf-8")).hexdigest()
 
 
-def get_cached_response(pergunta: str) -> Optional[Dict[str, Any]]:
+def anexar_pergunta(resposta: Dict[str, Any], pergunta: str) -> Dict[str, Any]:
+    """
+    Valor armazenado: a resposta com o texto da pergunta (campo reservado).
+
+    Com a pergunta no próprio backend, qualquer worker ou réplica encontra as
+    reformulações cacheadas pelos outros (invalidação por similaridade).
+    """
+    return {**resposta, CACHE_QUESTION_FIELD: pergunta}
+
+
+def separar_pergunta(valor: Any) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    Separa a resposta e a pergunta de um valor lido do backend.
+
+    Returns:
+        (resposta sem o campo reservado ou None se o valor não for um dicionário,
+        pergunta ou "" se o valor não a guardar)
+    """
+    if not isinstance(valor, dict):
+        return None, ""
+    if CACHE_QUESTION_FIELD not in valor:
+        return valor, ""
+    resposta = dict(valor)
+    return resposta, str(resposta.pop(CACHE_QUESTION_FIELD))
+
+
+async def get_cached_response(pergunta: str, namespace: str = "") -> Optional[Dict[str, Any]]:
     """
     Busca uma resposta no cache.
 
     Args:
         pergunta: Pergunta do usuário
+        namespace: Namespace do comando (vazio para perguntas comuns)
 
     Returns:
-        Resposta em cache ou None se não encontrada
+        Resposta em cache ou None se não encontrada (ou backend indisponível)
     """
-    cache = get_cache()
-    if cache is None:
+    backend = get_cache_backend()
+    if backend is None:
         return None
 
-    key = get_cache_key(pergunta)
-    resposta = cache.get(key)
+    key = get_cache_key(pergunta, namespace)
+    try:
+        resposta = await backend.get(key)
+    except CacheBackendError as e:
+        logger.warning(LogMessages.CACHE_BACKEND_ERROR.format(operation="get", error=e))
+        return None
 
     if resposta is not None:
         logger.debug(LogMessages.CACHE_HIT.format(pergunta=pergunta[:50]))
         # Garante que retorna dict[str, Any] ou None
-        if isinstance(resposta, dict):
-            return resposta
-        return None
+        return separar_pergunta(resposta)[0]
 
     logger.debug(LogMessages.CACHE_MISS.format(pergunta=pergunta[:50]))
     return None
 
 
-def set_cached_response(pergunta: str, resposta: Dict[str, Any]) -> None:
+async def set_cached_response(
+    pergunta: str, resposta: Dict[str, Any], cost: Optional[float] = None, namespace: str = ""
+) -> None:
     """
     Armazena uma resposta no cache.
 
     Args:
         pergunta: Pergunta do usuário
         resposta: Resposta a ser cacheada
+        cost: Segundos de pipeline gastos para gerar a resposta (peso na
+            admissão da política tinylfu)
+        namespace: Namespace do comando; respostas de comandos (com ou sem
+            namespace) não entram no índice da busca semântica nem guardam a
+            pergunta
     """
-    cache = get_cache()
-    if cache is None:
+    backend = get_cache_backend()
+    if backend is None:
         return
 
-    key = get_cache_key(pergunta)
-    cache[key] = resposta
+    key = get_cache_key(pergunta, namespace)
+    indexar = not namespace and resolver_comando(pergunta) is None
+    try:
+        await backend.set(
+            key, anexar_pergunta(resposta, pergunta) if indexar else resposta, cost=cost
+        )
+    except CacheBackendError as e:
+        logger.warning(LogMessages.CACHE_BACKEND_ERROR.format(operation="set", error=e))
+        return
+    if indexar:
+        get_question_index().add(key, pergunta)
     logger.debug(LogMessages.CACHE_CACHED.format(pergunta=pergunta[:50]))
 
 
-def clear_cache() -> None:
+async def clear_cache() -> None:
     """
     Limpa todo o cache.
     """
-    global _cache
-    if _cache is not None:
-        _cache.clear()
-        logger.info(LogMessages.CACHE_CLEARED)
+    backend = get_cache_backend()
+    if backend is None:
+        return
+    try:
+        await backend.clear()
+    except CacheBackendError as e:
+        logger.warning(LogMessages.CACHE_BACKEND_ERROR.format(operation="clear", error=e))
+        return
+    get_question_index().clear()
+    logger.info(LogMessages.CACHE_CLEARED)
 
 
-def get_cache_stats() -> Dict[str, Any]:
+async def get_cache_stats() -> Dict[str, Any]:
     """
     Retorna estatísticas do cache.
 
     Returns:
         Dicionário com estatísticas do cache
     """
-    cache = get_cache()
-    if cache is None:
+    backend = get_cache_backend()
+    if backend is None:
         return {"enabled": False, "size": 0, "max_size": 0, "ttl": 0}
 
-    return {"enabled": True, "size": len(cache), "max_size": cache.maxsize, "ttl": cache.ttl}
+    try:
+        stats = await backend.stats()
+    except CacheBackendError as e:
+        logger.warning(LogMessages.CACHE_BACKEND_ERROR.format(operation="stats", error=e))
+        return {"enabled": True, "backend": backend.name, "available": False}
+    return {"enabled": True, **stats}
+
+
+def reset_cache_backend() -> None:
+    """Descarta o cache e o backend atuais (útil para testes e troca de configuração)"""
+    global _cache, _backend, _codec, _codec_loaded, _index
+    _cache = None
+    _backend = None
+    _index = None
+    _codec = None
+    _codec_loaded = False
 
 
 def calculate_similarity(text1: str, text2: str) -> float:
@@ -144,96 +340,182 @@ def calculate_similarity(text1: str, text2: str) -> float:
     return SequenceMatcher(None, normalized1, normalized2).ratio()
 
 
-def find_similar_questions(
-    pergunta: str, threshold: float = 0.8
+async def find_similar_questions(
+    pergunta: str, threshold: Optional[float] = None
 ) -> List[Tuple[str, float, Dict[str, Any]]]:
     """
-    Encontra perguntas similares no cache.
+    Encontra perguntas similares no cache (índice BM25/TF-IDF das perguntas).
+
+    Entradas que já saíram do backend (expiradas ou removidas) são retiradas
+    do índice durante a busca.
 
     Args:
         pergunta: Pergunta a ser comparada
-        threshold: Limiar de similaridade (0.0 a 1.0). Padrão: 0.8 (80%)
+        threshold: Limiar de similaridade (0.0 a 1.0). Padrão:
+            settings.cache_semantic_threshold
 
     Returns:
         Lista de tuplas (pergunta_original, similaridade, resposta) ordenada por similaridade
     """
-    cache = get_cache()
-    if cache is None:
+    backend = get_cache_backend()
+    if backend is None:
         return []
+    if threshold is None:
+        threshold = getattr(settings, "cache_semantic_threshold", CACHE_SEMANTIC_THRESHOLD)
 
+    index = get_question_index()
     similar: List[Tuple[str, float, Dict[str, Any]]] = []
-
-    # Itera sobre todas as entradas do cache
-    # Nota: TTLCache não expõe diretamente as chaves, então precisamos
-    # manter um registro das perguntas originais ou usar uma abordagem diferente
-    # Por limitação do TTLCache, vamos usar uma heurística baseada na chave
-    # Para uma implementação completa, seria necessário manter um índice separado
-
-    # Por enquanto, retornamos lista vazia pois TTLCache não permite iteração direta
-    # Uma implementação completa exigiria um cache customizado ou estrutura adicional
-    logger.debug(f"Buscando perguntas similares a: {pergunta[:50]}...")
+    for key, original, similaridade in index.search(pergunta, limit=CACHE_SEMANTIC_CANDIDATES):
+        if similaridade < threshold:
+            logger.debug(
+                LogMessages.CACHE_SEMANTIC_BELOW_THRESHOLD.format(
+                    score=similaridade,
+                    threshold=threshold,
+                    pergunta=pergunta[:50],
+                    original=original[:50],
+                )
+            )
+            continue
+        try:
+            resposta, _pergunta = separar_pergunta(await backend.get(key))
+        except CacheBackendError as e:
+            logger.warning(LogMessages.CACHE_BACKEND_ERROR.format(operation="get", error=e))
+            return similar
+        if resposta is not None:
+            similar.append((original, similaridade, resposta))
+        else:
+            index.remove(key)
 
     return similar
 
 
-def invalidate_similar_cache(pergunta: str, threshold: float = 0.95) -> int:
+async def invalidate_similar_cache(
+    pergunta: str, threshold: float = CACHE_INVALIDATION_THRESHOLD, dry_run: bool = False
+) -> List[str]:
     """
     Invalida entradas do cache que são muito similares à pergunta fornecida.
-    Útil para evitar respostas obsoletas quando uma pergunta muito similar é feita.
+    Útil para atualizar todas as reformulações de uma resposta quando a
+    orientação muda, sem limpar o cache inteiro.
+
+    A similaridade é o Jaccard dos termos normalizados. No backend memory
+    (um cache por worker) as candidatas vêm do LSH do índice de perguntas do
+    processo (sublinear), que conhece todas as entradas do worker. Nos
+    backends compartilhados (shared, disk, redis) as entradas de outros
+    workers e réplicas não estão no índice local: as perguntas são lidas do
+    próprio backend, guardadas junto de cada resposta (varredura completa).
 
     Args:
         pergunta: Pergunta que pode invalidar entradas similares
         threshold: Limiar de similaridade para invalidação (0.0 a 1.0). Padrão: 0.95 (95%)
+        dry_run: Apenas lista as perguntas que seriam invalidadas
 
     Returns:
-        Número de entradas invalidadas
+        Perguntas originais das entradas invalidadas (ou que seriam invalidadas)
     """
-    cache = get_cache()
-    if cache is None:
-        return 0
-
-    # Por limitação do TTLCache, não podemos iterar diretamente sobre as chaves
-    # Uma implementação completa exigiria manter um índice separado das perguntas
-    # Por enquanto, apenas logamos a intenção
-    logger.debug(
-        f"Tentativa de invalidar cache para perguntas similares a: {pergunta[:50]}... "
-        f"(threshold: {threshold})"
-    )
+    backend = get_cache_backend()
+    if backend is None:
+        return []
 
-    # Retorna 0 pois não podemos invalidar sem acesso direto às chaves
-    # Em produção, considere usar um cache que permita iteração (ex: Redis com SCAN)
-    return 0
+    index = get_question_index()
+    if backend.name == "memory":
+        candidatas = index.find_near_duplicates(pergunta, threshold)
+    else:
+        try:
+            candidatas = await _near_duplicates_no_backend(backend, pergunta, threshold)
+        except CacheBackendError as e:
+            logger.warning(LogMessages.CACHE_BACKEND_ERROR.format(operation="scan", error=e))
+            return []
+
+    invalidadas: List[str] = []
+    for key, original, _similaridade in candidatas:
+        if not dry_run:
+            try:
+                await backend.delete(key)
+            except CacheBackendError as e:
+                logger.warning(LogMessages.CACHE_BACKEND_ERROR.format(operation="delete", error=e))
+                break
+            index.remove(key)
+        invalidadas.append(original)
+
+    logger.info(
+        LogMessages.CACHE_INVALIDATED_SIMILAR.format(
+            count=len(invalidadas), pergunta=pergunta[:50], threshold=threshold, dry_run=dry_run
+        )
+    )
+    return invalidadas
 
 
-def get_cached_response_with_similarity(
-    pergunta: str, similarity_threshold: float = 0.9
+async def _near_duplicates_no_backend(
+    backend: CacheBackend, pergunta: str, threshold: float
+) -> List[Tuple[str, str, float]]:
+    """Quase duplicatas entre as perguntas guardadas no backend (chave, pergunta, Jaccard)"""
+    alvo = shingles(tokenize(pergunta))
+    if not alvo:
+        return []
+    keys = await backend.scan()
+    logger.info(LogMessages.CACHE_INVALIDATION_SCAN.format(backend=backend.name, count=len(keys)))
+    resultados = []
+    for key in keys:
+        _resposta, original = separar_pergunta(await backend.get(key))
+        if not original:
+            continue
+        similaridade = jaccard(alvo, shingles(tokenize(original)))
+        if similaridade >= threshold:
+            resultados.append((key, original, similaridade))
+    return sorted(resultados, key=lambda item: item[2], reverse=True)
+
+
+async def get_cached_response_with_similarity(
+    pergunta: str, similarity_threshold: Optional[float] = None
 ) -> Optional[Tuple[Dict[str, Any], float]]:
     """
     Busca uma resposta no cache, considerando também perguntas similares.
 
     Args:
         pergunta: Pergunta do usuário
-        similarity_threshold: Limiar de similaridade para aceitar resposta (0.0 a 1.0). Padrão: 0.9
+        similarity_threshold: Limiar de similaridade para aceitar resposta (0.0 a 1.0).
+            Padrão: settings.cache_semantic_threshold
 
     Returns:
         Tupla (resposta, similaridade) se encontrada, ou None
     """
     # Primeiro tenta busca exata
-    resposta_exata = get_cached_response(pergunta)
+    resposta_exata = await get_cached_response(pergunta)
     if resposta_exata is not None:
         return (resposta_exata, 1.0)
 
-    # Depois tenta buscar perguntas similares
-    # Por limitação do TTLCache, não podemos implementar isso completamente
-    # sem uma estrutura adicional de índice
-    similar = find_similar_questions(pergunta, threshold=similarity_threshold)
+    return await get_similar_cached_response(pergunta, similarity_threshold)
 
-    if similar:
-        # Retorna a mais similar
-        pergunta_original, similaridade, resposta = similar[0]
-        logger.debug(
-            f"Cache hit com similaridade {similaridade:.2%} para pergunta similar: {pergunta_original[:50]}..."
-        )
-        return (resposta, similaridade)
 
-    return None
+async def get_similar_cached_response(
+    pergunta: str, similarity_threshold: Optional[float] = None
+) -> Optional[Tuple[Dict[str, Any], float]]:
+    """
+    Busca a resposta da pergunta cacheada mais parecida (sem a busca exata).
+
+    Todo hit semântico é registrado em log (pergunta, pergunta original e
+    similaridade) para auditoria do limiar. Comandos (/simular, /refatorar)
+    nunca são respondidos por similaridade: uma persona ou um trecho de código
+    parecido não é a mesma pergunta.
+
+    Args:
+        pergunta: Pergunta do usuário
+        similarity_threshold: Limiar de similaridade (padrão: settings.cache_semantic_threshold)
+
+    Returns:
+        Tupla (resposta, similaridade) se encontrada, ou None
+    """
+    if resolver_comando(pergunta) is not None:
+        return None
+    similar = await find_similar_questions(pergunta, threshold=similarity_threshold)
+    if not similar:
+        return None
+
+    # Retorna a mais similar
+    pergunta_original, similaridade, resposta = similar[0]
+    logger.info(
+        LogMessages.CACHE_SEMANTIC_HIT.format(
+            score=similaridade, pergunta=pergunta[:50], original=pergunta_original[:50]
+        )
+    )
+    return (resposta, similaridade)
@@ -0,0 +1,519 @@
+"""
+Backends de armazenamento do cache de respostas
+
+O cache.py fala apenas com o protocolo CacheBackend; o armazenamento é
+escolhido por settings.cache_backend:
+
+- memory: TTLCache por worker (padrão)
+- shared: memória compartilhada entre os workers do host (shared_cache.py)
+- disk: um arquivo JSON por entrada, sobrevive a reinícios
+- redis: qualquer servidor que fale o protocolo do Redis (RESP), compartilhado
+  por todos os pods do cluster
+
+O cliente Redis é mínimo (GET/SET/DEL/SCAN/DBSIZE) e não depende do redis-py.
+"""
+
+import asyncio
+import fnmatch
+import hashlib
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    List,
+    MutableMapping,
+    Optional,
+    Protocol,
+    Tuple,
+    runtime_checkable,
+)
+from urllib.parse import unquote, urlparse
+
+from cachetools import Cache, TTLCache
+
+from chatbot_acessibilidade.core.cache_codec import CacheCodec, value_sizes
+from chatbot_acessibilidade.core.constants import (
+    CACHE_REDIS_KEY_PREFIX,
+    CACHE_REDIS_SCAN_COUNT,
+    CACHE_REDIS_TIMEOUT_SECONDS,
+    ErrorMessages,
+)
+from chatbot_acessibilidade.core.exceptions import CacheBackendError
+
+
+@runtime_checkable
+class CacheBackend(Protocol):
+    """Interface assíncrona comum a todos os armazenamentos do cache"""
+
+    name: str
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Retorna o valor da chave ou None (ausente ou expirado)"""
+        ...
+
+    async def set(self, key: str, value: Dict[str, Any], cost: Optional[float] = None) -> None:
+        """Armazena o valor com o TTL do backend (cost: segundos gastos para gerá-lo)"""
+        ...
+
+    async def delete(self, key: str) -> bool:
+        """Remove a chave; True se ela existia"""
+        ...
+
+    async def scan(self, match: str = "*") -> List[str]:
+        """Lista as chaves válidas que casam com o padrão (glob)"""
+        ...
+
+    async def clear(self) -> None:
+        """Remove todas as entradas do cache"""
+        ...
+
+    async def stats(self) -> Dict[str, Any]:
+        """Retorna backend, size, max_size e ttl"""
+        ...
+
+
+# =========================================
+# Memória (por worker ou compartilhada)
+# =========================================
+class SizedTTLCache(TTLCache):
+    """
+    TTLCache que mantém os bytes armazenados e os bytes do JSON original.
+
+    Os tamanhos são medidos na inserção e descontados na remoção, expiração
+    ou despejo LRU, então as estatísticas não precisam percorrer as entradas.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._value_sizes: Dict[str, Tuple[int, int]] = {}
+        self.stored_bytes = 0
+        self.raw_bytes = 0
+
+    def _forget(self, key: Any) -> None:
+        stored, raw = self._value_sizes.pop(key, (0, 0))
+        self.stored_bytes -= stored
+        self.raw_bytes -= raw
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        # Pode despejar outras entradas (expire/popitem), descontadas abaixo
+        super().__setitem__(key, value)
+        self._forget(key)
+        stored, raw = self._value_sizes[key] = value_sizes(value)
+        self.stored_bytes += stored
+        self.raw_bytes += raw
+
+    def __delitem__(self, key: Any) -> None:
+        try:
+            super().__delitem__(key)
+        finally:
+            # TTLCache remove a entrada expirada e só então gera KeyError
+            if not Cache.__contains__(self, key):
+                self._forget(key)
+
+    def expire(self, time: Optional[float] = None) -> List[Tuple[Any, Any]]:
+        expiradas = super().expire(time)
+        for key, _value in expiradas:
+            self._forget(key)
+        return expiradas
+
+    def clear(self) -> None:
+        super().clear()
+        self._value_sizes.clear()
+        self.stored_bytes = self.raw_bytes = 0
+
+
+class MemoryCacheBackend:
+    """
+    Adapta um mapeamento com TTL (TTLCache, TinyLFUCache ou SharedMemoryCache)
+    ao protocolo. Com um codec, os valores são guardados comprimidos.
+    """
+
+    def __init__(
+        self,
+        store: MutableMapping[str, Any],
+        name: str = "memory",
+        codec: Optional[CacheCodec] = None,
+    ):
+        self.store = store
+        self.name = name
+        self.codec = codec
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.store.get(key)
+        if isinstance(value, bytes) and self.codec is not None:
+            return self.codec.decode(value)
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any], cost: Optional[float] = None) -> None:
+        if self.codec is not None:
+            value = self.codec.encode(value)
+        put = getattr(self.store, "put", None)
+        if put is not None:
+            # Armazenamento com admissão ponderada por custo (TinyLFUCache)
+            put(key, value, cost)
+        else:
+            self.store[key] = value
+
+    async def delete(self, key: str) -> bool:
+        try:
+            del self.store[key]
+            return True
+        except KeyError:
+            return False
+
+    async def scan(self, match: str = "*") -> List[str]:
+        return [key for key in list(self.store) if fnmatch.fnmatchcase(key, match)]
+
+    async def clear(self) -> None:
+        self.store.clear()
+
+    async def stats(self) -> Dict[str, Any]:
+        stats = {
+            "backend": self.name,
+            "size": len(self.store),
+            "max_size": getattr(self.store, "maxsize", 0),
+            "ttl": getattr(self.store, "ttl", 0),
+            **self._memory_stats(),
+        }
+        if hasattr(self.store, "currsize") and hasattr(self.store, "admitted"):
+            # TinyLFUCache: max_size é o orçamento em bytes
+            stats.update(
+                policy="tinylfu",
+                bytes=self.store.currsize,
+                admitted=self.store.admitted,
+                rejected=self.store.rejected,
+            )
+        return stats
+
+    def _memory_stats(self) -> Dict[str, Any]:
+        """
+        Memória ocupada pelas respostas, antes e depois da compressão.
+
+        Lê os contadores mantidos pelo armazenamento (SizedTTLCache,
+        TinyLFUCache, SharedMemoryCache) em vez de medir cada entrada.
+        """
+        armazenados = getattr(self.store, "stored_bytes", 0)
+        originais = getattr(self.store, "raw_bytes", 0)
+        entradas = len(self.store)
+        return {
+            "compression": self.codec.algorithm if self.codec is not None else "none",
+            "stored_bytes": armazenados,
+            "raw_bytes": originais,
+            "avg_entry_bytes": armazenados // entradas if entradas else 0,
+            "compression_ratio": round(originais / armazenados, 2) if armazenados else 1.0,
+        }
+
+
+# =========================================
+# Disco
+# =========================================
+class DiskCacheBackend:
+    """
+    Cache em disco: um arquivo JSON por entrada ({key, expires_at, value}).
+
+    O nome do arquivo é o hash da chave (chaves arbitrárias viram nomes
+    seguros). Acima de max_size, as entradas gravadas há mais tempo são
+    removidas. O I/O roda em threads para não bloquear o event loop.
+
+    O número de arquivos é contado uma vez e depois mantido a cada escrita e
+    remoção, então gravações e estatísticas não listam o diretório. A contagem
+    é aproximada (outros processos gravam no mesmo diretório e entradas
+    expiradas só saem quando lidas) e é refeita a cada despejo.
+    """
+
+    name = "disk"
+
+    def __init__(self, directory: Path, max_size: int, ttl: float):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.ttl = ttl
+        self._count: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    def _files(self) -> List[Path]:
+        return list(self.directory.glob("*/*.json"))
+
+    def _file_count(self) -> int:
+        if self._count is None:
+            self._count = len(self._files())
+        return self._count
+
+    def _unlink(self, path: Path) -> bool:
+        """Remove o arquivo da entrada e atualiza a contagem; True se ele existia"""
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        if self._count is not None:
+            self._count = max(self._count - 1, 0)
+        return True
+
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Lê uma entrada válida; entradas expiradas ou corrompidas são removidas"""
+        try:
+            with path.open(encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self._unlink(path)
+            return None
+        if entry.get("expires_at", 0) <= time.time():
+            self._unlink(path)
+            return None
+        return entry
+
+    def _get(self, key: str) -> Optional[Any]:
+        entry = self._read(self._path(key))
+        return entry["value"] if entry and entry.get("key") == key else None
+
+    def _set(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"key": key, "expires_at": time.time() + self.ttl, "value": value}
+        nova = not path.exists()
+        # Contagem inicial antes da gravação, para não contar o arquivo novo duas vezes
+        self._file_count()
+
+        # Escrita atômica: leitores nunca veem um arquivo pela metade
+        # (nome único: duas corrotinas do processo podem gravar a mesma chave)
+        temporario = path.with_suffix(f".{os.getpid()}.{uuid.uuid4().hex}.tmp")
+        try:
+            with temporario.open("w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temporario, path)
+        except BaseException:
+            temporario.unlink(missing_ok=True)
+            raise
+        if nova:
+            self._count = self._file_count() + 1
+            if self._count > self.max_size:
+                self._evict()
+
+    def _evict(self) -> None:
+        files = self._files()
+        self._count = len(files)
+        excesso = len(files) - self.max_size
+        if excesso <= 0:
+            return
+        files.sort(key=lambda path: path.stat().st_mtime)
+        for path in files[:excesso]:
+            self._unlink(path)
+
+    def _delete(self, key: str) -> bool:
+        path = self._path(key)
+        existia = self._read(path) is not None
+        self._unlink(path)
+        return existia
+
+    def _scan(self, match: str) -> List[str]:
+        keys = []
+        for path in self._files():
+            entry = self._read(path)
+            if entry and fnmatch.fnmatchcase(entry["key"], match):
+                keys.append(entry["key"])
+        return keys
+
+    def _clear(self) -> None:
+        for path in self._files():
+            path.unlink(missing_ok=True)
+        self._count = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Dict[str, Any], cost: Optional[float] = None) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+    async def delete(self, key: str) -> bool:
+        return await asyncio.to_thread(self._delete, key)
+
+    async def scan(self, match: str = "*") -> List[str]:
+        return await asyncio.to_thread(self._scan, match)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._clear)
+
+    async def stats(self) -> Dict[str, Any]:
+        size = await asyncio.to_thread(self._file_count)
+        return {"backend": self.name, "size": size, "max_size": self.max_size, "ttl": self.ttl}
+
+
+# =========================================
+# Redis (protocolo RESP)
+# =========================================
+class RespClient:
+    """
+    Cliente mínimo do protocolo RESP2 sobre asyncio.
+
+    Uma conexão por processo, com os comandos serializados por um Lock.
+    Reconecta uma vez se a conexão cair entre comandos.
+    """
+
+    def __init__(self, url: str, timeout: float = CACHE_REDIS_TIMEOUT_SECONDS):
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise CacheBackendError(ErrorMessages.CACHE_REDIS_INVALID_URL.format(url=url))
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            if self.password:
+                credenciais = [self.username, self.password] if self.username else [self.password]
+                await self._roundtrip("AUTH", *credenciais)
+            if self.db:
+                await self._roundtrip("SELECT", str(self.db))
+        except BaseException:
+            # AUTH/SELECT recusados: a conexão sem autenticação não é reaproveitada
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+        self._reader = self._writer = None
+
+    @staticmethod
+    def encode(*args: str) -> bytes:
+        """Codifica um comando como array de bulk strings"""
+        partes = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            dados = arg.encode("utf-8")
+            partes.append(f"${len(dados)}\r\n".encode() + dados + b"\r\n")
+        return b"".join(partes)
+
+    async def _read_reply(self) -> Any:
+        assert self._reader is not None
+        linha = await self._reader.readuntil(b"\r\n")
+        tipo, conteudo = linha[:1], linha[1:-2]
+        if tipo == b"+":
+            return conteudo.decode("utf-8")
+        if tipo == b"-":
+            raise CacheBackendError(conteudo.decode("utf-8"))
+        if tipo == b":":
+            return int(conteudo)
+        if tipo == b"$":
+            tamanho = int(conteudo)
+            if tamanho < 0:
+                return None
+            dados = await self._reader.readexactly(tamanho + 2)
+            return dados[:-2]
+        if tipo == b"*":
+            tamanho = int(conteudo)
+            if tamanho < 0:
+                return None
+            return [await self._read_reply() for _ in range(tamanho)]
+        raise CacheBackendError(ErrorMessages.CACHE_REDIS_PROTOCOL_ERROR.format(reply=linha[:20]))
+
+    async def _roundtrip(self, *args: str) -> Any:
+        assert self._writer is not None
+        self._writer.write(self.encode(*args))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def execute(self, *args: str) -> Any:
+        """
+        Executa um comando e retorna a resposta decodificada.
+
+        Raises:
+            CacheBackendError: Servidor indisponível, timeout ou erro do Redis
+        """
+        async with self._lock:
+            for tentativa in range(2):
+                try:
+                    if self._writer is None:
+                        await asyncio.wait_for(self._connect(), self.timeout)
+                    return await asyncio.wait_for(self._roundtrip(*args), self.timeout)
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+                    await self.close()
+                    if tentativa == 1:
+                        raise CacheBackendError(
+                            ErrorMessages.CACHE_REDIS_UNAVAILABLE.format(
+                                host=self.host, port=self.port, error=str(e) or type(e).__name__
+                            )
+                        ) from e
+
+
+class RedisCacheBackend:
+    """
+    Cache em um servidor Redis (ou compatível: Valkey, KeyDB, Dragonfly).
+
+    As chaves recebem um prefixo para conviver com outros dados no mesmo
+    banco; o TTL fica a cargo do servidor (SET ... EX).
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        url: str,
+        ttl: int,
+        max_size: int = 0,
+        prefix: str = CACHE_REDIS_KEY_PREFIX,
+        client: Optional[RespClient] = None,
+    ):
+        self.client = client or RespClient(url)
+        self.ttl = int(ttl)
+        self.max_size = max_size  # Informativo: o limite real é o maxmemory do servidor
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        dados = await self.client.execute("GET", self.prefix + key)
+        return json.loads(dados) if dados is not None else None
+
+    async def set(self, key: str, value: Dict[str, Any], cost: Optional[float] = None) -> None:
+        dados = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        await self.client.execute("SET", self.prefix + key, dados, "EX", str(self.ttl))
+
+    async def delete(self, key: str) -> bool:
+        return bool(await self.client.execute("DEL", self.prefix + key))
+
+    async def scan(self, match: str = "*") -> List[str]:
+        keys: List[str] = []
+        cursor = "0"
+        while True:
+            cursor_bytes, lote = await self.client.execute(
+                "SCAN", cursor, "MATCH", self.prefix + match, "COUNT", str(CACHE_REDIS_SCAN_COUNT)
+            )
+            keys.extend(key.decode("utf-8")[len(self.prefix) :] for key in lote)
+            cursor = cursor_bytes.decode("utf-8")
+            if cursor == "0":
+                # SCAN pode repetir chaves entre lotes
+                return list(dict.fromkeys(keys))
+
+    async def clear(self) -> None:
+        keys = await self.scan()
+        for inicio in range(0, len(keys), CACHE_REDIS_SCAN_COUNT):
+            lote = keys[inicio : inicio + CACHE_REDIS_SCAN_COUNT]
+            await self.client.execute("DEL", *(self.prefix + key for key in lote))
+
+    async def stats(self) -> Dict[str, Any]:
+        # DBSIZE é O(1); SCAN percorreria o keyspace inteiro segurando a conexão
+        # compartilhada com as leituras do chat. Conta todas as chaves do banco,
+        # inclusive as que não são do cache.
+        return {
+            "backend": self.name,
+            "size": await self.client.execute("DBSIZE"),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+        }
@@ -0,0 +1,185 @@
+"""
+Compressão dos valores do cache de respostas
+
+As respostas cacheadas são dicionários de Markdown longo e muito repetitivo
+(títulos das seções, trechos padrão da WCAG). No backend memory elas podem ser
+guardadas comprimidas e são descomprimidas de forma transparente no hit.
+
+Algoritmos (settings.cache_compression):
+- zlib: biblioteca padrão, com dicionário pré-definido (zdict)
+- zstd: requer o pacote zstandard; sem ele cai para zlib
+- none: valores guardados como dicionários (comportamento anterior)
+
+O dicionário é construído a partir das respostas do corpus de warm-up: os
+trechos que se repetem entre respostas deixam de custar bytes em cada entrada.
+
+Formato de um valor comprimido:
+    algoritmo (1 byte) | tamanho do JSON original (uint32) | dados
+"""
+
+import json
+import logging
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from chatbot_acessibilidade.core.constants import (
+    CACHE_COMPRESSION_DICT_BYTES,
+    CACHE_COMPRESSION_DICT_SAMPLES,
+    CACHE_COMPRESSION_ZLIB_LEVEL,
+    CACHE_COMPRESSION_ZSTD_LEVEL,
+    LogMessages,
+)
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depende do ambiente
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct("<cI")  # algoritmo, tamanho do JSON original
+ALGORITHM_TAGS = {"zlib": b"z", "zstd": b"s"}
+ZLIB_MAX_DICT_BYTES = 32 * 1024  # Janela do deflate: bytes além disso são ignorados
+
+
+def encode_json(value: Any) -> bytes:
+    """Serialização compacta usada para medir e comprimir as respostas"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def build_dictionary(samples: List[Dict[str, Any]], algorithm: str) -> Optional[bytes]:
+    """
+    Constrói o dicionário de compressão a partir de respostas de exemplo.
+
+    Args:
+        samples: Respostas (dicionários) representativas
+        algorithm: "zlib" ou "zstd"
+
+    Returns:
+        Dicionário em bytes ou None se não houver amostras suficientes
+    """
+    dados = [encode_json(sample) for sample in samples[:CACHE_COMPRESSION_DICT_SAMPLES]]
+    if not dados:
+        return None
+
+    if algorithm == "zstd":
+        try:
+            return zstandard.train_dictionary(CACHE_COMPRESSION_DICT_BYTES, dados).as_bytes()
+        except zstandard.ZstdError as e:
+            # O treinamento exige um volume mínimo de amostras
+            logger.info(LogMessages.CACHE_COMPRESSION_DICT_FAILED.format(error=e))
+            return None
+
+    # zlib: o deflate prefere as referências mais próximas do fim do dicionário,
+    # então as amostras entram em ordem e o excesso é cortado do início
+    limite = min(CACHE_COMPRESSION_DICT_BYTES, ZLIB_MAX_DICT_BYTES)
+    return b"".join(dados)[-limite:]
+
+
+def load_samples(path: Path) -> List[Dict[str, Any]]:
+    """
+    Lê as respostas do corpus de warm-up para treinar o dicionário.
+
+    Args:
+        path: Arquivo do corpus ({"entries": [{"resposta": {...}}, ...]})
+
+    Returns:
+        Respostas encontradas (vazia se o arquivo não existir ou for inválido)
+    """
+    try:
+        with path.open(encoding="utf-8") as f:
+            entries = json.load(f).get("entries", [])
+    except (OSError, ValueError, AttributeError):
+        return []
+    return [
+        entry["resposta"]
+        for entry in entries
+        if isinstance(entry, dict) and isinstance(entry.get("resposta"), dict)
+    ]
+
+
+class CacheCodec:
+    """Comprime e descomprime respostas com o algoritmo e o dicionário escolhidos"""
+
+    def __init__(self, algorithm: str = "zlib", dictionary: Optional[bytes] = None):
+        if algorithm not in ALGORITHM_TAGS or (algorithm == "zstd" and zstandard is None):
+            raise ValueError(f"Algoritmo de compressão indisponível: {algorithm}")
+
+        self.algorithm = algorithm
+        self.dictionary = dictionary
+        if algorithm == "zstd":
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            self._compressor = zstandard.ZstdCompressor(
+                level=CACHE_COMPRESSION_ZSTD_LEVEL, dict_data=dict_data
+            )
+            self._decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+
+    def encode(self, value: Dict[str, Any]) -> bytes:
+        """Serializa e comprime uma resposta"""
+        raw = encode_json(value)
+        if self.algorithm == "zstd":
+            dados = self._compressor.compress(raw)
+        elif self.dictionary:
+            compressor = zlib.compressobj(CACHE_COMPRESSION_ZLIB_LEVEL, zdict=self.dictionary)
+            dados = compressor.compress(raw) + compressor.flush()
+        else:
+            dados = zlib.compress(raw, CACHE_COMPRESSION_ZLIB_LEVEL)
+        return HEADER.pack(ALGORITHM_TAGS[self.algorithm], len(raw)) + dados
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        """Descomprime uma resposta gerada por encode"""
+        tag, tamanho = HEADER.unpack_from(data)
+        dados = data[HEADER.size :]
+        if tag == ALGORITHM_TAGS["zstd"]:
+            raw = self._decompressor.decompress(dados, max_output_size=tamanho)
+        elif self.dictionary:
+            decompressor = zlib.decompressobj(zdict=self.dictionary)
+            raw = decompressor.decompress(dados) + decompressor.flush()
+        else:
+            raw = zlib.decompress(dados)
+        return json.loads(raw)
+
+
+def create_codec(algorithm: str, corpus_path: Optional[Path] = None) -> Optional[CacheCodec]:
+    """
+    Cria o codec configurado, com dicionário treinado nas respostas do corpus.
+
+    Args:
+        algorithm: "zlib", "zstd" ou "none"
+        corpus_path: Corpus de warm-up usado como amostra (opcional)
+
+    Returns:
+        CacheCodec ou None se a compressão estiver desabilitada
+    """
+    if algorithm not in ALGORITHM_TAGS:
+        return None
+    if algorithm == "zstd" and zstandard is None:
+        logger.warning(LogMessages.CACHE_COMPRESSION_ZSTD_UNAVAILABLE)
+        algorithm = "zlib"
+
+    samples = load_samples(corpus_path) if corpus_path else []
+    dictionary = build_dictionary(samples, algorithm)
+    logger.info(
+        LogMessages.CACHE_COMPRESSION_ENABLED.format(
+            algorithm=algorithm, dict_bytes=len(dictionary or b""), samples=len(samples)
+        )
+    )
+    return CacheCodec(algorithm, dictionary)
+
+
+def value_sizes(value: Any) -> Tuple[int, int]:
+    """
+    Bytes ocupados por um valor do cache e tamanho do JSON original.
+
+    Args:
+        value: Valor comprimido (bytes de CacheCodec.encode) ou dicionário
+
+    Returns:
+        (bytes armazenados, bytes do JSON sem compressão)
+    """
+    if isinstance(value, bytes):
+        return len(value), HEADER.unpack_from(value)[1]
+    tamanho = len(encode_json(value))
+    return tamanho, tamanho
@@ -0,0 +1,280 @@
+"""
+Warm-up do cache de respostas
+
+Depois de cada deploy o cache em memória começa vazio e as primeiras perguntas
+frequentes passam pelo pipeline completo. Este módulo pré-carrega o cache
+(qualquer CacheBackend) em segundo plano a partir de:
+
+- um corpus de respostas pré-computadas (scripts/build_cache_corpus.py)
+- o snapshot salvo no shutdown anterior (se configurado)
+
+O progresso é exposto na verificação de prontidão (/api/ready).
+
+Formato dos arquivos (JSON):
+    {"entries": [{"pergunta": "...", "resposta": {...}}, {"key": "...", "resposta": {...}}]}
+
+Entradas com "pergunta" também alimentam o índice da busca por similaridade.
+
+No shutdown todos os workers salvam o snapshot ao mesmo tempo: as escritas são
+serializadas por um lock de arquivo (flock em <snapshot>.lock) e cada worker
+mescla as entradas que outro worker gravou depois do seu startup, para que o
+cache em memória de um worker não descarte o dos demais.
+"""
+
+import asyncio
+import contextlib
+import fcntl
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional
+
+from chatbot_acessibilidade.config import settings
+from chatbot_acessibilidade.core.cache import (
+    anexar_pergunta,
+    get_cache_backend,
+    get_cache_key,
+    get_question_index,
+    separar_pergunta,
+)
+from chatbot_acessibilidade.core.constants import CACHE_CORPUS_FILE, LogMessages
+from chatbot_acessibilidade.core.exceptions import CacheBackendError
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+# Estados possíveis do warm-up do cache
+CACHE_WARMUP_PENDING = "pending"
+CACHE_WARMUP_RUNNING = "running"
+CACHE_WARMUP_DONE = "done"
+CACHE_WARMUP_FAILED = "failed"
+CACHE_WARMUP_DISABLED = "disabled"
+
+_lock = Lock()
+_state: Dict[str, Any] = {
+    "status": CACHE_WARMUP_PENDING,
+    "loaded": 0,  # Respostas já inseridas no cache
+    "total": 0,  # Respostas encontradas nos arquivos
+    "sources": [],
+    "error": None,
+}
+_task: Optional["asyncio.Task[None]"] = None
+
+# Snapshots gravados depois disso vêm de outros workers do mesmo deploy
+_PROCESS_STARTED_AT = time.time()
+
+
+def _set_state(**changes: Any) -> None:
+    with _lock:
+        _state.update(changes)
+
+
+def _resolve(path: str) -> Path:
+    """Caminhos relativos são resolvidos a partir da raiz do projeto"""
+    resolved = Path(path)
+    return resolved if resolved.is_absolute() else PROJECT_ROOT / resolved
+
+
+def get_warmup_sources() -> List[Path]:
+    """
+    Lista os arquivos configurados para o warm-up (corpus e snapshot).
+
+    Returns:
+        Caminhos na ordem de carga (o snapshot sobrescreve o corpus)
+    """
+    corpus = getattr(settings, "cache_corpus_file", CACHE_CORPUS_FILE)
+    snapshot = getattr(settings, "cache_snapshot_file", "")
+    return [_resolve(path) for path in (corpus, snapshot) if path]
+
+
+def read_entries(path: Path) -> List[Dict[str, Any]]:
+    """
+    Lê as entradas de um arquivo de corpus/snapshot.
+
+    Args:
+        path: Arquivo JSON
+
+    Returns:
+        Lista de entradas (vazia se o arquivo não existir)
+    """
+    if not path.is_file():
+        logger.info(LogMessages.CACHE_WARMUP_SKIPPED.format(source=path))
+        return []
+
+    with path.open(encoding="utf-8") as f:
+        data = json.load(f)
+    return list(data.get("entries", []))
+
+
+async def load_entries(entries: Iterable[Dict[str, Any]]) -> int:
+    """
+    Insere entradas no cache, atualizando o progresso a cada resposta.
+
+    Entradas sem pergunta/chave ou com resposta inválida são ignoradas.
+
+    Args:
+        entries: Entradas com "pergunta" (ou "key") e "resposta"
+
+    Returns:
+        Número de respostas inseridas
+    """
+    backend = get_cache_backend()
+    if backend is None:
+        return 0
+
+    question_index = get_question_index()
+    inseridas = 0
+    for index, entry in enumerate(entries):
+        resposta = entry.get("resposta")
+        key = entry.get("key") or (entry.get("pergunta") and get_cache_key(entry["pergunta"]))
+        if not key or not isinstance(resposta, dict) or not resposta:
+            logger.warning(LogMessages.CACHE_WARMUP_INVALID_ENTRY.format(index=index))
+            continue
+
+        if entry.get("pergunta"):
+            await backend.set(key, anexar_pergunta(resposta, entry["pergunta"]))
+            question_index.add(key, entry["pergunta"])
+        else:
+            await backend.set(key, resposta)
+        inseridas += 1
+        with _lock:
+            _state["loaded"] += 1
+    return inseridas
+
+
+async def warm_up_cache() -> None:
+    """
+    Executa o warm-up do cache (a leitura dos arquivos roda em uma thread).
+
+    Falhas são registradas no estado e não propagam: o cache apenas começa
+    vazio, como antes.
+    """
+    _set_state(status=CACHE_WARMUP_RUNNING, loaded=0, total=0, sources=[], error=None)
+    for path in get_warmup_sources():
+        try:
+            entries = await asyncio.to_thread(read_entries, path)
+            if not entries:
+                continue
+            with _lock:
+                _state["total"] += len(entries)
+                _state["sources"].append(str(path))
+            loaded = await load_entries(entries)
+            logger.info(LogMessages.CACHE_WARMUP_LOADED.format(loaded=loaded, source=path))
+        except (OSError, ValueError, AttributeError, CacheBackendError) as e:
+            logger.error(LogMessages.CACHE_WARMUP_FAILED.format(source=path, error=e))
+            _set_state(status=CACHE_WARMUP_FAILED, error=str(e))
+            return
+
+    _set_state(status=CACHE_WARMUP_DONE)
+
+
+def start_cache_warmup() -> "asyncio.Task[None]":
+    """
+    Agenda o warm-up do cache em segundo plano, sem atrasar o startup.
+
+    Returns:
+        Task do warm-up (a mesma se já tiver sido iniciado)
+    """
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(warm_up_cache())
+    return _task
+
+
+async def save_cache_snapshot(path: Optional[str] = None) -> int:
+    """
+    Salva o conteúdo atual do cache para ser recarregado no próximo startup.
+
+    Args:
+        path: Arquivo de destino (padrão: settings.cache_snapshot_file)
+
+    Returns:
+        Número de respostas salvas (0 se snapshot desabilitado)
+    """
+    path = path or getattr(settings, "cache_snapshot_file", "")
+    backend = get_cache_backend()
+    if not path or backend is None:
+        return 0
+
+    question_index = get_question_index()
+    entries = []
+    for key in await backend.scan():
+        resposta, pergunta = separar_pergunta(await backend.get(key))
+        if resposta is not None:
+            entry = {"key": key, "resposta": resposta}
+            # Com a pergunta, o próximo startup também recupera a busca por similaridade
+            pergunta = pergunta or question_index.get_question(key)
+            if pergunta:
+                entry["pergunta"] = pergunta
+            entries.append(entry)
+    await asyncio.to_thread(_write_snapshot, _resolve(path), entries)
+    return len(entries)
+
+
+def _write_snapshot(destino: Path, entries: List[Dict[str, Any]]) -> None:
+    destino.parent.mkdir(parents=True, exist_ok=True)
+
+    # Um worker por vez; cada um mescla o que os anteriores gravaram
+    with open(destino.with_suffix(destino.suffix + ".lock"), "a") as trava:
+        fcntl.flock(trava, fcntl.LOCK_EX)
+        entries = _merge_recent_snapshot(destino, entries)
+
+        # Escrita atômica em um temporário do processo: um shutdown interrompido
+        # não corrompe o snapshot anterior
+        fd, temporario = tempfile.mkstemp(
+            dir=destino.parent, prefix=f".{destino.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"entries": entries}, f, ensure_ascii=False)
+            os.replace(temporario, destino)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temporario)
+            raise
+    logger.info(LogMessages.CACHE_SNAPSHOT_SAVED.format(count=len(entries), source=destino))
+
+
+def _merge_recent_snapshot(destino: Path, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Acrescenta as entradas gravadas por outro worker desde o startup (as próprias vencem)"""
+    try:
+        if destino.stat().st_mtime < _PROCESS_STARTED_AT:
+            return entries
+        anteriores = read_entries(destino)
+    except (OSError, ValueError, AttributeError):
+        return entries
+    chaves = {entry["key"] for entry in entries}
+    return entries + [
+        entry
+        for entry in anteriores
+        if isinstance(entry, dict) and entry.get("key") and entry["key"] not in chaves
+    ]
+
+
+def get_cache_warmup_state() -> Dict[str, Any]:
+    """
+    Retorna uma cópia do estado atual do warm-up do cache.
+
+    Returns:
+        Dicionário com status, loaded, total, sources e error
+    """
+    with _lock:
+        estado = dict(_state, sources=list(_state["sources"]))
+    warmup_habilitado = getattr(settings, "cache_warmup_enabled", True) and getattr(
+        settings, "cache_enabled", True
+    )
+    if not warmup_habilitado and estado["status"] == CACHE_WARMUP_PENDING:
+        estado["status"] = CACHE_WARMUP_DISABLED
+    return estado
+
+
+def reset_cache_warmup() -> None:
+    """Reseta o estado do warm-up do cache (útil para testes)"""
+    global _task
+    _set_state(status=CACHE_WARMUP_PENDING, loaded=0, total=0, sources=[], error=None)
+    _task = None
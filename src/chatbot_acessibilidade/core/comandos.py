@@ -0,0 +1,170 @@
+"""
+Registro dos comandos do chat (/simular, /refatorar)
+
+Cada comando tem uma especificação própria, usada pela API e pelo orquestrador:
+
+- perfil: agente que atende o comando (modelo do roteador e métricas)
+- cache: namespace próprio e chave canônica dos argumentos ("/simular cega X"
+  e "/simular leitor-tela X" são a mesma simulação); comandos ficam fora da
+  busca semântica, onde simulações de personas diferentes se confundiriam;
+  o /refatorar usa o código exato (indentação e maiúsculas mudam o código)
+- rate limit: limite por minuto do comando, somado ao limite global do chat
+
+A resolução percorre uma trie com os nomes dos comandos: o custo depende só
+do tamanho do nome, não do número de comandos registrados. Este módulo não
+importa o ADK, então a API resolve comandos sem carregar o pipeline.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from chatbot_acessibilidade.core.constants import (
+    COMMAND_REFATORAR_RATE_LIMIT_PER_MINUTE,
+    COMMAND_SIMULAR_RATE_LIMIT_PER_MINUTE,
+)
+
+# Comandos inclusivos e nomes antigos das personas internas
+PERSONAS = {
+    "leitor-tela": "Cega",
+    "cega": "Cega",  # Mantém compatibilidade
+    "zoom-contraste": "Baixa Visão",
+    "baixa_visao": "Baixa Visão",
+    "teclado": "Motora",
+    "motora": "Motora",
+    "linguagem-simples": "Cognitiva",
+    "cognitiva": "Cognitiva",
+}
+
+# Marca de fim de nome na trie de comandos
+_FIM = ""
+
+
+def normalizar_argumentos(argumentos: str) -> Optional[str]:
+    """Chave de cache padrão: argumentos sem espaços repetidos (None se vazios)"""
+    return " ".join(argumentos.split()) or None
+
+
+def interpretar_simulacao(argumentos: str) -> Optional[Tuple[str, str]]:
+    """
+    Separa persona e contexto dos argumentos do /simular.
+
+    Returns:
+        (persona interna, contexto) ou None se faltar o contexto
+    """
+    partes = argumentos.split(" ", 1)
+    if len(partes) < 2:
+        return None
+    persona_raw = partes[0].lower()
+    return PERSONAS.get(persona_raw, persona_raw), partes[1]
+
+
+def chave_simulacao(argumentos: str) -> Optional[str]:
+    """Chave de cache do /simular: persona interna e contexto normalizado"""
+    simulacao = interpretar_simulacao(argumentos)
+    if simulacao is None:
+        return None
+    persona, contexto = simulacao
+    return f"{persona.casefold()}|{' '.join(contexto.split())}"
+
+
+def chave_refatoracao(argumentos: str) -> Optional[str]:
+    """Chave de cache do /refatorar: hash do código sem alterações além do strip"""
+    codigo = argumentos.strip()
+    if not codigo:
+        return None
+    return hashlib.sha256(codigo.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class Comando:
+    """Especificação de um comando do chat"""
+
+    nome: str
+    agente: str
+    namespace: str
+    rate_limit_per_minute: Optional[int] = None
+    cacheavel: bool = True
+    chave_cache: Callable[[str], Optional[str]] = normalizar_argumentos
+
+
+@dataclass(frozen=True)
+class ComandoResolvido:
+    """Comando encontrado em uma pergunta e seus argumentos"""
+
+    comando: Comando
+    argumentos: str
+
+    def chave_cache(self) -> Optional[str]:
+        """Chave no namespace do comando (None: a resposta não é cacheada)"""
+        if not self.comando.cacheavel:
+            return None
+        return self.comando.chave_cache(self.argumentos)
+
+
+class CommandRegistry:
+    """Trie dos nomes dos comandos"""
+
+    def __init__(self, comandos: Iterable[Comando] = ()) -> None:
+        self._raiz: Dict[str, Any] = {}
+        for comando in comandos:
+            self.registrar(comando)
+
+    def registrar(self, comando: Comando) -> None:
+        no = self._raiz
+        for caractere in comando.nome:
+            no = no.setdefault(caractere, {})
+        no[_FIM] = comando
+
+    def resolver(self, pergunta: str) -> Optional[ComandoResolvido]:
+        """
+        Comando no início da pergunta.
+
+        O nome precisa terminar em espaço ou no fim do texto ("/simulação"
+        não é "/simular"); vale o nome mais longo registrado.
+
+        Args:
+            pergunta: Pergunta do usuário
+
+        Returns:
+            ComandoResolvido ou None se a pergunta não for um comando
+        """
+        texto = pergunta.strip()
+        no = self._raiz
+        encontrado: Optional[Tuple[Comando, int]] = None
+        for posicao, caractere in enumerate(texto):
+            no = no.get(caractere)
+            if no is None:
+                break
+            fim = posicao + 1
+            if _FIM in no and (fim == len(texto) or texto[fim].isspace()):
+                encontrado = (no[_FIM], fim)
+        if encontrado is None:
+            return None
+        comando, fim = encontrado
+        return ComandoResolvido(comando, texto[fim:].strip())
+
+
+COMANDOS = CommandRegistry(
+    [
+        Comando(
+            nome="/simular",
+            agente="persona",
+            namespace="simular",
+            rate_limit_per_minute=COMMAND_SIMULAR_RATE_LIMIT_PER_MINUTE,
+            chave_cache=chave_simulacao,
+        ),
+        Comando(
+            nome="/refatorar",
+            agente="refatorador",
+            namespace="refatorar",
+            rate_limit_per_minute=COMMAND_REFATORAR_RATE_LIMIT_PER_MINUTE,
+            chave_cache=chave_refatoracao,
+        ),
+    ]
+)
+
+
+def resolver_comando(pergunta: str) -> Optional[ComandoResolvido]:
+    """Comando registrado no início da pergunta (None para perguntas comuns)"""
+    return COMANDOS.resolver(pergunta)
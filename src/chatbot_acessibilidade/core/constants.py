@@ -25,21 +25,162 @@ MIN_PARAGRAPH_LENGTH = 30  # Tamanho mínimo para considerar um parágrafo váli
 # =========================================
 CACHE_MAX_SIZE = 100  # Tamanho máximo do cache (número de itens)
 CACHE_TTL_SECONDS = 3600  # TTL do cache em segundos (1 hora)
+CACHE_MAX_BYTES = 8 * 1024 * 1024  # Orçamento de memória da política tinylfu (8 MB)
+CACHE_CORPUS_FILE = "data/cache_corpus.json"  # Corpus pré-computado (relativo à raiz)
+
+# Política W-TinyLFU (core/tinylfu.py)
+CACHE_TINYLFU_WINDOW_RATIO = 0.01  # Fração do orçamento para a janela LRU de admissão
+CACHE_TINYLFU_PROTECTED_RATIO = 0.8  # Fração da região principal reservada a entradas populares
+CACHE_TINYLFU_AVG_ENTRY_BYTES = 4096  # Tamanho médio estimado (dimensiona o sketch)
+CACHE_DEFAULT_COST_SECONDS = 10.0  # Custo presumido de uma resposta sem medição (pipeline típico)
+
+# Compressão dos valores no backend memory (core/cache_codec.py)
+CACHE_COMPRESSION_ZLIB_LEVEL = 6  # Nível do zlib (1-9)
+CACHE_COMPRESSION_ZSTD_LEVEL = 9  # Nível do zstd (1-22)
+CACHE_COMPRESSION_DICT_BYTES = 16 * 1024  # Tamanho do dicionário treinado no corpus
+CACHE_COMPRESSION_DICT_SAMPLES = 500  # Respostas do corpus usadas como amostra
+
+# Busca semântica de perguntas cacheadas (core/semantic_index.py)
+CACHE_SEMANTIC_THRESHOLD = 0.8  # Similaridade mínima para reaproveitar uma resposta
+CACHE_SEMANTIC_CANDIDATES = 5  # Candidatas do BM25 avaliadas por busca
+CACHE_SEMANTIC_MAX_QUESTIONS = 100_000  # Perguntas indexadas por processo
+CACHE_SEMANTIC_MAX_SCORED = 500  # Candidatas pontuadas pelo BM25 (limita a latência)
+CACHE_SEMANTIC_STEM_CACHE_SIZE = 50_000  # Radicais memorizados (vocabulário das perguntas)
+CACHE_SEMANTIC_BM25_K1 = 1.2  # Saturação da frequência do termo
+CACHE_SEMANTIC_BM25_B = 0.75  # Normalização pelo tamanho da pergunta
+
+# Invalidação por similaridade (core/minhash.py)
+CACHE_MINHASH_BANDS = 16  # Bandas do LSH (mais bandas: mais candidatas)
+CACHE_MINHASH_ROWS = 4  # Linhas por banda (assinatura de 64 posições)
+CACHE_INVALIDATION_THRESHOLD = 0.95  # Jaccard mínimo padrão para invalidar reformulações
+CACHE_QUESTION_FIELD = "_pergunta"  # Campo com o texto da pergunta guardado junto da resposta
+
+# Cache compartilhado entre workers (core/shared_cache.py)
+CACHE_SHARED_FILE_NAME = "ada-answer-cache"  # Arquivo do segmento em /dev/shm
+CACHE_SHARED_SLOT_BYTES = 65536  # Bytes por entrada (respostas maiores não são cacheadas)
+CACHE_SHARED_PROBE_LIMIT = 8  # Slots candidatos por chave
+CACHE_SHARED_READ_RETRIES = 5  # Releituras de um slot sendo escrito antes de desistir
+
+# Backends de disco e Redis (core/cache_backends.py)
+CACHE_DISK_DIR = "data/cache"  # Diretório do cache em disco (relativo à raiz)
+CACHE_REDIS_KEY_PREFIX = "ada:cache:"  # Prefixo das chaves no Redis
+CACHE_REDIS_SCAN_COUNT = 100  # Chaves por lote no SCAN/DEL
+CACHE_REDIS_TIMEOUT_SECONDS = 2.0  # Timeout por comando (cache lento = cache miss)
+
+# Perguntas frequentes usadas para gerar o corpus de warm-up do cache
+# (mesma lista simulada em tests/load/locustfile.py)
+CACHE_WARMUP_QUESTIONS = (
+    "Como testar contraste de cores?",
+    "O que é WCAG 2.1?",
+    "Como tornar um site acessível a leitores de tela?",
+    "Quais são os critérios de sucesso do WCAG AA?",
+    "Como testar navegação por teclado?",
+    "O que é ARIA?",
+    "Como implementar skip links?",
+    "Qual a diferença entre WCAG A, AA e AAA?",
+    "Como testar acessibilidade com axe-core?",
+    "O que são landmarks ARIA?",
+)
+
+# =========================================
+# Base de Conhecimento Offline (core/knowledge_base.py)
+# =========================================
+KNOWLEDGE_BASE_FILE = "data/knowledge_base.json"  # Relativo ao pacote chatbot_acessibilidade
+KNOWLEDGE_BASE_MAX_RESULTS = 5  # Referências devolvidas por busca (padrão)
+KNOWLEDGE_BASE_KEYWORD_WEIGHT = 2  # Títulos e palavras-chave contam em dobro no BM25
+
+# =========================================
+# Respostas Curadas (core/faq.py)
+# =========================================
+FAQ_FILE = "data/faq.json"  # Relativo ao pacote chatbot_acessibilidade
+FAQ_CONFIDENCE_THRESHOLD = 0.75  # Cosseno mínimo com uma pergunta canônica
+FAQ_CANDIDATES = 5  # Perguntas canônicas comparadas por classificação
+
+# =========================================
+# Roteamento por Complexidade (core/router.py)
+# =========================================
+ROUTER_MEDIUM_QUESTION_WORDS = 15  # Acima disso a pergunta ganha 1 ponto
+ROUTER_LONG_QUESTION_WORDS = 40  # Acima disso a pergunta ganha 2 pontos
+
+# =========================================
+# Modo Combinado (core/resposta_combinada.py)
+# =========================================
+COMBINED_MIN_SECTION_CHARS = 40  # Tamanho mínimo de cada seção da resposta combinada
+COMBINED_REFERENCES = 5  # Referências da base local embutidas no prompt
+
+# =========================================
+# Comandos do Chat (core/comandos.py)
+# =========================================
+COMMAND_SIMULAR_RATE_LIMIT_PER_MINUTE = 5  # Simulações de persona por minuto (por IP)
+COMMAND_REFATORAR_RATE_LIMIT_PER_MINUTE = 3  # Refatorações por minuto (saída do tamanho do código)
+
+# =========================================
+# Saídas em JSON dos Agentes (core/saida_estruturada.py)
+# =========================================
+JSON_EXTRACT_MAX_CANDIDATES = 5  # Posições de "{" testadas antes de desistir da extração
 
 # =========================================
 # TTLs de Cache para Assets Estáticos
 # =========================================
 STATIC_CACHE_TTL_SECONDS = 86400  # 1 dia para CSS/JS
 ASSETS_CACHE_TTL_SECONDS = 604800  # 7 dias para imagens
+IMMUTABLE_CACHE_TTL_SECONDS = 31536000  # 1 ano para assets versionados (hash no nome)
+HASHED_ASSET_PATTERN = (
+    r"\.[0-9a-f]{8}\.[a-z0-9]+$"  # nome.<hash>.ext (scripts/fingerprint_assets.py)
+)
 
 # =========================================
 # Limites de Compressão
 # =========================================
 COMPRESSION_MIN_SIZE_BYTES = 500  # Tamanho mínimo para comprimir resposta
+COMPRESSION_GZIP_LEVEL = 6  # Nível gzip para respostas dinâmicas (1-9)
+COMPRESSION_BROTLI_QUALITY = 5  # Qualidade brotli para respostas dinâmicas (0-11)
+COMPRESSION_ZSTD_LEVEL = 3  # Nível zstd para respostas dinâmicas (1-22)
+PRECOMPRESSED_EXTENSIONS = {"br": ".br", "gzip": ".gz"}  # Variantes geradas no build
 
 # =========================================
 # Limites de Tokens (LLM)
 # =========================================
+# Geração padrão de cada agente; settings.agent_configs sobrescreve por agente.
+# thinking_budget=0 desliga o raciocínio do Gemini 2.5 Flash, cujos tokens também
+# contam em max_output_tokens (agentes de saída curta e sem decisões técnicas).
+# prompt_budget_tokens limita o prompt do estágio (sem as instruções): acima do
+# orçamento o Validador valida a resposta em partes (em paralelo, cada uma do
+# tamanho que ele consegue devolver corrigida), o Revisor é pulado e o Testador
+# recebe a resposta final resumida (core/tokens.py). Validador e Revisor
+# reescrevem o texto recebido, então o que passa a eles também fica abaixo de
+# max_output_tokens menos o thinking_budget; uma resposta cortada pelo limite
+# (finish MAX_TOKENS) é erro e o estágio mantém o texto anterior.
+AGENT_GENERATION_DEFAULTS = {
+    "assistente": {"max_output_tokens": 8192, "temperature": 0.4},
+    "validador": {
+        "max_output_tokens": 4096,
+        "temperature": 0.1,
+        "thinking_budget": 1024,
+        "prompt_budget_tokens": 6000,
+    },
+    "revisor": {
+        "max_output_tokens": 4096,
+        "temperature": 0.3,
+        "thinking_budget": 0,
+        "prompt_budget_tokens": 4000,
+    },
+    "testador": {
+        "max_output_tokens": 1536,
+        "temperature": 0.3,
+        "thinking_budget": 0,
+        "prompt_budget_tokens": 1500,
+    },
+    "aprofundador": {"max_output_tokens": 1024, "temperature": 0.2, "thinking_budget": 0},
+    "refatorador": {"max_output_tokens": 4096, "temperature": 0.1},
+    "persona": {"max_output_tokens": 1536, "temperature": 0.7, "thinking_budget": 0},
+    "combinado": {"max_output_tokens": 8192, "temperature": 0.3},
+}
+TOKEN_ESTIMATE_CHARS_PER_TOKEN = 4  # Caracteres por token em palavras (estimativa local)
+TOKEN_TRIM_MARKER = "[...]"  # Marca dos trechos omitidos para caber no orçamento
+CONTEXT_CACHE_REFRESH_MARGIN_SECONDS = 60  # Renova o cached content antes de expirar
+CONTEXT_CACHE_RETRY_SECONDS = 300  # Instruções inline após falha ao criar o cache
+CONTEXT_CACHE_INVALID_CODES = (400, 403, 404)  # Handle recusado (expirado, apagado, outra chave)
 
 
 # =========================================
@@ -53,6 +194,11 @@ MAX_RETRY_ATTEMPTS = 3  # Número máximo de tentativas em caso de erro
 DEFAULT_RATE_LIMIT_PER_MINUTE = 10  # Requisições por minuto (padrão)
 FALLBACK_RATE_LIMIT_PER_MINUTE = 1000  # Requisições por minuto (quando desabilitado)
 
+# =========================================
+# Circuito do Provedor LLM
+# =========================================
+PROVIDER_CIRCUIT_COOLDOWN_SECONDS = 60  # Tempo com circuito aberto após esgotar as chaves
+
 
 # =========================================
 # Mensagens de Erro
@@ -60,6 +206,16 @@ FALLBACK_RATE_LIMIT_PER_MINUTE = 1000  # Requisições por minuto (quando desabi
 class ErrorMessages:
     """Mensagens de erro padronizadas"""
 
+    # Cache
+    CACHE_REDIS_INVALID_URL = "URL do Redis inválida (use redis://[:senha@]host:porta/db): {url}"
+    CACHE_REDIS_UNAVAILABLE = "Redis indisponível em {host}:{port}: {error}"
+    CACHE_REDIS_PROTOCOL_ERROR = "Resposta inesperada do Redis: {reply!r}"
+
+    # Administração
+    ADMIN_DISABLED = "Endpoints administrativos desabilitados (configure ADMIN_API_TOKEN)"
+    ADMIN_INVALID_TOKEN = "Token administrativo ausente ou inválido"
+    ADMIN_UNKNOWN_AGENT = "Agente desconhecido: {tipo}"
+
     # Validação
     PERGUNTA_VAZIA = "❌ Por favor, digite uma pergunta sobre acessibilidade digital."
     PERGUNTA_MUITO_CURTA = "❌ A pergunta deve ter pelo menos {min} caracteres."
@@ -74,12 +230,17 @@ class ErrorMessages:
     # Quota/Rate Limit
     QUOTA_EXHAUSTED = "Limite de uso atingido. Tente novamente mais tarde."
     RATE_LIMIT_EXCEEDED = "Rate limit excedido no {provider}"
+    COMMAND_RATE_LIMIT_EXCEEDED = "Limite do comando {comando} excedido: {limite} por minuto"
 
     # API Errors
     API_ERROR_GENERIC = (
         "❌ Ocorreu um erro inesperado ao processar sua pergunta. Por favor, tente novamente."
     )
     API_ERROR_EMPTY_RESPONSE = "Erro: A resposta da API veio vazia."
+    API_ERROR_STREAM_INTERRUPTED = (
+        "Erro: A resposta foi interrompida no meio. Por favor, tente novamente."
+    )
+    API_ERROR_TRUNCATED = "Erro: A resposta foi cortada pelo limite de tokens de saída."
     API_ERROR_SAFETY_BLOCK = (
         "Erro: Sua pergunta não pôde ser processada devido às diretrizes de segurança."
     )
@@ -108,6 +269,10 @@ class ErrorMessages:
     # Validation Errors
     VALIDATION_ERROR_GENERIC = "Erro de validação: {error}"
 
+    # Saídas em JSON dos agentes
+    JSON_NOT_FOUND = "Nenhum objeto JSON na resposta do agente"
+    JSON_INCOMPLETE = "Objeto JSON malformado ou incompleto a partir da posição {posicao}"
+
     # Cache
     CACHE_TRUNCATED_WARNING = "Texto truncado para {max_length} caracteres"
 
@@ -127,6 +292,28 @@ class LogMessages:
     CACHE_CACHED = "Resposta cacheada para pergunta: {pergunta}..."
     CACHE_CLEARED = "Cache limpo"
     CACHE_INITIALIZED = "Cache inicializado: max_size={max_size}, ttl={ttl}s"
+    CACHE_BACKEND_SELECTED = "Armazenamento do cache: {backend}"
+    CACHE_BACKEND_ERROR = "Falha no cache ({operation}), seguindo sem cache: {error}"
+    CACHE_SEMANTIC_HIT = (
+        "Cache HIT semântico (similaridade {score:.2f}): '{pergunta}' ~ '{original}'"
+    )
+    CACHE_SEMANTIC_BELOW_THRESHOLD = (
+        "Pergunta similar abaixo do limiar ({score:.2f} < {threshold:.2f}): "
+        "'{pergunta}' ~ '{original}'"
+    )
+    CACHE_INVALIDATION_SCAN = (
+        "Invalidação por similaridade: perguntas lidas do backend {backend} ({count} entradas)"
+    )
+    CACHE_INVALIDATED_SIMILAR = (
+        "Invalidação por similaridade: {count} entradas para '{pergunta}' "
+        "(threshold={threshold}, dry_run={dry_run})"
+    )
+    CACHE_SHARED_CREATED = (
+        "Segmento de cache compartilhado criado em {path}: {slots} slots de {slot_bytes} bytes"
+    )
+    CACHE_SHARED_VALUE_TOO_LARGE = (
+        "Resposta com {size} bytes excede o slot do cache compartilhado ({limit} bytes)"
+    )
 
     # Timeout
     TIMEOUT_GEMINI = "Timeout ao executar Gemini após {timeout}s"
@@ -148,6 +335,54 @@ class LogMessages:
     CONFIG_MISSING_API_KEY = "GOOGLE_API_KEY não configurada nas settings"
     CONFIG_GENAI_INIT_ERROR = "Erro ao inicializar genai.Client: {error}"
 
+    # Startup / Warm-up
+    AGENTS_CREATED = "{count} agentes criados"
+    AGENTS_RELOADED = "{count} agentes recriados com a nova configuração"
+    STREAM_INTERRUPTED = "Streaming do Gemini interrompido depois da primeira parte: {error}"
+    STREAM_FALLBACK = "Streaming do Gemini falhou antes da primeira parte, usando generate: {error}"
+    CONTEXT_CACHE_CREATED = (
+        "Cache de contexto criado para {agente} ({model}, ~{tokens} tokens, TTL {ttl}s): {handle}"
+    )
+    CONTEXT_CACHE_FAILED = (
+        "Falha ao criar cache de contexto para {agente} ({model}); "
+        "instruções inline por {retry}s: {error}"
+    )
+    CONTEXT_CACHE_INVALID = (
+        "Cache de contexto {handle} de {agente} recusado pela API; "
+        "instruções inline por {retry}s: {error}"
+    )
+    CONTEXT_CACHE_RETRY_INLINE = "Refazendo a chamada de {agente} com instruções inline"
+    JSON_EXTRACTED = "JSON do {agente} extraído a partir da posição {inicio} (reparos: {reparos})"
+    COMBINED_FALLBACK = "Resposta combinada rejeitada ({motivo}), usando o pipeline de agentes"
+    RESPONSE_TRUNCATED = "Resposta do {agente} cortada pelo limite de tokens de saída ({limite})"
+    PROMPT_OVER_BUDGET = (
+        "Prompt do {agente} com ~{tokens} tokens excede o orçamento de {budget}: {acao}"
+    )
+    WARMUP_STARTED = "Warm-up iniciado em segundo plano"
+    WARMUP_FINISHED = "Warm-up concluído em {duration:.2f}s"
+    WARMUP_FAILED = "Falha no warm-up: {error}"
+    PROVIDER_CIRCUIT_OPENED = "Circuito do provedor {provider} aberto por {cooldown}s: {reason}"
+    PROVIDER_CIRCUIT_CLOSED = "Circuito do provedor {provider} fechado"
+    CACHE_WARMUP_LOADED = "Cache pré-carregado com {loaded} respostas de {source}"
+    CACHE_WARMUP_SKIPPED = "Arquivo de warm-up do cache não encontrado: {source}"
+    CACHE_WARMUP_FAILED = "Falha ao pré-carregar o cache de {source}: {error}"
+    CACHE_WARMUP_INVALID_ENTRY = "Entrada inválida ignorada no corpus do cache: {index}"
+    CACHE_COMPRESSION_ENABLED = (
+        "Compressão do cache: {algorithm} (dicionário de {dict_bytes} bytes, {samples} amostras)"
+    )
+    CACHE_COMPRESSION_ZSTD_UNAVAILABLE = (
+        "Pacote zstandard não instalado, compressão do cache usa zlib"
+    )
+    CACHE_COMPRESSION_DICT_FAILED = "Dicionário zstd não treinado, comprimindo sem ele: {error}"
+    CACHE_SNAPSHOT_SAVED = "Snapshot do cache salvo com {count} respostas em {source}"
+    ROUTER_DECISION = "Rota '{nivel}' (score {score}) para pergunta: {pergunta}... (estágios pulados: {ignorados})"
+    FAQ_LOADED = "FAQ carregada: {count} temas de {source}"
+    FAQ_HIT = "FAQ HIT (confiança {score:.2f}): '{pergunta}' ~ '{original}'"
+    FAQ_BELOW_THRESHOLD = (
+        "FAQ abaixo do limiar ({score:.2f} < {threshold:.2f}): '{pergunta}' ~ {faq}"
+    )
+    KNOWLEDGE_BASE_LOADED = "Base de conhecimento carregada: {count} referências de {source}"
+
 
 # =========================================
 # Configurações de Frontend
@@ -0,0 +1,319 @@
+"""
+Cache de contexto do Gemini para as instruções fixas dos agentes
+
+Cada agente tem instruções de vários KB (exemplos, regras de formato) que eram
+reenviadas em toda chamada. Aqui as instruções do agente (system instruction,
+declarações das tools e tool_config) são enviadas uma vez por TTL como cached
+content do Gemini e as chamadas passam a referenciar o handle:
+
+- o before_model_callback dos agentes (`usar_cache_de_contexto`) recebe o
+  LlmRequest já montado pelo ADK e troca instruções e tools por cached_content
+- a chave é o hash de modelo + instruções + tools: modelos do roteador e
+  agentes recriados com outra configuração ganham o próprio cache
+- o handle é renovado CONTEXT_CACHE_REFRESH_MARGIN_SECONDS antes de expirar
+- instruções abaixo de settings.context_cache_min_tokens (mínimo do cache
+  explícito do Gemini 2.5) ou falhas na criação seguem inline; depois de uma
+  falha a chave só é tentada de novo após CONTEXT_CACHE_RETRY_SECONDS
+- um handle recusado pela API antes da validade local (apagado, expirado no
+  servidor ou criado com outra chave de API) é descartado pelo
+  on_model_error_callback (`descartar_cache_invalido`) e a chamada é refeita
+  uma vez com as instruções inline (llm_provider)
+
+O cache de contexto do próprio ADK (ContextCacheConfig) só começa no segundo
+turno de uma sessão, e cada chamada do pipeline usa uma sessão nova.
+LocalContextCacheBackend substitui a API nos testes.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from google.genai import types
+
+from chatbot_acessibilidade.config import settings
+from chatbot_acessibilidade.core.constants import (
+    CONTEXT_CACHE_INVALID_CODES,
+    CONTEXT_CACHE_REFRESH_MARGIN_SECONDS,
+    CONTEXT_CACHE_RETRY_SECONDS,
+    LogMessages,
+)
+from chatbot_acessibilidade.core.metrics import record_context_cache
+from chatbot_acessibilidade.core.tokens import estimar_tokens_instrucao
+
+logger = logging.getLogger(__name__)
+
+
+class ContextCacheBackend(ABC):
+    """Onde o conteúdo fixo dos agentes é armazenado"""
+
+    @abstractmethod
+    async def create(
+        self,
+        model: str,
+        system_instruction: Any,
+        tools: Optional[List[types.Tool]],
+        tool_config: Optional[types.ToolConfig],
+        ttl_seconds: int,
+        display_name: str,
+    ) -> str:
+        """
+        Armazena instruções e tools de um agente.
+
+        Returns:
+            Handle usado em GenerateContentConfig.cached_content
+        """
+
+
+class GeminiContextCacheBackend(ContextCacheBackend):
+    """Cached content na API do Gemini (client.caches)"""
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self._client: Optional[Any] = None
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            from google import genai
+
+            self._client = genai.Client(api_key=self.api_key)
+        return self._client
+
+    async def create(
+        self,
+        model: str,
+        system_instruction: Any,
+        tools: Optional[List[types.Tool]],
+        tool_config: Optional[types.ToolConfig],
+        ttl_seconds: int,
+        display_name: str,
+    ) -> str:
+        cached = await self._get_client().aio.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                display_name=display_name,
+                system_instruction=system_instruction,
+                tools=tools or None,
+                tool_config=tool_config,
+                ttl=f"{ttl_seconds}s",
+            ),
+        )
+        return str(cached.name)
+
+
+class LocalContextCacheBackend(ContextCacheBackend):
+    """Substituto em memória da API (testes); os handles não valem no Gemini"""
+
+    def __init__(self) -> None:
+        self.contents: Dict[str, Dict[str, Any]] = {}
+
+    async def create(
+        self,
+        model: str,
+        system_instruction: Any,
+        tools: Optional[List[types.Tool]],
+        tool_config: Optional[types.ToolConfig],
+        ttl_seconds: int,
+        display_name: str,
+    ) -> str:
+        handle = f"cachedContents/local-{len(self.contents) + 1}"
+        self.contents[handle] = {
+            "model": model,
+            "system_instruction": system_instruction,
+            "tools": tools,
+            "tool_config": tool_config,
+            "ttl_seconds": ttl_seconds,
+            "display_name": display_name,
+        }
+        return handle
+
+
+def eh_erro_de_cache_de_contexto(error: BaseException) -> bool:
+    """Erro da API que recusa o handle de cached content do request"""
+    return (
+        getattr(error, "code", None) in CONTEXT_CACHE_INVALID_CODES
+        and "cachedcontent" in str(error).lower()
+    )
+
+
+def _serializar(config: types.GenerateContentConfig, *campos: str) -> str:
+    """Campos da configuração em JSON canônico (parte da chave do cache)"""
+    return json.dumps(
+        config.model_dump(mode="json", include=set(campos), exclude_none=True), sort_keys=True
+    )
+
+
+@dataclass
+class _Entrada:
+    """Handle de uma chave (None após falha) e até quando ele vale"""
+
+    handle: Optional[str]
+    valido_ate: float
+
+
+class InstructionCache:
+    """Handles de cached content por modelo + instruções + tools"""
+
+    def __init__(
+        self,
+        backend: ContextCacheBackend,
+        ttl_seconds: int,
+        min_tokens: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.min_tokens = min_tokens
+        self._clock = clock
+        self._entradas: Dict[str, _Entrada] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def __len__(self) -> int:
+        return sum(1 for entrada in self._entradas.values() if entrada.handle)
+
+    @staticmethod
+    def _chave(model: str, instrucao: str, tools_json: str) -> str:
+        dados = f"{model}\0{instrucao}\0{tools_json}".encode("utf-8")
+        return hashlib.sha256(dados).hexdigest()
+
+    async def aplicar(self, llm_request: Any, agente: str = "") -> bool:
+        """
+        Troca instruções e tools do request pelo handle do cache, se possível.
+
+        Args:
+            llm_request: LlmRequest montado pelo ADK (alterado no lugar)
+            agente: Nome do agente (display_name do cache e logs)
+
+        Returns:
+            True se o request passou a usar cached_content
+        """
+        config = llm_request.config
+        if config is None or config.cached_content or not config.system_instruction:
+            return False
+
+        instrucao = config.system_instruction
+        texto = (
+            instrucao if isinstance(instrucao, str) else _serializar(config, "system_instruction")
+        )
+        tools_json = _serializar(config, "tools", "tool_config")
+        tokens = estimar_tokens_instrucao(texto) + estimar_tokens_instrucao(tools_json)
+        if tokens < self.min_tokens:
+            return False
+
+        model = llm_request.model or settings.agent_model
+        handle = await self._obter_handle(
+            self._chave(model, texto, tools_json), model, config, agente, tokens
+        )
+        if handle is None:
+            record_context_cache("fallbacks")
+            return False
+
+        config.system_instruction = None
+        config.tools = None
+        config.tool_config = None
+        config.cached_content = handle
+        return True
+
+    def descartar(self, handle: str) -> bool:
+        """
+        Descarta um handle recusado pela API antes da validade local.
+
+        A chave segue inline por CONTEXT_CACHE_RETRY_SECONDS, como após uma
+        falha na criação.
+
+        Returns:
+            True se o handle estava em uso
+        """
+        agora = self._clock()
+        chaves = [chave for chave, entrada in self._entradas.items() if entrada.handle == handle]
+        for chave in chaves:
+            self._entradas[chave] = _Entrada(None, agora + CONTEXT_CACHE_RETRY_SECONDS)
+        return bool(chaves)
+
+    async def _obter_handle(
+        self, chave: str, model: str, config: types.GenerateContentConfig, agente: str, tokens: int
+    ) -> Optional[str]:
+        entrada = self._entradas.get(chave)
+        if entrada is not None and self._clock() < entrada.valido_ate:
+            if entrada.handle:
+                record_context_cache("hits")
+            return entrada.handle
+
+        # Uma criação por chave, mesmo com chamadas concorrentes do mesmo agente
+        lock = self._locks.setdefault(chave, asyncio.Lock())
+        async with lock:
+            entrada = self._entradas.get(chave)
+            agora = self._clock()
+            if entrada is not None and agora < entrada.valido_ate:
+                return entrada.handle
+            try:
+                handle = await self.backend.create(
+                    model,
+                    config.system_instruction,
+                    config.tools,
+                    config.tool_config,
+                    self.ttl_seconds,
+                    agente or "agente",
+                )
+            except Exception as e:
+                logger.warning(
+                    LogMessages.CONTEXT_CACHE_FAILED.format(
+                        agente=agente, model=model, retry=CONTEXT_CACHE_RETRY_SECONDS, error=e
+                    )
+                )
+                self._entradas[chave] = _Entrada(None, agora + CONTEXT_CACHE_RETRY_SECONDS)
+                return None
+
+            valido_ate = agora + self.ttl_seconds - CONTEXT_CACHE_REFRESH_MARGIN_SECONDS
+            self._entradas[chave] = _Entrada(handle, valido_ate)
+            record_context_cache("created")
+            logger.info(
+                LogMessages.CONTEXT_CACHE_CREATED.format(
+                    agente=agente, model=model, tokens=tokens, ttl=self.ttl_seconds, handle=handle
+                )
+            )
+            return handle
+
+
+_instruction_cache: Optional[InstructionCache] = None
+
+
+def get_instruction_cache() -> InstructionCache:
+    """Cache de instruções na API do Gemini, criado na primeira chamada"""
+    global _instruction_cache
+    if _instruction_cache is None:
+        _instruction_cache = InstructionCache(
+            GeminiContextCacheBackend(settings.google_api_key),
+            ttl_seconds=settings.context_cache_ttl_seconds,
+            min_tokens=settings.context_cache_min_tokens,
+        )
+    return _instruction_cache
+
+
+async def usar_cache_de_contexto(callback_context: Any, llm_request: Any) -> None:
+    """before_model_callback dos agentes: instruções e tools via cached content"""
+    if settings.context_cache_enabled:
+        await get_instruction_cache().aplicar(llm_request, agente=callback_context.agent_name)
+    return None
+
+
+async def descartar_cache_invalido(callback_context: Any, llm_request: Any, error: Any) -> None:
+    """on_model_error_callback dos agentes: descarta o handle recusado pela API"""
+    config = llm_request.config
+    handle = config.cached_content if config is not None else None
+    if not handle or not eh_erro_de_cache_de_contexto(error):
+        return None
+    if get_instruction_cache().descartar(handle):
+        logger.warning(
+            LogMessages.CONTEXT_CACHE_INVALID.format(
+                handle=handle,
+                agente=callback_context.agent_name,
+                retry=CONTEXT_CACHE_RETRY_SECONDS,
+                error=error,
+            )
+        )
+    return None
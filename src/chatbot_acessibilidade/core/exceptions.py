@@ -21,6 +21,14 @@ class APIError(ChatbotException):
     pass
 
 
+class ResponseTruncatedError(APIError):
+    """Resposta cortada pelo limite de tokens de saída (finish MAX_TOKENS)"""
+
+    def __init__(self, message: str, partial: str = ""):
+        super().__init__(message)
+        self.partial = partial  # Texto gerado até o corte
+
+
 class AgentError(ChatbotException):
     """Erro na execução de um agente"""
 
@@ -43,3 +51,9 @@ class ModelUnavailableError(ChatbotException):
     """Modelo não está disponível no momento"""
 
     pass
+
+
+class CacheBackendError(ChatbotException):
+    """Falha no armazenamento do cache (ex.: Redis indisponível)"""
+
+    pass
@@ -0,0 +1,197 @@
+"""
+Respostas curadas para as perguntas frequentes (FAQ)
+
+Boa parte das perguntas cai em poucas dezenas de temas (contraste, teclado,
+texto alternativo, leitores de tela...). Para esses temas há respostas
+revisadas em data/faq.json, entregues em milissegundos sem chamar nenhum
+agente. O classificador de intenção tem duas etapas:
+
+- autômato de palavras-chave: uma trie de frases gatilho (termos
+  normalizados por semantic_index.tokenize) percorrida sobre a pergunta;
+  só as entradas com algum gatilho viram candidatas
+- pontuação léxica: cosseno TF-IDF entre a pergunta e as perguntas
+  canônicas de cada candidata (QuestionIndex), usado como confiança
+
+A resposta curada só é usada com confiança >= settings.faq_confidence_threshold.
+Termos que não aparecem em nenhuma pergunta canônica derrubam o cosseno, então
+perguntas específicas ("contraste em gráficos SVG no React") seguem para o
+pipeline de agentes. Números (versões e critérios: "WCAG 3", "1.4.11") pesam
+pouco no cosseno, então uma pergunta canônica só vale se contiver todos os
+números da pergunta.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from chatbot_acessibilidade.config import settings
+from chatbot_acessibilidade.core.constants import (
+    FAQ_CANDIDATES,
+    FAQ_FILE,
+    LogMessages,
+)
+from chatbot_acessibilidade.core.formatter import formatar_resposta_final
+from chatbot_acessibilidade.core.semantic_index import QuestionIndex, tokenize
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+# Marca de fim de frase na trie de gatilhos
+_FIM = ""
+
+
+@dataclass
+class FaqEntry:
+    """Tema da FAQ com gatilhos, perguntas canônicas e resposta revisada"""
+
+    id: str
+    titulo: str
+    gatilhos: List[str]
+    perguntas: List[str]
+    resposta: Dict[str, str]
+
+    def formatar(self) -> Dict[str, str]:
+        """Resposta no mesmo formato de seções do pipeline"""
+        return formatar_resposta_final(
+            self.resposta["introducao"],
+            self.resposta["conceitos"],
+            self.resposta["testes"],
+            self.resposta["aprofundar"],
+            self.resposta["dica"],
+        )
+
+
+class KeywordAutomaton:
+    """Trie de frases gatilho sobre termos normalizados"""
+
+    def __init__(self) -> None:
+        self._raiz: Dict[str, Any] = {}
+
+    def add(self, frase: str, entry_id: str) -> None:
+        termos = tokenize(frase)
+        if not termos:
+            return
+        no = self._raiz
+        for termo in termos:
+            no = no.setdefault(termo, {})
+        no.setdefault(_FIM, set()).add(entry_id)
+
+    def match(self, termos: List[str]) -> Set[str]:
+        """Entradas com pelo menos uma frase gatilho contida nos termos"""
+        encontradas: Set[str] = set()
+        for inicio in range(len(termos)):
+            no = self._raiz
+            for termo in termos[inicio:]:
+                no = no.get(termo)
+                if no is None:
+                    break
+                encontradas |= no.get(_FIM, set())
+        return encontradas
+
+
+class FaqClassifier:
+    """Classifica a pergunta em um tema da FAQ com uma confiança de 0.0 a 1.0"""
+
+    def __init__(self, entries: List[FaqEntry]):
+        self.entries = {entry.id: entry for entry in entries}
+        self._automaton = KeywordAutomaton()
+        self._index = QuestionIndex()
+        for entry in entries:
+            for gatilho in entry.gatilhos:
+                self._automaton.add(gatilho, entry.id)
+            for posicao, pergunta in enumerate(entry.perguntas):
+                self._index.add(f"{entry.id}#{posicao}", pergunta)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def classify(self, pergunta: str) -> Optional[Tuple[FaqEntry, str, float]]:
+        """
+        Encontra o tema da FAQ mais provável para a pergunta.
+
+        Args:
+            pergunta: Pergunta do usuário
+
+        Returns:
+            (entrada, pergunta canônica mais próxima, confiança) ou None se
+            nenhum gatilho aparecer na pergunta ou se nenhuma pergunta canônica
+            tiver os números (versão, critério) da pergunta
+        """
+        termos = tokenize(pergunta)
+        candidatas = self._automaton.match(termos)
+        if not candidatas:
+            return None
+        numeros = {termo for termo in termos if termo[0].isdigit()}
+        for key, canonica, similaridade in self._index.search(pergunta, limit=FAQ_CANDIDATES):
+            entry_id = key.rsplit("#", 1)[0]
+            if entry_id in candidatas and numeros <= set(tokenize(canonica)):
+                return self.entries[entry_id], canonica, similaridade
+        return None
+
+
+def load_faq(path: Optional[Path] = None) -> FaqClassifier:
+    """
+    Carrega as respostas curadas e monta o classificador.
+
+    Args:
+        path: Arquivo JSON ({"entries": [...]}); padrão é a FAQ empacotada
+
+    Returns:
+        FaqClassifier pronto para uso
+    """
+    path = path or PACKAGE_DIR / FAQ_FILE
+    with path.open(encoding="utf-8") as f:
+        entries = [FaqEntry(**entry) for entry in json.load(f)["entries"]]
+    logger.info(LogMessages.FAQ_LOADED.format(count=len(entries), source=path))
+    return FaqClassifier(entries)
+
+
+_classifier: Optional[FaqClassifier] = None
+
+
+def get_faq_classifier() -> FaqClassifier:
+    """FAQ empacotada, carregada na primeira pergunta"""
+    global _classifier
+    if _classifier is None:
+        _classifier = load_faq()
+    return _classifier
+
+
+def responder_faq(pergunta: str) -> Optional[Dict[str, str]]:
+    """
+    Resposta curada para a pergunta, se a confiança for alta o bastante.
+
+    Comandos (/simular, /refatorar) nunca são respondidos pela FAQ.
+
+    Args:
+        pergunta: Pergunta do usuário
+
+    Returns:
+        Resposta formatada em seções ou None (segue para o cache e os agentes)
+    """
+    if not settings.faq_enabled or pergunta.lstrip().startswith("/"):
+        return None
+
+    resultado = get_faq_classifier().classify(pergunta)
+    if resultado is None:
+        return None
+
+    entry, canonica, confianca = resultado
+    if confianca < settings.faq_confidence_threshold:
+        logger.debug(
+            LogMessages.FAQ_BELOW_THRESHOLD.format(
+                score=confianca,
+                threshold=settings.faq_confidence_threshold,
+                pergunta=pergunta[:50],
+                faq=entry.id,
+            )
+        )
+        return None
+
+    logger.info(
+        LogMessages.FAQ_HIT.format(score=confianca, pergunta=pergunta[:50], original=canonica)
+    )
+    return entry.formatar()
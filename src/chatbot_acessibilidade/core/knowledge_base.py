@@ -0,0 +1,165 @@
+"""
+Base de conhecimento offline de acessibilidade
+
+O Aprofundador (e o Testador) devolvem quase sempre links canônicos da W3C,
+WebAIM e MDN. Com o `google_search` cada resposta custava idas e voltas da
+tool no Gemini; aqui as referências vêm de um arquivo empacotado com o projeto
+e indexado em memória:
+
+- critérios de sucesso da WCAG 2.2 (número, nível, link do Understanding)
+- padrões do WAI-ARIA APG, técnicas e falhas da WCAG
+- tutoriais WAI, artigos de referência e ferramentas de teste
+
+A busca usa os mesmos termos normalizados do índice semântico do cache
+(semantic_index.tokenize, sem negações e interrogativos) com BM25 sobre todas
+as entradas: a base tem poucas centenas de itens, então a varredura leva menos
+de um milissegundo.
+"""
+
+import json
+import logging
+import math
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from chatbot_acessibilidade.core.constants import (
+    CACHE_SEMANTIC_BM25_B,
+    CACHE_SEMANTIC_BM25_K1,
+    KNOWLEDGE_BASE_FILE,
+    KNOWLEDGE_BASE_KEYWORD_WEIGHT,
+    KNOWLEDGE_BASE_MAX_RESULTS,
+    LogMessages,
+)
+from chatbot_acessibilidade.core.semantic_index import KEYWORD_STOPWORDS, tokenize
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+# Campos devolvidos para o agente (palavras-chave ficam só no índice)
+RESULT_FIELDS = ("id", "tipo", "titulo", "titulo_pt", "nivel", "fonte", "url", "resumo")
+
+
+class KnowledgeBase:
+    """Índice BM25 em memória sobre as referências da base"""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries = entries
+        self._termos: List[Counter] = []
+        self._df: Counter = Counter()
+        for entry in entries:
+            destaque = f"{entry.get('titulo', '')} {entry.get('titulo_pt', '')} "
+            destaque += entry.get("palavras_chave", "")
+            termos = Counter(
+                tokenize(f"{entry['id']} {entry.get('resumo', '')}", KEYWORD_STOPWORDS)
+            )
+            for termo in tokenize(destaque, KEYWORD_STOPWORDS):
+                termos[termo] += KNOWLEDGE_BASE_KEYWORD_WEIGHT
+            self._termos.append(termos)
+            self._df.update(termos.keys())
+        total = sum(sum(termos.values()) for termos in self._termos)
+        self._media = total / len(entries) if entries else 0.0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _idf(self, termo: str) -> float:
+        df = self._df.get(termo, 0)
+        return math.log(1 + (len(self.entries) - df + 0.5) / (df + 0.5))
+
+    def search(
+        self, consulta: str, tipo: str = "", limit: int = KNOWLEDGE_BASE_MAX_RESULTS
+    ) -> List[Dict[str, Any]]:
+        """
+        Busca as referências mais relevantes para a consulta.
+
+        Args:
+            consulta: Tema em português ou inglês (ex: "contraste de texto", "1.4.3")
+            tipo: Filtra por tipo de entrada (criterio, padrao, tecnica, falha,
+                tutorial, especificacao, artigo, ferramenta); vazio = todos
+            limit: Número máximo de resultados
+
+        Returns:
+            Entradas encontradas (sem as palavras-chave) em ordem de relevância
+        """
+        termos_consulta = set(tokenize(consulta, KEYWORD_STOPWORDS))
+        if not termos_consulta or not self.entries:
+            return []
+
+        k1, b = CACHE_SEMANTIC_BM25_K1, CACHE_SEMANTIC_BM25_B
+        idf = {termo: self._idf(termo) for termo in termos_consulta}
+        pontuadas = []
+        for posicao, (entry, termos) in enumerate(zip(self.entries, self._termos, strict=True)):
+            if tipo and entry.get("tipo") != tipo:
+                continue
+            normalizacao = k1 * (1 - b + b * sum(termos.values()) / self._media)
+            score = sum(
+                idf[termo] * termos[termo] * (k1 + 1) / (termos[termo] + normalizacao)
+                for termo in termos_consulta
+                if termo in termos
+            )
+            if score > 0:
+                pontuadas.append((score, -posicao, entry))
+
+        pontuadas.sort(key=lambda item: item[:2], reverse=True)
+        return [
+            {campo: entry.get(campo, "") for campo in RESULT_FIELDS}
+            for _score, _posicao, entry in pontuadas[:limit]
+        ]
+
+
+def load_knowledge_base(path: Optional[Path] = None) -> KnowledgeBase:
+    """
+    Carrega e indexa a base de conhecimento.
+
+    Args:
+        path: Arquivo JSON ({"entries": [...]}); padrão é a base empacotada
+
+    Returns:
+        KnowledgeBase indexada
+    """
+    path = path or PACKAGE_DIR / KNOWLEDGE_BASE_FILE
+    with path.open(encoding="utf-8") as f:
+        entries = json.load(f)["entries"]
+    logger.info(LogMessages.KNOWLEDGE_BASE_LOADED.format(count=len(entries), source=path))
+    return KnowledgeBase(entries)
+
+
+_knowledge_base: Optional[KnowledgeBase] = None
+
+
+def get_knowledge_base() -> KnowledgeBase:
+    """Base empacotada, carregada na primeira busca"""
+    global _knowledge_base
+    if _knowledge_base is None:
+        _knowledge_base = load_knowledge_base()
+    return _knowledge_base
+
+
+def buscar_referencias_acessibilidade(consulta: str, tipo: str = "") -> Dict[str, Any]:
+    """
+    Busca referências oficiais de acessibilidade na base local (sem internet).
+
+    A base contém os critérios de sucesso da WCAG 2.2 (número, nível e link
+    do Understanding), padrões do WAI-ARIA APG, técnicas e falhas da WCAG,
+    tutoriais da WAI, artigos (MDN, WebAIM, A11y Project, web.dev) e
+    ferramentas de teste (axe, WAVE, Lighthouse, NVDA, verificadores de
+    contraste). Use os links devolvidos em vez de inventar URLs.
+
+    Args:
+        consulta: Tema da busca em português ou inglês, ou número de um
+            critério (ex: "modal foco teclado", "contraste", "1.4.3").
+        tipo: Filtro opcional: "criterio", "padrao", "tecnica", "falha",
+            "tutorial", "especificacao", "artigo" ou "ferramenta". Vazio
+            busca em todos.
+
+    Returns:
+        {"status": "success", "resultados": [...]} com título, fonte, nível,
+        url e resumo de cada referência, ou {"status": "not_found"} quando
+        nada corresponde à consulta.
+    """
+    resultados = get_knowledge_base().search(consulta, tipo=tipo)
+    if not resultados:
+        return {"status": "not_found", "resultados": []}
+    return {"status": "success", "resultados": resultados}
@@ -6,8 +6,9 @@ import asyncio
 import logging
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 from google.adk.agents import Agent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google import genai
@@ -20,15 +21,50 @@ from chatbot_acessibilidade.core.exceptions import (
     AgentError,
     QuotaExhaustedError,
     ModelUnavailableError,
+    ResponseTruncatedError,
 )
 from chatbot_acessibilidade.core.constants import (
     ErrorMessages,
     LogMessages,
 )
+from chatbot_acessibilidade.core.context_cache import eh_erro_de_cache_de_contexto
+from chatbot_acessibilidade.core.provider_health import (
+    record_provider_exhausted,
+    record_provider_success,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Cópias dos agentes com outro modelo (roteamento por complexidade)
+_agent_variants: Dict[Tuple[str, str], Agent] = {}
+
+
+def agent_with_model(agent: Agent, model: Optional[str]) -> Agent:
+    """
+    Retorna o agente configurado com o modelo pedido.
+
+    Args:
+        agent: Agente original
+        model: Modelo desejado (None mantém o modelo do agente)
+
+    Returns:
+        O próprio agente ou uma cópia (reutilizada entre chamadas) com o modelo trocado
+    """
+    if not model or model == agent.model:
+        return agent
+    key = (agent.name, model)
+    variant = _agent_variants.get(key)
+    if variant is None:
+        variant = agent.model_copy(update={"model": model})
+        _agent_variants[key] = variant
+    return variant
+
+
+def clear_agent_variants() -> None:
+    """Descarta as cópias com outro modelo (agentes recriados com nova configuração)"""
+    _agent_variants.clear()
+
 
 class LLMProvider(Enum):
     """Enum para identificar o provedor de LLM"""
@@ -40,13 +76,16 @@ class LLMClient(ABC):
     """Interface base para clientes de LLM"""
 
     @abstractmethod
-    async def generate(self, prompt: str, model: Optional[str] = None) -> str:
+    async def generate(
+        self, prompt: str, model: Optional[str] = None, timeout: Optional[float] = None
+    ) -> str:
         """
         Gera uma resposta para o prompt fornecido.
 
         Args:
             prompt: Texto do prompt
-            model: Nome do modelo (opcional, usado principalmente para Hugging Face)
+            model: Nome do modelo (opcional; None usa o modelo do agente)
+            timeout: Timeout em segundos (opcional; None usa settings.api_timeout_seconds)
 
         Returns:
             Resposta gerada como string
@@ -58,6 +97,24 @@ class LLMClient(ABC):
         """
         pass
 
+    async def generate_stream(
+        self, prompt: str, model: Optional[str] = None, timeout: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Gera a resposta em partes, à medida que o modelo produz o texto.
+
+        A implementação padrão entrega a resposta de `generate` em uma única parte.
+
+        Args:
+            prompt: Texto do prompt
+            model: Nome do modelo (opcional; None usa o modelo do agente)
+            timeout: Timeout total em segundos (opcional)
+
+        Yields:
+            Trechos de texto, na ordem; concatenados formam a resposta
+        """
+        yield await self.generate(prompt, model=model, timeout=timeout)
+
     @abstractmethod
     def should_fallback(self, exception: Exception) -> bool:
         """
@@ -143,28 +200,31 @@ class GoogleGeminiClient(LLMClient):
         # Garante que o cliente está inicializado
         self._get_genai_client()
 
-    async def _execute_runner_with_retry(self, prompt: str, session_id: str, app_name: str) -> str:
+    async def _execute_runner_with_retry(
+        self,
+        prompt: str,
+        session_id: str,
+        app_name: str,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
         """Executa o runner com lógica de retry para coletar resposta"""
-        session_service = InMemorySessionService()
-        runner = Runner(agent=self.agent, app_name=app_name, session_service=session_service)
-
-        await session_service.create_session(
-            user_id="user", session_id=session_id, app_name=app_name
-        )
-        content = types.Content(role="user", parts=[types.Part(text=prompt)])
+        runner, content = await self._preparar_runner(prompt, session_id, app_name, model)
         final_response_content = None
+        finish_reason = None
 
         async def coletar_resposta():
-            nonlocal final_response_content
+            nonlocal final_response_content, finish_reason
             async for evento in runner.run_async(
                 user_id="user", session_id=session_id, new_message=content
             ):
                 if evento.is_final_response():
                     final_response_content = evento.content
+                    finish_reason = evento.finish_reason
                     break
 
         # Coleta a resposta final com timeout
-        await asyncio.wait_for(coletar_resposta(), timeout=settings.api_timeout_seconds)
+        await asyncio.wait_for(coletar_resposta(), timeout=timeout or settings.api_timeout_seconds)
 
         # Verifica se a resposta recebida é válida
         if not final_response_content or not final_response_content.parts:
@@ -186,10 +246,163 @@ class GoogleGeminiClient(LLMClient):
             for parte in final_response_content.parts
             if getattr(parte, "text", None) is not None
         )
+        self._verificar_corte(finish_reason, resultado.strip())
         return str(resultado.strip())
 
-    async def generate(self, prompt: str, model: Optional[str] = None) -> str:
-        """Gera resposta usando Google Gemini"""
+    def _verificar_corte(self, finish_reason: Any, texto: str) -> None:
+        """
+        Resposta cortada por max_output_tokens vira erro: quem reescreve a resposta
+        (Validador, Revisor) mantém o texto anterior em vez de um texto pela metade.
+        """
+        if finish_reason != types.FinishReason.MAX_TOKENS:
+            return
+        config = getattr(self.agent, "generate_content_config", None)
+        logger.warning(
+            LogMessages.RESPONSE_TRUNCATED.format(
+                agente=self.agent.name, limite=config.max_output_tokens if config else None
+            )
+        )
+        raise ResponseTruncatedError(ErrorMessages.API_ERROR_TRUNCATED, partial=texto)
+
+    async def _execute_runner_inline_on_cache_error(
+        self,
+        prompt: str,
+        session_id: str,
+        app_name: str,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Executa o runner refazendo a chamada uma vez se a API recusar o cache de contexto.
+
+        O on_model_error_callback do agente já descartou o handle, então a nova
+        chamada segue com as instruções inline.
+        """
+        try:
+            return await self._execute_runner_with_retry(
+                prompt, session_id, app_name, model, timeout
+            )
+        except Exception as e:
+            if not eh_erro_de_cache_de_contexto(e):
+                raise
+            logger.warning(LogMessages.CONTEXT_CACHE_RETRY_INLINE.format(agente=self.agent.name))
+            return await self._execute_runner_with_retry(
+                prompt, session_id, app_name, model, timeout
+            )
+
+    async def _preparar_runner(
+        self, prompt: str, session_id: str, app_name: str, model: Optional[str]
+    ) -> Tuple[Runner, types.Content]:
+        """Runner com sessão nova e a mensagem do usuário"""
+        session_service = InMemorySessionService()
+        runner = Runner(
+            agent=agent_with_model(self.agent, model),
+            app_name=app_name,
+            session_service=session_service,
+        )
+        await session_service.create_session(
+            user_id="user", session_id=session_id, app_name=app_name
+        )
+        return runner, types.Content(role="user", parts=[types.Part(text=prompt)])
+
+    async def _stream_runner(
+        self,
+        prompt: str,
+        session_id: str,
+        app_name: str,
+        model: Optional[str],
+        timeout: float,
+    ) -> AsyncIterator[str]:
+        """Executa o runner em modo SSE e entrega o texto dos eventos parciais"""
+        runner, content = await self._preparar_runner(prompt, session_id, app_name, model)
+        eventos = runner.run_async(
+            user_id="user",
+            session_id=session_id,
+            new_message=content,
+            run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+        ).__aiter__()
+        loop = asyncio.get_running_loop()
+        prazo = loop.time() + timeout
+        emitiu = False
+        finish_reason = None
+        textos = []
+
+        try:
+            while True:
+                # O timeout vale para a resposta inteira, não para cada parte
+                try:
+                    evento = await asyncio.wait_for(
+                        eventos.__anext__(), timeout=max(prazo - loop.time(), 0)
+                    )
+                except StopAsyncIteration:
+                    break
+
+                partes = evento.content.parts if evento.content and evento.content.parts else []
+                texto = "".join(
+                    parte.text
+                    for parte in partes
+                    if parte.text and not getattr(parte, "thought", False)
+                )
+                if evento.partial:
+                    if texto:
+                        emitiu = True
+                        textos.append(texto)
+                        yield texto
+                elif evento.is_final_response():
+                    # Sem eventos parciais (ex: resposta após uma tool) o texto vem inteiro aqui
+                    if texto and not emitiu:
+                        emitiu = True
+                        textos.append(texto)
+                        yield texto
+                    finish_reason = evento.finish_reason
+                    break
+        finally:
+            await eventos.aclose()
+
+        if not emitiu:
+            logger.warning("Resposta vazia do Gemini")
+            raise APIError(ErrorMessages.API_ERROR_EMPTY_RESPONSE)
+        self._verificar_corte(finish_reason, "".join(textos))
+
+    async def generate_stream(
+        self, prompt: str, model: Optional[str] = None, timeout: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Gera a resposta em partes usando Google Gemini (streaming SSE do ADK).
+
+        Erros antes da primeira parte seguem para `generate`, que trata troca de
+        chave e manutenção; depois da primeira parte o erro é propagado, pois o
+        consumidor já recebeu texto.
+        """
+        self._get_genai_client()
+
+        import os
+
+        session_id = f"gemini_{os.urandom(4).hex()}"
+        limite = timeout or settings.api_timeout_seconds
+        emitiu = False
+        try:
+            async for texto in self._stream_runner(prompt, session_id, "agents", model, limite):
+                emitiu = True
+                yield texto
+            record_provider_success(self.get_provider_name())
+            return
+        except asyncio.TimeoutError:
+            raise APIError(ErrorMessages.TIMEOUT_GEMINI.format(timeout=limite))
+        except APIError:
+            raise
+        except Exception as e:
+            if emitiu:
+                logger.error(LogMessages.STREAM_INTERRUPTED.format(error=e))
+                raise APIError(ErrorMessages.API_ERROR_STREAM_INTERRUPTED)
+            logger.warning(LogMessages.STREAM_FALLBACK.format(error=e))
+
+        yield await self.generate(prompt, model=model, timeout=timeout)
+
+    async def generate(
+        self, prompt: str, model: Optional[str] = None, timeout: Optional[float] = None
+    ) -> str:
+        """Gera resposta usando Google Gemini (model substitui o modelo do agente)"""
         logger.debug("Usando Google Gemini para gerar resposta")
 
         # Garante que o cliente está inicializado
@@ -201,11 +414,15 @@ class GoogleGeminiClient(LLMClient):
         app_name = "agents"
 
         try:
-            return await self._execute_runner_with_retry(prompt, session_id, app_name)
+            resposta = await self._execute_runner_inline_on_cache_error(
+                prompt, session_id, app_name, model, timeout
+            )
+            record_provider_success(self.get_provider_name())
+            return resposta
 
         except asyncio.TimeoutError:
             raise APIError(
-                ErrorMessages.TIMEOUT_GEMINI.format(timeout=settings.api_timeout_seconds)
+                ErrorMessages.TIMEOUT_GEMINI.format(timeout=timeout or settings.api_timeout_seconds)
             )
         except (google_exceptions.ResourceExhausted, google_exceptions.GoogleAPICallError) as e:
             # Verifica se é erro de quota (429 ou ResourceExhausted)
@@ -223,14 +440,18 @@ class GoogleGeminiClient(LLMClient):
                     logger.info("Tentando novamente com chave secundária...")
                     try:
                         # Reinicializa cliente com nova chave (feito no switch) e tenta novamente
-                        return await self._execute_runner_with_retry(prompt, session_id, app_name)
+                        resposta = await self._execute_runner_with_retry(
+                            prompt, session_id, app_name, model, timeout
+                        )
+                        record_provider_success(self.get_provider_name())
+                        return resposta
                     except Exception as retry_error:
                         logger.error(f"Erro mesmo com chave secundária: {retry_error}")
                         # Se falhar novamente, retorna mensagem de manutenção
-                        return str(ErrorMessages.MAINTENANCE_MESSAGE)
+                        return self._maintenance_response(str(retry_error))
                 else:
                     # Se não tem chave secundária ou já usou, retorna mensagem de manutenção
-                    return str(ErrorMessages.MAINTENANCE_MESSAGE)
+                    return self._maintenance_response(str(e))
 
             # Outros erros de API
             if isinstance(e, google_exceptions.PermissionDenied):
@@ -260,15 +481,24 @@ class GoogleGeminiClient(LLMClient):
                 if self._switch_to_secondary_key():
                     logger.info("Tentando novamente com chave secundária...")
                     try:
-                        return await self._execute_runner_with_retry(prompt, session_id, app_name)
+                        resposta = await self._execute_runner_with_retry(
+                            prompt, session_id, app_name, model, timeout
+                        )
+                        record_provider_success(self.get_provider_name())
+                        return resposta
                     except Exception as retry_error:
                         logger.error(f"Erro mesmo com chave secundária: {retry_error}")
-                        return str(ErrorMessages.MAINTENANCE_MESSAGE)
+                        return self._maintenance_response(str(retry_error))
                 else:
-                    return str(ErrorMessages.MAINTENANCE_MESSAGE)
+                    return self._maintenance_response(str(e))
 
             raise AgentError(f"Erro: Ocorreu uma falha inesperada. Detalhes: {str(e)}")
 
+    def _maintenance_response(self, reason: str) -> str:
+        """Abre o circuito do provedor (chaves esgotadas) e retorna a mensagem de manutenção"""
+        record_provider_exhausted(self.get_provider_name(), reason)
+        return str(ErrorMessages.MAINTENANCE_MESSAGE)
+
     def should_fallback(self, exception: Exception) -> bool:
         """Determina se deve acionar fallback"""
         if isinstance(exception, QuotaExhaustedError):
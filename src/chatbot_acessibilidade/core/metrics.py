@@ -10,6 +10,11 @@ from threading import Lock
 
 logger = logging.getLogger(__name__)
 
+
+def _novo_contador_tokens() -> Dict[str, int]:
+    return {"calls": 0, "prompt_tokens": 0, "response_tokens": 0, "over_budget": 0}
+
+
 # Armazenamento de métricas (thread-safe)
 _metrics_lock = Lock()
 _metrics: Dict[str, Any] = {
@@ -19,6 +24,10 @@ _metrics: Dict[str, Any] = {
     "total_requests": 0,  # Total de requisições
     "cache_hits": 0,  # Cache hits
     "cache_misses": 0,  # Cache misses
+    "faq_hits": 0,  # Perguntas respondidas pela FAQ curada
+    "tokens": defaultdict(_novo_contador_tokens),  # Tokens estimados por agente
+    "context_cache": {"hits": 0, "created": 0, "fallbacks": 0},  # Instruções cacheadas
+    "combined": {"accepted": 0, "fallbacks": 0},  # Respostas do modo combinado
 }
 
 _lock = Lock()
@@ -69,6 +78,57 @@ def record_cache_miss() -> None:
         _metrics["cache_misses"] += 1
 
 
+def record_faq_hit() -> None:
+    """Registra uma pergunta respondida pela FAQ curada."""
+    with _lock:
+        _metrics["faq_hits"] += 1
+
+
+def record_tokens(agent_name: str, prompt_tokens: int, response_tokens: int) -> None:
+    """
+    Registra os tokens estimados de uma chamada a um agente.
+
+    Args:
+        agent_name: Nome do agente
+        prompt_tokens: Tokens de entrada (instruções + prompt)
+        response_tokens: Tokens da resposta
+    """
+    with _lock:
+        contador = _metrics["tokens"][agent_name]
+        contador["calls"] += 1
+        contador["prompt_tokens"] += prompt_tokens
+        contador["response_tokens"] += response_tokens
+
+
+def record_prompt_over_budget(agent_name: str) -> None:
+    """Registra um prompt acima do orçamento do estágio (resumido ou pulado)."""
+    with _lock:
+        _metrics["tokens"][agent_name]["over_budget"] += 1
+
+
+def record_context_cache(evento: str) -> None:
+    """
+    Registra o uso do cache de contexto das instruções.
+
+    Args:
+        evento: "hits" (handle reutilizado), "created" (handle criado) ou
+            "fallbacks" (instruções enviadas inline após falha)
+    """
+    with _lock:
+        _metrics["context_cache"][evento] += 1
+
+
+def record_combined(evento: str) -> None:
+    """
+    Registra o resultado de uma resposta do modo combinado.
+
+    Args:
+        evento: "accepted" (resposta usada) ou "fallbacks" (pipeline de agentes)
+    """
+    with _lock:
+        _metrics["combined"][evento] += 1
+
+
 def get_metrics() -> Dict[str, Any]:
     """
     Retorna todas as métricas coletadas.
@@ -82,6 +142,23 @@ def get_metrics() -> Dict[str, Any]:
         fallback_count = _metrics["fallback_count"]
         cache_hits = _metrics["cache_hits"]
         cache_misses = _metrics["cache_misses"]
+        faq_hits = _metrics["faq_hits"]
+        context_cache = dict(_metrics["context_cache"])
+        combined = dict(_metrics["combined"])
+        tokens = {
+            agent: {
+                **contador,
+                "avg_prompt_tokens": (
+                    round(contador["prompt_tokens"] / contador["calls"]) if contador["calls"] else 0
+                ),
+                "avg_response_tokens": (
+                    round(contador["response_tokens"] / contador["calls"])
+                    if contador["calls"]
+                    else 0
+                ),
+            }
+            for agent, contador in _metrics["tokens"].items()
+        }
 
         # Calcula estatísticas de tempo
         avg_response_time = sum(response_times) / len(response_times) if response_times else 0.0
@@ -120,9 +197,15 @@ def get_metrics() -> Dict[str, Any]:
                 "misses": cache_misses,
                 "hit_rate": round(cache_hit_rate, 2),
             },
+            "faq": {
+                "hits": faq_hits,
+            },
             "agent_times": {
                 agent: round(avg_time, 3) for agent, avg_time in agent_avg_times.items()
             },
+            "tokens": tokens,
+            "context_cache": context_cache,
+            "combined": combined,
         }
 
 
@@ -135,6 +218,10 @@ def reset_metrics() -> None:
         _metrics["total_requests"] = 0
         _metrics["cache_hits"] = 0
         _metrics["cache_misses"] = 0
+        _metrics["faq_hits"] = 0
+        _metrics["tokens"] = defaultdict(_novo_contador_tokens)
+        _metrics["context_cache"] = {"hits": 0, "created": 0, "fallbacks": 0}
+        _metrics["combined"] = {"accepted": 0, "fallbacks": 0}
 
 
 class MetricsContext:
@@ -0,0 +1,139 @@
+"""
+Detecção de perguntas quase duplicadas com MinHash e LSH
+
+Quando uma orientação da WCAG muda, todas as reformulações de uma pergunta
+precisam sair do cache, não só a chave exata. Comparar a pergunta com cada
+entrada cacheada é linear; aqui cada pergunta ganha uma assinatura MinHash e
+as assinaturas são divididas em faixas (bandas): perguntas que coincidem em
+pelo menos uma banda caem no mesmo bucket e viram candidatas.
+
+- Conjunto de cada pergunta: termos normalizados (os mesmos do índice de
+  perguntas, semantic_index.tokenize) e pares de termos consecutivos, para
+  considerar a ordem
+- As assinaturas só escolhem as candidatas; a similaridade devolvida é o
+  Jaccard exato entre os conjuntos
+- Com 16 bandas de 4 linhas, perguntas com Jaccard 0.7 viram candidatas com
+  probabilidade de ~99%; os limiares de invalidação são mais altos
+"""
+
+import hashlib
+import struct
+from typing import Dict, FrozenSet, List, Sequence, Set, Tuple
+
+from chatbot_acessibilidade.core.constants import CACHE_MINHASH_BANDS, CACHE_MINHASH_ROWS
+
+MAX_HASH = (1 << 32) - 1
+
+
+def shingles(termos: Sequence[str]) -> FrozenSet[str]:
+    """
+    Conjunto comparado entre perguntas: termos e pares de termos consecutivos.
+
+    Args:
+        termos: Termos normalizados da pergunta, na ordem original
+
+    Returns:
+        Conjunto de shingles (vazio se a pergunta só tiver stopwords)
+    """
+    pares = (f"{a} {b}" for a, b in zip(termos, termos[1:], strict=False))
+    return frozenset([*termos, *pares])
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Similaridade de Jaccard entre dois conjuntos"""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashLSH:
+    """
+    Índice LSH de assinaturas MinHash por chave do cache.
+
+    Cada posição da assinatura usa uma função de hash independente: os
+    `bands x rows` valores de um shingle saem de um único SHAKE-128, sem
+    sementes aleatórias (assinaturas comparáveis entre processos).
+    """
+
+    def __init__(self, bands: int = CACHE_MINHASH_BANDS, rows: int = CACHE_MINHASH_ROWS):
+        self.bands = bands
+        self.rows = rows
+        self._positions = bands * rows
+        self._format = struct.Struct(f"<{self._positions}I")
+        self._shingles: Dict[str, FrozenSet[str]] = {}
+        self._bands: Dict[str, List[Tuple[int, ...]]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def signature(self, conjunto: FrozenSet[str]) -> List[int]:
+        """Assinatura MinHash (um mínimo por permutação)"""
+        if not conjunto:
+            return [MAX_HASH] * self._positions
+        hashes = [
+            self._format.unpack(
+                hashlib.shake_128(shingle.encode("utf-8")).digest(self._format.size)
+            )
+            for shingle in conjunto
+        ]
+        return list(map(min, zip(*hashes, strict=True)))
+
+    def _split(self, assinatura: List[int]) -> List[Tuple[int, ...]]:
+        return [
+            tuple(assinatura[banda * self.rows : (banda + 1) * self.rows])
+            for banda in range(self.bands)
+        ]
+
+    def add(self, key: str, termos: Sequence[str]) -> None:
+        """Indexa (ou reindexa) os termos da pergunta de uma chave"""
+        self.remove(key)
+        conjunto = shingles(termos)
+        if not conjunto:
+            return
+        bandas = self._split(self.signature(conjunto))
+        self._shingles[key] = conjunto
+        self._bands[key] = bandas
+        for indice, banda in enumerate(bandas):
+            self._buckets.setdefault((indice, banda), set()).add(key)
+
+    def remove(self, key: str) -> bool:
+        """Remove uma chave; True se ela estava indexada"""
+        if self._shingles.pop(key, None) is None:
+            return False
+        for indice, banda in enumerate(self._bands.pop(key)):
+            bucket = self._buckets[(indice, banda)]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[(indice, banda)]
+        return True
+
+    def clear(self) -> None:
+        self._shingles.clear()
+        self._bands.clear()
+        self._buckets.clear()
+
+    def query(self, termos: Sequence[str], threshold: float) -> List[Tuple[str, float]]:
+        """
+        Busca as chaves com Jaccard >= threshold em relação à pergunta.
+
+        Args:
+            termos: Termos normalizados da pergunta de referência
+            threshold: Similaridade mínima (0.0 a 1.0)
+
+        Returns:
+            Lista de (chave, similaridade) em ordem decrescente
+        """
+        conjunto = shingles(termos)
+        if not conjunto:
+            return []
+        candidatas: Set[str] = set()
+        for indice, banda in enumerate(self._split(self.signature(conjunto))):
+            candidatas |= self._buckets.get((indice, banda), set())
+
+        resultados = []
+        for key in candidatas:
+            similaridade = jaccard(conjunto, self._shingles[key])
+            if similaridade >= threshold:
+                resultados.append((key, similaridade))
+        return sorted(resultados, key=lambda item: item[1], reverse=True)
@@ -0,0 +1,94 @@
+"""
+Estado de saúde (circuito) dos provedores de LLM
+
+Quando todas as chaves de um provedor esgotam a quota, o circuito é aberto por
+um período de resfriamento. O estado é usado pela verificação de prontidão
+(/api/ready) para que o balanceador não envie tráfego a um pod que só
+conseguiria responder com a mensagem de manutenção.
+
+Módulo sem dependências do ADK/genai, para poder ser consultado antes do
+warm-up.
+"""
+
+import logging
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from chatbot_acessibilidade.core.constants import (
+    PROVIDER_CIRCUIT_COOLDOWN_SECONDS,
+    LogMessages,
+)
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+
+_lock = Lock()
+_providers: Dict[str, Dict[str, Any]] = {}
+
+
+def _provider_state(provider: str) -> Dict[str, Any]:
+    return _providers.setdefault(provider, {"open_until": 0.0, "last_failure": None})
+
+
+def record_provider_exhausted(provider: str, reason: str, cooldown: Optional[float] = None) -> None:
+    """
+    Abre o circuito do provedor (todas as chaves sem quota).
+
+    Args:
+        provider: Nome do provedor
+        reason: Motivo registrado para diagnóstico
+        cooldown: Segundos com o circuito aberto (padrão: PROVIDER_CIRCUIT_COOLDOWN_SECONDS)
+    """
+    cooldown = PROVIDER_CIRCUIT_COOLDOWN_SECONDS if cooldown is None else cooldown
+    with _lock:
+        state = _provider_state(provider)
+        state["open_until"] = time.monotonic() + cooldown
+        state["last_failure"] = reason
+    logger.warning(
+        LogMessages.PROVIDER_CIRCUIT_OPENED.format(
+            provider=provider, cooldown=cooldown, reason=reason
+        )
+    )
+
+
+def record_provider_success(provider: str) -> None:
+    """Fecha o circuito do provedor após uma resposta bem-sucedida"""
+    with _lock:
+        state = _provider_state(provider)
+        was_open = state["open_until"] > time.monotonic()
+        state["open_until"] = 0.0
+    if was_open:
+        logger.info(LogMessages.PROVIDER_CIRCUIT_CLOSED.format(provider=provider))
+
+
+def get_provider_health() -> Dict[str, Dict[str, Any]]:
+    """
+    Retorna o estado do circuito de cada provedor já utilizado.
+
+    Returns:
+        Dicionário {provedor: {"state", "retry_after_seconds", "last_failure"}}
+    """
+    agora = time.monotonic()
+    with _lock:
+        return {
+            provider: {
+                "state": CIRCUIT_OPEN if state["open_until"] > agora else CIRCUIT_CLOSED,
+                "retry_after_seconds": max(0, round(state["open_until"] - agora)),
+                "last_failure": state["last_failure"],
+            }
+            for provider, state in _providers.items()
+        }
+
+
+def all_circuits_closed() -> bool:
+    """True se nenhum provedor usado está com o circuito aberto"""
+    return all(info["state"] == CIRCUIT_CLOSED for info in get_provider_health().values())
+
+
+def reset_provider_health() -> None:
+    """Reseta o estado de todos os provedores (útil para testes)"""
+    with _lock:
+        _providers.clear()
@@ -0,0 +1,101 @@
+"""
+Resposta combinada: todas as seções em uma chamada
+
+No modo combinado (settings.pipeline_mode) um único agente escreve introdução,
+conceitos, testes e referências de uma vez, no lugar das cinco chamadas do
+pipeline (três em sequência). A saída é um JSON estrito no schema
+RespostaCombinada (output_schema do agente) e passa por duas verificações:
+
+- parser: saida_estruturada.validar_saida (JSON estrito do pydantic-core e,
+  se falhar, extração tolerante do primeiro objeto) no schema RespostaCombinada
+- qualidade: seções com pelo menos COMBINED_MIN_SECTION_CHARS caracteres, sem
+  mensagem de erro e com pelo menos um link em "aprofundar"
+
+Respostas rejeitadas voltam ao pipeline de vários agentes. Com output_schema
+cada chamada de tool custa uma ida e volta a mais, então as referências da
+base local são buscadas antes e embutidas no prompt.
+"""
+
+from typing import Optional, Tuple
+
+from pydantic import BaseModel, Field, ValidationError
+
+from chatbot_acessibilidade.core.constants import (
+    COMBINED_MIN_SECTION_CHARS,
+    COMBINED_REFERENCES,
+)
+from chatbot_acessibilidade.core.knowledge_base import get_knowledge_base
+from chatbot_acessibilidade.core.saida_estruturada import validar_saida
+
+SECOES_COMBINADAS = ("introducao", "conceitos", "testes", "aprofundar")
+
+PROMPT_COMBINADO = "Pergunta: {pergunta}\n\nReferências da base local:\n{referencias}"
+
+
+class RespostaCombinada(BaseModel):
+    """Seções da resposta geradas pelo agente combinado (schema da saída)"""
+
+    introducao: str = Field(description="Resumo da resposta em um parágrafo")
+    conceitos: str = Field(
+        description="Conceito, implementação (HTML/JS com data-testid) e critério WCAG em Markdown"
+    )
+    testes: str = Field(description="Plano de testes automático, teclado e mobile em Markdown")
+    aprofundar: str = Field(description="Até 3 referências com título, fonte e link em Markdown")
+
+
+def montar_prompt_combinado(pergunta: str) -> str:
+    """
+    Prompt do agente combinado: pergunta e referências da base local.
+
+    Args:
+        pergunta: Pergunta do usuário
+
+    Returns:
+        Prompt com as referências mais relevantes (título, fonte e link)
+    """
+    resultados = get_knowledge_base().search(pergunta, limit=COMBINED_REFERENCES)
+    referencias = "\n".join(
+        f"- {ref['titulo']} ({ref['fonte']}): {ref['url']}" for ref in resultados
+    )
+    return PROMPT_COMBINADO.format(pergunta=pergunta, referencias=referencias or "- nenhuma")
+
+
+def verificar_qualidade(resposta: RespostaCombinada) -> Optional[str]:
+    """
+    Verifica se a resposta combinada pode substituir o pipeline.
+
+    Returns:
+        Motivo da rejeição ou None se a resposta for aceita
+    """
+    for secao in SECOES_COMBINADAS:
+        texto = getattr(resposta, secao).strip()
+        if len(texto) < COMBINED_MIN_SECTION_CHARS:
+            return f"seção {secao} com {len(texto)} caracteres"
+        # eh_erro também procura "falha", comum no conteúdo (falhas da WCAG)
+        if texto.lower().startswith("erro"):
+            return f"erro na seção {secao}"
+    if "http" not in resposta.aprofundar:
+        return "seção aprofundar sem links"
+    return None
+
+
+def interpretar_resposta_combinada(texto: str) -> Tuple[Optional[RespostaCombinada], str]:
+    """
+    Interpreta e verifica a saída do agente combinado.
+
+    Args:
+        texto: Resposta do agente (JSON no schema RespostaCombinada)
+
+    Returns:
+        (resposta, "") se aceita ou (None, motivo da rejeição)
+    """
+    try:
+        resposta = validar_saida(texto, RespostaCombinada, "combinado")
+    except ValidationError as e:
+        return None, f"JSON fora do schema: {e.errors()[0]['msg']}"
+    except ValueError as e:
+        return None, f"JSON inválido: {e}"
+    motivo = verificar_qualidade(resposta)
+    if motivo:
+        return None, motivo
+    return resposta, ""
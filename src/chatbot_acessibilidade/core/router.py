@@ -0,0 +1,143 @@
+"""
+Roteamento das perguntas por complexidade
+
+Todas as perguntas passavam pelos cinco estágios com o mesmo modelo. Aqui cada
+pergunta recebe uma pontuação de complexidade e um plano de execução:
+
+- simples: perguntas curtas e conceituais ("O que é ARIA?"); estágios de
+  settings.router_simple_skip_stages são pulados e os estágios de
+  settings.router_lite_stages usam settings.router_lite_model
+- padrao: todos os estágios; os estágios leves usam o modelo lite
+- complexa: código, comandos de refatoração ou pedidos longos de
+  implementação; todos os estágios com o modelo de cada agente
+
+A pontuação é só CPU (regex sobre o texto normalizado): tamanho, presença de
+código, tema de implementação, várias perguntas e o prefixo do comando.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional
+
+from chatbot_acessibilidade.config import settings
+from chatbot_acessibilidade.core.constants import (
+    ROUTER_LONG_QUESTION_WORDS,
+    ROUTER_MEDIUM_QUESTION_WORDS,
+    LogMessages,
+)
+from chatbot_acessibilidade.core.semantic_index import strip_accents
+
+logger = logging.getLogger(__name__)
+
+NIVEL_SIMPLES = "simples"
+NIVEL_PADRAO = "padrao"
+NIVEL_COMPLEXA = "complexa"
+
+CODE_PATTERN = re.compile(r"```|</?[a-z][a-z0-9-]*[\s>/]|[{};]\s*$|=>|\bfunction\b", re.MULTILINE)
+IMPLEMENTATION_PATTERN = re.compile(
+    r"\b(implement|cri[ae]r?|codigo|componente|javascript|react|vue|angular|css|html|widget"
+    r"|modal|dropdown|carrossel|corrig|refator|bug|erro no)\w*"
+)
+DEFINITION_PATTERN = re.compile(
+    r"^\s*(o que (e|sao|significa)|qual (e )?a diferenca|para que serve|quais (sao|os))\b"
+)
+
+# Pontos por característica da pergunta
+PESO_CODIGO = 3
+PESO_IMPLEMENTACAO = 2
+PESO_LONGA = 2
+PESO_MEDIA = 1
+PESO_VARIAS_PERGUNTAS = 1
+PESO_DEFINICAO = -1
+PESO_COMANDOS = {"/refatorar": 5, "/simular": 2}
+
+
+@dataclass(frozen=True)
+class RoutePlan:
+    """Plano de execução de uma pergunta: nível, modelos por estágio e estágios pulados"""
+
+    nivel: str = NIVEL_COMPLEXA
+    score: int = 0
+    modelos: Dict[str, str] = field(default_factory=dict)
+    estagios_ignorados: FrozenSet[str] = frozenset()
+
+    def modelo(self, estagio: str) -> Optional[str]:
+        """Modelo do estágio (None usa o modelo configurado no agente)"""
+        return self.modelos.get(estagio)
+
+    def executa(self, estagio: str) -> bool:
+        return estagio not in self.estagios_ignorados
+
+
+# Plano sem roteamento: todos os estágios, modelo de cada agente
+PLANO_COMPLETO = RoutePlan()
+
+
+def pontuar_pergunta(pergunta: str) -> int:
+    """
+    Pontua a complexidade de uma pergunta.
+
+    Args:
+        pergunta: Pergunta do usuário (ou comando)
+
+    Returns:
+        Pontuação (quanto maior, mais complexa)
+    """
+    texto = strip_accents(pergunta.casefold()).strip()
+    score = 0
+
+    comando = texto.split(maxsplit=1)[0] if texto.startswith("/") else ""
+    score += PESO_COMANDOS.get(comando, 0)
+
+    if CODE_PATTERN.search(pergunta):
+        score += PESO_CODIGO
+    if IMPLEMENTATION_PATTERN.search(texto):
+        score += PESO_IMPLEMENTACAO
+
+    palavras = len(texto.split())
+    if palavras > ROUTER_LONG_QUESTION_WORDS:
+        score += PESO_LONGA
+    elif palavras > ROUTER_MEDIUM_QUESTION_WORDS:
+        score += PESO_MEDIA
+
+    if texto.count("?") > 1:
+        score += PESO_VARIAS_PERGUNTAS
+    if DEFINITION_PATTERN.search(texto):
+        score += PESO_DEFINICAO
+    return score
+
+
+def rotear_pergunta(pergunta: str) -> RoutePlan:
+    """
+    Escolhe o plano de execução da pergunta conforme as settings do roteador.
+
+    Args:
+        pergunta: Pergunta do usuário (ou comando)
+
+    Returns:
+        RoutePlan (PLANO_COMPLETO com o roteador desabilitado)
+    """
+    if not settings.router_enabled:
+        return PLANO_COMPLETO
+
+    score = pontuar_pergunta(pergunta)
+    if score >= settings.router_complex_min_score:
+        plano = RoutePlan(nivel=NIVEL_COMPLEXA, score=score)
+    else:
+        nivel = NIVEL_SIMPLES if score <= settings.router_simple_max_score else NIVEL_PADRAO
+        modelos = dict.fromkeys(settings.router_lite_stages, settings.router_lite_model)
+        ignorados = (
+            frozenset(settings.router_simple_skip_stages) if nivel == NIVEL_SIMPLES else frozenset()
+        )
+        plano = RoutePlan(nivel=nivel, score=score, modelos=modelos, estagios_ignorados=ignorados)
+
+    logger.info(
+        LogMessages.ROUTER_DECISION.format(
+            nivel=plano.nivel,
+            score=score,
+            pergunta=pergunta[:50],
+            ignorados=",".join(sorted(plano.estagios_ignorados)) or "-",
+        )
+    )
+    return plano
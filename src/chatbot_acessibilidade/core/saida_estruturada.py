@@ -0,0 +1,177 @@
+"""
+Extração tolerante das saídas em JSON dos agentes
+
+O Refatorador e o agente combinado respondem em JSON, e o modelo às vezes
+embrulha o objeto em um bloco ```json, escreve uma frase antes ou depois dele
+ou comete erros de sintaxe comuns. Descartar a resposta nesses casos joga fora
+uma chamada cara (a saída do Refatorador tem o tamanho do código), então aqui
+o JSON é recuperado em uma passada pelo texto:
+
+- caminho rápido: o texto inteiro já é JSON válido
+- varredura: acha o primeiro objeto com chaves balanceadas (respeitando
+  strings e escapes) e ignora o texto em volta; se o candidato não for JSON,
+  tenta a partir da próxima "{" (até JSON_EXTRACT_MAX_CANDIDATES)
+- reparos: vírgulas antes de "}" ou "]", escapes inválidos em strings (\\' vira
+  ', \\d em código vira \\\\d) e quebras de linha cruas dentro de strings
+
+Depois da extração o objeto é validado no schema pydantic do agente.
+"""
+
+import json
+import logging
+from typing import Any, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, Field
+
+from chatbot_acessibilidade.core.constants import (
+    JSON_EXTRACT_MAX_CANDIDATES,
+    ErrorMessages,
+    LogMessages,
+)
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+# Caracteres válidos depois de uma barra invertida em strings JSON
+ESCAPES_JSON = frozenset('"\\/bfnrtu')
+FECHAMENTOS = {"{": "}", "[": "]"}
+
+
+class RefatoracaoCodigo(BaseModel):
+    """Saída do Refatorador (schema da resposta do /refatorar)"""
+
+    code: str = Field(description="Código refatorado completo")
+    explanation: str = Field(default="", description="Explicação das mudanças")
+    wcag_criteria: List[str] = Field(
+        default_factory=list, description="Critérios WCAG atendidos (ex: 2.1.1)"
+    )
+    language: str = Field(default="html", description="Linguagem do código (html, css, js)")
+
+
+def _isolar_objeto(texto: str, inicio: int) -> Tuple[str, List[str]]:
+    """
+    Objeto JSON balanceado que começa em texto[inicio], com os reparos aplicados.
+
+    Raises:
+        ValueError: Se as chaves não fecharem (objeto truncado ou malformado)
+    """
+    saida: List[str] = []
+    reparos: List[str] = []
+    pilha: List[str] = []
+    virgula_pendente: Optional[int] = None  # Posição em saida de uma vírgula final
+    em_string = False
+    posicao = inicio
+    while posicao < len(texto):
+        c = texto[posicao]
+        if em_string:
+            if c == "\\":
+                seguinte = texto[posicao + 1 : posicao + 2]
+                if seguinte and seguinte in ESCAPES_JSON:
+                    saida.append(c + seguinte)
+                elif seguinte == "'":
+                    saida.append("'")
+                    reparos.append("escape \\'")
+                else:
+                    saida.append("\\\\")
+                    reparos.append(f"escape \\{seguinte}")
+                    posicao += 1
+                    continue
+                posicao += 2
+                continue
+            if c == '"':
+                em_string = False
+            saida.append(c)
+        elif c == '"':
+            em_string = True
+            virgula_pendente = None
+            saida.append(c)
+        elif c in FECHAMENTOS:
+            pilha.append(FECHAMENTOS[c])
+            virgula_pendente = None
+            saida.append(c)
+        elif c in "}]":
+            if not pilha or c != pilha[-1]:
+                break
+            if virgula_pendente is not None:
+                saida[virgula_pendente] = ""
+                reparos.append(f"vírgula antes de {c}")
+            virgula_pendente = None
+            pilha.pop()
+            saida.append(c)
+            if not pilha:
+                return "".join(saida), reparos
+        else:
+            if c == ",":
+                virgula_pendente = len(saida)
+            elif not c.isspace():
+                virgula_pendente = None
+            saida.append(c)
+        posicao += 1
+    raise ValueError(ErrorMessages.JSON_INCOMPLETE.format(posicao=inicio))
+
+
+def extrair_json(texto: str, agente: str = "") -> Any:
+    """
+    Extrai o primeiro objeto JSON de uma resposta de agente.
+
+    Args:
+        texto: Resposta do agente (JSON puro, em bloco ```json ou com texto em volta)
+        agente: Nome do agente (logs)
+
+    Returns:
+        Objeto decodificado
+
+    Raises:
+        ValueError: Se nenhum objeto JSON puder ser recuperado
+    """
+    try:
+        return json.loads(texto)
+    except ValueError:
+        pass
+
+    erro: ValueError = ValueError(ErrorMessages.JSON_NOT_FOUND)
+    inicio = texto.find("{")
+    for _tentativa in range(JSON_EXTRACT_MAX_CANDIDATES):
+        if inicio < 0:
+            break
+        try:
+            candidato, reparos = _isolar_objeto(texto, inicio)
+            # strict=False aceita quebras de linha e tabs crus dentro das strings
+            dados = json.loads(candidato, strict=False)
+        except ValueError as e:
+            erro = e
+            inicio = texto.find("{", inicio + 1)
+            continue
+        if reparos or candidato != texto.strip():
+            logger.debug(
+                LogMessages.JSON_EXTRACTED.format(
+                    agente=agente or "agente",
+                    inicio=inicio,
+                    reparos=", ".join(reparos) or "-",
+                )
+            )
+        return dados
+    raise erro
+
+
+def validar_saida(texto: str, modelo: Type[M], agente: str = "") -> M:
+    """
+    Extrai o JSON da resposta e valida no schema do agente.
+
+    Args:
+        texto: Resposta do agente
+        modelo: Schema pydantic da saída
+        agente: Nome do agente (logs)
+
+    Returns:
+        Instância do schema
+
+    Raises:
+        ValueError: JSON irrecuperável ou pydantic.ValidationError (subclasse
+            de ValueError) se o objeto não seguir o schema
+    """
+    try:
+        return modelo.model_validate_json(texto)
+    except ValueError:
+        return modelo.model_validate(extrair_json(texto, agente))
@@ -0,0 +1,298 @@
+"""
+Índice léxico-semântico das perguntas cacheadas
+
+A chave do cache é o MD5 da pergunta normalizada: "como testar contraste" e
+"testar contraste de cores como?" viram chaves diferentes. Este módulo indexa o
+texto das perguntas cacheadas para encontrar reformulações, só com CPU:
+
+- normalização para português: casefold, remoção de acentos, stopwords e um
+  stemmer leve por sufixos (testar/testes/teste -> test); negações, "sem"/"com"
+  e interrogativos são termos, e a busca só aceita perguntas que tenham os
+  mesmos (MEANING_TERMS)
+- índice invertido: as candidatas são as perguntas que contêm os termos mais
+  raros da consulta (interseção de conjuntos) e são ordenadas por BM25
+- similaridade de cosseno TF-IDF entre a pergunta e cada candidata como
+  confiança (0.0 a 1.0), comparada com o limiar configurado
+
+O índice também mantém assinaturas MinHash/LSH (minhash.py) para encontrar
+quase duplicatas sem varrer o cache (invalidação por similaridade).
+
+A interseção roda em C e no máximo CACHE_SEMANTIC_MAX_SCORED candidatas são
+pontuadas em Python, o que mantém a busca em poucos milissegundos mesmo com
+100 mil perguntas.
+"""
+
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from typing import Dict, FrozenSet, List, Tuple
+
+from chatbot_acessibilidade.core.constants import (
+    CACHE_SEMANTIC_BM25_B,
+    CACHE_SEMANTIC_BM25_K1,
+    CACHE_SEMANTIC_MAX_QUESTIONS,
+    CACHE_SEMANTIC_MAX_SCORED,
+    CACHE_SEMANTIC_STEM_CACHE_SIZE,
+)
+from chatbot_acessibilidade.core.minhash import MinHashLSH
+
+TOKEN_PATTERN = re.compile(r"\d+(?:[.,]\d+)*|[a-z]+")
+
+# Negação/contraste ("sem", "com") e interrogativos ("quando", "por que") não são
+# stopwords: "modal sem JavaScript" e "modal em JavaScript" pedem respostas opostas
+STOPWORDS = frozenset(
+    """
+    a ao aos as ate como da das de do dos e ela elas ele eles em entre era
+    essa esse esta este eu foi ha isso isto ja la lhe mais mas me mesmo meu
+    minha muito na nas no nos nossa nosso num numa o os ou para pela pelas
+    pelo pelos se ser seu sua sao so tambem te tem tu um uma umas uns voce
+    voces vos
+    """.split()
+)
+
+# Termos que mudam o sentido da pergunta: a busca só aceita perguntas com os mesmos
+MEANING_WORDS = "sem com nem nao quando por que qual quais quem onde porque".split()
+
+# Busca por palavras-chave (knowledge_base): o sentido da pergunta não importa
+KEYWORD_STOPWORDS = STOPWORDS | frozenset("com nem por qual quais quando que quem sem".split())
+
+# Sufixos removidos pelo stemmer, do mais longo para o mais curto
+SUFFIXES = (
+    "ibilidade",
+    "abilidade",
+    "amentos",
+    "imentos",
+    "amento",
+    "imento",
+    "adoras",
+    "adores",
+    "idades",
+    "mente",
+    "acoes",
+    "idade",
+    "acao",
+    "ador",
+    "avel",
+    "ivel",
+    "ando",
+    "endo",
+    "indo",
+    "ado",
+    "ido",
+    "ar",
+    "er",
+    "ir",
+    "as",
+    "es",
+    "os",
+    "a",
+    "e",
+    "o",
+)
+MIN_STEM_LENGTH = 3
+
+
+def strip_accents(text: str) -> str:
+    """Remove acentos e cedilha (ação -> acao); outros caracteres não ASCII somem"""
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+
+@lru_cache(maxsize=CACHE_SEMANTIC_STEM_CACHE_SIZE)
+def stem(word: str) -> str:
+    """
+    Stemmer leve para português (sem acentos).
+
+    Args:
+        word: Palavra normalizada
+
+    Returns:
+        Radical da palavra (testes -> test, imagens -> imagem)
+    """
+    if word.endswith("ns"):
+        word = word[:-2] + "m"
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[: -len(suffix)]
+    return word
+
+
+MEANING_TERMS = frozenset(stem(word) for word in MEANING_WORDS)
+
+
+def tokenize(text: str, stopwords: FrozenSet[str] = STOPWORDS) -> List[str]:
+    """
+    Normaliza uma pergunta em termos indexáveis.
+
+    Args:
+        text: Pergunta original
+        stopwords: Palavras ignoradas (KEYWORD_STOPWORDS para busca por palavras-chave)
+
+    Returns:
+        Radicais sem stopwords (números como "2.1" são mantidos inteiros)
+    """
+    normalized = strip_accents(text.casefold())
+    return [
+        token if token[0].isdigit() else stem(token)
+        for token in TOKEN_PATTERN.findall(normalized)
+        if token not in stopwords
+    ]
+
+
+class QuestionIndex:
+    """
+    Índice invertido BM25 sobre as perguntas cacheadas.
+
+    Cada chave do cache aparece no máximo uma vez; acima de `max_questions`
+    as perguntas indexadas há mais tempo são descartadas.
+    """
+
+    def __init__(self, max_questions: int = CACHE_SEMANTIC_MAX_QUESTIONS):
+        self.max_questions = max_questions
+        # chave -> (pergunta original, frequência dos termos)
+        self._docs: "OrderedDict[str, Tuple[str, Counter]]" = OrderedDict()
+        self._lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._lsh = MinHashLSH()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._docs
+
+    def add(self, key: str, pergunta: str) -> None:
+        """Indexa (ou reindexa) a pergunta de uma chave do cache"""
+        if key in self._docs:
+            self.remove(key)
+        tokens = tokenize(pergunta)
+        termos = Counter(tokens)
+        if not termos:
+            return
+
+        self._docs[key] = (pergunta, termos)
+        self._lsh.add(key, tokens)
+        tamanho = sum(termos.values())
+        self._lengths[key] = tamanho
+        self._total_length += tamanho
+        for termo, tf in termos.items():
+            self._postings.setdefault(termo, {})[key] = tf
+
+        while len(self._docs) > self.max_questions:
+            self.remove(next(iter(self._docs)))
+
+    def remove(self, key: str) -> bool:
+        """Remove uma chave do índice; True se ela estava indexada"""
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return False
+        self._total_length -= self._lengths.pop(key)
+        self._lsh.remove(key)
+        for termo in doc[1]:
+            postings = self._postings[termo]
+            del postings[key]
+            if not postings:
+                del self._postings[termo]
+        return True
+
+    def clear(self) -> None:
+        self._docs.clear()
+        self._lengths.clear()
+        self._postings.clear()
+        self._total_length = 0
+        self._lsh.clear()
+
+    def get_question(self, key: str) -> str:
+        """Pergunta original indexada para a chave ("" se não indexada)"""
+        doc = self._docs.get(key)
+        return doc[0] if doc else ""
+
+    def find_near_duplicates(self, pergunta: str, threshold: float) -> List[Tuple[str, str, float]]:
+        """
+        Busca perguntas quase idênticas via LSH (Jaccard dos termos).
+
+        Args:
+            pergunta: Pergunta de referência
+            threshold: Similaridade de Jaccard mínima (0.0 a 1.0)
+
+        Returns:
+            Lista de (chave, pergunta original, similaridade) em ordem decrescente
+        """
+        return [
+            (key, self._docs[key][0], similaridade)
+            for key, similaridade in self._lsh.query(tokenize(pergunta), threshold)
+        ]
+
+    def _idf(self, termo: str) -> float:
+        df = len(self._postings.get(termo, ()))
+        n = len(self._docs)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _cosine(self, consulta: Counter, termos: Counter) -> float:
+        """Similaridade de cosseno entre os vetores TF-IDF de duas perguntas"""
+        idf = {termo: self._idf(termo) for termo in consulta.keys() | termos.keys()}
+        produto = sum(tf * termos[termo] * idf[termo] ** 2 for termo, tf in consulta.items())
+        norma_consulta = math.sqrt(sum((tf * idf[termo]) ** 2 for termo, tf in consulta.items()))
+        norma_doc = math.sqrt(sum((tf * idf[termo]) ** 2 for termo, tf in termos.items()))
+        if not norma_consulta or not norma_doc:
+            return 0.0
+        return min(1.0, produto / (norma_consulta * norma_doc))
+
+    def search(self, pergunta: str, limit: int = 5) -> List[Tuple[str, str, float]]:
+        """
+        Busca as perguntas indexadas mais parecidas.
+
+        Args:
+            pergunta: Pergunta do usuário
+            limit: Número máximo de resultados
+
+        Returns:
+            Lista de (chave, pergunta original, similaridade) em ordem decrescente
+        """
+        consulta = Counter(tokenize(pergunta))
+        if not consulta or not self._docs:
+            return []
+
+        # Candidatas: perguntas com todos os termos, do mais raro para o mais
+        # comum, parando antes que a interseção (feita em C) fique vazia
+        candidatas = None
+        for termo in sorted(consulta, key=lambda t: len(self._postings.get(t, ()))):
+            postings = self._postings.get(termo)
+            if not postings:
+                continue
+            proximas = postings.keys() if candidatas is None else candidatas & postings.keys()
+            if not proximas:
+                break
+            candidatas = proximas
+        if not candidatas:
+            return []
+
+        n = len(self._docs)
+        media = self._total_length / n
+        k1, b = CACHE_SEMANTIC_BM25_K1, CACHE_SEMANTIC_BM25_B
+        idf = {termo: self._idf(termo) for termo in consulta}
+        sentido = consulta.keys() & MEANING_TERMS
+        scores: Dict[str, float] = {}
+        for key in islice(candidatas, CACHE_SEMANTIC_MAX_SCORED):
+            termos = self._docs[key][1]
+            if termos.keys() & MEANING_TERMS != sentido:
+                # "sem" x "com", "quando" x "por que": outra pergunta
+                continue
+            normalizacao = k1 * (1 - b + b * self._lengths[key] / media)
+            scores[key] = sum(
+                idf[termo] * termos[termo] * (k1 + 1) / (termos[termo] + normalizacao)
+                for termo in consulta
+                if termo in termos
+            )
+
+        candidatas = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+        resultados = [
+            (key, self._docs[key][0], self._cosine(consulta, self._docs[key][1]))
+            for key, _score in candidatas
+        ]
+        return sorted(resultados, key=itemgetter(2), reverse=True)
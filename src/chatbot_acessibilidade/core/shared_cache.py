@@ -0,0 +1,334 @@
+"""
+Cache de respostas em memória compartilhada entre workers
+
+Com vários workers do uvicorn cada processo tinha o seu próprio TTLCache: a
+taxa de acerto era dividida pelo número de workers e a mesma pergunta era
+respondida uma vez por worker. Este módulo implementa uma tabela hash de
+tamanho fixo sobre um arquivo mapeado em memória (mmap em /dev/shm), visível a
+todos os processos do host, com a mesma interface usada do TTLCache.
+
+Layout do segmento:
+    cabeçalho (magic, versão, nº de slots, bytes por slot)
+    slots: seq | expires_at | tamanho da chave | tamanho do valor | chave | valor
+
+O layout (versão, slots, bytes por slot) faz parte do nome do arquivo: num
+rolling restart que muda CACHE_MAX_SIZE ou o layout, os workers novos usam
+outro segmento e os antigos seguem com o seu. Um segmento em uso nunca é
+truncado (workers que o mapeiam receberiam SIGBUS); um arquivo com cabeçalho
+inválido é substituído por um novo (os.replace), e quem já o mapeava mantém o
+inode antigo. Segmentos de layouts antigos ficam no tmpfs até serem removidos.
+
+Concorrência:
+    - Leituras não usam lock (seqlock): o writer deixa `seq` ímpar durante a
+      escrita e o leitor descarta a leitura se `seq` mudou ou estava ímpar.
+    - Escritas são serializadas entre processos com flock e, dentro do
+      processo, com um Lock (flock é compartilhado pelas threads do processo).
+
+Endereçamento aberto com janela de sondagem fixa: a chave ocupa um dos
+CACHE_SHARED_PROBE_LIMIT slots a partir do seu hash; com a janela cheia, a
+entrada que expira primeiro é substituída. Requer POSIX (fcntl).
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from chatbot_acessibilidade.core.constants import (
+    CACHE_SHARED_PROBE_LIMIT,
+    CACHE_SHARED_READ_RETRIES,
+    CACHE_SHARED_SLOT_BYTES,
+    LogMessages,
+)
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ADACACHE"
+LAYOUT_VERSION = 1
+FILE_HEADER = struct.Struct("<8sIII")  # magic, versão, slots, bytes por slot
+FILE_HEADER_BYTES = 64
+SLOT_HEADER = struct.Struct("<QdHI")  # seq, expires_at, tamanho da chave, tamanho do valor
+KEY_BYTES = 64
+
+
+def default_shared_path(name: str) -> str:
+    """Arquivo do segmento: /dev/shm (tmpfs) quando disponível"""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, name)
+
+
+def layout_path(path: str, maxsize: int, slot_bytes: int) -> str:
+    """Arquivo do segmento para um layout: layouts diferentes nunca dividem o arquivo"""
+    return f"{path}-v{LAYOUT_VERSION}-{maxsize}x{slot_bytes}"
+
+
+class SharedMemoryCache:
+    """
+    Cache com TTL em memória compartilhada entre processos.
+
+    Expõe o subconjunto da interface do TTLCache usado pelo projeto
+    (get, [], in, len, items, clear, maxsize, ttl). Valores são dicionários
+    serializados em JSON; cada leitura devolve uma cópia nova.
+    """
+
+    def __init__(
+        self, path: str, maxsize: int, ttl: float, slot_bytes: int = CACHE_SHARED_SLOT_BYTES
+    ):
+        self.path = layout_path(path, maxsize, slot_bytes)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.slot_bytes = slot_bytes
+        self._payload_bytes = slot_bytes - SLOT_HEADER.size - KEY_BYTES
+        self._write_lock = Lock()
+
+        size = FILE_HEADER_BYTES + maxsize * slot_bytes
+        self._fd = self._open_segment(size)
+        self._mm = mmap.mmap(self._fd, size)
+
+    # -----------------------------------------
+    # Layout e lock entre processos
+    # -----------------------------------------
+    def _locked(self) -> "_FileLock":
+        return _FileLock(self._fd, self._write_lock)
+
+    def _open_segment(self, size: int) -> int:
+        """
+        Abre o segmento do layout, criando-o se necessário.
+
+        Nunca trunca um arquivo com conteúdo: outros workers podem tê-lo
+        mapeado. Um cabeçalho inválido faz um segmento novo ser trocado no
+        lugar, e a abertura é refeita sobre ele.
+        """
+        expected = FILE_HEADER.pack(MAGIC, LAYOUT_VERSION, self.maxsize, self.slot_bytes)
+        while True:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            with self._locked():
+                # Outro processo pode ter trocado o arquivo entre o open e o lock
+                trocado = os.fstat(self._fd).st_ino != os.stat(self.path).st_ino
+                if not trocado:
+                    tamanho = os.fstat(self._fd).st_size
+                    if tamanho == 0:
+                        self._init_segment(self._fd, size, expected)
+                        return self._fd
+                    header = os.pread(self._fd, FILE_HEADER.size, 0)
+                    if header == expected and tamanho == size:
+                        return self._fd
+                    self._replace_segment(size, expected)
+            os.close(self._fd)
+
+    def _init_segment(self, fd: int, size: int, header: bytes) -> None:
+        os.ftruncate(fd, size)
+        os.pwrite(fd, header, 0)
+        logger.info(
+            LogMessages.CACHE_SHARED_CREATED.format(
+                path=self.path, slots=self.maxsize, slot_bytes=self.slot_bytes
+            )
+        )
+
+    def _replace_segment(self, size: int, header: bytes) -> None:
+        """Troca um arquivo inválido por um segmento novo (quem o mapeia mantém o inode)"""
+        diretorio, nome = os.path.split(self.path)
+        fd, temporario = tempfile.mkstemp(dir=diretorio or None, prefix=f".{nome}.")
+        try:
+            self._init_segment(fd, size, header)
+            os.replace(temporario, self.path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temporario)
+            raise
+        finally:
+            os.close(fd)
+
+    def _slot_offset(self, index: int) -> int:
+        return FILE_HEADER_BYTES + index * self.slot_bytes
+
+    def _probe(self, key_bytes: bytes) -> List[int]:
+        """Slots candidatos da chave (janela de sondagem linear)"""
+        inicio = int.from_bytes(hashlib.md5(key_bytes).digest()[:8], "little") % self.maxsize
+        janela = min(CACHE_SHARED_PROBE_LIMIT, self.maxsize)
+        return [(inicio + i) % self.maxsize for i in range(janela)]
+
+    # -----------------------------------------
+    # Leitura sem lock (seqlock)
+    # -----------------------------------------
+    def _read_slot(self, index: int) -> Optional[Tuple[bytes, float, bytes]]:
+        """
+        Lê um slot de forma consistente.
+
+        Returns:
+            (chave, expires_at, valor) ou None se vazio ou em escrita contínua
+        """
+        offset = self._slot_offset(index)
+        dados = offset + SLOT_HEADER.size
+        for _ in range(CACHE_SHARED_READ_RETRIES):
+            seq, expires_at, key_len, value_len = SLOT_HEADER.unpack_from(self._mm, offset)
+            if seq & 1:
+                continue
+            if key_len == 0:
+                return None
+            key = self._mm[dados : dados + key_len]
+            value = self._mm[dados + KEY_BYTES : dados + KEY_BYTES + value_len]
+            if SLOT_HEADER.unpack_from(self._mm, offset)[0] == seq:
+                return key, expires_at, value
+        return None
+
+    def _find(self, key_bytes: bytes) -> Optional[bytes]:
+        agora = time.time()
+        for index in self._probe(key_bytes):
+            slot = self._read_slot(index)
+            if slot is not None and slot[0] == key_bytes and slot[1] > agora:
+                return slot[2]
+        return None
+
+    # -----------------------------------------
+    # Escrita (flock + seqlock)
+    # -----------------------------------------
+    def _write_slot(self, index: int, key_bytes: bytes, expires_at: float, value: bytes) -> None:
+        offset = self._slot_offset(index)
+        # seq ímpar sinaliza escrita em andamento para os leitores (o "| 1" também
+        # recupera slots deixados ímpares por um worker morto no meio da escrita)
+        seq = (SLOT_HEADER.unpack_from(self._mm, offset)[0] + 1) | 1
+        struct.pack_into("<Q", self._mm, offset, seq)
+        dados = offset + SLOT_HEADER.size
+        self._mm[dados : dados + len(key_bytes)] = key_bytes
+        self._mm[dados + KEY_BYTES : dados + KEY_BYTES + len(value)] = value
+        SLOT_HEADER.pack_into(self._mm, offset, seq, expires_at, len(key_bytes), len(value))
+        struct.pack_into("<Q", self._mm, offset, seq + 1)
+
+    def _encode_key(self, key: str) -> bytes:
+        key_bytes = key.encode("utf-8")
+        if not key_bytes or len(key_bytes) > KEY_BYTES:
+            raise KeyError(key)
+        return key_bytes
+
+    def __setitem__(self, key: str, value: Dict[str, Any]) -> None:
+        key_bytes = self._encode_key(key)
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if len(payload) > self._payload_bytes:
+            # Respostas maiores que o slot não são cacheadas (o pipeline responde normalmente)
+            logger.warning(
+                LogMessages.CACHE_SHARED_VALUE_TOO_LARGE.format(
+                    size=len(payload), limit=self._payload_bytes
+                )
+            )
+            return
+
+        agora = time.time()
+        with self._locked():
+            mesma_chave = livre = None
+            mais_antigo: Optional[Tuple[float, int]] = None
+            for index in self._probe(key_bytes):
+                slot = self._read_slot(index)
+                if slot is not None and slot[0] == key_bytes:
+                    mesma_chave = index
+                    break
+                if slot is None or slot[1] <= agora:
+                    livre = index if livre is None else livre
+                elif mais_antigo is None or slot[1] < mais_antigo[0]:
+                    mais_antigo = (slot[1], index)
+
+            # Preferência: mesma chave, slot livre/expirado, o que expira primeiro
+            destino = next(
+                index
+                for index in (mesma_chave, livre, mais_antigo and mais_antigo[1])
+                if index is not None
+            )
+            self._write_slot(destino, key_bytes, agora + self.ttl, payload)
+
+    def __delitem__(self, key: str) -> None:
+        key_bytes = self._encode_key(key)
+        with self._locked():
+            for index in self._probe(key_bytes):
+                slot = self._read_slot(index)
+                if slot is not None and slot[0] == key_bytes:
+                    self._write_slot(index, b"", 0.0, b"")
+                    return
+        raise KeyError(key)
+
+    def clear(self) -> None:
+        """Remove todas as entradas (para todos os workers)"""
+        with self._locked():
+            for index in range(self.maxsize):
+                offset = self._slot_offset(index)
+                if SLOT_HEADER.unpack_from(self._mm, offset)[2]:
+                    self._write_slot(index, b"", 0.0, b"")
+
+    # -----------------------------------------
+    # Interface de mapeamento
+    # -----------------------------------------
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        value = self._find(self._encode_key(key))
+        if value is None:
+            raise KeyError(key)
+        return json.loads(value)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key) is not None
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Entradas válidas no momento da leitura de cada slot"""
+        agora = time.time()
+        for index in range(self.maxsize):
+            slot = self._read_slot(index)
+            if slot is not None and slot[1] > agora:
+                yield slot[0].decode("utf-8"), json.loads(slot[2])
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, _value in self.items())
+
+    def _live_sizes(self) -> Iterator[int]:
+        """Tamanho do JSON de cada slot válido (só lê os cabeçalhos)"""
+        agora = time.time()
+        for index in range(self.maxsize):
+            _seq, expires_at, key_len, size = SLOT_HEADER.unpack_from(
+                self._mm, self._slot_offset(index)
+            )
+            if key_len and expires_at > agora:
+                yield size
+
+    def __len__(self) -> int:
+        return sum(1 for _size in self._live_sizes())
+
+    @property
+    def stored_bytes(self) -> int:
+        return sum(self._live_sizes())
+
+    @property
+    def raw_bytes(self) -> int:
+        # Valores guardados em JSON, sem compressão
+        return self.stored_bytes
+
+    def close(self) -> None:
+        """Libera o mapeamento (o segmento continua disponível aos outros workers)"""
+        self._mm.close()
+        os.close(self._fd)
+
+
+class _FileLock:
+    """Lock exclusivo entre processos (flock) e entre threads (Lock)"""
+
+    def __init__(self, fd: int, thread_lock: Lock):
+        self._fd = fd
+        self._thread_lock = thread_lock
+
+    def __enter__(self) -> None:
+        self._thread_lock.acquire()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc: Any) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
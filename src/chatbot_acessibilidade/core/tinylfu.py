@@ -0,0 +1,317 @@
+"""
+Cache W-TinyLFU limitado por bytes e ponderado pelo custo de cada resposta
+
+O TTLCache conta entradas: uma resposta de 20 KB ocupa o mesmo "slot" que uma
+de 1 KB e a remoção é só por expiração/LRU. Aqui o limite é um orçamento de
+memória e a política segue o W-TinyLFU (Caffeine):
+
+- Count-Min Sketch com envelhecimento estima a frequência de acesso de
+  qualquer chave (inclusive das que não estão no cache)
+- Janela LRU pequena (~1% do orçamento) absorve rajadas de chaves novas
+- Região principal SLRU (probation + protected) guarda as entradas populares
+- Ao sair da janela, a candidata só entra na região principal se valer mais
+  que a vítima: valor = frequência x custo de LLM / bytes
+
+Assim o cache maximiza chamadas de LLM evitadas por MB de RAM.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from chatbot_acessibilidade.core.cache_codec import value_sizes
+from chatbot_acessibilidade.core.constants import (
+    CACHE_DEFAULT_COST_SECONDS,
+    CACHE_TINYLFU_AVG_ENTRY_BYTES,
+    CACHE_TINYLFU_PROTECTED_RATIO,
+    CACHE_TINYLFU_WINDOW_RATIO,
+)
+
+# Contadores de 4 bits, como no Caffeine
+SKETCH_MAX_COUNT = 15
+SKETCH_DEPTH = 4
+
+
+class CountMinSketch:
+    """
+    Estimativa de frequência com memória constante.
+
+    A cada `sample_size` incrementos todos os contadores são divididos por 2
+    (envelhecimento), para que chaves populares no passado percam peso.
+    """
+
+    def __init__(self, width: int):
+        self.width = max(16, 1 << (width - 1).bit_length())
+        self.sample_size = 10 * self.width
+        self.additions = 0
+        self.tables = [bytearray(self.width) for _ in range(SKETCH_DEPTH)]
+
+    def _indexes(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8 * SKETCH_DEPTH).digest()
+        mask = self.width - 1
+        return [
+            int.from_bytes(digest[i * 8 : (i + 1) * 8], "little") & mask
+            for i in range(SKETCH_DEPTH)
+        ]
+
+    def increment(self, key: str) -> None:
+        for table, index in zip(self.tables, self._indexes(key), strict=True):
+            if table[index] < SKETCH_MAX_COUNT:
+                table[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._reset()
+
+    def estimate(self, key: str) -> int:
+        return min(
+            table[index] for table, index in zip(self.tables, self._indexes(key), strict=True)
+        )
+
+    def _reset(self) -> None:
+        for table in self.tables:
+            for index in range(self.width):
+                table[index] >>= 1
+        self.additions //= 2
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    cost: float
+    expires_at: float
+    raw: int  # Bytes do JSON antes da compressão
+
+
+class TinyLFUCache:
+    """
+    Cache com TTL, orçamento em bytes e admissão W-TinyLFU ponderada por custo.
+
+    Expõe o subconjunto da interface do TTLCache usado pelo projeto
+    (get, [], in, del, len, items, clear, maxsize, ttl) e `put` com custo.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.window_bytes = max(1, int(max_bytes * CACHE_TINYLFU_WINDOW_RATIO))
+        self.main_bytes = max_bytes - self.window_bytes
+        self.protected_bytes = int(self.main_bytes * CACHE_TINYLFU_PROTECTED_RATIO)
+        self.sketch = CountMinSketch(max(1, max_bytes // CACHE_TINYLFU_AVG_ENTRY_BYTES))
+
+        self._entries: Dict[str, _Entry] = {}
+        # Regiões em ordem LRU -> MRU
+        self._window: "OrderedDict[str, None]" = OrderedDict()
+        self._probation: "OrderedDict[str, None]" = OrderedDict()
+        self._protected: "OrderedDict[str, None]" = OrderedDict()
+        self._regions = {
+            "window": self._window,
+            "probation": self._probation,
+            "protected": self._protected,
+        }
+        self._sizes = dict.fromkeys(self._regions, 0)
+        self.raw_bytes = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    # -----------------------------------------
+    # Interface de mapeamento
+    # -----------------------------------------
+    @property
+    def maxsize(self) -> int:
+        return self.max_bytes
+
+    @property
+    def currsize(self) -> int:
+        """Bytes ocupados pelas respostas armazenadas"""
+        return sum(self._sizes.values())
+
+    @property
+    def stored_bytes(self) -> int:
+        return self.currsize
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Todo acesso conta para a frequência, inclusive misses
+        self.sketch.increment(key)
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return default
+        self._on_hit(key)
+        return entry.value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.put(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._entries:
+            raise KeyError(key)
+        self._remove(key)
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._entries.get(key) if isinstance(key, str) else None
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, _value in self.items())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        agora = time.monotonic()
+        return iter(
+            [(key, entry.value) for key, entry in self._entries.items() if entry.expires_at > agora]
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+        for region in self._regions.values():
+            region.clear()
+        self._sizes = dict.fromkeys(self._sizes, 0)
+        self.raw_bytes = 0
+
+    def entry_info(self, key: str) -> Optional[Dict[str, Any]]:
+        """Tamanho, custo, frequência estimada e região de uma entrada"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return {
+            "size": entry.size,
+            "cost": entry.cost,
+            "frequency": self.sketch.estimate(key),
+            "region": self._region_of(key),
+        }
+
+    # -----------------------------------------
+    # Inserção e admissão
+    # -----------------------------------------
+    def put(self, key: str, value: Any, cost: Optional[float] = None) -> None:
+        """
+        Insere (ou atualiza) uma entrada.
+
+        Args:
+            key: Chave
+            value: Valor (bytes já comprimidos ou serializável em JSON, usado para
+                medir os bytes)
+            cost: Custo para produzir o valor (segundos de LLM); padrão
+                CACHE_DEFAULT_COST_SECONDS
+        """
+        if isinstance(value, bytes):
+            size, raw = value_sizes(value)
+        else:
+            size = raw = len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+        cost = CACHE_DEFAULT_COST_SECONDS if cost is None else cost
+        if size > self.main_bytes:
+            # Maior que toda a região principal: nunca seria mantida (e a versão
+            # anterior da chave não pode continuar sendo servida)
+            if key in self._entries:
+                self._remove(key)
+            self.rejected += 1
+            return
+
+        if key in self._entries:
+            region = self._region_of(key)
+            self._sizes[region] += size - self._entries[key].size
+            self.raw_bytes += raw - self._entries[key].raw
+            self._entries[key] = _Entry(value, size, cost, time.monotonic() + self.ttl, raw)
+            self._on_hit(key)
+            self._evict_protected_overflow()
+            self._evict_main_overflow()
+            return
+
+        self._entries[key] = _Entry(value, size, cost, time.monotonic() + self.ttl, raw)
+        self._window[key] = None
+        self._sizes["window"] += size
+        self.raw_bytes += raw
+        self._drain_window()
+
+    def _score(self, key: str) -> float:
+        """Chamadas de LLM evitadas por byte (frequência x custo / tamanho)"""
+        entry = self._entries[key]
+        return (self.sketch.estimate(key) + 1) * entry.cost / entry.size
+
+    def _drain_window(self) -> None:
+        """Candidatas que saem da janela disputam espaço na região principal"""
+        while self._sizes["window"] > self.window_bytes and self._window:
+            candidate, _ = self._window.popitem(last=False)
+            self._sizes["window"] -= self._entries[candidate].size
+            self._admit(candidate)
+
+    def _admit(self, candidate: str) -> None:
+        size = self._entries[candidate].size
+        agora = time.monotonic()
+        while self._sizes["probation"] + self._sizes["protected"] + size > self.main_bytes:
+            victim = self._victim()
+            victim_entry = self._entries[victim]
+            if victim_entry.expires_at > agora and self._score(victim) >= self._score(candidate):
+                self.raw_bytes -= self._entries.pop(candidate).raw
+                self.rejected += 1
+                return
+            self._remove(victim)
+
+        self._probation[candidate] = None
+        self._sizes["probation"] += size
+        self.admitted += 1
+
+    def _victim(self) -> str:
+        """LRU da probation (ou da protected, se a probation estiver vazia)"""
+        region = self._probation if self._probation else self._protected
+        return next(iter(region))
+
+    # -----------------------------------------
+    # Manutenção das regiões
+    # -----------------------------------------
+    def _region_of(self, key: str) -> str:
+        if key in self._window:
+            return "window"
+        return "protected" if key in self._protected else "probation"
+
+    def _on_hit(self, key: str) -> None:
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+        elif key in self._probation:
+            # Segundo acesso na região principal: promove para protected
+            del self._probation[key]
+            size = self._entries[key].size
+            self._sizes["probation"] -= size
+            self._protected[key] = None
+            self._sizes["protected"] += size
+            self._evict_protected_overflow()
+
+    def _evict_protected_overflow(self) -> None:
+        """Protected acima da cota devolve as LRU para a probation"""
+        while self._sizes["protected"] > self.protected_bytes and len(self._protected) > 1:
+            key, _ = self._protected.popitem(last=False)
+            size = self._entries[key].size
+            self._sizes["protected"] -= size
+            self._probation[key] = None
+            self._sizes["probation"] += size
+
+    def _evict_main_overflow(self) -> None:
+        while self._sizes["probation"] + self._sizes["protected"] > self.main_bytes:
+            self._remove(self._victim())
+        self._drain_window()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        region = self._region_of(key)
+        del self._regions[region][key]
+        self._sizes[region] -= entry.size
+        self.raw_bytes -= entry.raw
+
+
+_MISSING = object()
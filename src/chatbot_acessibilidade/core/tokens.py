@@ -0,0 +1,159 @@
+"""
+Estimativa de tokens e orçamento de prompt por estágio
+
+Os prompts dos estágios crescem com a resposta: Validador e Revisor recebem a
+resposta anterior inteira e o Testador recebe a pergunta mais a resposta final,
+somados às instruções de vários KB de cada agente. Este módulo estima os tokens
+de um texto sem chamar a API e ajusta entradas ao orçamento do estágio:
+
+- estimativa: cada palavra conta 1 token a cada TOKEN_ESTIMATE_CHARS_PER_TOKEN
+  caracteres e cada símbolo conta 1 token (código HTML/JS tem muitos símbolos)
+- ajuste: resumo extrativo que mantém os blocos (parágrafos, listas, blocos de
+  código inteiros) em ordem enquanto couberem no orçamento e marca os trechos
+  omitidos com TOKEN_TRIM_MARKER
+- partes: divisão do texto inteiro em partes que cabem no orçamento, sem
+  omitir nada (estágios que precisam ver todo o conteúdo)
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+from chatbot_acessibilidade.core.constants import (
+    TOKEN_ESTIMATE_CHARS_PER_TOKEN,
+    TOKEN_TRIM_MARKER,
+)
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+FENCE_PATTERN = re.compile(r"^\s*```")
+
+
+def estimar_tokens(texto: str) -> int:
+    """
+    Estima o número de tokens de um texto.
+
+    Args:
+        texto: Texto do prompt ou da resposta
+
+    Returns:
+        Número aproximado de tokens
+    """
+    return sum(
+        1 + (len(pedaco) - 1) // TOKEN_ESTIMATE_CHARS_PER_TOKEN
+        for pedaco in TOKEN_PATTERN.findall(texto)
+    )
+
+
+@lru_cache(maxsize=32)
+def estimar_tokens_instrucao(instrucao: str) -> int:
+    """Estimativa das instruções dos agentes (texto fixo, calculada uma vez)"""
+    return estimar_tokens(instrucao)
+
+
+def dividir_blocos(texto: str) -> List[str]:
+    """
+    Divide o texto em blocos separados por linhas em branco.
+
+    Blocos de código cercados por ``` ficam inteiros, mesmo com linhas em branco.
+    """
+    blocos: List[str] = []
+    atual: List[str] = []
+    em_codigo = False
+    for linha in texto.splitlines():
+        if FENCE_PATTERN.match(linha):
+            em_codigo = not em_codigo
+        if not linha.strip() and not em_codigo:
+            if atual:
+                blocos.append("\n".join(atual))
+                atual = []
+            continue
+        atual.append(linha)
+    if atual:
+        blocos.append("\n".join(atual))
+    return blocos
+
+
+def _cortar_palavras(texto: str, max_tokens: int) -> str:
+    """Primeiras palavras do texto que cabem em max_tokens"""
+    palavras: List[str] = []
+    usados = 0
+    for palavra in texto.split():
+        usados += estimar_tokens(palavra)
+        if usados > max_tokens:
+            break
+        palavras.append(palavra)
+    return " ".join(palavras)
+
+
+def ajustar_ao_orcamento(texto: str, max_tokens: int) -> Tuple[str, bool]:
+    """
+    Reduz o texto ao orçamento de tokens com um resumo extrativo.
+
+    O primeiro bloco (introdução) sempre entra, cortado por palavras se
+    sozinho exceder o orçamento; os demais entram em ordem enquanto couberem.
+
+    Args:
+        texto: Texto a ser embutido no prompt
+        max_tokens: Orçamento de tokens do texto
+
+    Returns:
+        (texto ajustado, True se algo foi omitido)
+    """
+    if estimar_tokens(texto) <= max_tokens:
+        return texto, False
+
+    # Sempre sobra espaço para uma marca de omissão depois do último bloco
+    custo_marca = estimar_tokens(TOKEN_TRIM_MARKER)
+    disponivel = max_tokens - custo_marca
+    selecionados: List[str] = []
+    omitiu = False
+    for posicao, bloco in enumerate(dividir_blocos(texto)):
+        custo = estimar_tokens(bloco)
+        if custo <= disponivel:
+            selecionados.append(bloco)
+            disponivel -= custo
+            omitiu = False
+            continue
+        if posicao == 0:
+            bloco = _cortar_palavras(bloco, disponivel)
+            if bloco:
+                selecionados.append(bloco)
+                disponivel -= estimar_tokens(bloco)
+        # Uma marca por trecho omitido (blocos consecutivos contam como um só)
+        if not omitiu:
+            selecionados.append(TOKEN_TRIM_MARKER)
+            disponivel -= custo_marca
+            omitiu = True
+    return "\n\n".join(selecionados), True
+
+
+def dividir_no_orcamento(texto: str, max_tokens: int) -> List[str]:
+    """
+    Divide o texto em partes consecutivas que cabem no orçamento.
+
+    As partes agrupam blocos inteiros (blocos de código não são cortados); um
+    bloco maior que o orçamento forma uma parte sozinho.
+
+    Args:
+        texto: Texto a ser dividido
+        max_tokens: Orçamento de tokens de cada parte
+
+    Returns:
+        Partes na ordem original ([texto] se ele já couber)
+    """
+    if estimar_tokens(texto) <= max_tokens:
+        return [texto]
+
+    partes: List[str] = []
+    atual: List[str] = []
+    usados = 0
+    for bloco in dividir_blocos(texto):
+        custo = estimar_tokens(bloco)
+        if atual and usados + custo > max_tokens:
+            partes.append("\n\n".join(atual))
+            atual, usados = [], 0
+        atual.append(bloco)
+        usados += custo
+    if atual:
+        partes.append("\n\n".join(atual))
+    return partes
@@ -0,0 +1,152 @@
+"""
+Módulo de warm-up do backend
+
+O import do ADK/genai e a criação dos agentes são caros e não são necessários
+para responder aos health checks. A API sobe sem eles e este módulo os carrega
+em segundo plano (ou sob demanda, na primeira pergunta).
+
+O estado do warm-up, junto com o pré-carregamento do cache (cache_warmup) e o
+circuito dos provedores, compõe a prontidão exposta em /api/ready.
+"""
+
+import asyncio
+import logging
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from chatbot_acessibilidade.config import settings
+from chatbot_acessibilidade.core.cache_warmup import (
+    CACHE_WARMUP_DISABLED,
+    CACHE_WARMUP_DONE,
+    CACHE_WARMUP_FAILED,
+    get_cache_warmup_state,
+)
+from chatbot_acessibilidade.core.constants import LogMessages
+from chatbot_acessibilidade.core.provider_health import all_circuits_closed, get_provider_health
+
+logger = logging.getLogger(__name__)
+
+# Estados possíveis do warm-up
+WARMUP_PENDING = "pending"
+WARMUP_RUNNING = "running"
+WARMUP_DONE = "done"
+WARMUP_FAILED = "failed"
+WARMUP_DISABLED = "disabled"
+
+_lock = Lock()
+_state: Dict[str, Any] = {
+    "status": WARMUP_PENDING,
+    "agents_ready": False,
+    "duration": None,  # Segundos gastos no warm-up
+    "error": None,
+}
+_task: Optional["asyncio.Task[None]"] = None
+
+
+def _set_state(**changes: Any) -> None:
+    with _lock:
+        _state.update(changes)
+
+
+def warm_up() -> None:
+    """
+    Executa o warm-up de forma síncrona: importa o dispatcher (ADK, genai,
+    api_core) e cria os agentes.
+
+    Falhas são registradas no estado e não propagam: a API continua no ar e
+    a primeira pergunta tenta criar os agentes novamente.
+    """
+    _set_state(status=WARMUP_RUNNING, error=None)
+    inicio = time.perf_counter()
+    try:
+        from chatbot_acessibilidade.agents.dispatcher import get_agentes
+
+        get_agentes()
+        _set_state(agents_ready=True)
+    except Exception as e:
+        logger.error(LogMessages.WARMUP_FAILED.format(error=e), exc_info=True)
+        _set_state(status=WARMUP_FAILED, error=str(e), duration=time.perf_counter() - inicio)
+        return
+
+    duracao = time.perf_counter() - inicio
+    _set_state(status=WARMUP_DONE, duration=duracao)
+    logger.info(LogMessages.WARMUP_FINISHED.format(duration=duracao))
+
+
+def start_warmup() -> "asyncio.Task[None]":
+    """
+    Agenda o warm-up em uma thread, sem bloquear o event loop.
+
+    Returns:
+        Task do warm-up (a mesma se já tiver sido iniciado)
+    """
+    global _task
+    if _task is None:
+        logger.info(LogMessages.WARMUP_STARTED)
+        _task = asyncio.create_task(asyncio.to_thread(warm_up))
+    return _task
+
+
+def get_warmup_state() -> Dict[str, Any]:
+    """
+    Retorna uma cópia do estado atual do warm-up.
+
+    Returns:
+        Dicionário com status, agents_ready, duration e error
+    """
+    with _lock:
+        estado = dict(_state)
+    if not settings.startup_warmup_enabled and estado["status"] == WARMUP_PENDING:
+        # Modo sob demanda: agentes são criados na primeira pergunta
+        estado["status"] = WARMUP_DISABLED
+    return estado
+
+
+def get_readiness() -> Dict[str, Any]:
+    """
+    Avalia se a instância está pronta para receber tráfego.
+
+    Pronta quando o warm-up terminou (ou está desabilitado), o cache terminou
+    de ser pré-carregado (uma falha não bloqueia: o cache só começa vazio) e
+    nenhum provedor está com o circuito aberto. Um warm-up que falhou é
+    agendado novamente pelo endpoint de prontidão.
+
+    Returns:
+        Dicionário com ready (bool) e o detalhe de cada verificação
+    """
+    warmup = get_warmup_state()
+    cache = get_cache_warmup_state()
+    providers = get_provider_health()
+    warmup_ok = warmup["status"] in (WARMUP_DONE, WARMUP_DISABLED)
+    cache_ok = cache["status"] in (CACHE_WARMUP_DONE, CACHE_WARMUP_FAILED, CACHE_WARMUP_DISABLED)
+
+    return {
+        "ready": warmup_ok and cache_ok and all_circuits_closed(),
+        "checks": {
+            "warmup": warmup,
+            "cache": cache,
+            "providers": providers,
+        },
+    }
+
+
+def restart_warmup_if_failed() -> None:
+    """Agenda um novo warm-up se o anterior falhou (requer event loop ativo)"""
+    global _task
+    if get_warmup_state()["status"] == WARMUP_FAILED and (_task is None or _task.done()):
+        _task = None
+        start_warmup()
+
+
+def reset_warmup() -> None:
+    """Reseta o estado do warm-up (útil para testes)"""
+    global _task
+    with _lock:
+        _state.update(
+            status=WARMUP_PENDING,
+            agents_ready=False,
+            duration=None,
+            error=None,
+        )
+    _task = None
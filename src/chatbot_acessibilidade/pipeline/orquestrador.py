@@ -7,23 +7,122 @@ de execução dos agentes especializados em acessibilidade digital.
 
 import asyncio
 import logging
-import json
-from typing import Dict, Tuple, Union
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
-from chatbot_acessibilidade.agents.dispatcher import get_agent_response
+from chatbot_acessibilidade.agents.dispatcher import get_agent_response, stream_agent_response
 from chatbot_acessibilidade.config import settings
-from chatbot_acessibilidade.core.constants import ErrorMessages
-from chatbot_acessibilidade.core.exceptions import APIError, AgentError, ValidationError
+from chatbot_acessibilidade.core.comandos import (
+    ComandoResolvido,
+    interpretar_simulacao,
+    resolver_comando,
+)
+from chatbot_acessibilidade.core.constants import ErrorMessages, LogMessages
+from chatbot_acessibilidade.core.exceptions import (
+    APIError,
+    AgentError,
+    ResponseTruncatedError,
+    ValidationError,
+)
 from chatbot_acessibilidade.core.formatter import (
     eh_erro,
     extrair_primeiro_paragrafo,
     formatar_resposta_final,
     gerar_dica_final,
 )
-from chatbot_acessibilidade.core.metrics import MetricsContext, record_request
+from chatbot_acessibilidade.core.metrics import (
+    MetricsContext,
+    record_combined,
+    record_prompt_over_budget,
+    record_request,
+)
+from chatbot_acessibilidade.core.resposta_combinada import (
+    interpretar_resposta_combinada,
+    montar_prompt_combinado,
+)
+from chatbot_acessibilidade.core.router import PLANO_COMPLETO, RoutePlan, rotear_pergunta
+from chatbot_acessibilidade.core.saida_estruturada import RefatoracaoCodigo, validar_saida
+from chatbot_acessibilidade.core.tokens import (
+    ajustar_ao_orcamento,
+    dividir_no_orcamento,
+    estimar_tokens,
+)
 
 logger = logging.getLogger(__name__)
 
+# Validador recebe a resposta inteira ou, acima do orçamento, um trecho por chamada
+PROMPT_VALIDADOR = "Analise esta resposta técnica sobre acessibilidade digital:\n\n{resposta}"
+PROMPT_VALIDADOR_PARTE = (
+    "Analise este trecho ({parte} de {total}) de uma resposta técnica sobre "
+    "acessibilidade digital. Responda OK ou apenas o trecho corrigido:\n\n{trecho}"
+)
+
+# Testador recebe pergunta + resposta final (resumida acima do orçamento)
+PROMPT_TESTADOR = (
+    "Crie um plano de testes práticos para validar esta solução de "
+    "acessibilidade:\n\n"
+    "Pergunta: {pergunta}\n\n"
+    "Resposta: {resposta}"
+)
+
+# Seções removidas da resposta quando o roteador pula o estágio
+SECOES_POR_ESTAGIO = {
+    "testador": "🧪 **Como Testar na Prática**",
+    "aprofundador": "📚 **Quer se Aprofundar?**",
+}
+
+
+async def _estagio_ignorado() -> str:
+    """Resultado vazio de um estágio paralelo pulado pelo roteador"""
+    return ""
+
+
+def _saida_disponivel(estagio: str) -> Optional[int]:
+    """
+    Tokens de texto que o estágio consegue devolver: max_output_tokens menos o
+    raciocínio (thinking), que conta no mesmo limite.
+
+    Com raciocínio dinâmico (thinking_budget None) o gasto não é conhecido; uma
+    resposta cortada ainda vira erro (ResponseTruncatedError) e o estágio mantém
+    o texto anterior.
+    """
+    config = settings.agent_config(estagio)
+    if config.max_output_tokens is None:
+        return None
+    return config.max_output_tokens - (config.thinking_budget or 0)
+
+
+def _limite_de_reescrita(estagio: str, fixos: int = 0) -> Optional[int]:
+    """Maior texto que o estágio reescreve: orçamento do prompt e saída disponível"""
+    orcamento = settings.agent_config(estagio).prompt_budget_tokens
+    limites = [_saida_disponivel(estagio)]
+    if orcamento is not None:
+        limites.append(orcamento - fixos)
+    limites = [limite for limite in limites if limite is not None]
+    return min(limites) if limites else None
+
+
+def _dentro_do_orcamento(estagio: str, prompt: str) -> bool:
+    """
+    Verifica o prompt do Revisor, que reescreve a resposta inteira.
+
+    Resumir a entrada cortaria a própria resposta e validar em partes mudaria o
+    tom entre os trechos, então acima do orçamento (ou do que o estágio consegue
+    devolver) o estágio é pulado e mantém a resposta da etapa anterior.
+    """
+    limite = _limite_de_reescrita(estagio)
+    if limite is None:
+        return True
+    tokens = estimar_tokens(prompt)
+    if tokens <= limite:
+        return True
+    logger.warning(
+        LogMessages.PROMPT_OVER_BUDGET.format(
+            agente=estagio, tokens=tokens, budget=limite, acao="estágio pulado"
+        )
+    )
+    record_prompt_over_budget(estagio)
+    return False
+
 
 def _tratar_resultado_paralelo(
     resultado: Union[str, Exception], nome_agente: str, fallback: str
@@ -61,6 +160,9 @@ class PipelineOrquestrador:
     4. Testador: Gera plano de testes (paralelo)
     5. Aprofundador: Busca referências (paralelo)
 
+    Com settings.pipeline_mode="combinado" o agente combinado gera todas as
+    seções em uma chamada; respostas rejeitadas seguem pelos cinco agentes.
+
     Attributes:
         pergunta: Pergunta do usuário sobre acessibilidade
         resposta_inicial: Resposta gerada pelo assistente
@@ -68,16 +170,30 @@ class PipelineOrquestrador:
         resposta_final: Resposta após revisão de linguagem
         testes: Plano de testes gerado
         aprofundar: Referências e materiais de estudo
+        rota: Plano do roteador (modelos por estágio e estágios pulados)
+        ao_receber_revisao: Consumidor das partes do Revisor em streaming
     """
 
-    def __init__(self):
-        """Inicializa o orquestrador do pipeline."""
+    # Handler de cada comando registrado em core.comandos
+    HANDLERS_COMANDOS = {"/simular": "_simular_persona", "/refatorar": "_refatorar_codigo"}
+
+    def __init__(self, ao_receber_revisao: Optional[Callable[[str], Awaitable[None]]] = None):
+        """
+        Inicializa o orquestrador do pipeline.
+
+        Args:
+            ao_receber_revisao: Recebe cada trecho do texto do Revisor assim que o
+                modelo o produz (None: o Revisor roda sem streaming). Se o Revisor
+                falhar, a resposta final volta a ser a validada.
+        """
         self.pergunta: str = ""
         self.resposta_inicial: str = ""
         self.resposta_validada: str = ""
         self.resposta_final: str = ""
         self.testes: str = ""
         self.aprofundar: str = ""
+        self.rota: RoutePlan = PLANO_COMPLETO
+        self.ao_receber_revisao = ao_receber_revisao
 
     def validar_entrada(self, pergunta: str) -> None:
         """
@@ -110,7 +226,8 @@ class PipelineOrquestrador:
         """
         Executa os agentes sequencialmente: Assistente → Validador → Revisor.
 
-        Cada etapa tem fallback para a etapa anterior em caso de erro.
+        Cada etapa tem fallback para a etapa anterior em caso de erro; etapas
+        puladas pelo roteador também mantêm a resposta da etapa anterior.
         Métricas são coletadas para cada agente usando MetricsContext.
         """
         # 1. Agente Assistente: Gera a primeira versão da resposta
@@ -119,7 +236,7 @@ class PipelineOrquestrador:
             try:
                 # O agente assistente já tem instrução completa, apenas passamos a pergunta
                 self.resposta_inicial = await get_agent_response(
-                    "assistente", self.pergunta, "assistente"
+                    "assistente", self.pergunta, "assistente", model=self.rota.modelo("assistente")
                 )
 
                 if eh_erro(self.resposta_inicial):
@@ -129,21 +246,43 @@ class PipelineOrquestrador:
                     )
 
                 logger.debug("Agente Assistente executado com sucesso")
+            except ResponseTruncatedError as e:
+                # Sem etapa anterior para manter: segue com o texto gerado até o corte
+                if not e.partial:
+                    raise
+                logger.warning("Resposta do assistente cortada, seguindo com o texto parcial")
+                self.resposta_inicial = e.partial
             except (APIError, AgentError) as e:
                 logger.error(f"Erro no agente assistente: {e}")
                 raise
 
         # 2. Agente Validador: Valida e corrige tecnicamente
+        if not self.rota.executa("validador"):
+            logger.debug("Validador pulado pelo roteador")
+            self.resposta_validada = self.resposta_inicial
+        else:
+            await self._executar_validador()
+
+        # 3. Agente Revisor: Simplifica a linguagem
+        if not self.rota.executa("revisor"):
+            logger.debug("Revisor pulado pelo roteador")
+            self.resposta_final = self.resposta_validada
+        else:
+            await self._executar_revisor()
+
+    async def _executar_validador(self) -> None:
+        """Validador: mantém a resposta inicial (OK/erro) ou usa a versão corrigida"""
         logger.debug("Executando agente Validador...")
         with MetricsContext(agent_name="validador"):
+            partes = self._partes_para_validador()
+            if len(partes) > 1:
+                self.resposta_validada = await self._validar_em_partes(partes)
+                return
             try:
                 # Validador recebe a resposta do assistente para validar
-                prompt_validador = (
-                    f"Analise esta resposta técnica sobre acessibilidade digital:\n\n"
-                    f"{self.resposta_inicial}"
-                )
+                prompt_validador = PROMPT_VALIDADOR.format(resposta=self.resposta_inicial)
                 resposta_validacao = await get_agent_response(
-                    "validador", prompt_validador, "validador"
+                    "validador", prompt_validador, "validador", model=self.rota.modelo("validador")
                 )
 
                 if eh_erro(resposta_validacao):
@@ -162,7 +301,68 @@ class PipelineOrquestrador:
                 logger.warning(f"Erro no agente validador: {e}, usando resposta inicial")
                 self.resposta_validada = self.resposta_inicial  # Fallback
 
-        # 3. Agente Revisor: Simplifica a linguagem
+    def _partes_para_validador(self) -> List[str]:
+        """
+        Divide a resposta inicial para o Validador.
+
+        Cada parte cabe no orçamento do prompt (descontado o enunciado) e na saída
+        disponível do agente (descontado o raciocínio), para que o trecho
+        corrigido volte inteiro.
+        """
+        fixos = estimar_tokens(PROMPT_VALIDADOR_PARTE.format(parte=0, total=0, trecho=""))
+        limite = _limite_de_reescrita("validador", fixos)
+        if limite is None:
+            return [self.resposta_inicial]
+
+        partes = dividir_no_orcamento(self.resposta_inicial, limite)
+        if len(partes) > 1:
+            logger.info(
+                LogMessages.PROMPT_OVER_BUDGET.format(
+                    agente="validador",
+                    tokens=estimar_tokens(self.resposta_inicial),
+                    budget=limite,
+                    acao=f"validado em {len(partes)} partes",
+                )
+            )
+            record_prompt_over_budget("validador")
+        return partes
+
+    async def _validar_em_partes(self, partes: List[str]) -> str:
+        """Valida os trechos em paralelo; trechos com erro ou OK ficam como estavam"""
+        total = len(partes)
+        resultados = await asyncio.gather(
+            *(
+                get_agent_response(
+                    "validador",
+                    PROMPT_VALIDADOR_PARTE.format(parte=indice, total=total, trecho=trecho),
+                    "validador",
+                    model=self.rota.modelo("validador"),
+                )
+                for indice, trecho in enumerate(partes, start=1)
+            ),
+            return_exceptions=True,
+        )
+
+        validadas = []
+        corrigiu = False
+        for trecho, resultado in zip(partes, resultados, strict=True):
+            if isinstance(resultado, Exception):
+                logger.warning(f"Erro no agente validador: {resultado}, mantendo o trecho")
+                validadas.append(trecho)
+            elif eh_erro(resultado) or resultado.strip() == "OK":
+                validadas.append(trecho)
+            else:
+                validadas.append(resultado)
+                corrigiu = True
+
+        if not corrigiu:
+            logger.debug("Validador aprovou todos os trechos (OK)")
+            return self.resposta_inicial
+        logger.debug("Validador corrigiu trechos da resposta")
+        return "\n\n".join(validadas)
+
+    async def _executar_revisor(self) -> None:
+        """Revisor: simplifica a linguagem, com fallback para a resposta validada"""
         logger.debug("Executando agente Revisor...")
         with MetricsContext(agent_name="revisor"):
             try:
@@ -172,7 +372,17 @@ class PipelineOrquestrador:
                     "simples e inclusiva:\n\n"
                     f"{self.resposta_validada}"
                 )
-                self.resposta_final = await get_agent_response("revisor", prompt_revisor, "revisor")
+                if not _dentro_do_orcamento("revisor", prompt_revisor):
+                    self.resposta_final = self.resposta_validada
+                    return
+                if self.ao_receber_revisao is None:
+                    self.resposta_final = await get_agent_response(
+                        "revisor", prompt_revisor, "revisor", model=self.rota.modelo("revisor")
+                    )
+                else:
+                    self.resposta_final = await self._revisar_em_streaming(
+                        prompt_revisor, self.ao_receber_revisao
+                    )
 
                 if eh_erro(self.resposta_final):
                     logger.warning("Erro na resposta do revisor, usando resposta validada")
@@ -184,6 +394,18 @@ class PipelineOrquestrador:
                 logger.warning(f"Erro no agente revisor: {e}, usando resposta validada")
                 self.resposta_final = self.resposta_validada  # Fallback
 
+    async def _revisar_em_streaming(
+        self, prompt_revisor: str, consumidor: Callable[[str], Awaitable[None]]
+    ) -> str:
+        """Revisor em streaming: repassa cada trecho e devolve o texto completo"""
+        partes = []
+        async for parte in stream_agent_response(
+            "revisor", prompt_revisor, "revisor", model=self.rota.modelo("revisor")
+        ):
+            partes.append(parte)
+            await consumidor(parte)
+        return "".join(partes)
+
     async def executar_paralelo(self) -> Tuple[str, str]:
         """
         Executa os agentes Testador e Aprofundador em paralelo.
@@ -194,12 +416,8 @@ class PipelineOrquestrador:
         logger.debug("Executando agentes paralelos (Testador + Aprofundador)...")
 
         # Prepara prompts para os agentes paralelos
-        # Testador recebe pergunta + resposta final
-        prompt_testes = (
-            "Crie um plano de testes práticos para validar esta solução de "
-            "acessibilidade:\n\n"
-            f"Pergunta: {self.pergunta}\n\n"
-            f"Resposta: {self.resposta_final}"
+        prompt_testes = PROMPT_TESTADOR.format(
+            pergunta=self.pergunta, resposta=self._resposta_para_testador()
         )
 
         # Aprofundador recebe apenas a pergunta (busca referências)
@@ -208,9 +426,24 @@ class PipelineOrquestrador:
             f"Pergunta: {self.pergunta}"
         )
 
-        # Executa as tarefas em paralelo
-        task_testes = get_agent_response("testador", prompt_testes, "teste")
-        task_aprofundar = get_agent_response("aprofundador", prompt_aprofundar, "aprofundar")
+        # Executa as tarefas em paralelo (estágios pulados pelo roteador ficam vazios)
+        task_testes = (
+            get_agent_response(
+                "testador", prompt_testes, "teste", model=self.rota.modelo("testador")
+            )
+            if self.rota.executa("testador")
+            else _estagio_ignorado()
+        )
+        task_aprofundar = (
+            get_agent_response(
+                "aprofundador",
+                prompt_aprofundar,
+                "aprofundar",
+                model=self.rota.modelo("aprofundador"),
+            )
+            if self.rota.executa("aprofundador")
+            else _estagio_ignorado()
+        )
 
         try:
             resultados_paralelos = await asyncio.gather(
@@ -252,6 +485,63 @@ class PipelineOrquestrador:
             self.aprofundar = "Não foi possível gerar sugestões de aprofundamento desta vez."
             return (self.testes, self.aprofundar)
 
+    def _resposta_para_testador(self) -> str:
+        """Resposta final no orçamento do Testador, descontados pergunta e enunciado"""
+        orcamento = settings.agent_config("testador").prompt_budget_tokens
+        if orcamento is None:
+            return self.resposta_final
+        fixos = estimar_tokens(PROMPT_TESTADOR.format(pergunta=self.pergunta, resposta=""))
+        resposta, resumida = ajustar_ao_orcamento(self.resposta_final, orcamento - fixos)
+        if resumida:
+            logger.info(
+                LogMessages.PROMPT_OVER_BUDGET.format(
+                    agente="testador",
+                    tokens=fixos + estimar_tokens(self.resposta_final),
+                    budget=orcamento,
+                    acao="resposta resumida",
+                )
+            )
+            record_prompt_over_budget("testador")
+        return resposta
+
+    async def executar_combinado(self) -> Optional[Dict[str, str]]:
+        """
+        Gera todas as seções em uma chamada do agente combinado.
+
+        Returns:
+            Resposta formatada em seções ou None se a chamada, o parser ou a
+            verificação de qualidade falharem (segue para o pipeline de agentes)
+        """
+        logger.debug("Executando agente Combinado...")
+        with MetricsContext(agent_name="combinado"):
+            try:
+                texto = await get_agent_response(
+                    "combinado",
+                    montar_prompt_combinado(self.pergunta),
+                    "combinado",
+                    model=self.rota.modelo("combinado"),
+                )
+                resposta, motivo = interpretar_resposta_combinada(texto)
+            except (APIError, AgentError) as e:
+                resposta, motivo = None, str(e)
+
+        if resposta is None:
+            logger.warning(LogMessages.COMBINED_FALLBACK.format(motivo=motivo))
+            record_combined("fallbacks")
+            return None
+
+        record_combined("accepted")
+        self.resposta_final = f"{resposta.introducao}\n\n{resposta.conceitos}"
+        self.testes = resposta.testes
+        self.aprofundar = resposta.aprofundar
+        return formatar_resposta_final(
+            resposta.introducao,
+            resposta.conceitos,
+            resposta.testes,
+            resposta.aprofundar,
+            gerar_dica_final(self.pergunta, self.resposta_final),
+        )
+
     def formatar_saida(self) -> Dict[str, str]:
         """
         Formata a resposta final usando os formatadores existentes.
@@ -277,9 +567,73 @@ class PipelineOrquestrador:
         resultado_final: Dict[str, str] = formatar_resposta_final(
             introducao, corpo_conceitos, self.testes, self.aprofundar, dica
         )
+        for estagio, secao in SECOES_POR_ESTAGIO.items():
+            if not self.rota.executa(estagio):
+                del resultado_final[secao]
 
         return resultado_final
 
+    async def _simular_persona(self, resolvido: ComandoResolvido) -> Dict[str, str]:
+        """/simular [persona] [contexto]: relato em primeira pessoa da persona"""
+        try:
+            simulacao = interpretar_simulacao(resolvido.argumentos)
+            if simulacao is None:
+                return {
+                    "erro": "Formato inválido. Use: /simular [persona] [contexto]. Ex: /simular cega Como faço login?"
+                }
+            persona_nome, contexto = simulacao
+
+            # Executa o agente de persona
+            agente = resolvido.comando.agente
+            prompt_persona = f"Persona: {persona_nome}\nContexto: {contexto}"
+            resposta_persona = await get_agent_response(
+                agente, prompt_persona, "persona", model=self.rota.modelo(agente)
+            )
+
+            return {
+                "🎭 **Análise de Cenário**": f"**Persona:** {persona_nome.capitalize()}\n\n{resposta_persona}",
+                "ℹ️ **Nota**": "Esta é uma simulação baseada em padrões comuns. Pessoas reais podem ter experiências diferentes.",
+            }
+
+        except Exception as e:
+            logger.error(f"Erro na simulação de persona: {e}")
+            return {"erro": f"Erro ao simular persona: {str(e)}"}
+
+    async def _refatorar_codigo(self, resolvido: ComandoResolvido) -> Dict[str, str]:
+        """/refatorar [código]: código acessível, explicação e critérios WCAG"""
+        try:
+            codigo = resolvido.argumentos
+            if not codigo:
+                return {"erro": "Por favor, forneça o código que deseja refatorar após o comando."}
+
+            # Executa o agente refatorador
+            agente = resolvido.comando.agente
+            resposta_json = await get_agent_response(
+                agente,
+                f"Analise e refatore o seguinte código:\n\n{codigo}",
+                "refatorador",
+                model=self.rota.modelo(agente),
+            )
+
+            # Extrai o JSON mesmo com markdown, texto em volta ou erros de sintaxe comuns
+            try:
+                refatoracao = validar_saida(resposta_json, RefatoracaoCodigo, agente)
+            except ValueError as e:
+                logger.error(f"Erro ao interpretar o JSON do refatorador ({e}): {resposta_json}")
+                # Fallback: retorna o texto cru se não houver JSON recuperável
+                return {"⚠️ **Resultado (Formato Bruto)**": resposta_json}
+
+            # Formata para o frontend (chaves amigáveis)
+            return {
+                "💻 **Código Refatorado**": f"```{refatoracao.language}\n{refatoracao.code}\n```",
+                "📝 **Explicação**": refatoracao.explanation,
+                "✅ **Critérios WCAG**": "\n".join([f"- {c}" for c in refatoracao.wcag_criteria]),
+            }
+
+        except Exception as e:
+            logger.error(f"Erro no processo de refatoração: {e}")
+            return {"erro": f"Erro ao refatorar código: {str(e)}"}
+
     async def executar(self, pergunta: str) -> Dict[str, str]:
         """
         Executa o pipeline completo de geração de resposta.
@@ -301,90 +655,22 @@ class PipelineOrquestrador:
         # Valida entrada
         self.validar_entrada(pergunta)
 
-        # Verifica se é uma solicitação de simulação de persona
-        if pergunta.strip().startswith("/simular"):
-            logger.info("Detectado comando de simulação de persona")
-            try:
-                # Remove o comando
-                resto = pergunta.replace("/simular", "", 1).strip()
-
-                # Tenta extrair a persona (primeira palavra)
-                partes = resto.split(" ", 1)
-                if len(partes) < 2:
-                    return {
-                        "erro": "Formato inválido. Use: /simular [persona] [contexto]. Ex: /simular cega Como faço login?"
-                    }
-
-                persona_raw = partes[0].lower()
-                contexto = partes[1]
-
-                # Mapeamento de comandos inclusivos para personas internas
-                mapa_personas = {
-                    "leitor-tela": "Cega",
-                    "cega": "Cega",  # Mantém compatibilidade
-                    "zoom-contraste": "Baixa Visão",
-                    "baixa_visao": "Baixa Visão",
-                    "teclado": "Motora",
-                    "motora": "Motora",
-                    "linguagem-simples": "Cognitiva",
-                    "cognitiva": "Cognitiva",
-                }
-
-                persona_nome = mapa_personas.get(persona_raw, persona_raw)
-
-                # Executa o agente de persona
-                prompt_persona = f"Persona: {persona_nome}\nContexto: {contexto}"
-                resposta_persona = await get_agent_response("persona", prompt_persona, "persona")
-
-                return {
-                    "🎭 **Análise de Cenário**": f"**Persona:** {persona_nome.capitalize()}\n\n{resposta_persona}",
-                    "ℹ️ **Nota**": "Esta é uma simulação baseada em padrões comuns. Pessoas reais podem ter experiências diferentes.",
-                }
-
-            except Exception as e:
-                logger.error(f"Erro na simulação de persona: {e}")
-                return {"erro": f"Erro ao simular persona: {str(e)}"}
-
-        # Verifica se é uma solicitação de refatoração
-        if pergunta.strip().startswith("/refatorar"):
-            logger.info("Detectado comando de refatoração")
-            try:
-                # Remove o comando e pega o código
-                codigo = pergunta.replace("/refatorar", "", 1).strip()
-                if not codigo:
-                    return {
-                        "erro": "Por favor, forneça o código que deseja refatorar após o comando."
-                    }
-
-                # Executa o agente refatorador
-                resposta_json = await get_agent_response(
-                    "refatorador",
-                    f"Analise e refatore o seguinte código:\n\n{codigo}",
-                    "refatorador",
-                )
-
-                # Tenta fazer o parse do JSON
-                try:
-                    # O agente pode retornar markdown de código json, removemos se necessário
-                    resposta_limpa = resposta_json.replace("```json", "").replace("```", "").strip()
-                    dados = json.loads(resposta_limpa)
-
-                    # Formata para o frontend (chaves amigáveis)
-                    return {
-                        "💻 **Código Refatorado**": f"```{dados.get('language', 'html')}\n{dados.get('code', '')}\n```",
-                        "📝 **Explicação**": dados.get("explanation", ""),
-                        "✅ **Critérios WCAG**": "\n".join(
-                            [f"- {c}" for c in dados.get("wcag_criteria", [])]
-                        ),
-                    }
-                except json.JSONDecodeError:
-                    logger.error(f"Erro ao decodificar JSON do refatorador: {resposta_json}")
-                    # Fallback: retorna o texto cru se não for JSON válido
-                    return {"⚠️ **Resultado (Formato Bruto)**": resposta_json}
-
-            except Exception as e:
-                logger.error(f"Erro no processo de refatoração: {e}")
-                return {"erro": f"Erro ao refatorar código: {str(e)}"}
+        # Escolhe modelos e estágios conforme a complexidade da pergunta
+        self.rota = rotear_pergunta(self.pergunta)
+
+        # Comandos (/simular, /refatorar) vão direto ao handler registrado
+        resolvido = resolver_comando(self.pergunta)
+        if resolvido is not None:
+            logger.info(f"Detectado comando {resolvido.comando.nome}")
+            handler = getattr(self, self.HANDLERS_COMANDOS[resolvido.comando.nome])
+            resposta_comando: Dict[str, str] = await handler(resolvido)
+            return resposta_comando
+
+        # Modo combinado: uma chamada com todas as seções (sem streaming do Revisor)
+        if settings.pipeline_mode == "combinado":
+            resposta_combinada = await self.executar_combinado()
+            if resposta_combinada is not None:
+                return resposta_combinada
 
         # Executa sequencialmente: Assistente → Validador → Revisor
         await self.executar_sequencial()
@@ -11,6 +11,18 @@ os.environ.setdefault("GOOGLE_API_KEY", "test_key_for_pytest")
 # Desabilita rate limiting durante testes para evitar falhas por 429
 os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
 
+# Desabilita a FAQ curada: perguntas de exemplo como "O que é WCAG?" devem
+# chegar ao cache e ao pipeline (tests/unit/core/test_faq.py a habilita)
+os.environ.setdefault("FAQ_ENABLED", "false")
+
+# Desabilita o roteamento por complexidade: os testes do pipeline esperam os
+# cinco estágios com o modelo de cada agente (tests/unit/core/test_router.py o habilita)
+os.environ.setdefault("ROUTER_ENABLED", "false")
+
+# Desabilita o cache de contexto: nenhum teste deve criar cached content na API
+# do Gemini (tests/unit/core/test_context_cache.py usa o backend local)
+os.environ.setdefault("CONTEXT_CACHE_ENABLED", "false")
+
 # Suprime warnings de dependências externas e ambiente
 try:
     from urllib3.exceptions import NotOpenSSLWarning
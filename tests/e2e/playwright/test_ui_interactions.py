@@ -186,3 +186,83 @@ def test_message_history_persistence(page: Page, base_url: str):
         # Pode não limpar completamente se houver confirmação ou se localStorage não for limpo
         # Por enquanto, apenas verifica que botão funciona
         assert messages_after <= messages_before, "Mensagens devem ser reduzidas após limpar"
+
+
+def test_message_history_paginated_loading(page: Page, base_url: str):
+    """
+    Testa carregamento paginado do histórico salvo em IndexedDB.
+    """
+    page.goto(base_url)
+    page.wait_for_load_state("networkidle")
+
+    # Popula o histórico diretamente pelo módulo de storage
+    page.evaluate(
+        """async () => {
+            const storage = await import('/static/modules/storage.js');
+            await storage.clearMessagesFromStorage();
+            for (let i = 0; i < 45; i++) {
+                await storage.appendMessageToStorage({
+                    role: 'user', content: `Mensagem ${i}`, timestamp: Date.now()
+                });
+            }
+        }"""
+    )
+
+    page.reload()
+    page.wait_for_load_state("networkidle")
+
+    # Apenas a página mais recente é renderizada
+    user_messages = page.get_by_test_id("chat-mensagem-user")
+    expect(user_messages).to_have_count(30)
+    expect(user_messages.last).to_contain_text("Mensagem 44")
+
+    # Carrega a página anterior
+    load_older = page.get_by_test_id("btn-carregar-anteriores")
+    expect(load_older).to_be_visible()
+    load_older.click()
+
+    expect(user_messages).to_have_count(45)
+    expect(user_messages.first).to_contain_text("Mensagem 0")
+    expect(load_older).to_have_count(0)
+
+
+def test_long_history_is_windowed(page: Page, base_url: str):
+    """
+    Testa que históricos longos mantêm apenas uma janela de mensagens no DOM.
+    """
+    page.goto(base_url)
+    page.wait_for_load_state("networkidle")
+
+    page.evaluate(
+        """async () => {
+            const storage = await import('/static/modules/storage.js');
+            await storage.clearMessagesFromStorage();
+            for (let i = 0; i < 90; i++) {
+                await storage.appendMessageToStorage({
+                    role: 'user', content: `Mensagem ${i}`, timestamp: Date.now()
+                });
+            }
+        }"""
+    )
+
+    page.reload()
+    page.wait_for_load_state("networkidle")
+
+    user_messages = page.get_by_test_id("chat-mensagem-user")
+    load_older = page.get_by_test_id("btn-carregar-anteriores")
+    expect(user_messages).to_have_count(30)
+
+    load_older.click()
+    expect(user_messages).to_have_count(60)
+    load_older.click()
+
+    # 90 mensagens carregadas, mas só a janela (limite de 60) fica montada
+    expect(user_messages.first).to_contain_text("Mensagem 0")
+    expect(user_messages).to_have_count(60)
+
+    # Foco fica na primeira mensagem que já estava visível antes do carregamento
+    expect(page.locator('[data-message-id="30"]')).to_be_focused()
+
+    # Rolar até o final remonta as mensagens mais recentes
+    page.locator("#chat-container").evaluate("el => { el.scrollTop = el.scrollHeight; }")
+    expect(user_messages.last).to_contain_text("Mensagem 89")
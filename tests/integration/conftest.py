@@ -15,9 +15,23 @@ src_path = Path(__file__).parent.parent.parent / "src"
 if str(src_path) not in sys.path:
     sys.path.insert(0, str(src_path))
 
+from chatbot_acessibilidade.core.cache import reset_cache_backend  # noqa: E402
 from src.backend.api import app  # noqa: E402
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache():
+    """
+    Cache de respostas vazio em cada teste.
+
+    Com a busca por similaridade, uma pergunta cacheada por outro teste
+    ("Pergunta teste erro") responderia uma reformulação ("teste erro").
+    """
+    reset_cache_backend()
+    yield
+    reset_cache_backend()
+
+
 @pytest.fixture
 def client() -> TestClient:
     """
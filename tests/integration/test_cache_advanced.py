@@ -32,11 +32,11 @@ def client():
 
 
 @pytest.fixture(autouse=True)
-def clear_cache_before_test():
+async def clear_cache_before_test():
     """Limpa cache antes de cada teste."""
-    clear_cache()
+    await clear_cache()
     yield
-    clear_cache()
+    await clear_cache()
 
 
 @pytest.mark.asyncio
@@ -91,7 +91,7 @@ async def test_detailed_metrics(client: TestClient):
             assert isinstance(metrics, dict)
 
         # Verifica métricas de cache (estrutura pode variar)
-        cache_stats = get_cache_stats()
+        cache_stats = await get_cache_stats()
         # get_cache_stats retorna informações sobre o cache, não necessariamente hits/misses
         assert isinstance(cache_stats, dict)
 
@@ -28,7 +28,7 @@ async def test_chat_flow_deep_integration_success(client):
     """
 
     # Mock para simular as respostas dos agentes
-    async def mock_get_agent_response(agent_name, prompt, model_type):
+    async def mock_get_agent_response(agent_name, prompt, model_type, model=None):
         responses = {
             "assistente": "Resposta inicial do assistente sobre acessibilidade.",
             "validador": "OK",  # Validador aprova
@@ -70,7 +70,7 @@ async def test_chat_flow_deep_integration_validator_correction(client):
     Verifica o fluxo onde o Validador corrige a resposta do Assistente.
     """
 
-    async def mock_get_agent_response(agent_name, prompt, model_type):
+    async def mock_get_agent_response(agent_name, prompt, model_type, model=None):
         if agent_name == "assistente":
             return "Resposta incorreta."
         if agent_name == "validador":
@@ -97,7 +97,7 @@ async def test_chat_flow_deep_integration_parallel_failure(client):
     Verifica se o pipeline continua funcionando mesmo se um agente paralelo falhar.
     """
 
-    async def mock_get_agent_response(agent_name, prompt, model_type):
+    async def mock_get_agent_response(agent_name, prompt, model_type, model=None):
         if agent_name == "testador":
             raise Exception("Erro no agente testador")
         return "Conteúdo válido"
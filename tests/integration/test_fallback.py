@@ -47,7 +47,7 @@ async def test_retry_on_temporary_error():
     # Mock de GoogleGeminiClient.generate que simula retry
     call_count = 0
 
-    async def mock_generate(self, prompt):
+    async def mock_generate(self, prompt, model=None, timeout=None):
         nonlocal call_count
         call_count += 1
         # Simula que após algumas tentativas, funciona
@@ -7,7 +7,14 @@ from unittest.mock import MagicMock, patch, AsyncMock
 
 from google.adk.agents import Agent
 
-from chatbot_acessibilidade.agents.dispatcher import get_agent_response
+from chatbot_acessibilidade.agents import dispatcher
+from chatbot_acessibilidade.agents.dispatcher import (
+    get_agent_response,
+    recarregar_agentes,
+    stream_agent_response,
+)
+from chatbot_acessibilidade.config import AgentConfig, settings
+from chatbot_acessibilidade.core.tokens import estimar_tokens
 from chatbot_acessibilidade.core.exceptions import APIError
 
 pytestmark = pytest.mark.unit
@@ -171,3 +178,74 @@ async def test_get_agent_response_erro_inesperado(mock_client_class):
 
     with pytest.raises(AgentError):
         await get_agent_response("assistente", "Teste", "prefixo")
+
+
+@patch("chatbot_acessibilidade.agents.dispatcher.GoogleGeminiClient")
+@pytest.mark.asyncio
+async def test_get_agent_response_usa_timeout_do_agente(mock_client_class):
+    """O timeout configurado para o agente chega ao cliente"""
+    mock_client = MagicMock()
+    mock_client.generate = AsyncMock(return_value="ok")
+    mock_client_class.return_value = mock_client
+
+    with patch.dict(settings.agent_configs, {"testador": AgentConfig(timeout_seconds=15)}):
+        await get_agent_response("testador", "Teste", "prefixo")
+
+    mock_client.generate.assert_awaited_once_with("Teste", model=None, timeout=15)
+
+
+def test_recarregar_agentes_aplica_nova_configuracao():
+    """Os agentes são recriados e as cópias por modelo descartadas"""
+    with (
+        patch("chatbot_acessibilidade.agents.dispatcher.clear_agent_variants") as mock_clear,
+        patch.dict(settings.agent_configs, {"testador": AgentConfig(max_output_tokens=256)}),
+    ):
+        antigos = dispatcher.get_agentes()
+        novos = recarregar_agentes()
+
+        assert novos is not antigos
+        assert dispatcher.get_agentes() is novos
+        assert novos["testador"].generate_content_config.max_output_tokens == 256
+        mock_clear.assert_called_once()
+
+    recarregar_agentes()
+
+
+@patch("chatbot_acessibilidade.agents.dispatcher.record_tokens")
+@patch("chatbot_acessibilidade.agents.dispatcher.GoogleGeminiClient")
+@pytest.mark.asyncio
+async def test_get_agent_response_registra_tokens(mock_client_class, mock_record_tokens):
+    """Instruções + prompt e resposta são contabilizados por agente"""
+    mock_client = MagicMock()
+    mock_client.generate = AsyncMock(return_value="Resposta de teste")
+    mock_client_class.return_value = mock_client
+
+    await get_agent_response("revisor", "Revise este texto", "revisor")
+
+    tipo, prompt_tokens, response_tokens = mock_record_tokens.call_args.args
+    assert tipo == "revisor"
+    assert prompt_tokens > 100  # instruções do agente + prompt
+    assert response_tokens == 5
+
+
+@patch("chatbot_acessibilidade.agents.dispatcher.record_tokens")
+@patch("chatbot_acessibilidade.agents.dispatcher.GoogleGeminiClient")
+async def test_stream_agent_response_repassa_partes(mock_client_class, mock_record_tokens):
+    """As partes do cliente chegam na ordem e os tokens são contados no fim"""
+
+    async def gerar(prompt, model=None, timeout=None):
+        for parte in ("Texto ", "revisado."):
+            yield parte
+
+    mock_client_class.return_value = MagicMock(generate_stream=gerar)
+
+    partes = [parte async for parte in stream_agent_response("revisor", "Revise", "revisor")]
+
+    assert partes == ["Texto ", "revisado."]
+    assert mock_record_tokens.call_args.args[2] == estimar_tokens("Texto revisado.")
+
+
+async def test_stream_agent_response_agente_inexistente():
+    """Agente inexistente gera uma única parte com a mensagem de erro"""
+    partes = [parte async for parte in stream_agent_response("inexistente", "x", "p")]
+    assert partes == ["Erro: agente 'inexistente' não encontrado."]
@@ -1,4 +1,12 @@
+from unittest.mock import patch
+
 from chatbot_acessibilidade.agents.factory import criar_agentes
+from chatbot_acessibilidade.config import AgentConfig, settings
+from chatbot_acessibilidade.core.context_cache import (
+    descartar_cache_invalido,
+    usar_cache_de_contexto,
+)
+from chatbot_acessibilidade.core.knowledge_base import buscar_referencias_acessibilidade
 
 
 def test_criar_agentes_inclui_refatorador():
@@ -19,3 +27,29 @@ def test_todos_agentes_tem_instrucoes():
     for nome, agente in agentes.items():
         assert agente.instruction is not None
         assert len(agente.instruction) > 10
+
+
+def test_agentes_de_referencia_usam_base_local():
+    """Aprofundador, testador e assistente buscam na base local, sem google_search."""
+    agentes = criar_agentes()
+    for nome in ("aprofundador", "testador", "assistente"):
+        assert agentes[nome].tools == [buscar_referencias_acessibilidade]
+    assert "google_search" not in agentes["aprofundador"].instruction
+
+
+def test_agentes_usam_configuracao_de_geracao():
+    """Modelo e geração de cada agente vêm de settings.agent_config"""
+    overrides = {"testador": AgentConfig(model="gemini-2.5-flash-lite", max_output_tokens=512)}
+    with patch.dict(settings.agent_configs, overrides):
+        agentes = criar_agentes()
+
+    testador = agentes["testador"]
+    assert testador.model == "gemini-2.5-flash-lite"
+    assert testador.generate_content_config.max_output_tokens == 512
+    assert testador.generate_content_config.thinking_config.thinking_budget == 0
+    assistente = agentes["assistente"]
+    assert assistente.model == settings.agent_model
+    assert assistente.generate_content_config.max_output_tokens == 8192
+    assert assistente.generate_content_config.thinking_config is None
+    assert all(a.before_model_callback is usar_cache_de_contexto for a in agentes.values())
+    assert all(a.on_model_error_callback is descartar_cache_invalido for a in agentes.values())
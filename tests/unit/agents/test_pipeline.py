@@ -276,7 +276,7 @@ async def test_pipeline_agentes_paralelos_excecao_geral(mock_get_agent_response)
 
     # Mock que retorna valores normais para os primeiros 3 agentes
     # e levanta exceção para os agentes paralelos
-    async def async_side_effect(tipo, prompt, prefixo):
+    async def async_side_effect(tipo, prompt, prefixo, model=None):
         if tipo == "assistente":
             return resposta_assistente
         elif tipo == "validador":
@@ -348,7 +348,7 @@ async def test_pipeline_agentes_paralelos_excecao_geral_no_gather(mock_get_agent
 
     call_count = [0]
 
-    async def async_side_effect(tipo, prompt, prefixo):
+    async def async_side_effect(tipo, prompt, prefixo, model=None):
         call_count[0] += 1
         if call_count[0] == 1:  # assistente
             return resposta_assistente
@@ -9,14 +9,17 @@ from fastapi.testclient import TestClient
 
 
 from src.backend.api import app
+from chatbot_acessibilidade.core.cache import reset_cache_backend
 
 pytestmark = pytest.mark.unit
 
 
 @pytest.fixture
 def client():
-    """Cria um cliente de teste para a API"""
-    return TestClient(app)
+    """Cria um cliente de teste para a API (com o cache de respostas vazio)"""
+    reset_cache_backend()
+    yield TestClient(app)
+    reset_cache_backend()
 
 
 def test_health_check(client):
@@ -29,6 +32,38 @@ def test_health_check(client):
     assert "funcionando" in data["message"].lower()
 
 
+def test_liveness(client):
+    """Liveness responde sem depender de warm-up ou provedores"""
+    response = client.get("/api/live")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+@patch("src.backend.api.get_readiness")
+def test_readiness_pronta(mock_readiness, client):
+    """Readiness retorna 200 quando todas as verificações passam"""
+    mock_readiness.return_value = {"ready": True, "checks": {"warmup": {"status": "done"}}}
+
+    response = client.get("/api/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+@patch("src.backend.api.get_readiness")
+def test_readiness_nao_pronta(mock_readiness, client):
+    """Readiness retorna 503 enquanto o warm-up não termina"""
+    mock_readiness.return_value = {"ready": False, "checks": {"warmup": {"status": "running"}}}
+
+    response = client.get("/api/ready")
+
+    assert response.status_code == 503
+    data = response.json()
+    assert data["status"] == "not_ready"
+    assert data["checks"]["warmup"]["status"] == "running"
+
+
 @patch("src.backend.api.pipeline_acessibilidade", new_callable=AsyncMock)
 def test_chat_endpoint_sucesso(mock_pipeline, client):
     """Testa o endpoint de chat com sucesso"""
@@ -107,7 +142,7 @@ def test_chat_endpoint_metodo_errado(client):
     assert response.status_code == 405  # Method not allowed
 
 
-@patch("src.backend.api.get_cached_response")
+@patch("src.backend.api.get_cached_response", new_callable=AsyncMock)
 @patch("src.backend.api.pipeline_acessibilidade")
 def test_chat_endpoint_com_cache_hit(mock_pipeline, mock_cache, client):
     """Testa quando resposta vem do cache"""
@@ -122,8 +157,8 @@ def test_chat_endpoint_com_cache_hit(mock_pipeline, mock_cache, client):
     mock_pipeline.assert_not_called()
 
 
-@patch("src.backend.api.get_cached_response")
-@patch("src.backend.api.set_cached_response")
+@patch("src.backend.api.get_cached_response", new_callable=AsyncMock)
+@patch("src.backend.api.set_cached_response", new_callable=AsyncMock)
 @patch("src.backend.api.pipeline_acessibilidade", new_callable=AsyncMock)
 @pytest.mark.asyncio
 async def test_chat_endpoint_salva_no_cache(mock_pipeline, mock_set_cache, mock_get_cache, client):
@@ -143,8 +178,8 @@ async def test_chat_endpoint_salva_no_cache(mock_pipeline, mock_set_cache, mock_
     mock_set_cache.assert_called_once()
 
 
-@patch("src.backend.api.get_cached_response")
-@patch("src.backend.api.set_cached_response")
+@patch("src.backend.api.get_cached_response", new_callable=AsyncMock)
+@patch("src.backend.api.set_cached_response", new_callable=AsyncMock)
 @patch("src.backend.api.pipeline_acessibilidade", new_callable=AsyncMock)
 @pytest.mark.asyncio
 async def test_chat_endpoint_nao_salva_erro_no_cache(
@@ -260,6 +295,16 @@ def test_read_root_endpoint(client):
         assert "text/html" in response.headers.get("content-type", "")
 
 
+def test_service_worker_endpoint(client):
+    """Testa que o service worker é servido na raiz e sempre revalidado"""
+    response = client.get("/sw.js")
+
+    assert response.status_code == 200
+    assert "javascript" in response.headers["content-type"]
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.headers["service-worker-allowed"] == "/"
+
+
 def test_api_sys_path_insert():
     """Testa se sys.path.insert é executado quando necessário (linha 23)"""
     import sys
@@ -295,7 +340,7 @@ def test_chat_endpoint_validation_error(mock_pipeline, client):
     )
 
 
-@patch("src.backend.api.get_cache_stats")
+@patch("src.backend.api.get_cache_stats", new_callable=AsyncMock)
 def test_health_check_com_cache(mock_cache_stats, client):
     """Testa health check com cache habilitado"""
     mock_cache_stats.return_value = {"enabled": True, "size": 5, "max_size": 100, "ttl": 3600}
@@ -309,7 +354,7 @@ def test_health_check_com_cache(mock_cache_stats, client):
     assert data["cache"]["enabled"] is True
 
 
-@patch("src.backend.api.get_cache_stats")
+@patch("src.backend.api.get_cache_stats", new_callable=AsyncMock)
 def test_health_check_sem_cache(mock_cache_stats, client):
     """Testa health check com cache desabilitado"""
     mock_cache_stats.return_value = {"enabled": False, "size": 0, "max_size": 0, "ttl": 0}
@@ -319,3 +364,157 @@ def test_health_check_sem_cache(mock_cache_stats, client):
     assert response.status_code == 200
     data = response.json()
     assert data["cache"]["enabled"] is False
+
+
+@patch("src.backend.api.get_similar_cached_response", new_callable=AsyncMock)
+@patch("src.backend.api.get_cached_response", new_callable=AsyncMock)
+@patch("src.backend.api.pipeline_acessibilidade", new_callable=AsyncMock)
+def test_chat_endpoint_usa_pergunta_similar_do_cache(
+    mock_pipeline, mock_get_cache, mock_get_similar, client
+):
+    """Sem hit exato, uma reformulação já cacheada responde sem chamar o pipeline"""
+    mock_get_cache.return_value = None
+    mock_get_similar.return_value = ({"📘 **Introdução**": "Resposta cacheada"}, 0.92)
+
+    response = client.post("/api/chat", json={"pergunta": "testar contraste como?"})
+
+    assert response.status_code == 200
+    assert response.json()["resposta"] == {"📘 **Introdução**": "Resposta cacheada"}
+    mock_pipeline.assert_not_called()
+
+
+@patch("src.backend.api.invalidate_similar_cache", new_callable=AsyncMock)
+def test_admin_invalida_cache_com_token(mock_invalidate, client):
+    """Com o token correto, reformulações são invalidadas"""
+    mock_invalidate.return_value = ["Como testar contraste?", "testar o contraste"]
+
+    with patch("src.backend.api.settings.admin_api_token", "segredo"):
+        response = client.post(
+            "/api/admin/cache/invalidate",
+            json={"pergunta": "Como testar contraste?", "threshold": 0.9},
+            headers={"X-Admin-Token": "segredo"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "invalidated": 2,
+        "perguntas": ["Como testar contraste?", "testar o contraste"],
+        "dry_run": False,
+    }
+    mock_invalidate.assert_awaited_once_with("Como testar contraste?", threshold=0.9, dry_run=False)
+
+
+@patch("src.backend.api.invalidate_similar_cache", new_callable=AsyncMock)
+def test_admin_exige_token(mock_invalidate, client):
+    """Sem token configurado: 404; token errado: 401"""
+    payload = {"pergunta": "Como testar contraste?"}
+
+    with patch("src.backend.api.settings.admin_api_token", ""):
+        assert client.post("/api/admin/cache/invalidate", json=payload).status_code == 404
+
+    with patch("src.backend.api.settings.admin_api_token", "segredo"):
+        response = client.post(
+            "/api/admin/cache/invalidate", json=payload, headers={"X-Admin-Token": "errado"}
+        )
+    assert response.status_code == 401
+    mock_invalidate.assert_not_called()
+
+
+@patch("chatbot_acessibilidade.agents.dispatcher.recarregar_agentes")
+def test_admin_altera_configuracao_do_agente(mock_recarregar, client):
+    """PUT aplica a nova configuração, recria os agentes e rejeita agentes desconhecidos"""
+    headers = {"X-Admin-Token": "segredo"}
+    with (
+        patch("src.backend.api.settings.admin_api_token", "segredo"),
+        patch.dict("src.backend.api.settings.agent_configs", clear=True),
+    ):
+        response = client.put(
+            "/api/admin/agents/testador", json={"max_output_tokens": 512}, headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["max_output_tokens"] == 512
+        mock_recarregar.assert_called_once()
+
+        configs = client.get("/api/admin/agents", headers=headers).json()
+        assert configs["testador"]["max_output_tokens"] == 512
+        assert set(configs) >= {"assistente", "validador", "revisor", "aprofundador"}
+
+        response = client.put("/api/admin/agents/tradutor", json={}, headers=headers)
+        assert response.status_code == 404
+
+
+@patch("src.backend.api.get_cached_response", new_callable=AsyncMock)
+@patch("src.backend.api.pipeline_acessibilidade", new_callable=AsyncMock)
+@patch("src.backend.api.responder_faq")
+def test_chat_endpoint_responde_pela_faq(mock_faq, mock_pipeline, mock_get_cache, client):
+    """Pergunta frequente recebe a resposta curada sem cache nem agentes"""
+    mock_faq.return_value = {"📘 **Introdução**": "Resposta curada"}
+
+    response = client.post("/api/chat", json={"pergunta": "O que é WCAG?"})
+
+    assert response.status_code == 200
+    assert response.json()["resposta"] == {"📘 **Introdução**": "Resposta curada"}
+    mock_get_cache.assert_not_called()
+    mock_pipeline.assert_not_called()
+
+
+@patch("src.backend.api.get_similar_cached_response", new_callable=AsyncMock)
+@patch("src.backend.api.get_cached_response", new_callable=AsyncMock)
+@patch("src.backend.api.set_cached_response", new_callable=AsyncMock)
+@patch("src.backend.api.pipeline_acessibilidade", new_callable=AsyncMock)
+def test_chat_comando_usa_namespace_do_cache(
+    mock_pipeline, mock_set_cache, mock_get_cache, mock_similar, client
+):
+    """Comandos usam a chave canônica no namespace próprio, sem busca semântica"""
+    mock_get_cache.return_value = None
+    mock_pipeline.return_value = {"🎭 **Análise de Cenário**": "Relato"}
+
+    response = client.post("/api/chat", json={"pergunta": "/simular leitor-tela Como faço login?"})
+
+    assert response.status_code == 200
+    mock_get_cache.assert_awaited_once_with("cega|Como faço login?", namespace="simular")
+    assert mock_set_cache.call_args.args[0] == "cega|Como faço login?"
+    assert mock_set_cache.call_args.kwargs["namespace"] == "simular"
+    mock_similar.assert_not_called()
+
+
+@patch("src.backend.api.pipeline_acessibilidade", new_callable=AsyncMock)
+def test_chat_comando_tem_rate_limit_proprio(mock_pipeline, client):
+    """Acima do limite do comando a API responde 429 sem chamar o pipeline"""
+    from src.backend.api import limiter, settings
+
+    mock_pipeline.return_value = {"💻 **Código Refatorado**": "```html\n<button>Ok</button>\n```"}
+    limiter.reset()
+    try:
+        with patch.object(settings, "rate_limit_enabled", True):
+            respostas = [
+                client.post("/api/chat", json={"pergunta": f"/refatorar <div>{i}</div>"})
+                for i in range(4)
+            ]
+    finally:
+        limiter.reset()
+
+    assert [r.status_code for r in respostas] == [200, 200, 200, 429]
+    assert "/refatorar" in respostas[-1].json()["detail"]
+    assert mock_pipeline.await_count == 3
+
+
+@patch("src.backend.api.pipeline_acessibilidade", new_callable=AsyncMock)
+def test_chat_comando_em_cache_nao_conta_no_rate_limit(mock_pipeline, client):
+    """Respostas de comando vindas do cache não consomem o limite do comando"""
+    from src.backend.api import limiter, settings
+
+    mock_pipeline.return_value = {"💻 **Código Refatorado**": "```html\n<button>Ok</button>\n```"}
+    limiter.reset()
+    try:
+        with patch.object(settings, "rate_limit_enabled", True):
+            perguntas = [f"/refatorar <div>{i}</div>" for i in range(3)]
+            respostas = [
+                client.post("/api/chat", json={"pergunta": pergunta})
+                for pergunta in perguntas + perguntas[:2]
+            ]
+    finally:
+        limiter.reset()
+
+    assert [r.status_code for r in respostas] == [200] * 5
+    assert mock_pipeline.await_count == 3
@@ -0,0 +1,170 @@
+"""
+Testes para a compressão dinâmica (brotli/zstd/gzip) e assets pré-comprimidos
+"""
+
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from backend import middleware
+from backend.middleware import CompressionMiddleware, negotiate_encoding
+from backend.static_files import PrecompressedStaticFiles
+
+pytestmark = pytest.mark.unit
+
+GRANDE = {"texto": "acessibilidade digital " * 200}
+
+
+@pytest.fixture
+def app():
+    """Aplicação de teste com o middleware de compressão"""
+    app = FastAPI()
+
+    @app.get("/grande")
+    async def grande():
+        return JSONResponse(GRANDE)
+
+    @app.get("/pequena")
+    async def pequena():
+        return JSONResponse({"ok": True})
+
+    @app.get("/imagem")
+    async def imagem():
+        return PlainTextResponse("x" * 2000, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def gerar():
+            for _ in range(3):
+                yield b"parte " * 200
+
+        return StreamingResponse(gerar(), media_type="text/plain")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return TestClient(app)
+
+
+def test_negotiate_encoding_prefere_ordem_do_servidor():
+    """Com q iguais, vence a ordem de preferência do servidor"""
+    assert negotiate_encoding("gzip, br, zstd", ["br", "zstd", "gzip"]) == "br"
+
+
+def test_negotiate_encoding_respeita_q_values():
+    """q=0 recusa a codificação e q maior vence"""
+    assert negotiate_encoding("br;q=0, gzip", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("br;q=0.5, gzip;q=0.8", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("identity", ["br", "gzip"]) is None
+    assert negotiate_encoding("*", ["br", "gzip"]) == "br"
+
+
+def test_negotiate_encoding_sem_codecs_opcionais(monkeypatch):
+    """Sem brotli/zstandard instalados, apenas gzip é oferecido"""
+    monkeypatch.setattr(middleware, "brotli", None)
+    monkeypatch.setattr(middleware, "zstandard", None)
+    assert negotiate_encoding("br, zstd, gzip") == "gzip"
+
+
+def test_compressao_gzip(client):
+    response = client.get("/grande", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.json() == GRANDE
+
+
+@pytest.mark.skipif(middleware.brotli is None, reason="brotli não instalado")
+def test_compressao_brotli(client):
+    response = client.get("/grande", headers={"Accept-Encoding": "br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert int(response.headers["Content-Length"]) < len(str(GRANDE))
+    assert response.json() == GRANDE
+
+
+@pytest.mark.skipif(middleware.zstandard is None, reason="zstandard não instalado")
+def test_compressao_zstd(client):
+    response = client.get("/grande", headers={"Accept-Encoding": "zstd"})
+    assert response.headers["Content-Encoding"] == "zstd"
+    assert response.json() == GRANDE
+
+
+def test_resposta_pequena_nao_comprimida(client):
+    response = client.get("/pequena", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_imagem_nao_comprimida(client):
+    response = client.get("/imagem", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_sem_accept_encoding_nao_comprime(client):
+    response = client.get("/grande", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.json() == GRANDE
+
+
+def test_streaming_comprimido(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert response.text == "parte " * 600
+
+
+@pytest.fixture
+def static_client(tmp_path):
+    """Cliente servindo um diretório com variantes pré-comprimidas"""
+    conteudo = b"body { color: #000; } " * 100
+    (tmp_path / "styles.css").write_bytes(conteudo)
+    (tmp_path / "styles.css.gz").write_bytes(gzip.compress(conteudo))
+    (tmp_path / "app.js").write_bytes(b"console.log('ok');" * 100)
+
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=str(tmp_path)), name="static")
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(app), conteudo
+
+
+def test_static_serve_variante_precomprimida(static_client):
+    client, conteudo = static_client
+    response = client.get("/static/styles.css", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Content-Type"].startswith("text/css")
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.content == conteudo
+
+
+def test_static_sem_accept_encoding_serve_original(static_client):
+    client, conteudo = static_client
+    response = client.get("/static/styles.css", headers={"Accept-Encoding": "identity"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.content == conteudo
+
+
+def test_static_sem_variante_usa_compressao_dinamica(static_client):
+    """Sem irmão pré-comprimido, o middleware comprime dinamicamente"""
+    client, _ = static_client
+    response = client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.text == "console.log('ok');" * 100
+
+
+def test_static_variante_nao_e_recomprimida(static_client):
+    """A variante .gz é entregue byte a byte, sem dupla compressão"""
+    client, conteudo = static_client
+    with client.stream(
+        "GET", "/static/styles.css", headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        bruto = b"".join(response.iter_raw())
+    assert zlib.decompress(bruto, 16 + zlib.MAX_WBITS) == conteudo
@@ -0,0 +1,190 @@
+"""
+Testes de startup rápido da API (imports sob demanda e warm-up)
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from chatbot_acessibilidade.core import cache_warmup, provider_health, warmup
+
+pytestmark = pytest.mark.unit
+
+SRC_DIR = Path(__file__).resolve().parents[3] / "src"
+
+# Módulos pesados que só devem ser carregados pelo warm-up/primeira pergunta
+LAZY_MODULES = (
+    "google.adk",
+    "google.genai",
+    "google.api_core",
+    "chatbot_acessibilidade.agents.dispatcher",
+    "chatbot_acessibilidade.pipeline",
+)
+
+# Limite generoso para o import de backend.api (hoje ~0,5s, dominado pelo FastAPI)
+MAX_IMPORT_SECONDS = 2.0
+
+
+def _importtime(module: str) -> dict:
+    """Executa `python -X importtime` e retorna {módulo: tempo cumulativo em µs}"""
+    env = {**os.environ, "GOOGLE_API_KEY": "test_key_for_pytest", "PYTHONPATH": str(SRC_DIR)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    tempos = {}
+    for linha in result.stderr.splitlines():
+        # Formato: "import time:  self [us] | cumulative | imported package"
+        if not linha.startswith("import time:") or "imported package" in linha:
+            continue
+        _self_us, cumulativo, nome = linha.split(":", 1)[1].split("|")
+        tempos[nome.strip()] = int(cumulativo)
+    return tempos
+
+
+@pytest.fixture
+def estado_limpo():
+    """Garante estado de warm-up limpo antes e depois do teste"""
+    warmup.reset_warmup()
+    cache_warmup.reset_cache_warmup()
+    provider_health.reset_provider_health()
+    yield
+    warmup.reset_warmup()
+    cache_warmup.reset_cache_warmup()
+    provider_health.reset_provider_health()
+
+
+def test_import_api_nao_carrega_adk_nem_agentes():
+    """Importar backend.api não deve importar ADK/genai nem criar agentes"""
+    tempos = _importtime("backend.api")
+
+    carregados = [nome for nome in tempos if any(nome.startswith(lazy) for lazy in LAZY_MODULES)]
+    assert carregados == []
+
+
+def test_import_api_dentro_do_limite_de_tempo():
+    """Regressão de tempo de import (evita novas dependências pesadas no startup)"""
+    tempos = _importtime("backend.api")
+
+    assert tempos["backend.api"] / 1_000_000 < MAX_IMPORT_SECONDS
+
+
+def test_warm_up_cria_agentes(estado_limpo):
+    """warm_up cria os agentes e marca o estado como concluído"""
+    with patch("chatbot_acessibilidade.agents.dispatcher.get_agentes") as mock_get_agentes:
+        warmup.warm_up()
+
+    mock_get_agentes.assert_called_once()
+    estado = warmup.get_warmup_state()
+    assert estado["status"] == warmup.WARMUP_DONE
+    assert estado["agents_ready"] is True
+    assert estado["duration"] is not None
+
+
+def test_warm_up_registra_falha_sem_propagar(estado_limpo):
+    """Falha no warm-up fica no estado e não derruba a aplicação"""
+    with patch(
+        "chatbot_acessibilidade.agents.dispatcher.get_agentes",
+        side_effect=RuntimeError("sem rede"),
+    ):
+        warmup.warm_up()
+
+    estado = warmup.get_warmup_state()
+    assert estado["status"] == warmup.WARMUP_FAILED
+    assert estado["agents_ready"] is False
+    assert "sem rede" in estado["error"]
+
+
+@pytest.mark.asyncio
+async def test_start_warmup_executa_uma_vez(estado_limpo):
+    """start_warmup agenda o warm-up uma única vez"""
+    with patch.object(warmup, "warm_up") as mock_warm_up:
+        task = warmup.start_warmup()
+        assert warmup.start_warmup() is task
+        await task
+
+    mock_warm_up.assert_called_once()
+
+
+def test_dispatcher_agentes_sao_criados_sob_demanda():
+    """AGENTES continua acessível, mas os agentes são criados uma única vez"""
+    from chatbot_acessibilidade.agents import dispatcher
+
+    with (
+        patch.object(dispatcher, "_agentes", None),
+        patch.object(
+            dispatcher, "criar_agentes", return_value={"assistente": object()}
+        ) as mock_criar,
+    ):
+        assert dispatcher.AGENTES is dispatcher.get_agentes()
+        assert "assistente" in dispatcher.get_agentes()
+
+    mock_criar.assert_called_once()
+
+
+def test_prontidao_depende_do_warm_up(estado_limpo):
+    """Instância só fica pronta depois do warm-up concluído"""
+    cache_warmup._set_state(status=cache_warmup.CACHE_WARMUP_DONE)
+    with patch.object(warmup.settings, "startup_warmup_enabled", True):
+        assert warmup.get_readiness()["ready"] is False
+
+        warmup._set_state(status=warmup.WARMUP_DONE)
+        assert warmup.get_readiness()["ready"] is True
+
+
+def test_prontidao_aguarda_pre_carga_do_cache(estado_limpo):
+    """Pré-carga do cache em andamento mantém a instância fora de prontidão"""
+    warmup._set_state(status=warmup.WARMUP_DONE)
+    cache_warmup._set_state(status=cache_warmup.CACHE_WARMUP_RUNNING, loaded=3, total=10)
+
+    readiness = warmup.get_readiness()
+    assert readiness["ready"] is False
+    assert readiness["checks"]["cache"]["loaded"] == 3
+
+    # Falha no corpus não bloqueia: o cache apenas começa vazio
+    cache_warmup._set_state(status=cache_warmup.CACHE_WARMUP_FAILED)
+    assert warmup.get_readiness()["ready"] is True
+
+
+def test_prontidao_com_warm_up_desabilitado(estado_limpo):
+    """Sem warm-up (modo sob demanda) a instância está pronta desde o início"""
+    with (
+        patch.object(warmup.settings, "startup_warmup_enabled", False),
+        patch.object(cache_warmup.settings, "cache_warmup_enabled", False),
+    ):
+        readiness = warmup.get_readiness()
+
+    assert readiness["ready"] is True
+    assert readiness["checks"]["warmup"]["status"] == warmup.WARMUP_DISABLED
+
+
+def test_prontidao_com_circuito_aberto(estado_limpo):
+    """Provedor sem quota tira a instância de prontidão"""
+    warmup._set_state(status=warmup.WARMUP_DONE)
+    cache_warmup._set_state(status=cache_warmup.CACHE_WARMUP_DONE)
+    provider_health.record_provider_exhausted("Google Gemini", "quota", cooldown=60)
+
+    readiness = warmup.get_readiness()
+    assert readiness["ready"] is False
+    assert readiness["checks"]["providers"]["Google Gemini"]["state"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_warm_up_com_falha_e_reagendado(estado_limpo):
+    """Warm-up que falhou é agendado novamente"""
+    warmup._set_state(status=warmup.WARMUP_FAILED)
+
+    with patch.object(warmup, "warm_up") as mock_warm_up:
+        warmup.restart_warmup_if_failed()
+        await warmup._task
+
+    mock_warm_up.assert_called_once()
@@ -31,6 +31,20 @@ def test_app():
     async def asset_image():
         return JSONResponse({"content": "image"}, media_type="image/jpeg")
 
+    @app.get("/static/app_modular.1a2b3c4d.js")
+    async def static_js_versionado():
+        return JSONResponse(
+            {"content": "console.log('test');"}, media_type="application/javascript"
+        )
+
+    @app.get("/assets/ada-happy.0f9e8d7c.webp")
+    async def asset_versionado():
+        return JSONResponse({"content": "image"}, media_type="image/webp")
+
+    @app.get("/static/modules/chat.deadbeef.js")
+    async def static_versionado_inexistente():
+        return JSONResponse({"detail": "Not Found"}, status_code=404)
+
     @app.get("/api/test")
     async def api_endpoint():
         return JSONResponse({"message": "test"})
@@ -104,3 +118,27 @@ def test_static_cache_different_ttls(client):
     # Rollback: Tudo deve ser no-cache agora
     assert "no-cache" in css_ttl
     assert "no-cache" in image_ttl
+
+
+def test_static_versionado_recebe_cache_imutavel(client):
+    """Assets com hash de conteúdo no nome recebem cache imutável de 1 ano"""
+    response = client.get("/static/app_modular.1a2b3c4d.js")
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_imagem_versionada_recebe_cache_imutavel(client):
+    """Imagens versionadas em /assets também são imutáveis"""
+    response = client.get("/assets/ada-happy.0f9e8d7c.webp")
+
+    assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+
+
+def test_static_versionado_404_nao_e_imutavel(client):
+    """Respostas de erro nunca devem ser cacheadas como imutáveis"""
+    response = client.get("/static/modules/chat.deadbeef.js")
+
+    assert response.status_code == 404
+    assert "immutable" not in response.headers["Cache-Control"]
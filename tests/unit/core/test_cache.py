@@ -26,6 +26,7 @@ def mock_settings():
         mock.cache_enabled = True
         mock.cache_max_size = 10
         mock.cache_ttl_seconds = 3600
+        mock.cache_semantic_threshold = 0.8
         yield mock
 
 
@@ -87,7 +88,15 @@ def test_get_cache_key_diferentes_perguntas():
     assert key1 != key2
 
 
-def test_get_cached_response_cache_hit(mock_settings):
+def test_get_cache_key_namespace_de_comando():
+    """O namespace do comando separa a chave; a chave do comando não é normalizada"""
+    assert get_cache_key("<Button>", "refatorar") != get_cache_key("<button>", "refatorar")
+    assert get_cache_key("cega|login", "simular") != get_cache_key("cega|login ", "simular")
+    assert get_cache_key("cega|login", "simular") != get_cache_key("cega|login")
+
+
+@pytest.mark.asyncio
+async def test_get_cached_response_cache_hit(mock_settings):
     """Testa get_cached_response quando há cache hit"""
     import chatbot_acessibilidade.core.cache as cache_module
 
@@ -101,12 +110,13 @@ def test_get_cached_response_cache_hit(mock_settings):
     cache[key] = resposta_teste
 
     # Busca no cache
-    resultado = get_cached_response(pergunta)
+    resultado = await get_cached_response(pergunta)
 
     assert resultado == resposta_teste
 
 
-def test_get_cached_response_cache_miss(mock_settings):
+@pytest.mark.asyncio
+async def test_get_cached_response_cache_miss(mock_settings):
     """Testa get_cached_response quando há cache miss"""
     import chatbot_acessibilidade.core.cache as cache_module
 
@@ -116,12 +126,13 @@ def test_get_cached_response_cache_miss(mock_settings):
     get_cache()
 
     # Busca pergunta que não está no cache
-    resultado = get_cached_response("Pergunta que não existe")
+    resultado = await get_cached_response("Pergunta que não existe")
 
     assert resultado is None
 
 
-def test_get_cached_response_cache_desabilitado():
+@pytest.mark.asyncio
+async def test_get_cached_response_cache_desabilitado():
     """Testa get_cached_response quando cache está desabilitado"""
     with patch("chatbot_acessibilidade.core.cache.settings") as mock:
         mock.cache_enabled = False
@@ -130,11 +141,12 @@ def test_get_cached_response_cache_desabilitado():
 
         cache_module._cache = None
 
-        resultado = get_cached_response("Qualquer pergunta")
+        resultado = await get_cached_response("Qualquer pergunta")
         assert resultado is None
 
 
-def test_set_cached_response(mock_settings):
+@pytest.mark.asyncio
+async def test_set_cached_response(mock_settings):
     """Testa set_cached_response armazena corretamente"""
     import chatbot_acessibilidade.core.cache as cache_module
 
@@ -143,14 +155,15 @@ def test_set_cached_response(mock_settings):
     pergunta = "O que é WCAG?"
     resposta = {"teste": "resposta"}
 
-    set_cached_response(pergunta, resposta)
+    await set_cached_response(pergunta, resposta)
 
     # Verifica se foi armazenado
-    resultado = get_cached_response(pergunta)
+    resultado = await get_cached_response(pergunta)
     assert resultado == resposta
 
 
-def test_set_cached_response_cache_desabilitado():
+@pytest.mark.asyncio
+async def test_set_cached_response_cache_desabilitado():
     """Testa set_cached_response quando cache está desabilitado"""
     with patch("chatbot_acessibilidade.core.cache.settings") as mock:
         mock.cache_enabled = False
@@ -160,10 +173,11 @@ def test_set_cached_response_cache_desabilitado():
         cache_module._cache = None
 
         # Não deve gerar erro
-        set_cached_response("Pergunta", {"resposta": "teste"})
+        await set_cached_response("Pergunta", {"resposta": "teste"})
 
 
-def test_clear_cache(mock_settings):
+@pytest.mark.asyncio
+async def test_clear_cache(mock_settings):
     """Testa clear_cache limpa o cache corretamente"""
     import chatbot_acessibilidade.core.cache as cache_module
 
@@ -171,37 +185,39 @@ def test_clear_cache(mock_settings):
 
     # Adiciona itens ao cache
     cache = get_cache()
-    set_cached_response("Pergunta 1", {"resposta": "1"})
-    set_cached_response("Pergunta 2", {"resposta": "2"})
+    await set_cached_response("Pergunta 1", {"resposta": "1"})
+    await set_cached_response("Pergunta 2", {"resposta": "2"})
 
     assert len(cache) == 2
 
     # Limpa cache
-    clear_cache()
+    await clear_cache()
 
     assert len(cache) == 0
 
 
-def test_clear_cache_sem_cache():
+@pytest.mark.asyncio
+async def test_clear_cache_sem_cache():
     """Testa clear_cache quando não há cache"""
     import chatbot_acessibilidade.core.cache as cache_module
 
     cache_module._cache = None
 
     # Não deve gerar erro
-    clear_cache()
+    await clear_cache()
 
 
-def test_get_cache_stats_com_cache(mock_settings):
+@pytest.mark.asyncio
+async def test_get_cache_stats_com_cache(mock_settings):
     """Testa get_cache_stats quando cache está habilitado"""
     import chatbot_acessibilidade.core.cache as cache_module
 
     cache_module._cache = None
 
     get_cache()
-    set_cached_response("Pergunta 1", {"resposta": "1"})
+    await set_cached_response("Pergunta 1", {"resposta": "1"})
 
-    stats = get_cache_stats()
+    stats = await get_cache_stats()
 
     assert stats["enabled"] is True
     assert stats["size"] == 1
@@ -209,7 +225,8 @@ def test_get_cache_stats_com_cache(mock_settings):
     assert stats["ttl"] == 3600
 
 
-def test_get_cache_stats_sem_cache():
+@pytest.mark.asyncio
+async def test_get_cache_stats_sem_cache():
     """Testa get_cache_stats quando cache está desabilitado"""
     with patch("chatbot_acessibilidade.core.cache.settings") as mock:
         mock.cache_enabled = False
@@ -218,7 +235,7 @@ def test_get_cache_stats_sem_cache():
 
         cache_module._cache = None
 
-        stats = get_cache_stats()
+        stats = await get_cache_stats()
 
         assert stats["enabled"] is False
         assert stats["size"] == 0
@@ -226,7 +243,8 @@ def test_get_cache_stats_sem_cache():
         assert stats["ttl"] == 0
 
 
-def test_cache_ttl_expiration(mock_settings):
+@pytest.mark.asyncio
+async def test_cache_ttl_expiration(mock_settings):
     """Testa se cache respeita TTL (simulação)"""
     import chatbot_acessibilidade.core.cache as cache_module
 
@@ -237,16 +255,17 @@ def test_cache_ttl_expiration(mock_settings):
     cache_module._cache = None
 
     get_cache()
-    set_cached_response("Pergunta", {"resposta": "teste"})
+    await set_cached_response("Pergunta", {"resposta": "teste"})
 
     # Verifica que está no cache
-    assert get_cached_response("Pergunta") is not None
+    assert await get_cached_response("Pergunta") is not None
 
     # Simula expiração (cachetools gerencia isso automaticamente)
     # Este teste verifica que o cache foi criado corretamente
 
 
-def test_get_cached_response_nao_dict(mock_settings):
+@pytest.mark.asyncio
+async def test_get_cached_response_nao_dict(mock_settings):
     """Testa get_cached_response quando resposta no cache não é dict"""
     import chatbot_acessibilidade.core.cache as cache_module
 
@@ -259,7 +278,7 @@ def test_get_cached_response_nao_dict(mock_settings):
     cache[key] = "não é um dict"  # Tipo incorreto
 
     # Busca no cache - deve retornar None pois não é dict
-    resultado = get_cached_response(pergunta)
+    resultado = await get_cached_response(pergunta)
 
     assert resultado is None
 
@@ -280,36 +299,73 @@ def test_calculate_similarity():
     assert similarity < 0.5
 
 
-def test_find_similar_questions(mock_settings):
-    """Testa find_similar_questions"""
+@pytest.mark.asyncio
+async def test_find_similar_questions(mock_settings):
+    """Testa find_similar_questions com o cache vazio"""
     from chatbot_acessibilidade.core.cache import find_similar_questions
 
     import chatbot_acessibilidade.core.cache as cache_module
 
     cache_module._cache = None
 
-    # Por limitação do TTLCache, a função retorna lista vazia
-    # Mas podemos testar que não quebra
-    resultado = find_similar_questions("O que é WCAG?")
+    # Perguntas indexadas cujas respostas não estão mais no cache são ignoradas
+    resultado = await find_similar_questions("O que é WCAG?", threshold=0.8)
     assert isinstance(resultado, list)
     assert len(resultado) == 0
 
 
-def test_invalidate_similar_cache(mock_settings):
-    """Testa invalidate_similar_cache"""
+@pytest.mark.asyncio
+async def test_invalidate_similar_cache(mock_settings):
+    """Testa invalidate_similar_cache: remove a pergunta e as reformulações"""
     from chatbot_acessibilidade.core.cache import invalidate_similar_cache
 
     import chatbot_acessibilidade.core.cache as cache_module
 
-    cache_module._cache = None
+    cache_module.reset_cache_backend()
+
+    await set_cached_response("Como testar contraste de cores?", {"v": "1"})
+    await set_cached_response("Como testar o contraste das cores?", {"v": "2"})
+    await set_cached_response("O que é ARIA?", {"v": "3"})
+
+    previstas = await invalidate_similar_cache("testar contraste cores", dry_run=True)
+    assert len(previstas) == 2
+    assert await get_cached_response("Como testar contraste de cores?") == {"v": "1"}
 
-    # Por limitação do TTLCache, a função retorna 0
-    # Mas podemos testar que não quebra
-    resultado = invalidate_similar_cache("O que é WCAG?")
-    assert resultado == 0
+    invalidadas = await invalidate_similar_cache("testar contraste cores")
+    assert sorted(invalidadas) == sorted(previstas)
+    assert await get_cached_response("Como testar contraste de cores?") is None
+    assert await get_cached_response("Como testar o contraste das cores?") is None
+    assert await get_cached_response("O que é ARIA?") == {"v": "3"}
+    cache_module.reset_cache_backend()
 
 
-def test_get_cached_response_with_similarity_cache_hit(mock_settings):
+@pytest.mark.asyncio
+async def test_invalidate_similar_cache_le_perguntas_do_backend(mock_settings, tmp_path):
+    """Backend compartilhado: entradas de outros workers (fora do índice local) são invalidadas"""
+    from chatbot_acessibilidade.core.cache import invalidate_similar_cache
+
+    import chatbot_acessibilidade.core.cache as cache_module
+
+    mock_settings.cache_backend = "disk"
+    mock_settings.cache_disk_dir = str(tmp_path)
+    cache_module.reset_cache_backend()
+    try:
+        await set_cached_response("Como testar contraste de cores?", {"v": "1"})
+        await set_cached_response("O que é ARIA?", {"v": "3"})
+        # Outro worker: mesmo diretório, índice de perguntas vazio
+        cache_module.get_question_index().clear()
+
+        assert await invalidate_similar_cache("testar contraste cores") == [
+            "Como testar contraste de cores?"
+        ]
+        assert await get_cached_response("Como testar contraste de cores?") is None
+        assert await get_cached_response("O que é ARIA?") == {"v": "3"}
+    finally:
+        cache_module.reset_cache_backend()
+
+
+@pytest.mark.asyncio
+async def test_get_cached_response_with_similarity_cache_hit(mock_settings):
     """Testa get_cached_response_with_similarity com cache hit exato"""
     from chatbot_acessibilidade.core.cache import get_cached_response_with_similarity
 
@@ -319,17 +375,18 @@ def test_get_cached_response_with_similarity_cache_hit(mock_settings):
 
     pergunta = "O que é WCAG?"
     resposta = {"teste": "resposta"}
-    set_cached_response(pergunta, resposta)
+    await set_cached_response(pergunta, resposta)
 
     # Busca exata
-    resultado = get_cached_response_with_similarity(pergunta)
+    resultado = await get_cached_response_with_similarity(pergunta)
     assert resultado is not None
     resposta_encontrada, similaridade = resultado
     assert resposta_encontrada == resposta
     assert similaridade == 1.0
 
 
-def test_get_cached_response_with_similarity_cache_miss(mock_settings):
+@pytest.mark.asyncio
+async def test_get_cached_response_with_similarity_cache_miss(mock_settings):
     """Testa get_cached_response_with_similarity com cache miss"""
     from chatbot_acessibilidade.core.cache import get_cached_response_with_similarity
 
@@ -338,5 +395,5 @@ def test_get_cached_response_with_similarity_cache_miss(mock_settings):
     cache_module._cache = None
 
     # Busca pergunta que não existe
-    resultado = get_cached_response_with_similarity("Pergunta que não existe")
+    resultado = await get_cached_response_with_similarity("Pergunta que não existe")
     assert resultado is None
@@ -0,0 +1,304 @@
+"""
+Testes para os backends do cache (cache_backends.py)
+
+O backend Redis é testado contra um servidor RESP mínimo em processo
+(FakeRespServer), sem depender de um Redis real.
+"""
+
+import asyncio
+import fnmatch
+import time
+from unittest.mock import patch
+
+import pytest
+from cachetools import TTLCache
+
+from chatbot_acessibilidade.core import cache as cache_module
+from chatbot_acessibilidade.core.cache_backends import (
+    CacheBackend,
+    DiskCacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    RespClient,
+)
+from chatbot_acessibilidade.core.exceptions import CacheBackendError
+
+pytestmark = pytest.mark.unit
+
+RESPOSTA = {"📘 **Introdução**": "Use aria-label apenas quando não houver texto visível"}
+
+
+class FakeRespServer:
+    """Servidor RESP2 mínimo com GET/SET EX/DEL/SCAN/DBSIZE/AUTH/SELECT"""
+
+    def __init__(self, password=None):
+        self.password = password
+        self.data = {}  # chave -> (valor, expira_em)
+        self.commands = []
+        self.server = None
+
+    @property
+    def url(self):
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}127.0.0.1:{self.port}/1"
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _read_command(self, reader):
+        linha = await reader.readuntil(b"\r\n")
+        args = []
+        for _ in range(int(linha[1:-2])):
+            tamanho = int((await reader.readuntil(b"\r\n"))[1:-2])
+            args.append((await reader.readexactly(tamanho + 2))[:-2].decode("utf-8"))
+        return args
+
+    @staticmethod
+    def _bulk(valor):
+        if valor is None:
+            return b"$-1\r\n"
+        dados = valor.encode("utf-8")
+        return f"${len(dados)}\r\n".encode() + dados + b"\r\n"
+
+    def _vivas(self):
+        agora = time.time()
+        return [k for k, (_v, expira) in self.data.items() if expira is None or expira > agora]
+
+    def _execute(self, args):
+        comando = args[0].upper()
+        self.commands.append(comando)
+        if comando == "AUTH":
+            return b"+OK\r\n" if args[-1] == self.password else b"-WRONGPASS invalid\r\n"
+        if comando in ("SELECT", "PING"):
+            return b"+OK\r\n"
+        if comando == "GET":
+            return self._bulk(self.data[args[1]][0] if args[1] in self._vivas() else None)
+        if comando == "SET":
+            expira = time.time() + int(args[4]) if len(args) > 4 else None
+            self.data[args[1]] = (args[2], expira)
+            return b"+OK\r\n"
+        if comando == "DEL":
+            removidas = sum(1 for k in args[1:] if self.data.pop(k, None) is not None)
+            return f":{removidas}\r\n".encode()
+        if comando == "SCAN":
+            padrao = args[args.index("MATCH") + 1]
+            keys = [k for k in self._vivas() if fnmatch.fnmatchcase(k, padrao)]
+            corpo = b"".join(self._bulk(k) for k in keys)
+            return b"*2\r\n" + self._bulk("0") + f"*{len(keys)}\r\n".encode() + corpo
+        if comando == "DBSIZE":
+            return f":{len(self._vivas())}\r\n".encode()
+        return b"-ERR unknown command\r\n"
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                writer.write(self._execute(await self._read_command(reader)))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+
+@pytest.fixture
+async def redis_server():
+    server = FakeRespServer(password="segredo")
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture(params=["memory", "disk", "redis"])
+async def backend(request, tmp_path, redis_server):
+    """Mesmo contrato para todos os backends"""
+    if request.param == "memory":
+        yield MemoryCacheBackend(TTLCache(maxsize=10, ttl=60))
+    elif request.param == "disk":
+        yield DiskCacheBackend(tmp_path / "cache", max_size=10, ttl=60)
+    else:
+        backend = RedisCacheBackend(redis_server.url, ttl=60)
+        yield backend
+        await backend.client.close()
+
+
+@pytest.mark.asyncio
+async def test_backend_implementa_protocolo(backend):
+    """Todos os backends satisfazem o protocolo CacheBackend"""
+    assert isinstance(backend, CacheBackend)
+
+
+@pytest.mark.asyncio
+async def test_set_get_delete(backend):
+    """Contrato básico: set, get, delete"""
+    assert await backend.get("abc") is None
+
+    await backend.set("abc", RESPOSTA)
+    assert await backend.get("abc") == RESPOSTA
+
+    assert await backend.delete("abc") is True
+    assert await backend.delete("abc") is False
+    assert await backend.get("abc") is None
+
+
+@pytest.mark.asyncio
+async def test_scan_clear_e_stats(backend):
+    """scan filtra por padrão; clear remove tudo; stats conta entradas"""
+    await backend.set("pergunta:1", {"v": "1"})
+    await backend.set("pergunta:2", {"v": "2"})
+    await backend.set("outro", {"v": "3"})
+
+    assert sorted(await backend.scan("pergunta:*")) == ["pergunta:1", "pergunta:2"]
+    stats = await backend.stats()
+    assert stats["backend"] == backend.name
+    assert stats["size"] == 3
+
+    await backend.clear()
+    assert await backend.scan() == []
+
+
+@pytest.mark.asyncio
+async def test_disk_respeita_ttl_e_tamanho_maximo(tmp_path):
+    """Entradas expiradas somem; acima do limite as mais antigas são removidas"""
+    backend = DiskCacheBackend(tmp_path, max_size=2, ttl=60)
+    await backend.set("a", {"v": "a"})
+    await backend.set("b", {"v": "b"})
+    await backend.set("c", {"v": "c"})
+
+    assert len(await backend.scan()) == 2
+
+    with patch(
+        "chatbot_acessibilidade.core.cache_backends.time.time", return_value=time.time() + 120
+    ):
+        assert await backend.get("c") is None
+
+
+@pytest.mark.asyncio
+async def test_disk_mantem_contagem_sem_listar_diretorio(tmp_path):
+    """Gravações abaixo do limite e stats usam a contagem mantida, sem glob"""
+    backend = DiskCacheBackend(tmp_path, max_size=10, ttl=60)
+    await backend.set("a", {"v": "a"})
+
+    with patch.object(DiskCacheBackend, "_files", side_effect=AssertionError("glob")):
+        await backend.set("b", {"v": "b"})
+        await backend.set("b", {"v": "b2"})
+        assert await backend.delete("a") is True
+        assert (await backend.stats())["size"] == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_gravacoes_concorrentes_da_mesma_chave(tmp_path):
+    """Corrotinas do mesmo processo gravando a mesma chave não dividem o temporário"""
+    backend = DiskCacheBackend(tmp_path, max_size=10, ttl=60)
+
+    await asyncio.gather(*(backend.set("a", {"v": str(i)}) for i in range(20)))
+
+    assert (await backend.get("a"))["v"] in {str(i) for i in range(20)}
+    assert list(tmp_path.rglob("*.tmp")) == []
+
+
+@pytest.mark.asyncio
+async def test_redis_stats_usa_dbsize(redis_server):
+    """stats não percorre o keyspace com SCAN"""
+    backend = RedisCacheBackend(redis_server.url, ttl=30)
+    await backend.set("abc", RESPOSTA)
+
+    assert (await backend.stats())["size"] == 1
+    assert "SCAN" not in redis_server.commands
+    await backend.client.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_usa_prefixo_ttl_e_autenticacao(redis_server):
+    """Chaves recebem prefixo e TTL; AUTH/SELECT são enviados na conexão"""
+    backend = RedisCacheBackend(redis_server.url, ttl=30)
+    await backend.set("abc", RESPOSTA)
+    await backend.client.close()
+
+    valor, expira = redis_server.data["ada:cache:abc"]
+    assert 0 < expira - time.time() <= 30
+    assert redis_server.commands[:2] == ["AUTH", "SELECT"]
+
+
+@pytest.mark.asyncio
+async def test_redis_senha_errada_fecha_a_conexao(redis_server):
+    """AUTH recusado não deixa a conexão sem autenticação aberta para os próximos comandos"""
+    url = redis_server.url.replace("segredo", "errada")
+    backend = RedisCacheBackend(url, ttl=30)
+
+    with pytest.raises(CacheBackendError):
+        await backend.get("abc")
+    assert backend.client._writer is None
+    with pytest.raises(CacheBackendError):
+        await backend.set("abc", RESPOSTA)
+    assert redis_server.commands.count("AUTH") == 2
+    assert redis_server.data == {}
+
+
+@pytest.mark.asyncio
+async def test_redis_reconecta_apos_queda(redis_server):
+    """Conexão perdida é refeita de forma transparente"""
+    backend = RedisCacheBackend(redis_server.url, ttl=30)
+    await backend.set("abc", RESPOSTA)
+    backend.client._writer.close()
+
+    assert await backend.get("abc") == RESPOSTA
+    await backend.client.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_indisponivel_gera_erro_de_backend(redis_server):
+    """Servidor fora do ar vira CacheBackendError"""
+    url = redis_server.url
+    await redis_server.stop()
+    backend = RedisCacheBackend(url, ttl=30, client=RespClient(url, timeout=0.5))
+
+    with pytest.raises(CacheBackendError):
+        await backend.get("abc")
+
+
+def test_redis_url_invalida():
+    """Somente URLs redis:// são aceitas"""
+    with pytest.raises(CacheBackendError):
+        RespClient("http://localhost:6379")
+
+
+@pytest.mark.asyncio
+async def test_cache_sem_redis_segue_sem_cache(redis_server):
+    """Falha do backend não derruba a requisição: vira cache miss"""
+    url = redis_server.url
+    await redis_server.stop()
+
+    with patch.object(
+        cache_module,
+        "get_cache_backend",
+        return_value=RedisCacheBackend(url, ttl=30, client=RespClient(url, timeout=0.5)),
+    ):
+        assert await cache_module.get_cached_response("O que é WCAG?") is None
+        await cache_module.set_cached_response("O que é WCAG?", RESPOSTA)
+        assert (await cache_module.get_cache_stats())["available"] is False
+
+
+@pytest.mark.asyncio
+async def test_get_cache_backend_seleciona_por_settings(tmp_path):
+    """settings.cache_backend escolhe o armazenamento"""
+    with patch.object(cache_module, "settings") as mock_settings:
+        mock_settings.cache_enabled = True
+        mock_settings.cache_max_size = 5
+        mock_settings.cache_ttl_seconds = 60
+        mock_settings.cache_backend = "disk"
+        mock_settings.cache_disk_dir = str(tmp_path)
+        cache_module.reset_cache_backend()
+        try:
+            backend = cache_module.get_cache_backend()
+            assert isinstance(backend, DiskCacheBackend)
+            assert cache_module.get_cache_backend() is backend
+
+            await cache_module.set_cached_response("O que é WCAG?", RESPOSTA)
+            assert await cache_module.get_cached_response("o que é wcag?") == RESPOSTA
+        finally:
+            cache_module.reset_cache_backend()
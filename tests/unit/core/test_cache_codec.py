@@ -0,0 +1,158 @@
+"""
+Testes para a compressão dos valores do cache (cache_codec.py)
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from chatbot_acessibilidade.core import cache as cache_module
+from chatbot_acessibilidade.core import cache_codec
+from chatbot_acessibilidade.core.cache_backends import MemoryCacheBackend, SizedTTLCache
+from chatbot_acessibilidade.core.cache_codec import (
+    CacheCodec,
+    build_dictionary,
+    create_codec,
+    value_sizes,
+)
+from chatbot_acessibilidade.core.tinylfu import TinyLFUCache
+
+pytestmark = pytest.mark.unit
+
+SECOES = (
+    "📘 **Introdução**",
+    "🔍 **Conceitos Essenciais**",
+    "🧪 **Verificação Prática**",
+    "💡 **Dicas de Ouro**",
+    "📚 **Quer se Aprofundar?**",
+)
+
+
+def _resposta(tema):
+    return {
+        secao: (
+            f"Sobre {tema}: siga o critério de sucesso 1.4.3 da WCAG 2.2 (nível AA), "
+            "teste com leitores de tela como NVDA e VoiceOver e valide com axe-core. "
+        )
+        * 3
+        for secao in SECOES
+    }
+
+
+def test_codec_zlib_ida_e_volta():
+    """A resposta descomprimida é idêntica à original e ocupa menos bytes"""
+    codec = CacheCodec("zlib")
+    resposta = _resposta("contraste")
+
+    dados = codec.encode(resposta)
+
+    assert isinstance(dados, bytes)
+    assert codec.decode(dados) == resposta
+    stored, raw = value_sizes(dados)
+    assert stored == len(dados)
+    assert raw == len(json.dumps(resposta, ensure_ascii=False, separators=(",", ":")).encode())
+    assert stored * 3 < raw
+
+
+def test_dicionario_do_corpus_reduz_o_tamanho():
+    """Com dicionário treinado em respostas parecidas a entrada fica menor"""
+    dictionary = build_dictionary([_resposta(f"tema {i}") for i in range(5)], "zlib")
+    com_dicionario = CacheCodec("zlib", dictionary)
+    sem_dicionario = CacheCodec("zlib")
+    resposta = _resposta("formulários")
+
+    dados = com_dicionario.encode(resposta)
+
+    assert com_dicionario.decode(dados) == resposta
+    assert len(dados) < len(sem_dicionario.encode(resposta))
+
+
+def test_create_codec_le_corpus_e_respeita_none(tmp_path):
+    """'none' desabilita; o corpus vira dicionário; zstd ausente cai para zlib"""
+    corpus = tmp_path / "corpus.json"
+    corpus.write_text(
+        json.dumps({"entries": [{"pergunta": "p", "resposta": _resposta("aria")}]}),
+        encoding="utf-8",
+    )
+
+    assert create_codec("none", corpus) is None
+    codec = create_codec("zlib", corpus)
+    assert codec.algorithm == "zlib" and codec.dictionary
+
+    with patch.object(cache_codec, "zstandard", None):
+        assert create_codec("zstd", tmp_path / "inexistente.json").algorithm == "zlib"
+
+
+@pytest.mark.asyncio
+async def test_backend_memory_comprime_de_forma_transparente():
+    """O armazenamento guarda bytes; get devolve o dicionário; stats mostram a economia"""
+    store = SizedTTLCache(maxsize=10, ttl=60)
+    backend = MemoryCacheBackend(store, codec=CacheCodec("zlib"))
+    resposta = _resposta("teclado")
+
+    await backend.set("abc", resposta)
+
+    assert isinstance(store["abc"], bytes)
+    assert await backend.get("abc") == resposta
+    stats = await backend.stats()
+    assert stats["compression"] == "zlib"
+    assert stats["stored_bytes"] == len(store["abc"])
+    assert stats["avg_entry_bytes"] == stats["stored_bytes"]
+    assert stats["compression_ratio"] > 3
+
+
+@pytest.mark.asyncio
+async def test_stats_usam_contadores_do_armazenamento():
+    """Tamanhos medidos na inserção e descontados em remoção, despejo e expiração"""
+    store = SizedTTLCache(maxsize=2, ttl=60)
+    backend = MemoryCacheBackend(store, codec=CacheCodec("zlib"))
+    for chave in ("a", "b", "c"):  # "a" é despejada pelo LRU
+        await backend.set(chave, _resposta(chave))
+
+    esperado = [value_sizes(store[chave]) for chave in ("b", "c")]
+    assert (store.stored_bytes, store.raw_bytes) == tuple(map(sum, zip(*esperado, strict=True)))
+
+    with patch.object(store, "items", side_effect=AssertionError("percorreu as entradas")):
+        stats = await backend.stats()
+    assert stats["stored_bytes"] == store.stored_bytes
+
+    await backend.delete("b")
+    assert (store.stored_bytes, store.raw_bytes) == esperado[1]
+    store.expire(store.timer() + 120)
+    assert (store.stored_bytes, store.raw_bytes) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_tinylfu_mede_bytes_comprimidos():
+    """O orçamento do TinyLFU conta o tamanho comprimido"""
+    store = TinyLFUCache(max_bytes=100_000, ttl=60)
+    backend = MemoryCacheBackend(store, codec=CacheCodec("zlib"))
+
+    await backend.set("abc", _resposta("imagens"))
+
+    assert store.currsize == len(store.get("abc"))
+    assert store.raw_bytes == value_sizes(store.get("abc"))[1]
+
+
+@pytest.mark.asyncio
+async def test_get_cache_stats_informa_compressao():
+    """cache_compression='zlib' comprime no backend memory"""
+    with patch.object(cache_module, "settings") as mock_settings:
+        mock_settings.cache_enabled = True
+        mock_settings.cache_backend = "memory"
+        mock_settings.cache_policy = "ttl"
+        mock_settings.cache_max_size = 10
+        mock_settings.cache_ttl_seconds = 60
+        mock_settings.cache_compression = "zlib"
+        mock_settings.cache_corpus_file = ""
+        cache_module.reset_cache_backend()
+        try:
+            await cache_module.set_cached_response("O que é WCAG?", _resposta("WCAG"))
+
+            assert await cache_module.get_cached_response("o que é wcag?") == _resposta("WCAG")
+            stats = await cache_module.get_cache_stats()
+            assert stats["compression"] == "zlib"
+            assert stats["raw_bytes"] > stats["stored_bytes"] > 0
+        finally:
+            cache_module.reset_cache_backend()
@@ -0,0 +1,151 @@
+"""
+Testes para o warm-up do cache (cache_warmup.py)
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+from cachetools import TTLCache
+
+from chatbot_acessibilidade.core import cache_warmup
+from chatbot_acessibilidade.core.cache import get_cache_key, separar_pergunta
+from chatbot_acessibilidade.core.cache_backends import MemoryCacheBackend
+
+pytestmark = pytest.mark.unit
+
+RESPOSTA = {"📘 **Introdução**": "WCAG são as diretrizes de acessibilidade"}
+
+
+@pytest.fixture
+def cache():
+    """Cache isolado e estado de warm-up limpo"""
+    cache = TTLCache(maxsize=10, ttl=3600)
+    cache_warmup.reset_cache_warmup()
+    with patch.object(cache_warmup, "get_cache_backend", return_value=MemoryCacheBackend(cache)):
+        yield cache
+    cache_warmup.reset_cache_warmup()
+
+
+def _escreve_corpus(path, entries):
+    path.write_text(json.dumps({"entries": entries}), encoding="utf-8")
+    return path
+
+
+@pytest.mark.asyncio
+async def test_warm_up_carrega_corpus(cache, tmp_path):
+    """Respostas do corpus entram no cache com a chave e o texto da pergunta"""
+    corpus = _escreve_corpus(
+        tmp_path / "corpus.json", [{"pergunta": "O que é WCAG?", "resposta": RESPOSTA}]
+    )
+
+    with patch.object(cache_warmup, "get_warmup_sources", return_value=[corpus]):
+        await cache_warmup.warm_up_cache()
+
+    valor = cache[get_cache_key("o que é  wcag?")]
+    assert separar_pergunta(valor) == (RESPOSTA, "O que é WCAG?")
+    estado = cache_warmup.get_cache_warmup_state()
+    assert estado["status"] == cache_warmup.CACHE_WARMUP_DONE
+    assert estado["loaded"] == estado["total"] == 1
+    assert estado["sources"] == [str(corpus)]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_ignora_entradas_invalidas(cache, tmp_path):
+    """Entradas sem pergunta ou com resposta vazia são ignoradas"""
+    corpus = _escreve_corpus(
+        tmp_path / "corpus.json",
+        [
+            {"pergunta": "Sem resposta"},
+            {"resposta": RESPOSTA},
+            {"pergunta": "O que é ARIA?", "resposta": RESPOSTA},
+        ],
+    )
+
+    with patch.object(cache_warmup, "get_warmup_sources", return_value=[corpus]):
+        await cache_warmup.warm_up_cache()
+
+    estado = cache_warmup.get_cache_warmup_state()
+    assert estado["loaded"] == 1
+    assert estado["total"] == 3
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_up_sem_arquivo_conclui_vazio(cache, tmp_path):
+    """Corpus inexistente não é erro: o cache só começa vazio"""
+    with patch.object(
+        cache_warmup, "get_warmup_sources", return_value=[tmp_path / "inexistente.json"]
+    ):
+        await cache_warmup.warm_up_cache()
+
+    assert cache_warmup.get_cache_warmup_state()["status"] == cache_warmup.CACHE_WARMUP_DONE
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_warm_up_com_arquivo_corrompido_registra_falha(cache, tmp_path):
+    """JSON inválido marca o warm-up como falho sem propagar"""
+    corpus = tmp_path / "corpus.json"
+    corpus.write_text("{não é json", encoding="utf-8")
+
+    with patch.object(cache_warmup, "get_warmup_sources", return_value=[corpus]):
+        await cache_warmup.warm_up_cache()
+
+    estado = cache_warmup.get_cache_warmup_state()
+    assert estado["status"] == cache_warmup.CACHE_WARMUP_FAILED
+    assert estado["error"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_e_recarregado(cache, tmp_path):
+    """Snapshot salvo no shutdown é recarregado no próximo startup"""
+    cache[get_cache_key("Como testar contraste?")] = RESPOSTA
+    snapshot = tmp_path / "snapshot.json"
+
+    assert await cache_warmup.save_cache_snapshot(str(snapshot)) == 1
+
+    cache.clear()
+    with patch.object(cache_warmup, "get_warmup_sources", return_value=[snapshot]):
+        await cache_warmup.warm_up_cache()
+
+    assert cache[get_cache_key("Como testar contraste?")] == RESPOSTA
+
+
+@pytest.mark.asyncio
+async def test_snapshot_desabilitado(cache):
+    """Sem arquivo configurado nada é salvo"""
+    with patch.object(cache_warmup.settings, "cache_snapshot_file", ""):
+        assert await cache_warmup.save_cache_snapshot() == 0
+
+
+@pytest.mark.asyncio
+async def test_snapshot_mescla_o_de_outros_workers(cache, tmp_path):
+    """Workers que salvam no mesmo shutdown somam as entradas; snapshots antigos são trocados"""
+    snapshot = tmp_path / "snapshot.json"
+    cache[get_cache_key("O que é WCAG?")] = RESPOSTA
+    assert await cache_warmup.save_cache_snapshot(str(snapshot)) == 1
+
+    # Outro worker, com outro cache em memória
+    cache.clear()
+    cache[get_cache_key("O que é ARIA?")] = RESPOSTA
+    assert await cache_warmup.save_cache_snapshot(str(snapshot)) == 1
+    chaves = {entry["key"] for entry in cache_warmup.read_entries(snapshot)}
+    assert chaves == {get_cache_key("O que é WCAG?"), get_cache_key("O que é ARIA?")}
+    assert not [p for p in tmp_path.iterdir() if p.suffix == ".tmp"]
+
+    # Snapshot do deploy anterior (gravado antes do startup) não é mesclado
+    antes = cache_warmup._PROCESS_STARTED_AT - 60
+    os.utime(snapshot, (antes, antes))
+    await cache_warmup.save_cache_snapshot(str(snapshot))
+    chaves = {entry["key"] for entry in cache_warmup.read_entries(snapshot)}
+    assert chaves == {get_cache_key("O que é ARIA?")}
+
+
+def test_estado_desabilitado(cache):
+    """Warm-up desabilitado aparece como tal na prontidão"""
+    with patch.object(cache_warmup.settings, "cache_warmup_enabled", False):
+        estado = cache_warmup.get_cache_warmup_state()
+
+    assert estado["status"] == cache_warmup.CACHE_WARMUP_DISABLED
@@ -0,0 +1,75 @@
+"""
+Testes do registro de comandos do chat
+"""
+
+import pytest
+
+from chatbot_acessibilidade.core.comandos import (
+    Comando,
+    CommandRegistry,
+    interpretar_simulacao,
+    resolver_comando,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def test_resolve_comandos_registrados():
+    """Nome do comando no início da pergunta e argumentos sem espaços em volta"""
+    resolvido = resolver_comando("  /simular   cega Como faço login?  ")
+
+    assert resolvido.comando.nome == "/simular"
+    assert resolvido.comando.agente == "persona"
+    assert resolvido.argumentos == "cega Como faço login?"
+
+    refatorar = resolver_comando("/refatorar\n<div onclick='x()'>Ok</div>")
+    assert refatorar.comando.namespace == "refatorar"
+    assert refatorar.argumentos == "<div onclick='x()'>Ok</div>"
+    assert resolver_comando("/refatorar").argumentos == ""
+
+
+@pytest.mark.parametrize(
+    "pergunta", ["O que é /simular?", "/simulação de leitor de tela", "/ajuda", "simular cega"]
+)
+def test_perguntas_que_nao_sao_comandos(pergunta):
+    """O nome precisa estar no início e terminar em espaço ou no fim do texto"""
+    assert resolver_comando(pergunta) is None
+
+
+def test_vale_o_nome_mais_longo():
+    """Comandos com prefixo comum são resolvidos pelo nome completo"""
+    registro = CommandRegistry(
+        [
+            Comando(nome="/testar", agente="testador", namespace="testar"),
+            Comando(nome="/testar-mobile", agente="testador", namespace="mobile"),
+        ]
+    )
+
+    assert registro.resolver("/testar-mobile menu").comando.namespace == "mobile"
+    assert registro.resolver("/testar menu").comando.namespace == "testar"
+    assert registro.resolver("/testar-desktop menu") is None
+
+
+def test_chave_de_cache_da_simulacao_usa_a_persona_interna():
+    """Aliases da mesma persona compartilham a chave; formato inválido não é cacheado"""
+    cega = resolver_comando("/simular cega Como faço   login?").chave_cache()
+    leitor = resolver_comando("/simular leitor-tela Como faço login?").chave_cache()
+    motora = resolver_comando("/simular motora Como faço login?").chave_cache()
+
+    assert cega == leitor == "cega|Como faço login?"
+    assert motora != cega
+    assert resolver_comando("/simular cega").chave_cache() is None
+    assert interpretar_simulacao("zoom-contraste Menu") == ("Baixa Visão", "Menu")
+
+
+def test_chave_de_cache_da_refatoracao_usa_o_codigo_exato():
+    """Maiúsculas e indentação mudam o código: cada variação tem sua chave"""
+    botao = resolver_comando("/refatorar <Button>Enviar</Button>").chave_cache()
+    minusculo = resolver_comando("/refatorar <button>Enviar</button>").chave_cache()
+    indentado = resolver_comando("/refatorar <div>\n  <img src=a.png>\n</div>").chave_cache()
+    sem_indentacao = resolver_comando("/refatorar <div>\n<img src=a.png>\n</div>").chave_cache()
+
+    assert botao != minusculo
+    assert indentado != sem_indentacao
+    assert resolver_comando("/refatorar   <Button>Enviar</Button>  ").chave_cache() == botao
+    assert resolver_comando("/refatorar").chave_cache() is None
@@ -110,3 +110,47 @@ def test_settings_validate_log_level_invalido():
     ):
         with pytest.raises(ValidationError):
             Settings()
+
+
+def test_settings_agent_config_precedencia():
+    """agent_configs sobrescreve os padrões do agente, que sobrescrevem os globais"""
+    with patch.dict(
+        os.environ,
+        {
+            "GOOGLE_API_KEY": "test_key",
+            "AGENT_MODEL": "gemini-2.5-pro",
+            "API_TIMEOUT_SECONDS": "30",
+            "AGENT_CONFIGS": '{"testador": {"max_output_tokens": 512, "timeout_seconds": 10}}',
+        },
+    ):
+        settings = Settings()
+
+    testador = settings.agent_config("testador")
+    assert testador.model == "gemini-2.5-pro"
+    assert testador.max_output_tokens == 512
+    assert testador.temperature == 0.3
+    assert testador.timeout_seconds == 10
+    assert settings.agent_config("assistente").timeout_seconds == 30
+
+
+def test_settings_agent_configs_rejeita_agente_desconhecido():
+    """Nomes de agentes inexistentes geram erro de validação"""
+    with (
+        patch.dict(
+            os.environ, {"GOOGLE_API_KEY": "test_key", "AGENT_CONFIGS": '{"tradutor": {}}'}
+        ),
+        pytest.raises(ValidationError),
+    ):
+        Settings()
+
+
+def test_settings_pipeline_mode():
+    """pipeline_mode aceita multi/combinado (sem diferenciar maiúsculas)"""
+    with patch.dict(os.environ, {"GOOGLE_API_KEY": "test_key", "PIPELINE_MODE": "Combinado"}):
+        assert Settings().pipeline_mode == "combinado"
+
+    with (
+        patch.dict(os.environ, {"GOOGLE_API_KEY": "test_key", "PIPELINE_MODE": "unico"}),
+        pytest.raises(ValidationError),
+    ):
+        Settings()
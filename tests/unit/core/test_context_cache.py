@@ -0,0 +1,215 @@
+"""
+Testes para o cache de contexto das instruções dos agentes
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.adk.models.llm_request import LlmRequest
+from google.genai import errors, types
+
+from chatbot_acessibilidade.core.constants import (
+    CONTEXT_CACHE_REFRESH_MARGIN_SECONDS,
+    CONTEXT_CACHE_RETRY_SECONDS,
+)
+from chatbot_acessibilidade.core.context_cache import (
+    InstructionCache,
+    LocalContextCacheBackend,
+    descartar_cache_invalido,
+    eh_erro_de_cache_de_contexto,
+    usar_cache_de_contexto,
+)
+
+pytestmark = pytest.mark.unit
+
+INSTRUCAO = "ROLE: Especialista em acessibilidade. " * 100
+
+
+class Relogio:
+    """Relógio controlado pelo teste"""
+
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self) -> float:
+        return self.agora
+
+
+class BackendQueApagaHandles(LocalContextCacheBackend):
+    """Backend local cujos handles podem sumir antes do TTL (como na API)"""
+
+    def apagar(self, handle: str) -> None:
+        del self.contents[handle]
+
+    def gerar(self, request: LlmRequest) -> str:
+        """Chamada ao modelo: recusa handles que não existem mais"""
+        handle = request.config.cached_content
+        if handle and handle not in self.contents:
+            raise errors.ClientError(
+                404, {"error": {"code": 404, "message": "CachedContent not found"}}
+            )
+        return "Resposta"
+
+
+def _request(instrucao: str = INSTRUCAO, model: str = "gemini-2.5-flash") -> LlmRequest:
+    tool = types.Tool(
+        function_declarations=[
+            types.FunctionDeclaration(name="buscar_referencias", description="Busca referências")
+        ]
+    )
+    return LlmRequest(
+        model=model,
+        config=types.GenerateContentConfig(
+            system_instruction=instrucao, tools=[tool], max_output_tokens=512
+        ),
+    )
+
+
+def _cache(backend, relogio=None, ttl=3600, min_tokens=100) -> InstructionCache:
+    return InstructionCache(
+        backend, ttl_seconds=ttl, min_tokens=min_tokens, clock=relogio or Relogio()
+    )
+
+
+async def test_aplicar_troca_instrucoes_pelo_handle():
+    """Instruções e tools vão para o cache uma vez; as chamadas seguintes reutilizam o handle"""
+    backend = LocalContextCacheBackend()
+    cache = _cache(backend)
+
+    primeiro, segundo = _request(), _request()
+    assert await cache.aplicar(primeiro, agente="assistente") is True
+    assert await cache.aplicar(segundo, agente="assistente") is True
+
+    assert len(backend.contents) == 1
+    handle, conteudo = next(iter(backend.contents.items()))
+    assert conteudo["system_instruction"] == INSTRUCAO
+    assert conteudo["tools"][0].function_declarations[0].name == "buscar_referencias"
+    assert conteudo["display_name"] == "assistente"
+    for request in (primeiro, segundo):
+        assert request.config.cached_content == handle
+        assert request.config.system_instruction is None
+        assert request.config.tools is None
+        assert request.config.max_output_tokens == 512
+
+
+async def test_chave_inclui_modelo_e_instrucoes():
+    """Outro modelo (roteador) ou outras instruções ganham outro handle"""
+    backend = LocalContextCacheBackend()
+    cache = _cache(backend)
+
+    await cache.aplicar(_request())
+    await cache.aplicar(_request(model="gemini-2.5-flash-lite"))
+    await cache.aplicar(_request(instrucao=INSTRUCAO + "Nova regra."))
+
+    assert len(backend.contents) == 3
+    assert len(cache) == 3
+
+
+async def test_handle_renovado_antes_de_expirar():
+    """Perto do fim do TTL um novo cached content é criado"""
+    backend = LocalContextCacheBackend()
+    relogio = Relogio()
+    cache = _cache(backend, relogio, ttl=600)
+
+    await cache.aplicar(_request())
+    relogio.agora += 600 - CONTEXT_CACHE_REFRESH_MARGIN_SECONDS - 1
+    await cache.aplicar(_request())
+    assert len(backend.contents) == 1
+
+    relogio.agora += 2
+    request = _request()
+    await cache.aplicar(request)
+    assert len(backend.contents) == 2
+    assert request.config.cached_content == "cachedContents/local-2"
+
+
+async def test_falha_na_criacao_mantem_instrucoes_inline():
+    """Com erro na API o request segue inline e a chave espera antes de tentar de novo"""
+    backend = LocalContextCacheBackend()
+    relogio = Relogio()
+    cache = _cache(backend, relogio)
+
+    with patch.object(backend, "create", side_effect=RuntimeError("400 too small")) as mock_create:
+        request = _request()
+        assert await cache.aplicar(request) is False
+        assert await cache.aplicar(_request()) is False
+        assert mock_create.call_count == 1
+
+    assert request.config.system_instruction == INSTRUCAO
+    assert request.config.cached_content is None
+
+    relogio.agora += CONTEXT_CACHE_RETRY_SECONDS
+    assert await cache.aplicar(_request()) is True
+
+
+async def test_instrucoes_pequenas_nao_sao_cacheadas():
+    """Abaixo do mínimo de tokens nada é criado"""
+    backend = LocalContextCacheBackend()
+    cache = _cache(backend, min_tokens=100_000)
+
+    request = _request()
+    assert await cache.aplicar(request) is False
+    assert backend.contents == {}
+    assert request.config.system_instruction == INSTRUCAO
+
+
+async def test_callback_respeita_settings():
+    """O before_model_callback só usa o cache com context_cache_enabled"""
+    cache = _cache(LocalContextCacheBackend())
+    contexto = MagicMock(agent_name="revisor")
+
+    with (
+        patch("chatbot_acessibilidade.core.context_cache.settings") as mock_settings,
+        patch(
+            "chatbot_acessibilidade.core.context_cache.get_instruction_cache", return_value=cache
+        ),
+    ):
+        mock_settings.context_cache_enabled = False
+        request = _request()
+        assert await usar_cache_de_contexto(contexto, request) is None
+        assert request.config.cached_content is None
+
+        mock_settings.context_cache_enabled = True
+        await usar_cache_de_contexto(contexto, request)
+        assert request.config.cached_content == "cachedContents/local-1"
+
+
+async def test_handle_recusado_e_descartado_antes_da_validade():
+    """Um handle apagado na API é descartado e a chave segue inline até nova tentativa"""
+    backend = BackendQueApagaHandles()
+    relogio = Relogio()
+    cache = _cache(backend, relogio)
+    contexto = MagicMock(agent_name="assistente")
+
+    await cache.aplicar(_request())
+    backend.apagar("cachedContents/local-1")
+
+    request = _request()
+    assert await cache.aplicar(request) is True
+    with pytest.raises(errors.ClientError) as erro:
+        backend.gerar(request)
+    assert eh_erro_de_cache_de_contexto(erro.value)
+
+    with patch(
+        "chatbot_acessibilidade.core.context_cache.get_instruction_cache", return_value=cache
+    ):
+        assert await descartar_cache_invalido(contexto, request, erro.value) is None
+
+    inline = _request()
+    assert await cache.aplicar(inline) is False
+    assert inline.config.system_instruction == INSTRUCAO
+    assert backend.gerar(inline) == "Resposta"
+    assert len(cache) == 0
+
+    relogio.agora += CONTEXT_CACHE_RETRY_SECONDS
+    novo = _request()
+    assert await cache.aplicar(novo) is True
+    assert novo.config.cached_content in backend.contents
+    assert backend.gerar(novo) == "Resposta"
+
+
+def test_erro_de_cache_de_contexto_so_para_cached_content():
+    """Outros erros 4xx não descartam o handle"""
+    outro = errors.ClientError(400, {"error": {"code": 400, "message": "Invalid argument"}})
+    assert eh_erro_de_cache_de_contexto(outro) is False
+    assert eh_erro_de_cache_de_contexto(RuntimeError("cachedContent")) is False
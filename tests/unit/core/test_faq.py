@@ -0,0 +1,113 @@
+"""
+Testes para as respostas curadas da FAQ (faq.py)
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from chatbot_acessibilidade.core import faq as faq_module
+from chatbot_acessibilidade.core.faq import (
+    FaqClassifier,
+    FaqEntry,
+    KeywordAutomaton,
+    get_faq_classifier,
+    responder_faq,
+)
+from chatbot_acessibilidade.core.semantic_index import tokenize
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def faq_settings():
+    """FAQ habilitada com o limiar padrão (tests/conftest.py a desabilita)"""
+    with patch.object(faq_module, "settings") as mock_settings:
+        mock_settings.faq_enabled = True
+        mock_settings.faq_confidence_threshold = 0.75
+        yield mock_settings
+
+
+def test_automato_encontra_frases_gatilho():
+    """Frases de vários termos casam em qualquer posição, com ou sem acento"""
+    automato = KeywordAutomaton()
+    automato.add("leitor de tela", "leitor")
+    automato.add("contraste", "contraste")
+
+    assert automato.match(tokenize("Como testar com leitores de tela?")) == {"leitor"}
+    assert automato.match(tokenize("Leitor sem contraste")) == {"contraste"}
+    assert automato.match(tokenize("tela cheia")) == set()
+
+
+def test_faq_empacotada_tem_respostas_completas():
+    """Todo tema tem gatilhos, perguntas canônicas e as cinco seções"""
+    classifier = get_faq_classifier()
+
+    assert len(classifier) >= 10
+    for entry in classifier.entries.values():
+        assert entry.gatilhos and entry.perguntas
+        secoes = entry.formatar()
+        assert len(secoes) == 5 and all(secoes.values())
+
+
+def test_classificacao_de_reformulacoes():
+    """Reformulações ficam no mesmo tema; perguntas específicas perdem confiança"""
+    classifier = get_faq_classifier()
+
+    entry, _canonica, confianca = classifier.classify("Como testar contraste de cores?")
+    assert entry.id == "contraste" and confianca == pytest.approx(1.0)
+
+    entry, _canonica, confianca = classifier.classify("testar o contraste das cores como?")
+    assert entry.id == "contraste" and confianca >= 0.75
+
+    _entry, _canonica, confianca = classifier.classify(
+        "Como testar contraste em gráficos SVG no React?"
+    )
+    assert confianca < 0.75
+
+    assert classifier.classify("Como fazer um modal acessível?") is None
+
+
+def test_numeros_da_pergunta_precisam_estar_na_canonica(faq_settings):
+    """Outra versão ou critério da WCAG não recebe a resposta curada da WCAG 2.2"""
+    classifier = get_faq_classifier()
+
+    assert classifier.classify("Qual contraste mínimo exigido pela WCAG 3?") is None
+    assert responder_faq("Qual contraste mínimo exigido pela WCAG 3?") is None
+    assert responder_faq("Qual o contraste mínimo do critério 1.4.11?") is None
+
+    entry, canonica, _confianca = classifier.classify("O que é a WCAG 2.2?")
+    assert (entry.id, canonica) == ("wcag", "O que é WCAG 2.2?")
+
+
+def test_responder_faq_respeita_limiar_e_comandos(faq_settings):
+    """Acima do limiar devolve as seções; comandos e FAQ desabilitada seguem adiante"""
+    resposta = responder_faq("O que é ARIA?")
+
+    assert "WAI-ARIA" in resposta["📘 **Introdução**"]
+    assert responder_faq("/simular cega O que é ARIA?") is None
+    assert responder_faq("Como testar contraste em gráficos SVG no React?") is None
+
+    faq_settings.faq_enabled = False
+    assert responder_faq("O que é ARIA?") is None
+
+
+def test_classificador_com_entradas_proprias():
+    """Sem gatilho na pergunta não há classificação, mesmo com termos em comum"""
+    entry = FaqEntry(
+        id="skip",
+        titulo="Skip links",
+        gatilhos=["skip"],
+        perguntas=["Como implementar skip links?"],
+        resposta={
+            "introducao": "i",
+            "conceitos": "c",
+            "testes": "t",
+            "aprofundar": "a",
+            "dica": "d",
+        },
+    )
+    classifier = FaqClassifier([entry])
+
+    assert classifier.classify("como implementar skip links")[0] is entry
+    assert classifier.classify("como implementar um menu") is None
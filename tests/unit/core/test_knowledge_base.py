@@ -0,0 +1,85 @@
+"""
+Testes para a base de conhecimento offline (knowledge_base.py)
+"""
+
+import json
+
+import pytest
+
+from chatbot_acessibilidade.core.knowledge_base import (
+    KnowledgeBase,
+    buscar_referencias_acessibilidade,
+    get_knowledge_base,
+    load_knowledge_base,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def test_base_empacotada_tem_criterios_wcag22():
+    """A base traz os critérios novos da WCAG 2.2 com link do Understanding"""
+    base = get_knowledge_base()
+    ids = {entry["id"]: entry for entry in base.entries}
+
+    assert len(ids) == len(base.entries)
+    assert ids["wcag-2.5.8"]["nivel"] == "AA"
+    assert ids["wcag-2.5.8"]["url"] == (
+        "https://www.w3.org/WAI/WCAG22/Understanding/target-size-minimum.html"
+    )
+    assert all(entry["url"].startswith("https://") for entry in base.entries)
+
+
+def test_busca_por_numero_e_por_tema():
+    """Número do critério e reformulações em português encontram a referência"""
+    base = get_knowledge_base()
+
+    assert base.search("1.4.3")[0]["id"] == "wcag-1.4.3"
+    modal = [entry["id"] for entry in base.search("modal acessível com foco no teclado")]
+    assert "apg-dialog-modal" in modal
+    alt = [entry["id"] for entry in base.search("texto alternativo das imagens")]
+    assert "wcag-1.1.1" in alt
+
+
+def test_filtro_por_tipo_e_limite():
+    """tipo restringe as entradas e limit corta os resultados"""
+    resultados = get_knowledge_base().search("contraste", tipo="ferramenta", limit=2)
+
+    assert 0 < len(resultados) <= 2
+    assert all(entry["tipo"] == "ferramenta" for entry in resultados)
+    assert "palavras_chave" not in resultados[0]
+
+
+def test_load_knowledge_base_de_arquivo(tmp_path):
+    """Bases alternativas podem ser carregadas de outro arquivo"""
+    arquivo = tmp_path / "kb.json"
+    arquivo.write_text(
+        json.dumps(
+            {
+                "entries": [
+                    {
+                        "id": "x",
+                        "tipo": "artigo",
+                        "titulo": "Skip links",
+                        "palavras_chave": "pular conteúdo",
+                        "url": "https://exemplo.org/skip",
+                    }
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    base = load_knowledge_base(arquivo)
+
+    assert isinstance(base, KnowledgeBase) and len(base) == 1
+    assert base.search("pular para o conteúdo")[0]["url"] == "https://exemplo.org/skip"
+
+
+def test_tool_adk_informa_status():
+    """A tool devolve status success com resultados ou not_found"""
+    encontrado = buscar_referencias_acessibilidade("leitor de tela")
+    vazio = buscar_referencias_acessibilidade("de para com")
+
+    assert encontrado["status"] == "success"
+    assert encontrado["resultados"][0]["url"]
+    assert vazio == {"status": "not_found", "resultados": []}
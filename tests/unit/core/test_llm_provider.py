@@ -13,6 +13,7 @@ from chatbot_acessibilidade.core.exceptions import (
     APIError,
     ModelUnavailableError,
     QuotaExhaustedError,
+    ResponseTruncatedError,
 )
 from chatbot_acessibilidade.core.llm_provider import (
     GoogleGeminiClient,
@@ -218,3 +219,171 @@ async def test_google_gemini_client_resposta_vazia(
         await client.generate("Teste")
 
     assert "vazia" in str(exc_info.value).lower()
+
+
+def test_agent_with_model_reutiliza_copia():
+    """Outro modelo gera uma cópia do agente, reutilizada nas chamadas seguintes"""
+    from chatbot_acessibilidade.core.llm_provider import agent_with_model
+
+    agent = Agent(name="agente_roteado", model="gemini-2.5-flash", instruction="x")
+
+    assert agent_with_model(agent, None) is agent
+    assert agent_with_model(agent, "gemini-2.5-flash") is agent
+    lite = agent_with_model(agent, "gemini-2.5-flash-lite")
+    assert lite.model == "gemini-2.5-flash-lite" and agent.model == "gemini-2.5-flash"
+    assert agent_with_model(agent, "gemini-2.5-flash-lite") is lite
+
+
+@patch("chatbot_acessibilidade.core.llm_provider.genai.Client")
+@patch("chatbot_acessibilidade.core.llm_provider.Runner")
+@patch("chatbot_acessibilidade.core.llm_provider.InMemorySessionService")
+@pytest.mark.asyncio
+async def test_google_gemini_client_resposta_cortada(
+    mock_session_service, mock_runner_class, mock_client_class, mock_agent, mock_evento
+):
+    """Resposta encerrada por MAX_TOKENS vira erro com o texto parcial"""
+    from google.genai import types
+
+    mock_session_service.return_value = AsyncMock()
+    mock_evento.finish_reason = types.FinishReason.MAX_TOKENS
+
+    async def async_gen(**kwargs):
+        yield mock_evento
+
+    mock_runner_class.return_value = MagicMock(run_async=async_gen)
+
+    with pytest.raises(ResponseTruncatedError) as exc_info:
+        await GoogleGeminiClient(mock_agent).generate("Teste")
+
+    assert exc_info.value.partial == "Resposta de teste"
+
+
+def _evento_stream(texto, partial, final=False):
+    """Evento do runner em modo SSE"""
+    evento = MagicMock()
+    evento.partial = partial
+    evento.is_final_response.return_value = final
+    evento.content.parts = [MagicMock(text=texto, thought=False)]
+    return evento
+
+
+@patch("chatbot_acessibilidade.core.llm_provider.genai.Client")
+@patch("chatbot_acessibilidade.core.llm_provider.Runner")
+@patch("chatbot_acessibilidade.core.llm_provider.InMemorySessionService")
+async def test_generate_stream_entrega_partes(
+    mock_session_service, mock_runner_class, mock_client_class, mock_agent
+):
+    """Eventos parciais viram partes; o evento final (texto agregado) não é repetido"""
+    mock_session_service.return_value = AsyncMock()
+    run_configs = []
+
+    async def async_gen(**kwargs):
+        run_configs.append(kwargs["run_config"])
+        yield _evento_stream("Olá, ", partial=True)
+        yield _evento_stream("mundo.", partial=True)
+        yield _evento_stream("Olá, mundo.", partial=False, final=True)
+
+    mock_runner_class.return_value = MagicMock(run_async=async_gen)
+
+    partes = [parte async for parte in GoogleGeminiClient(mock_agent).generate_stream("Teste")]
+
+    assert partes == ["Olá, ", "mundo."]
+    assert run_configs[0].streaming_mode.value == "sse"
+
+
+@patch("chatbot_acessibilidade.core.llm_provider.genai.Client")
+@patch("chatbot_acessibilidade.core.llm_provider.Runner")
+@patch("chatbot_acessibilidade.core.llm_provider.InMemorySessionService")
+async def test_generate_stream_resposta_cortada(
+    mock_session_service, mock_runner_class, mock_client_class, mock_agent
+):
+    """Streaming encerrado por MAX_TOKENS termina com erro depois das partes"""
+    from google.genai import types
+
+    mock_session_service.return_value = AsyncMock()
+    final = _evento_stream("Olá, mun", partial=False, final=True)
+    final.finish_reason = types.FinishReason.MAX_TOKENS
+
+    async def async_gen(**kwargs):
+        yield _evento_stream("Olá, mun", partial=True)
+        yield final
+
+    mock_runner_class.return_value = MagicMock(run_async=async_gen)
+    partes = []
+
+    with pytest.raises(ResponseTruncatedError) as exc_info:
+        async for parte in GoogleGeminiClient(mock_agent).generate_stream("Teste"):
+            partes.append(parte)
+
+    assert partes == ["Olá, mun"]
+    assert exc_info.value.partial == "Olá, mun"
+
+
+@patch("chatbot_acessibilidade.core.llm_provider.genai.Client")
+@patch("chatbot_acessibilidade.core.llm_provider.Runner")
+@patch("chatbot_acessibilidade.core.llm_provider.InMemorySessionService")
+async def test_generate_stream_erro_antes_da_primeira_parte_usa_generate(
+    mock_session_service, mock_runner_class, mock_client_class, mock_agent
+):
+    """Sem nenhuma parte entregue, o erro cai na chamada sem streaming"""
+    mock_session_service.return_value = AsyncMock()
+
+    async def async_gen_error(**kwargs):
+        raise google_exceptions.ServiceUnavailable("503")
+        yield  # nunca chega aqui
+
+    mock_runner_class.return_value = MagicMock(run_async=async_gen_error)
+    client = GoogleGeminiClient(mock_agent)
+    client.generate = AsyncMock(return_value="Resposta completa")
+
+    partes = [parte async for parte in client.generate_stream("Teste", model="m", timeout=5)]
+
+    assert partes == ["Resposta completa"]
+    client.generate.assert_awaited_once_with("Teste", model="m", timeout=5)
+
+
+@patch("chatbot_acessibilidade.core.llm_provider.genai.Client")
+@patch("chatbot_acessibilidade.core.llm_provider.Runner")
+@patch("chatbot_acessibilidade.core.llm_provider.InMemorySessionService")
+async def test_generate_stream_erro_depois_da_primeira_parte(
+    mock_session_service, mock_runner_class, mock_client_class, mock_agent
+):
+    """Depois de uma parte entregue o erro é propagado como APIError"""
+    mock_session_service.return_value = AsyncMock()
+
+    async def async_gen(**kwargs):
+        yield _evento_stream("Começo", partial=True)
+        raise google_exceptions.ServiceUnavailable("503")
+
+    mock_runner_class.return_value = MagicMock(run_async=async_gen)
+    client = GoogleGeminiClient(mock_agent)
+    client.generate = AsyncMock()
+
+    partes = []
+    with pytest.raises(APIError):
+        async for parte in client.generate_stream("Teste"):
+            partes.append(parte)
+
+    assert partes == ["Começo"]
+    client.generate.assert_not_called()
+
+
+@patch("chatbot_acessibilidade.core.llm_provider.genai.Client")
+@patch("chatbot_acessibilidade.core.llm_provider.Runner")
+@patch("chatbot_acessibilidade.core.llm_provider.InMemorySessionService")
+async def test_generate_stream_timeout_total(
+    mock_session_service, mock_runner_class, mock_client_class, mock_agent
+):
+    """O timeout vale para a resposta inteira"""
+    mock_session_service.return_value = AsyncMock()
+
+    async def async_gen_lento(**kwargs):
+        yield _evento_stream("Começo", partial=True)
+        await asyncio.sleep(1)
+        yield _evento_stream("fim", partial=True)
+
+    mock_runner_class.return_value = MagicMock(run_async=async_gen_lento)
+
+    with pytest.raises(APIError, match="Timeout"):
+        async for _parte in GoogleGeminiClient(mock_agent).generate_stream("Teste", timeout=0.05):
+            pass
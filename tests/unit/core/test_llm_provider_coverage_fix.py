@@ -5,6 +5,7 @@ Testes adicionais para cobrir linhas não testadas em llm_provider.py
 import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 from google.api_core import exceptions as google_exceptions
+from google.genai import errors as genai_errors
 from chatbot_acessibilidade.core.llm_provider import GoogleGeminiClient
 from chatbot_acessibilidade.core.exceptions import APIError, ModelUnavailableError, AgentError
 from chatbot_acessibilidade.core.constants import ErrorMessages
@@ -202,3 +203,20 @@ def test_should_fallback_google_api_call_error_overloaded(mock_agent):
     client = GoogleGeminiClient(mock_agent)
     error = google_exceptions.GoogleAPICallError("Service overloaded")
     assert client.should_fallback(error) is True
+
+
+@patch("chatbot_acessibilidade.core.llm_provider.settings")
+@pytest.mark.asyncio
+async def test_generate_refaz_chamada_com_cache_de_contexto_recusado(mock_settings, mock_agent):
+    """Handle de cache de contexto recusado: uma nova chamada (instruções inline)"""
+    mock_settings.google_api_key = "key1"
+
+    client = GoogleGeminiClient(mock_agent)
+    recusado = genai_errors.ClientError(
+        404, {"error": {"code": 404, "message": "CachedContent not found"}}
+    )
+    client._execute_runner_with_retry = AsyncMock(side_effect=[recusado, "Success Response"])
+
+    resultado = await client.generate("test")
+    assert resultado == "Success Response"
+    assert client._execute_runner_with_retry.call_count == 2
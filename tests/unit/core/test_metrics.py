@@ -10,8 +10,11 @@ from chatbot_acessibilidade.core.metrics import (
     record_cache_hit,
     record_cache_miss,
     record_fallback,
+    record_faq_hit,
+    record_prompt_over_budget,
     record_request,
     record_response_time,
+    record_tokens,
     reset_metrics,
 )
 
@@ -193,3 +196,33 @@ def test_metrics_context_sem_agente():
     metrics = get_metrics()
     assert metrics["response_time"]["count"] == 1
     assert len(metrics["agent_times"]) == 0
+
+
+def test_record_faq_hit():
+    """Respostas da FAQ são contadas separadamente do cache"""
+    reset_metrics()
+    record_faq_hit()
+    metrics = get_metrics()
+    assert metrics["faq"]["hits"] == 1
+    assert metrics["cache"]["hits"] == 0
+
+
+def test_record_tokens_por_agente():
+    """Tokens estimados são somados e expostos com médias por agente"""
+    reset_metrics()
+    record_tokens("testador", 1200, 400)
+    record_tokens("testador", 800, 200)
+    record_prompt_over_budget("testador")
+
+    tokens = get_metrics()["tokens"]["testador"]
+    assert tokens == {
+        "calls": 2,
+        "prompt_tokens": 2000,
+        "response_tokens": 600,
+        "over_budget": 1,
+        "avg_prompt_tokens": 1000,
+        "avg_response_tokens": 300,
+    }
+
+    reset_metrics()
+    assert get_metrics()["tokens"] == {}
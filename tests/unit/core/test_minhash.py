@@ -0,0 +1,61 @@
+"""
+Testes para a detecção de quase duplicatas (minhash.py)
+"""
+
+import pytest
+
+from chatbot_acessibilidade.core.minhash import MinHashLSH, jaccard, shingles
+from chatbot_acessibilidade.core.semantic_index import QuestionIndex, tokenize
+
+pytestmark = pytest.mark.unit
+
+
+def test_shingles_e_jaccard():
+    """Termos e pares consecutivos; Jaccard 1.0 só para conjuntos iguais"""
+    conjunto = shingles(["test", "contrast", "cor"])
+    assert conjunto == {"test", "contrast", "cor", "test contrast", "contrast cor"}
+    assert jaccard(conjunto, conjunto) == 1.0
+    assert jaccard(conjunto, shingles(["test", "foc"])) == pytest.approx(1 / 7)
+
+
+def test_assinaturas_sao_deterministicas():
+    """A mesma pergunta gera a mesma assinatura em instâncias diferentes"""
+    conjunto = shingles(tokenize("Como testar contraste de cores?"))
+    assert MinHashLSH().signature(conjunto) == MinHashLSH().signature(conjunto)
+
+
+def test_lsh_encontra_reformulacoes_e_ignora_outras():
+    """Reformulações viram candidatas; perguntas diferentes não"""
+    lsh = MinHashLSH()
+    lsh.add("k1", tokenize("Como testar contraste de cores?"))
+    lsh.add("k2", tokenize("testar o contraste das cores"))
+    lsh.add("k3", tokenize("Como usar ARIA em menus?"))
+
+    resultados = lsh.query(tokenize("Como testar contraste das cores?"), threshold=0.95)
+    assert sorted(key for key, _sim in resultados) == ["k1", "k2"]
+    assert all(sim == 1.0 for _key, sim in resultados)
+
+    assert lsh.remove("k1") is True
+    assert [key for key, _sim in lsh.query(tokenize("testar contraste cores"), 0.95)] == ["k2"]
+    assert lsh.remove("k1") is False
+
+
+def test_lsh_e_sublinear():
+    """Só as perguntas dos buckets coincidentes são comparadas"""
+    index = QuestionIndex()
+    for i in range(2_000):
+        index.add(f"k{i}", f"Como documentar o componente {i} do design system {i * 7}?")
+    index.add("alvo", "Como testar contraste de cores em botões?")
+
+    lsh = index._lsh
+    candidatas = set()
+    for indice, banda in enumerate(
+        lsh._split(lsh.signature(shingles(tokenize("testar contraste de cores em botões"))))
+    ):
+        candidatas |= lsh._buckets.get((indice, banda), set())
+
+    assert "alvo" in candidatas
+    assert len(candidatas) < 50
+    assert [
+        key for key, _p, _s in index.find_near_duplicates("testar contraste cores botões", 0.9)
+    ] == ["alvo"]
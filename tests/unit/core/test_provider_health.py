@@ -0,0 +1,51 @@
+"""
+Testes para o circuito de saúde dos provedores de LLM
+"""
+
+import pytest
+
+from chatbot_acessibilidade.core import provider_health
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def estado_limpo():
+    """Garante estado dos provedores limpo antes e depois de cada teste"""
+    provider_health.reset_provider_health()
+    yield
+    provider_health.reset_provider_health()
+
+
+def test_sem_provedores_circuito_fechado():
+    """Sem falhas registradas todos os circuitos estão fechados"""
+    assert provider_health.get_provider_health() == {}
+    assert provider_health.all_circuits_closed() is True
+
+
+def test_esgotamento_abre_circuito():
+    """Quota esgotada abre o circuito pelo tempo de resfriamento"""
+    provider_health.record_provider_exhausted("Google Gemini", "quota", cooldown=30)
+
+    estado = provider_health.get_provider_health()["Google Gemini"]
+    assert estado["state"] == provider_health.CIRCUIT_OPEN
+    assert 0 < estado["retry_after_seconds"] <= 30
+    assert estado["last_failure"] == "quota"
+    assert provider_health.all_circuits_closed() is False
+
+
+def test_circuito_fecha_apos_resfriamento():
+    """Circuito volta a fechar quando o resfriamento expira"""
+    provider_health.record_provider_exhausted("Google Gemini", "quota", cooldown=0)
+
+    assert provider_health.all_circuits_closed() is True
+
+
+def test_sucesso_fecha_circuito():
+    """Resposta bem-sucedida fecha o circuito imediatamente"""
+    provider_health.record_provider_exhausted("Google Gemini", "quota", cooldown=60)
+    provider_health.record_provider_success("Google Gemini")
+
+    estado = provider_health.get_provider_health()["Google Gemini"]
+    assert estado["state"] == provider_health.CIRCUIT_CLOSED
+    assert estado["last_failure"] == "quota"
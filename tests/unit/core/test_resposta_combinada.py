@@ -0,0 +1,90 @@
+"""
+Testes da resposta combinada (parser e verificação de qualidade)
+"""
+
+import json
+
+import pytest
+
+from chatbot_acessibilidade.core.resposta_combinada import (
+    interpretar_resposta_combinada,
+    montar_prompt_combinado,
+)
+
+pytestmark = pytest.mark.unit
+
+SECOES = {
+    "introducao": "Um modal acessível mantém o foco dentro dele e fecha com a tecla Esc.",
+    "conceitos": "### 💡 Conceito\n\nUse o elemento `<dialog>` nativo com `aria-labelledby`.",
+    "testes": "1. Teste Automático com axe DevTools\n2. Teclado: Tab e Esc\n3. Mobile: 44x44px",
+    "aprofundar": "1. **Dialog (Modal) Pattern** - https://www.w3.org/WAI/ARIA/apg/patterns/dialog-modal/",
+}
+
+
+def test_interpreta_resposta_valida():
+    """JSON completo no schema é aceito com todas as seções"""
+    resposta, motivo = interpretar_resposta_combinada(json.dumps(SECOES))
+
+    assert motivo == ""
+    assert resposta.introducao == SECOES["introducao"]
+    assert resposta.aprofundar == SECOES["aprofundar"]
+
+
+def test_aceita_json_em_bloco_de_markdown():
+    """O JSON é recuperado de um bloco ```json com texto em volta"""
+    texto = "Aqui está a resposta:\n```json\n" + json.dumps(SECOES) + "\n```"
+
+    resposta, motivo = interpretar_resposta_combinada(texto)
+
+    assert motivo == ""
+    assert resposta.testes == SECOES["testes"]
+
+
+@pytest.mark.parametrize(
+    "texto,inicio",
+    [
+        (json.dumps({k: v for k, v in SECOES.items() if k != "testes"}), "JSON fora do schema"),
+        ("Erro ao gerar resposta", "JSON inválido"),
+        ("", "JSON inválido"),
+    ],
+)
+def test_rejeita_json_fora_do_schema(texto, inicio):
+    """Chaves faltando ou texto livre invalidam a resposta"""
+    resposta, motivo = interpretar_resposta_combinada(texto)
+
+    assert resposta is None
+    assert motivo.startswith(inicio)
+
+
+@pytest.mark.parametrize(
+    "alteracao,trecho",
+    [
+        ({"testes": "Use o axe."}, "seção testes"),
+        ({"conceitos": "Erro: não foi possível gerar os conceitos desta vez."}, "erro na seção"),
+        ({"aprofundar": "Consulte a documentação oficial da WAI sobre modais."}, "sem links"),
+    ],
+)
+def test_rejeita_resposta_de_baixa_qualidade(alteracao, trecho):
+    """Seções curtas, mensagens de erro ou referências sem links voltam ao pipeline"""
+    resposta, motivo = interpretar_resposta_combinada(json.dumps({**SECOES, **alteracao}))
+
+    assert resposta is None
+    assert trecho in motivo
+
+
+def test_conteudo_sobre_falhas_da_wcag_e_aceito():
+    """Seções que citam falhas da WCAG não são confundidas com mensagens de erro"""
+    conceitos = "A falha F65 da WCAG ocorre quando uma imagem não tem o atributo alt."
+    resposta, _motivo = interpretar_resposta_combinada(
+        json.dumps({**SECOES, "conceitos": conceitos})
+    )
+
+    assert resposta is not None
+
+
+def test_prompt_inclui_referencias_da_base_local():
+    """O prompt leva a pergunta e os links da base local"""
+    prompt = montar_prompt_combinado("Como fazer um modal acessível?")
+
+    assert prompt.startswith("Pergunta: Como fazer um modal acessível?")
+    assert "https://www.w3.org/WAI/ARIA/apg/patterns/dialog-modal/" in prompt
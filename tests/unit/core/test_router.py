@@ -0,0 +1,70 @@
+"""
+Testes para o roteamento por complexidade (router.py)
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from chatbot_acessibilidade.core import router as router_module
+from chatbot_acessibilidade.core.router import (
+    NIVEL_COMPLEXA,
+    NIVEL_PADRAO,
+    NIVEL_SIMPLES,
+    PLANO_COMPLETO,
+    pontuar_pergunta,
+    rotear_pergunta,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def router_settings():
+    """Roteador habilitado com os valores padrão (tests/conftest.py o desabilita)"""
+    with patch.object(router_module, "settings") as mock_settings:
+        mock_settings.router_enabled = True
+        mock_settings.router_lite_model = "modelo-lite"
+        mock_settings.router_lite_stages = ["validador", "revisor", "testador"]
+        mock_settings.router_simple_skip_stages = ["validador"]
+        mock_settings.router_simple_max_score = 0
+        mock_settings.router_complex_min_score = 3
+        yield mock_settings
+
+
+def test_pontuacao_por_caracteristica():
+    """Definições pontuam menos; código, implementação e comandos pontuam mais"""
+    assert pontuar_pergunta("O que é ARIA?") < 0
+    assert pontuar_pergunta("Como testar contraste de cores?") == 0
+    assert pontuar_pergunta("Como implementar um modal acessível?") == 2
+    assert pontuar_pergunta("Meu <button> não é anunciado") == 3
+    assert pontuar_pergunta("/refatorar <div onclick='salvar()'>Salvar</div>") >= 5
+
+
+def test_plano_simples_pula_estagios_e_usa_modelo_leve(router_settings):
+    """Perguntas simples pulam o validador e usam o modelo lite nos estágios leves"""
+    plano = rotear_pergunta("O que é ARIA?")
+
+    assert plano.nivel == NIVEL_SIMPLES
+    assert not plano.executa("validador")
+    assert plano.executa("testador")
+    assert plano.modelo("revisor") == "modelo-lite"
+    assert plano.modelo("assistente") is None
+
+
+def test_planos_padrao_e_complexo(router_settings):
+    """Padrão executa tudo com modelos leves; complexa usa o modelo de cada agente"""
+    padrao = rotear_pergunta("Como implementar um modal acessível?")
+    complexa = rotear_pergunta("Como criar um dropdown em React com <ul> e submenus?")
+
+    assert padrao.nivel == NIVEL_PADRAO
+    assert padrao.executa("validador") and padrao.modelo("validador") == "modelo-lite"
+    assert complexa.nivel == NIVEL_COMPLEXA
+    assert complexa.executa("validador") and complexa.modelo("validador") is None
+
+
+def test_roteador_desabilitado(router_settings):
+    """Desabilitado, todas as perguntas seguem o plano completo"""
+    router_settings.router_enabled = False
+
+    assert rotear_pergunta("O que é ARIA?") is PLANO_COMPLETO
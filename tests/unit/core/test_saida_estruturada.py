@@ -0,0 +1,52 @@
+"""
+Testes da extração tolerante de JSON das saídas dos agentes
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from chatbot_acessibilidade.core.saida_estruturada import (
+    RefatoracaoCodigo,
+    extrair_json,
+    validar_saida,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize(
+    "texto,esperado",
+    [
+        ('{"code": "<b>x</b>"}', {"code": "<b>x</b>"}),
+        ('```json\n{"code": "x"}\n```\nEspero ter ajudado!', {"code": "x"}),
+        ('Veja {o resultado}: {"a": "}", "b": [1, {"c": 2}]} fim', {"a": "}", "b": [1, {"c": 2}]}),
+        ('{"wcag_criteria": ["1.1.1", "2.1.1",],\n}', {"wcag_criteria": ["1.1.1", "2.1.1"]}),
+        ('{"code": "<p>\n  oi\n</p>"}', {"code": "<p>\n  oi\n</p>"}),
+        ('{"explanation": "use \\\'aria-label\\\'"}', {"explanation": "use 'aria-label'"}),
+        ('{"code": "/\\d+/.test(valor)"}', {"code": "/\\d+/.test(valor)"}),
+    ],
+)
+def test_extrai_e_repara_json(texto, esperado):
+    """Markdown, texto em volta, vírgulas finais, quebras de linha e escapes inválidos"""
+    assert extrair_json(texto) == esperado
+
+
+@pytest.mark.parametrize("texto", ["Não é um JSON válido", '{"code": "<button>', "{ sem aspas }"])
+def test_extrair_json_irrecuperavel(texto):
+    """Sem objeto, objeto truncado ou malformado geram ValueError"""
+    with pytest.raises(ValueError):
+        extrair_json(texto)
+
+
+def test_validar_saida_no_schema():
+    """O objeto extraído é validado no schema, com os valores padrão do schema"""
+    refatoracao = validar_saida(
+        'Código corrigido:\n```json\n{"code": "<button>Ok</button>",}\n```', RefatoracaoCodigo
+    )
+
+    assert refatoracao.code == "<button>Ok</button>"
+    assert refatoracao.language == "html"
+    assert refatoracao.wcag_criteria == []
+
+    with pytest.raises(ValidationError):
+        validar_saida('{"explanation": "sem código"}', RefatoracaoCodigo)
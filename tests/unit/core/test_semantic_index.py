@@ -0,0 +1,132 @@
+"""
+Testes para o índice de perguntas cacheadas (semantic_index.py)
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from chatbot_acessibilidade.core import cache as cache_module
+from chatbot_acessibilidade.core.semantic_index import QuestionIndex, stem, tokenize
+
+pytestmark = pytest.mark.unit
+
+RESPOSTA = {"📘 **Introdução**": "Use um verificador de contraste como o do WebAIM"}
+
+
+def test_tokenize_normaliza_portugues():
+    """Acentos, caixa, stopwords e flexões não mudam os termos"""
+    assert tokenize("Como testar contraste?") == ["test", "contrast"]
+    assert tokenize("testes de CONTRASTES como?") == ["test", "contrast"]
+    assert tokenize("Critérios da WCAG 2.1") == ["criteri", "wcag", "2.1"]
+    assert stem("imagens") == stem("imagem")
+    assert stem("acessibilidade") == stem("acessível".replace("í", "i"))
+
+
+def test_busca_encontra_reformulacao():
+    """Reformulações ficam acima do limiar; perguntas diferentes, abaixo"""
+    index = QuestionIndex()
+    index.add("k1", "Como testar contraste de cores?")
+    index.add("k2", "Como usar ARIA em menus?")
+    index.add("k3", "O que é WCAG 2.1?")
+
+    key, original, similaridade = index.search("testar contraste das cores como?")[0]
+    assert (key, original) == ("k1", "Como testar contraste de cores?")
+    assert similaridade == pytest.approx(1.0)
+
+    resultados = index.search("Como testar navegação por teclado?")
+    assert all(similaridade < 0.8 for _key, _original, similaridade in resultados)
+    assert index.search("bom dia") == []
+
+
+@pytest.mark.parametrize(
+    "cacheada, pergunta",
+    [
+        (
+            "Como criar um modal acessível em JavaScript?",
+            "Como criar um modal acessível sem JavaScript?",
+        ),
+        ("Como validar formulário com JavaScript?", "Como validar formulário sem JavaScript?"),
+        ("Como usar aria-label em botões?", "Quando usar aria-label em botões?"),
+        ("Como usar aria-label em botões?", "Por que usar aria-label em botões?"),
+    ],
+)
+def test_busca_nao_iguala_perguntas_de_sentido_oposto(cacheada, pergunta):
+    """Negação, "sem"/"com" e interrogativos distinguem as perguntas"""
+    index = QuestionIndex()
+    index.add("k1", cacheada)
+
+    assert tokenize(cacheada) != tokenize(pergunta)
+    assert index.search(pergunta) == []
+    assert index.search(cacheada)[0][2] == pytest.approx(1.0)
+
+
+def test_remove_reindexa_e_limite():
+    """remove limpa as listas invertidas; acima do limite sai a mais antiga"""
+    index = QuestionIndex(max_questions=2)
+    index.add("k1", "Como testar contraste?")
+    index.add("k1", "Como testar foco visível?")
+    assert len(index) == 1
+    assert index.search("testar contraste") == [] or index.search("testar contraste")[0][2] < 1
+
+    index.add("k2", "O que é ARIA?")
+    index.add("k3", "Como criar legendas?")
+    assert "k1" not in index and len(index) == 2
+
+    assert index.remove("k2") is True
+    assert index.remove("k2") is False
+    assert index.get_question("k3") == "Como criar legendas?"
+
+
+@pytest.mark.asyncio
+async def test_cache_responde_pergunta_reformulada(caplog):
+    """O cache devolve a resposta de uma reformulação e registra o hit semântico"""
+    with patch.object(cache_module, "settings") as mock_settings:
+        mock_settings.cache_enabled = True
+        mock_settings.cache_max_size = 10
+        mock_settings.cache_ttl_seconds = 60
+        mock_settings.cache_semantic_threshold = 0.8
+        cache_module.reset_cache_backend()
+        try:
+            await cache_module.set_cached_response("Como testar contraste de cores?", RESPOSTA)
+
+            assert await cache_module.get_cached_response("testar contraste de cores como?") is None
+            with caplog.at_level("INFO", logger=cache_module.__name__):
+                resultado = await cache_module.get_cached_response_with_similarity(
+                    "testar contraste de cores como?"
+                )
+            assert resultado == (RESPOSTA, pytest.approx(1.0))
+            assert "Cache HIT semântico" in caplog.text
+
+            # Resposta removida do backend sai também do índice
+            await cache_module.get_cache_backend().clear()
+            assert await cache_module.find_similar_questions("testar contraste de cores") == []
+            assert len(cache_module.get_question_index()) == 0
+        finally:
+            cache_module.reset_cache_backend()
+
+
+@pytest.mark.asyncio
+async def test_comandos_ficam_fora_da_busca_semantica():
+    """Comandos não entram no índice nem são respondidos por similaridade"""
+    with patch.object(cache_module, "settings") as mock_settings:
+        mock_settings.cache_enabled = True
+        mock_settings.cache_max_size = 10
+        mock_settings.cache_ttl_seconds = 60
+        mock_settings.cache_semantic_threshold = 0.5
+        cache_module.reset_cache_backend()
+        try:
+            await cache_module.set_cached_response("/simular cega formulário de login", RESPOSTA)
+            await cache_module.set_cached_response(
+                "Formulário de login com leitor de tela", RESPOSTA
+            )
+
+            assert len(cache_module.get_question_index()) == 1
+            assert (
+                await cache_module.get_similar_cached_response(
+                    "/simular motora formulário de login"
+                )
+                is None
+            )
+        finally:
+            cache_module.reset_cache_backend()
@@ -0,0 +1,169 @@
+"""
+Testes para o cache em memória compartilhada (shared_cache.py)
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from chatbot_acessibilidade.core import shared_cache
+from chatbot_acessibilidade.core.shared_cache import SharedMemoryCache
+
+pytestmark = pytest.mark.unit
+
+SRC_DIR = Path(__file__).resolve().parents[3] / "src"
+RESPOSTA = {"📘 **Introdução**": "Contraste mínimo de 4.5:1 para texto normal"}
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / "ada-cache")
+
+
+@pytest.fixture
+def cache(caminho):
+    cache = SharedMemoryCache(caminho, maxsize=8, ttl=3600, slot_bytes=1024)
+    yield cache
+    cache.close()
+
+
+def test_set_e_get(cache):
+    """Valor armazenado é lido de volta como dicionário"""
+    cache["abc"] = RESPOSTA
+
+    assert cache.get("abc") == RESPOSTA
+    assert "abc" in cache
+    assert len(cache) == 1
+    assert cache.get("inexistente") is None
+
+
+def test_entradas_visiveis_entre_instancias(cache, caminho):
+    """Outra instância (outro worker) enxerga as mesmas entradas"""
+    outro_worker = SharedMemoryCache(caminho, maxsize=8, ttl=3600, slot_bytes=1024)
+    try:
+        cache["abc"] = RESPOSTA
+        assert outro_worker.get("abc") == RESPOSTA
+
+        outro_worker.clear()
+        assert cache.get("abc") is None
+    finally:
+        outro_worker.close()
+
+
+def test_entradas_visiveis_entre_processos(cache, caminho):
+    """Entrada gravada por outro processo é lida sem passar pelo pipeline"""
+    codigo = (
+        "from chatbot_acessibilidade.core.shared_cache import SharedMemoryCache;"
+        f"c = SharedMemoryCache({caminho!r}, maxsize=8, ttl=3600, slot_bytes=1024);"
+        "c['de-outro-processo'] = {'ok': 'sim'}"
+    )
+    env = {**os.environ, "GOOGLE_API_KEY": "test_key_for_pytest", "PYTHONPATH": str(SRC_DIR)}
+    subprocess.run([sys.executable, "-c", codigo], env=env, check=True)
+
+    assert cache.get("de-outro-processo") == {"ok": "sim"}
+
+
+def test_entrada_expirada_nao_e_retornada(cache):
+    """TTL é respeitado por todos os processos (relógio de parede)"""
+    cache["abc"] = RESPOSTA
+
+    with patch.object(shared_cache.time, "time", return_value=shared_cache.time.time() + 7200):
+        assert cache.get("abc") is None
+        assert len(cache) == 0
+
+
+def test_sobrescreve_mesma_chave(cache):
+    """Gravar a mesma chave atualiza o slot existente"""
+    cache["abc"] = {"v": "1"}
+    cache["abc"] = {"v": "2"}
+
+    assert cache["abc"] == {"v": "2"}
+    assert len(cache) == 1
+
+
+def test_cheio_substitui_entrada_que_expira_primeiro(cache):
+    """Com todos os slots ocupados a entrada mais antiga é substituída"""
+    for i in range(8):
+        cache[f"k{i}"] = {"i": str(i)}
+    cache["nova"] = {"i": "nova"}
+
+    assert cache["nova"] == {"i": "nova"}
+    assert len(cache) == 8
+
+
+def test_valor_maior_que_slot_nao_e_cacheado(cache):
+    """Respostas que não cabem no slot são ignoradas sem erro"""
+    cache["grande"] = {"texto": "x" * 2048}
+
+    assert cache.get("grande") is None
+
+
+def test_delete_e_items(cache):
+    """Entradas podem ser removidas e listadas (snapshot do cache)"""
+    cache["a"] = {"v": "a"}
+    cache["b"] = {"v": "b"}
+    del cache["a"]
+
+    assert dict(cache.items()) == {"b": {"v": "b"}}
+    with pytest.raises(KeyError):
+        del cache["a"]
+
+
+def test_layouts_diferentes_no_mesmo_caminho(cache, caminho):
+    """Outro layout (ex.: novo CACHE_MAX_SIZE) usa outro segmento sem afetar o atual"""
+    cache["abc"] = RESPOSTA
+
+    menor = SharedMemoryCache(caminho, maxsize=4, ttl=3600, slot_bytes=1024)
+    try:
+        assert menor.path != cache.path
+        assert menor.get("abc") is None
+        menor["xyz"] = RESPOSTA
+
+        # O worker antigo continua lendo e escrevendo no seu segmento
+        assert cache.get("abc") == RESPOSTA
+        cache["def"] = RESPOSTA
+        assert cache.get("xyz") is None
+        assert len(cache) == 2
+        assert len(menor) == 1
+    finally:
+        menor.close()
+
+
+def test_cabecalho_invalido_troca_o_segmento(cache, caminho):
+    """Arquivo corrompido é substituído por outro; quem já o mapeava não é truncado"""
+    cache["abc"] = RESPOSTA
+    with open(cache.path, "r+b") as f:
+        f.write(b"CORROMPIDO")
+
+    novo = SharedMemoryCache(caminho, maxsize=8, ttl=3600, slot_bytes=1024)
+    try:
+        assert novo.get("abc") is None
+        assert os.stat(novo.path).st_ino != os.fstat(cache._fd).st_ino
+        assert cache.get("abc") == RESPOSTA
+    finally:
+        novo.close()
+
+
+@pytest.mark.asyncio
+async def test_get_cache_usa_backend_compartilhado(caminho):
+    """cache_backend='shared' faz get_cache retornar o SharedMemoryCache"""
+    import chatbot_acessibilidade.core.cache as cache_module
+
+    with patch.object(cache_module, "settings") as mock_settings:
+        mock_settings.cache_enabled = True
+        mock_settings.cache_max_size = 4
+        mock_settings.cache_ttl_seconds = 60
+        mock_settings.cache_backend = "shared"
+        mock_settings.cache_shared_path = caminho
+        cache_module._cache = None
+        try:
+            cache = cache_module.get_cache()
+            assert isinstance(cache, SharedMemoryCache)
+            assert (await cache_module.get_cache_stats())["backend"] == "shared"
+            cache.close()
+        finally:
+            cache_module._cache = None
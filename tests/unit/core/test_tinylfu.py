@@ -0,0 +1,127 @@
+"""
+Testes para o cache W-TinyLFU (tinylfu.py)
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from chatbot_acessibilidade.core import tinylfu
+from chatbot_acessibilidade.core.cache_backends import MemoryCacheBackend
+from chatbot_acessibilidade.core.tinylfu import CountMinSketch, TinyLFUCache
+
+pytestmark = pytest.mark.unit
+
+
+def _resposta(bytes_aprox):
+    return {"texto": "x" * bytes_aprox}
+
+
+def test_sketch_estima_frequencia_e_envelhece():
+    """Contadores crescem com acessos e são divididos por 2 no reset"""
+    sketch = CountMinSketch(16)
+    for _ in range(6):
+        sketch.increment("popular")
+    sketch.increment("raro")
+
+    assert sketch.estimate("popular") >= 6
+    assert sketch.estimate("raro") >= 1
+
+    sketch._reset()
+    assert sketch.estimate("popular") == 3
+
+
+def test_orcamento_em_bytes_e_respeitado():
+    """A soma dos tamanhos nunca passa do orçamento"""
+    cache = TinyLFUCache(max_bytes=10_000, ttl=60)
+    for i in range(50):
+        cache.put(f"k{i}", _resposta(900), cost=1.0)
+
+    assert cache.currsize <= 10_000
+    assert 0 < len(cache) < 50
+
+
+def test_entrada_popular_sobrevive_a_varredura():
+    """Chaves acessadas uma única vez não expulsam uma resposta popular"""
+    cache = TinyLFUCache(max_bytes=10_000, ttl=60)
+    cache.put("popular", _resposta(900), cost=1.0)
+    for _ in range(5):
+        cache.get("popular")
+
+    for i in range(100):
+        cache.get(f"unica{i}")  # miss, como no fluxo real
+        cache.put(f"unica{i}", _resposta(900), cost=1.0)
+
+    assert cache.get("popular") is not None
+
+
+def test_resposta_cara_vence_resposta_barata():
+    """Com mesma frequência e tamanho, a resposta mais cara é mantida"""
+    # Só cabe uma resposta de ~1,3 KB na região principal
+    cache = TinyLFUCache(max_bytes=2_000, ttl=60)
+    cache.put("barata", _resposta(1_300), cost=1.0)
+    cache.put("cara", _resposta(1_300), cost=30.0)
+
+    assert "cara" in cache
+    assert "barata" not in cache
+    assert cache.rejected == 0
+
+
+def test_resposta_barata_nao_expulsa_cara():
+    """Candidata que vale menos que a vítima é rejeitada"""
+    cache = TinyLFUCache(max_bytes=2_000, ttl=60)
+    cache.put("cara", _resposta(1_300), cost=30.0)
+    cache.put("barata", _resposta(1_300), cost=1.0)
+
+    assert "cara" in cache
+    assert "barata" not in cache
+    assert cache.rejected == 1
+
+
+def test_entrada_expirada_nao_e_retornada():
+    """TTL continua valendo"""
+    cache = TinyLFUCache(max_bytes=10_000, ttl=60)
+    cache["abc"] = _resposta(10)
+
+    with patch.object(tinylfu.time, "monotonic", return_value=tinylfu.time.monotonic() + 120):
+        assert cache.get("abc") is None
+    assert len(cache) == 0
+
+
+def test_atualizacao_e_remocao_ajustam_bytes():
+    """Atualizar ou remover uma chave mantém a contabilidade de bytes"""
+    cache = TinyLFUCache(max_bytes=10_000, ttl=60)
+    cache["abc"] = _resposta(100)
+    cache["abc"] = _resposta(500)
+    assert cache.entry_info("abc")["size"] == cache.currsize
+
+    del cache["abc"]
+    assert cache.currsize == 0
+    with pytest.raises(KeyError):
+        cache["abc"]
+
+
+def test_atualizacao_maior_que_o_cache_remove_a_versao_anterior():
+    """Valor novo grande demais é rejeitado sem deixar a resposta antiga no cache"""
+    cache = TinyLFUCache(max_bytes=1000, ttl=60)
+    cache.put("k", "old")
+    cache.put("k", "x" * 5000)
+
+    assert cache.get("k") is None
+    assert cache.currsize == 0
+    assert cache.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_backend_memoria_repassa_custo_e_expoe_bytes():
+    """MemoryCacheBackend usa put com custo e reporta bytes nas estatísticas"""
+    cache = TinyLFUCache(max_bytes=10_000, ttl=60)
+    backend = MemoryCacheBackend(cache)
+
+    await backend.set("abc", _resposta(100), cost=12.5)
+
+    assert cache.entry_info("abc")["cost"] == 12.5
+    stats = await backend.stats()
+    assert stats["policy"] == "tinylfu"
+    assert stats["bytes"] == cache.currsize
+    assert stats["max_size"] == 10_000
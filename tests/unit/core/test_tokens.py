@@ -0,0 +1,70 @@
+"""
+Testes para a estimativa de tokens e o orçamento de prompt
+"""
+
+import pytest
+
+from chatbot_acessibilidade.core.constants import TOKEN_TRIM_MARKER
+from chatbot_acessibilidade.core.tokens import (
+    ajustar_ao_orcamento,
+    dividir_blocos,
+    dividir_no_orcamento,
+    estimar_tokens,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def test_estimar_tokens_palavras_e_simbolos():
+    """Palavras contam por tamanho e cada símbolo conta um token"""
+    assert estimar_tokens("") == 0
+    assert estimar_tokens("o que é") == 3
+    assert estimar_tokens("acessibilidade") == 4
+    assert estimar_tokens('<button type="button">') == 10
+
+
+def test_dividir_blocos_mantem_codigo_inteiro():
+    """Linhas em branco dentro de ``` não dividem o bloco de código"""
+    texto = "Introdução.\n\n```html\n<nav>\n\n</nav>\n```\n\nConclusão."
+    blocos = dividir_blocos(texto)
+    assert blocos == ["Introdução.", "```html\n<nav>\n\n</nav>\n```", "Conclusão."]
+
+
+def test_ajustar_ao_orcamento_texto_que_cabe():
+    """Texto dentro do orçamento volta inalterado"""
+    assert ajustar_ao_orcamento("Texto curto.", 100) == ("Texto curto.", False)
+
+
+def test_ajustar_ao_orcamento_resume_em_ordem():
+    """Blocos que não cabem são omitidos com marca e o resultado respeita o orçamento"""
+    paragrafos = ["Introdução sobre contraste.", "palavra " * 200, "Como testar com axe."]
+    texto = "\n\n".join(paragrafos)
+
+    resumo, resumido = ajustar_ao_orcamento(texto, 30)
+
+    assert resumido is True
+    assert estimar_tokens(resumo) <= 30
+    assert resumo == f"Introdução sobre contraste.\n\n{TOKEN_TRIM_MARKER}\n\nComo testar com axe."
+
+
+def test_ajustar_ao_orcamento_corta_primeiro_bloco():
+    """Um primeiro bloco maior que o orçamento é cortado por palavras"""
+    resumo, resumido = ajustar_ao_orcamento("palavra " * 100, 20)
+
+    assert resumido is True
+    assert resumo.startswith("palavra palavra")
+    assert resumo.endswith(TOKEN_TRIM_MARKER)
+    assert estimar_tokens(resumo) <= 20
+
+
+def test_dividir_no_orcamento_mantem_todo_o_texto():
+    """As partes agrupam blocos inteiros em ordem, sem omitir nada"""
+    texto = "Introdução.\n\nPasso um.\n\n```html\n<nav>\n\n</nav>\n```\n\n" + "palavra " * 50
+    partes = dividir_no_orcamento(texto, 20)
+
+    assert partes == [
+        "Introdução.\n\nPasso um.",
+        "```html\n<nav>\n\n</nav>\n```",
+        "palavra " * 50,
+    ]
+    assert dividir_no_orcamento("Texto curto.", 100) == ["Texto curto."]
@@ -2,10 +2,18 @@
 Testes unitários para PipelineOrquestrador.
 """
 
+import json
+
 import pytest
 from unittest.mock import AsyncMock, patch
 
-from chatbot_acessibilidade.core.exceptions import APIError, AgentError, ValidationError
+from chatbot_acessibilidade.config import AgentConfig, settings
+from chatbot_acessibilidade.core.exceptions import (
+    APIError,
+    AgentError,
+    ResponseTruncatedError,
+    ValidationError,
+)
 from chatbot_acessibilidade.pipeline.orquestrador import PipelineOrquestrador
 
 pytestmark = pytest.mark.unit
@@ -325,3 +333,205 @@ async def test_pipeline_init_exception_generica():
         assert "erro" in resultado
         # A mensagem deve ser a genérica de ErrorMessages.API_ERROR_GENERIC
         assert len(resultado["erro"]) > 0
+
+
+@patch("chatbot_acessibilidade.pipeline.orquestrador.rotear_pergunta")
+@patch("chatbot_acessibilidade.pipeline.orquestrador.get_agent_response", new_callable=AsyncMock)
+async def test_executar_segue_plano_do_roteador(mock_get_agent_response, mock_rotear):
+    """Estágios pulados não chamam agentes e os demais recebem o modelo do plano"""
+    from chatbot_acessibilidade.core.router import RoutePlan
+
+    mock_rotear.return_value = RoutePlan(
+        nivel="simples",
+        modelos={"revisor": "modelo-lite"},
+        estagios_ignorados=frozenset({"validador", "testador"}),
+    )
+    mock_get_agent_response.side_effect = [
+        "Resposta inicial do assistente com conteúdo suficiente.",
+        "Resposta revisada com conteúdo suficiente para a introdução.",
+        "Links para estudo.",
+    ]
+
+    resultado = await PipelineOrquestrador().executar("O que é ARIA?")
+
+    chamadas = {c.args[0]: c.kwargs["model"] for c in mock_get_agent_response.call_args_list}
+    assert chamadas == {"assistente": None, "revisor": "modelo-lite", "aprofundador": None}
+    assert "🧪 **Como Testar na Prática**" not in resultado
+    assert resultado["📚 **Quer se Aprofundar?**"] == "Links para estudo."
+
+
+@patch("chatbot_acessibilidade.pipeline.orquestrador.get_agent_response", new_callable=AsyncMock)
+async def test_orcamento_de_prompt_por_estagio(mock_get_agent_response):
+    """Acima do orçamento o Validador valida em partes e o Testador recebe o resumo"""
+    orquestrador = PipelineOrquestrador()
+    orquestrador.pergunta = "Como criar um modal acessível?"
+    resposta = "Introdução sobre modais.\n\n" + "detalhe " * 300 + "\n\nUse o elemento dialog."
+    mock_get_agent_response.side_effect = [
+        resposta,
+        "OK",
+        "Detalhe corrigido.",
+        "Erro: tempo esgotado.",
+        "Resposta revisada.",
+        "Testes",
+        "Links",
+    ]
+
+    orcamentos = {
+        "validador": AgentConfig(prompt_budget_tokens=100),
+        "revisor": AgentConfig(prompt_budget_tokens=10_000),
+        "testador": AgentConfig(prompt_budget_tokens=100),
+    }
+    with patch.dict(settings.agent_configs, orcamentos):
+        await orquestrador.executar_sequencial()
+        orquestrador.resposta_final = resposta
+        await orquestrador.executar_paralelo()
+
+    estagios = [c.args[0] for c in mock_get_agent_response.call_args_list]
+    assert estagios == ["assistente"] + ["validador"] * 3 + ["revisor", "testador", "aprofundador"]
+    prompts_validador = [c.args[1] for c in mock_get_agent_response.call_args_list[1:4]]
+    assert "(1 de 3)" in prompts_validador[0]
+    assert "Use o elemento dialog." in prompts_validador[2]
+    # Trecho aprovado (OK) e trecho com erro mantêm o texto original
+    assert orquestrador.resposta_validada == (
+        "Introdução sobre modais.\n\nDetalhe corrigido.\n\nUse o elemento dialog."
+    )
+
+    prompt_testes = mock_get_agent_response.call_args_list[5].args[1]
+    assert "Introdução sobre modais." in prompt_testes
+    assert "Use o elemento dialog." in prompt_testes
+    assert "[...]" in prompt_testes
+    assert "detalhe detalhe" not in prompt_testes
+
+
+@patch("chatbot_acessibilidade.pipeline.orquestrador.get_agent_response", new_callable=AsyncMock)
+async def test_reescrita_limitada_pela_saida_do_estagio(mock_get_agent_response):
+    """Texto maior que a saída disponível (max_output - thinking) não é reescrito"""
+    orquestrador = PipelineOrquestrador()
+    orquestrador.pergunta = "Como criar um modal acessível?"
+    resposta = "Introdução sobre modais.\n\n" + "detalhe " * 300
+    mock_get_agent_response.side_effect = [resposta, "OK", "OK"]
+
+    limites = {
+        "validador": AgentConfig(
+            max_output_tokens=1200, thinking_budget=1024, prompt_budget_tokens=10_000
+        ),
+        "revisor": AgentConfig(max_output_tokens=100, prompt_budget_tokens=10_000),
+    }
+    with patch.dict(settings.agent_configs, limites):
+        await orquestrador.executar_sequencial()
+
+    estagios = [c.args[0] for c in mock_get_agent_response.call_args_list]
+    # Validador divide pelo que sobra após o raciocínio; o Revisor é pulado
+    assert estagios == ["assistente", "validador", "validador"]
+    assert orquestrador.resposta_final == resposta
+
+
+@patch("chatbot_acessibilidade.pipeline.orquestrador.get_agent_response", new_callable=AsyncMock)
+async def test_assistente_cortado_segue_com_texto_parcial(mock_get_agent_response):
+    """Resposta do Assistente cortada por MAX_TOKENS segue com o texto gerado"""
+    orquestrador = PipelineOrquestrador()
+    orquestrador.pergunta = "O que é WCAG?"
+    mock_get_agent_response.side_effect = [
+        ResponseTruncatedError("cortada", partial="Resposta parcial."),
+        ResponseTruncatedError("cortada", partial="Resposta validada parcial."),
+        "Resposta revisada.",
+    ]
+
+    await orquestrador.executar_sequencial()
+
+    assert orquestrador.resposta_inicial == "Resposta parcial."
+    # Nos demais estágios o corte é falha: mantém o texto anterior
+    assert orquestrador.resposta_validada == "Resposta parcial."
+    assert orquestrador.resposta_final == "Resposta revisada."
+
+
+@patch("chatbot_acessibilidade.pipeline.orquestrador.get_agent_response", new_callable=AsyncMock)
+async def test_assistente_cortado_sem_texto_levanta_excecao(mock_get_agent_response):
+    """Corte sem nenhum texto gerado é erro do Assistente"""
+    orquestrador = PipelineOrquestrador()
+    orquestrador.pergunta = "O que é WCAG?"
+    mock_get_agent_response.side_effect = ResponseTruncatedError("cortada")
+
+    with pytest.raises(ResponseTruncatedError):
+        await orquestrador.executar_sequencial()
+
+
+@patch("chatbot_acessibilidade.pipeline.orquestrador.stream_agent_response")
+@patch("chatbot_acessibilidade.pipeline.orquestrador.get_agent_response", new_callable=AsyncMock)
+async def test_revisor_em_streaming(mock_get_agent_response, mock_stream):
+    """Com consumidor, o texto do Revisor é repassado em partes e montado no fim"""
+    recebidas = []
+
+    async def consumidor(parte):
+        recebidas.append(parte)
+
+    async def partes(*args, **kwargs):
+        for parte in ("Texto ", "em linguagem ", "simples."):
+            yield parte
+
+    mock_stream.side_effect = partes
+    mock_get_agent_response.side_effect = ["Resposta inicial.", "OK"]
+    orquestrador = PipelineOrquestrador(ao_receber_revisao=consumidor)
+    orquestrador.pergunta = "O que é WCAG?"
+
+    await orquestrador.executar_sequencial()
+
+    assert recebidas == ["Texto ", "em linguagem ", "simples."]
+    assert orquestrador.resposta_final == "Texto em linguagem simples."
+    assert mock_stream.call_args.args[0] == "revisor"
+
+
+RESPOSTA_COMBINADA = json.dumps(
+    {
+        "introducao": "Um modal acessível mantém o foco dentro dele e fecha com a tecla Esc.",
+        "conceitos": "### 💡 Conceito\n\nUse o elemento `<dialog>` nativo com `aria-labelledby`.",
+        "testes": "1. Teste Automático com axe DevTools\n2. Teclado: Tab e Esc\n3. Mobile",
+        "aprofundar": "1. **Dialog (Modal) Pattern** - https://www.w3.org/WAI/ARIA/apg/",
+    }
+)
+
+
+@patch("chatbot_acessibilidade.pipeline.orquestrador.get_agent_response", new_callable=AsyncMock)
+async def test_modo_combinado_uma_chamada(mock_get_agent_response):
+    """No modo combinado uma resposta válida dispensa os cinco agentes"""
+    mock_get_agent_response.return_value = RESPOSTA_COMBINADA
+
+    with patch.object(settings, "pipeline_mode", "combinado"):
+        resultado = await PipelineOrquestrador().executar("Como fazer um modal acessível?")
+
+    assert mock_get_agent_response.call_count == 1
+    assert mock_get_agent_response.call_args.args[0] == "combinado"
+    assert resultado["📘 **Introdução**"].startswith("Um modal acessível")
+    assert "axe DevTools" in resultado["🧪 **Como Testar na Prática**"]
+    assert "👋 **Dica Final**" in resultado
+
+
+@pytest.mark.parametrize(
+    "falha",
+    ["Resposta em texto livre, fora do JSON.", APIError("Timeout ao executar Gemini após 60s")],
+)
+@patch("chatbot_acessibilidade.pipeline.orquestrador.get_agent_response", new_callable=AsyncMock)
+async def test_modo_combinado_volta_ao_pipeline(mock_get_agent_response, falha):
+    """JSON inválido ou erro na chamada seguem pelo pipeline de agentes"""
+    from chatbot_acessibilidade.core.metrics import get_metrics, reset_metrics
+
+    reset_metrics()
+    mock_get_agent_response.side_effect = [
+        falha,
+        "Resposta inicial do assistente com conteúdo suficiente.",
+        "OK",
+        "Resposta revisada com conteúdo suficiente para a introdução.",
+        "Testes",
+        "Links",
+    ]
+
+    with patch.object(settings, "pipeline_mode", "combinado"):
+        resultado = await PipelineOrquestrador().executar("Como fazer um modal acessível?")
+
+    estagios = [c.args[0] for c in mock_get_agent_response.call_args_list]
+    assert estagios[0] == "combinado"
+    assert sorted(estagios[1:]) == sorted(
+        ["assistente", "validador", "revisor", "testador", "aprofundador"]
+    )
+    assert resultado["📚 **Quer se Aprofundar?**"] == "Links"
+    assert get_metrics()["combined"] == {"accepted": 0, "fallbacks": 1}
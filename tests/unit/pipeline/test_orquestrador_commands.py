@@ -132,3 +132,23 @@ async def test_comando_refatorar_erro_execucao(mock_record, mock_get_agent_respo
 
     assert "erro" in resultado
     assert "Erro ao refatorar código" in resultado["erro"]
+
+
+@patch("chatbot_acessibilidade.pipeline.orquestrador.get_agent_response", new_callable=AsyncMock)
+@patch("chatbot_acessibilidade.pipeline.orquestrador.record_request")
+async def test_comando_refatorar_json_com_texto_e_virgula_final(
+    mock_record, mock_get_agent_response
+):
+    """JSON com texto em volta e vírgula final é recuperado em vez do formato bruto"""
+    mock_get_agent_response.return_value = (
+        "Aqui está o código refatorado:\n"
+        '{"code": "<button type=\\"button\\">Ok</button>", "wcag_criteria": ["4.1.2",],}\n'
+        "Qualquer dúvida, pergunte!"
+    )
+
+    resultado = await PipelineOrquestrador().executar("/refatorar <div>Ok</div>")
+
+    assert (
+        resultado["💻 **Código Refatorado**"] == '```html\n<button type="button">Ok</button>\n```'
+    )
+    assert resultado["✅ **Critérios WCAG**"] == "- 4.1.2"